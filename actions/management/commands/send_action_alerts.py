@@ -11,12 +11,13 @@ from django.core.management.base import BaseCommand
 from django.utils import timezone
 
 from actions.models import CorrectiveAction
-from actions.notifications import _action_html, _managers_and_raiser
+from actions.notifications import _action_html
+from core.alert_runs import SENT, AlertRunner
+from core.recipients import recipients as resolve_recipients
 
 
-def _send_overdue_alert(action, days_left):
-    from core.utils.email import send_brevo_email
-
+def _send_overdue_alert(run, action, days_left):
+    """Queue the reminder to every recipient; returns how many were sent."""
     if days_left < 0:
         overdue_days  = abs(days_left)
         header_color  = "#dc2626"
@@ -33,25 +34,16 @@ def _send_overdue_alert(action, days_left):
             f"Please complete and submit for verification before the due date.</p>"
         )
 
-    recipients = set()
-    if action.assigned_to and action.assigned_to.email:
-        recipients.add(action.assigned_to.email)
-    for e in _managers_and_raiser(action):
-        recipients.add(e)
+    recipients = resolve_recipients(action.assigned_to, action.raised_by, org=action.organization)
 
     if not recipients:
         return 0
 
     html = _action_html(action, subject, body, header_color)
-    sent = 0
-    for email in recipients:
-        try:
-            from core.utils.email import send_brevo_email
-            send_brevo_email(to_email=email, subject=subject, html_content=html)
-            sent += 1
-        except Exception:
-            pass
-    return sent
+    return sum(
+        run.notify("actions.due", action, email, subject, html) == SENT
+        for email in recipients
+    )
 
 
 class Command(BaseCommand):
@@ -59,7 +51,6 @@ class Command(BaseCommand):
 
     def handle(self, *args, **options):
         today   = timezone.now().date()
-        total   = 0
 
         open_actions = CorrectiveAction.objects.filter(
             due_date__isnull=False,
@@ -67,16 +58,16 @@ class Command(BaseCommand):
             "assigned_to", "raised_by", "organization"
         )
 
-        for action in open_actions:
-            days_left = (action.due_date - today).days
-            # Alert at 7 days before OR any overdue day
-            if days_left == 7 or days_left < 0:
-                sent = _send_overdue_alert(action, days_left)
-                total += sent
-                self.stdout.write(
-                    self.style.SUCCESS(
-                        f"  CA-{action.pk:04d} ({days_left}d): {sent} email(s) sent"
+        with AlertRunner("send_action_alerts", today) as run:
+            for action in run.iterate("actions", open_actions):
+                days_left = (action.due_date - today).days
+                # Alert at 7 days before OR any overdue day
+                if days_left == 7 or days_left < 0:
+                    sent = _send_overdue_alert(run, action, days_left)
+                    self.stdout.write(
+                        self.style.SUCCESS(
+                            f"  CA-{action.pk:04d} ({days_left}d): {sent} email(s) sent"
+                        )
                     )
-                )
 
-        self.stdout.write(self.style.SUCCESS(f"Done. {total} alert email(s) sent."))
+        self.stdout.write(self.style.SUCCESS(f"Done. Action alerts: {run.summary()}."))
@@ -0,0 +1,35 @@
+# Generated by Django 5.1 on 2026-10-17 02:02
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('actions', '0003_alter_correctiveaction_source_module'),
+        ('compliance', '0001_initial'),
+        ('core', '0009_add_safety_manager_to_invitation_role'),
+        ('hira', '0002_phase2'),
+        ('observations', '0003_alter_location_options'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='correctiveaction',
+            index=models.Index(fields=['organization', 'status', 'due_date'], name='ca_org_status_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='correctiveaction',
+            index=models.Index(condition=models.Q(('status', 'closed'), _negated=True), fields=['organization', 'due_date'], name='ca_org_open_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='correctiveaction',
+            index=models.Index(condition=models.Q(models.Q(('status', 'closed'), _negated=True), ('due_date__isnull', False)), fields=['due_date'], name='ca_open_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='correctiveaction',
+            index=models.Index(fields=['assigned_to', 'status'], name='ca_assignee_status_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.1 on 2026-10-17 02:57
+
+import datetime
+import django.db.models.functions.comparison
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('actions', '0004_tenant_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='correctiveaction',
+            index=models.Index(models.F('organization'), django.db.models.functions.comparison.Coalesce('due_date', models.Value(datetime.date(9999, 12, 31))), models.OrderBy(models.F('id'), descending=True), name='ca_org_due_sort_idx'),
+        ),
+    ]
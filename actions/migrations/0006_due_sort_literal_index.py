@@ -0,0 +1,23 @@
+# Generated by Django 5.1 on 2026-10-17 04:59
+
+import django.db.models.expressions
+import django.db.models.functions.comparison
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('actions', '0005_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='correctiveaction',
+            name='ca_org_due_sort_idx',
+        ),
+        migrations.AddIndex(
+            model_name='correctiveaction',
+            index=models.Index(models.F('organization'), django.db.models.functions.comparison.Coalesce('due_date', django.db.models.expressions.RawSQL("'9999-12-31'", ())), models.OrderBy(models.F('id'), descending=True), name='ca_org_due_sort_idx'),
+        ),
+    ]
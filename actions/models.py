@@ -1,8 +1,19 @@
 # actions/models.py
+from datetime import date
+
 from django.db import models
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Coalesce
 from django.conf import settings
 from django.utils import timezone
 
+# due_date with undated actions sorted last — a non-null keyset column.
+# The fallback is an inline SQL literal, as in the index DDL: a bound
+# parameter never matches the indexed expression. DateField is inferred
+# from due_date; an explicit output_field instance never compares equal
+# to the migration's copy, so ca_org_due_sort_idx would always drift.
+_DUE_SORT = Coalesce("due_date", RawSQL(f"'{date.max.isoformat()}'", ()))
+
 
 class CorrectiveAction(models.Model):
 
@@ -96,8 +107,38 @@ class CorrectiveAction(models.Model):
     )
     reopen_comment = models.TextField(blank=True)
 
+    # Annotate as this so ca_org_due_sort_idx serves the ordering.
+    DUE_SORT = _DUE_SORT
+
     class Meta:
         ordering = ["due_date", "-created_at"]
+        indexes = [
+            # action_list keyset pages: (due_sort, -id) per tenant
+            models.Index(
+                models.F("organization"),
+                _DUE_SORT,
+                models.F("id").desc(),
+                name="ca_org_due_sort_idx",
+            ),
+            # action_list: filter by status, default ordering by due date
+            models.Index(
+                fields=["organization", "status", "due_date"],
+                name="ca_org_status_due_idx",
+            ),
+            # Overdue counts + send_action_alerts: everything not yet closed
+            models.Index(
+                fields=["organization", "due_date"],
+                condition=~models.Q(status="closed"),
+                name="ca_org_open_due_idx",
+            ),
+            models.Index(
+                fields=["due_date"],
+                condition=~models.Q(status="closed") & models.Q(due_date__isnull=False),
+                name="ca_open_due_idx",
+            ),
+            # my_actions / "assigned to me" cards
+            models.Index(fields=["assigned_to", "status"], name="ca_assignee_status_idx"),
+        ]
 
     def __str__(self):
         return f"CA-{self.pk:04d}: {self.title}"
@@ -130,12 +130,5 @@ def send_action_notification(action, event):
 
 
 def _managers_and_raiser(action):
-    from django.contrib.auth import get_user_model
-    User = get_user_model()
-    emails = set()
-    if action.raised_by and action.raised_by.email:
-        emails.add(action.raised_by.email)
-    for u in User.objects.filter(organization=action.organization, is_active=True):
-        if (u.is_manager or u.is_safety_manager) and u.email:
-            emails.add(u.email)
-    return list(emails)
+    from core.recipients import recipients
+    return recipients(action.raised_by, org=action.organization)
@@ -8,6 +8,7 @@ from django.utils import timezone
 
 from .forms import CorrectiveActionForm, SubmitEvidenceForm, VerifyActionForm
 from .models import CorrectiveAction
+from core.utils.pagination import paginate_keyset
 
 
 # ── Guards ────────────────────────────────────────────────────────────────────
@@ -68,8 +69,13 @@ def action_list(request):
     today   = timezone.now().date()
     overdue = qs.filter(due_date__lt=today).exclude(status=CorrectiveAction.STATUS_CLOSED).count()
 
+    # Soonest due first, undated last (matches ca_org_due_sort_idx).
+    qs = qs.annotate(due_sort=CorrectiveAction.DUE_SORT)
+    page_obj = paginate_keyset(request, qs, ("due_sort", "-id"))
+
     return render(request, "actions/action_list.html", {
-        "actions":         qs,
+        "actions":         page_obj,
+        "page_obj":        page_obj,
         "status_filter":   status_filter,
         "priority_filter": priority_filter,
         "source_filter":   source_filter,
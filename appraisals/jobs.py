@@ -0,0 +1,16 @@
+"""appraisals/jobs.py — background job handlers (see jobs/registry.py)."""
+from jobs.registry import JobResult, register
+
+from .models import AppraisalRecord
+from .pdf import generate_appraisal_pdf
+
+
+@register("appraisals.record_pdf")
+def record_pdf(job):
+    # Access was checked by the view that queued the job.
+    record = AppraisalRecord.objects.select_related("employee", "cycle").get(pk=job.params["pk"])
+    safe_name = (
+        f"appraisal_{record.employee.full_name.replace(' ', '_')}"
+        f"_{record.cycle.name.replace(' ', '_')}.pdf"
+    )
+    return JobResult(filename=safe_name, content=generate_appraisal_pdf(record))
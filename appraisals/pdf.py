@@ -7,13 +7,13 @@ from decimal import Decimal
 
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import mm
 from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_RIGHT
 from reportlab.platypus import (
     SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, HRFlowable, KeepTogether
 )
 
+from core.pdf import data_table, sample_style, text_style
 from .models import AppraisalItem, AppraisalRating
 
 
@@ -57,6 +57,18 @@ def _score_color(score):
     return GREY_DARK
 
 
+def _ps(size, bold=False, color=NAVY, align=TA_LEFT, leading=None, after=2):
+    return text_style(
+        parent=sample_style(),
+        fontSize=size,
+        leading=leading or round(size * 1.4),
+        fontName="Helvetica-Bold" if bold else "Helvetica",
+        textColor=color,
+        alignment=align,
+        spaceAfter=after,
+    )
+
+
 def generate_appraisal_pdf(record) -> bytes:
     buf = BytesIO()
     doc = SimpleDocTemplate(
@@ -65,27 +77,14 @@ def generate_appraisal_pdf(record) -> bytes:
         topMargin=16*mm, bottomMargin=16*mm,
     )
 
-    base = getSampleStyleSheet()["Normal"]
-
-    def ps(name, size, bold=False, color=NAVY, align=TA_LEFT, leading=None, after=2):
-        return ParagraphStyle(
-            name, parent=base,
-            fontSize=size,
-            leading=leading or round(size * 1.4),
-            fontName="Helvetica-Bold" if bold else "Helvetica",
-            textColor=color,
-            alignment=align,
-            spaceAfter=after,
-        )
-
-    h1        = ps("H1",   18, bold=True, color=NAVY,      after=4)
-    h2        = ps("H2",   12, bold=True, color=DARK_BLUE,  after=3)
-    h3        = ps("H3",   10, bold=True, color=DARK_BLUE,  after=2)
-    label_s   = ps("Lbl",   7, bold=True, color=GREY_DARK, after=1)
-    body_s    = ps("Body",  9, color=NAVY, after=2)
-    small_s   = ps("Sm",    8, color=GREY_DARK, after=1)
-    right_s   = ps("Rt",   10, bold=True, color=NAVY, align=TA_RIGHT, after=2)
-    center_s  = ps("Ctr",   9, color=GREY_DARK, align=TA_CENTER, after=2)
+    h1        = _ps(18, bold=True, color=NAVY,      after=4)
+    h2        = _ps(12, bold=True, color=DARK_BLUE,  after=3)
+    h3        = _ps(10, bold=True, color=DARK_BLUE,  after=2)
+    label_s   = _ps(7, bold=True, color=GREY_DARK, after=1)
+    body_s    = _ps(9, color=NAVY, after=2)
+    small_s   = _ps(8, color=GREY_DARK, after=1)
+    right_s   = _ps(10, bold=True, color=NAVY, align=TA_RIGHT, after=2)
+    center_s  = _ps(9, color=GREY_DARK, align=TA_CENTER, after=2)
 
     story = []
     cycle = record.cycle
@@ -94,9 +93,9 @@ def generate_appraisal_pdf(record) -> bytes:
     # ── Header ──────────────────────────────────────────────────────────────
     org_name  = org.name if org else "Vigilo"
     hdr_data  = [[
-        Paragraph(org_name, ps("OrgN", 13, bold=True, color=NAVY)),
+        Paragraph(org_name, _ps(13, bold=True, color=NAVY)),
         Paragraph("PERFORMANCE APPRAISAL REPORT",
-                  ps("Rpt", 8, bold=True, color=GREY_DARK, align=TA_RIGHT)),
+                  _ps(8, bold=True, color=GREY_DARK, align=TA_RIGHT)),
     ]]
     hdr_tbl = Table(hdr_data, colWidths=["65%", "35%"])
     hdr_tbl.setStyle(TableStyle([("VALIGN", (0,0), (-1,-1), "BOTTOM")]))
@@ -142,10 +141,10 @@ def generate_appraisal_pdf(record) -> bytes:
         banner_data = [[
             [Paragraph("OVERALL SCORE", label_s),
              Paragraph(f"{score_val:.1f}%",
-                       ps("Score", 28, bold=True, color=score_color, leading=34))],
+                       _ps(28, bold=True, color=score_color, leading=34))],
             [Paragraph("RATING", label_s),
              Paragraph(rating_lbl,
-                       ps("Rtng", 16, bold=True, color=score_color, leading=22))],
+                       _ps(16, bold=True, color=score_color, leading=22))],
             [Paragraph("STATUS", label_s),
              Paragraph(record.get_status_display(), body_s)],
         ]]
@@ -182,7 +181,7 @@ def generate_appraisal_pdf(record) -> bytes:
         cat_hdr = Table(
             [[Paragraph(cat.name, h2),
               Paragraph(f"Weight: {cat.weight}%",
-                        ps("CW", 9, color=GREY_DARK, align=TA_RIGHT))]],
+                        _ps(9, color=GREY_DARK, align=TA_RIGHT))]],
             colWidths=["75%", "25%"]
         )
         cat_hdr.setStyle(TableStyle([
@@ -198,13 +197,13 @@ def generate_appraisal_pdf(record) -> bytes:
 
         # Items table header row
         item_rows = [[
-            Paragraph("Goal / Competency", ps("ITH", 8, bold=True, color=GREY_DARK)),
-            Paragraph("Type",              ps("ITH", 8, bold=True, color=GREY_DARK, align=TA_CENTER)),
-            Paragraph("Target",            ps("ITH", 8, bold=True, color=GREY_DARK, align=TA_CENTER)),
-            Paragraph("Actual",            ps("ITH", 8, bold=True, color=GREY_DARK, align=TA_CENTER)),
-            Paragraph("Self",              ps("ITH", 8, bold=True, color=GREY_DARK, align=TA_CENTER)),
-            Paragraph("Manager",           ps("ITH", 8, bold=True, color=GREY_DARK, align=TA_CENTER)),
-            Paragraph("Wt%",              ps("ITH", 8, bold=True, color=GREY_DARK, align=TA_CENTER)),
+            Paragraph("Goal / Competency", _ps(8, bold=True, color=GREY_DARK)),
+            Paragraph("Type",              _ps(8, bold=True, color=GREY_DARK, align=TA_CENTER)),
+            Paragraph("Target",            _ps(8, bold=True, color=GREY_DARK, align=TA_CENTER)),
+            Paragraph("Actual",            _ps(8, bold=True, color=GREY_DARK, align=TA_CENTER)),
+            Paragraph("Self",              _ps(8, bold=True, color=GREY_DARK, align=TA_CENTER)),
+            Paragraph("Manager",           _ps(8, bold=True, color=GREY_DARK, align=TA_CENTER)),
+            Paragraph("Wt%",              _ps(8, bold=True, color=GREY_DARK, align=TA_CENTER)),
         ]]
 
         for item in cat_items:
@@ -223,21 +222,17 @@ def generate_appraisal_pdf(record) -> bytes:
                     mgr_color = colors.HexColor("#d97706")
 
             item_rows.append([
-                [Paragraph(item.title, ps("IT", 8, color=NAVY)),
+                [Paragraph(item.title, _ps(8, color=NAVY)),
                  Paragraph(item.get_goal_type_display(),
-                           ps("GT", 7, color=GREY_DARK)) if item.goal_type == AppraisalItem.GOAL_SELF_SET else Paragraph("", small_s)],
+                           _ps(7, color=GREY_DARK)) if item.goal_type == AppraisalItem.GOAL_SELF_SET else Paragraph("", small_s)],
                 Paragraph(item.get_item_type_display(), center_s),
                 Paragraph(target, center_s),
                 Paragraph(actual, center_s),
-                Paragraph(self_r,  ps("SR", 9, color=GREY_DARK, align=TA_CENTER)),
-                Paragraph(mgr_r,   ps("MR", 9, bold=True, color=mgr_color, align=TA_CENTER)),
+                Paragraph(self_r,  _ps(9, color=GREY_DARK, align=TA_CENTER)),
+                Paragraph(mgr_r,   _ps(9, bold=True, color=mgr_color, align=TA_CENTER)),
                 Paragraph(f"{item.weight:.0f}%", center_s),
             ])
 
-        item_tbl = Table(
-            item_rows,
-            colWidths=["38%", "12%", "10%", "10%", "8%", "10%", "7%"],
-        )
         row_styles = [
             ("BACKGROUND",    (0,0), (-1,0),  GREY_BG),
             ("BOX",           (0,0), (-1,-1), 0.5, BORDER),
@@ -252,8 +247,9 @@ def generate_appraisal_pdf(record) -> bytes:
         for idx in range(1, len(item_rows)):
             if idx % 2 == 0:
                 row_styles.append(("BACKGROUND", (0, idx), (-1, idx), GREY_BG))
-        item_tbl.setStyle(TableStyle(row_styles))
-        story.append(item_tbl)
+        story.extend(data_table(
+            item_rows, ["38%", "12%", "10%", "10%", "8%", "10%", "7%"], row_styles,
+        ))
         story.append(Spacer(1, 4*mm))
 
     # ── Manager summary ──────────────────────────────────────────────────────
@@ -283,7 +279,7 @@ def generate_appraisal_pdf(record) -> bytes:
          Paragraph(
              f"Acknowledged on {record.acknowledged_at.strftime('%d %b %Y at %H:%M')}"
              if record.acknowledged_at else "Pending acknowledgment",
-             ps("AckV", 9, color=GREEN if record.acknowledged_at else GREY_DARK)
+             _ps(9, color=GREEN if record.acknowledged_at else GREY_DARK)
          )],
         [Paragraph("Reviewed by", label_s),
          Paragraph(reviewer_name, body_s)],
@@ -302,7 +298,7 @@ def generate_appraisal_pdf(record) -> bytes:
     story.append(Spacer(1, 4*mm))
     story.append(Paragraph(
         f"Generated by Vigilo · {org_name} · Confidential",
-        ps("Ftr", 7, color=GREY_DARK, align=TA_CENTER)
+        _ps(7, color=GREY_DARK, align=TA_CENTER)
     ))
 
     doc.build(story)
@@ -2,7 +2,6 @@ from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.core.exceptions import PermissionDenied
-from django.http import HttpResponse
 from django.utils import timezone
 from django.db import transaction
 
@@ -10,6 +9,7 @@ from .models import (
     AppraisalCycle, AppraisalCategory, AppraisalRecord,
     AppraisalItem, AppraisalRating, CalibrateNote, DevPlanLink,
 )
+from jobs.views import enqueue_for_request
 
 User = None  # resolved lazily via get_user_model()
 
@@ -737,16 +737,8 @@ def record_pdf(request, record_pk):
     if not user_is_employee and not user_is_manager:
         raise PermissionDenied
 
-    from .pdf import generate_appraisal_pdf
-    pdf_bytes = generate_appraisal_pdf(record)
-
-    safe_name = (
-        f"appraisal_{record.employee.full_name.replace(' ', '_')}"
-        f"_{record.cycle.name.replace(' ', '_')}.pdf"
-    )
-    response = HttpResponse(pdf_bytes, content_type="application/pdf")
-    response["Content-Disposition"] = f'inline; filename="{safe_name}"'
-    return response
+    # Rendered by a background worker (appraisals/jobs.py).
+    return enqueue_for_request(request, "appraisals.record_pdf", params={"pk": record.pk})
 
 
 # ─────────────────────────────────────────────────────────────
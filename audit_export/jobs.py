@@ -0,0 +1,17 @@
+"""audit_export/jobs.py — background job handlers (see jobs/registry.py)."""
+from datetime import date
+
+from jobs.registry import JobResult, register
+
+from .pack import build_pack_file, pack_filename
+
+
+@register("audit_export.iso45001_pack")
+def iso45001_pack(job):
+    org       = job.organization
+    from_date = date.fromisoformat(job.params["from_date"])
+    to_date   = date.fromisoformat(job.params["to_date"])
+    return JobResult(
+        filename=pack_filename(org, to_date),
+        file=build_pack_file(org, from_date, to_date),
+    )
@@ -0,0 +1,233 @@
+"""
+audit_export/pack.py — builds the ISO 45001 Evidence Pack ZIP.
+
+The data is read once, up front, into a PackSnapshot (snapshot.py).
+Sections are then rendered concurrently in a process pool (ReportLab is pure
+Python, so threads would serialise on the GIL); workers receive the snapshot
+pickled and never touch the database. Each PDF is written to the ZIP the
+moment it finishes. Sections whose source data hasn't changed since the
+last run of the same period are reused from storage (section_cache.py). The ZIP itself is written to a caller
+supplied file object — a temp file for the background job — so peak memory
+is roughly one section PDF per pool worker, however large the pack.
+"""
+import multiprocessing
+import os
+import pickle
+import tempfile
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.conf import settings
+
+from .pdf_sections import (
+    generate_cover,
+    generate_section_01_org,
+    generate_section_02_hira,
+    generate_section_03_compliance,
+    generate_section_04_training,
+    generate_section_05_operations,
+    generate_section_06_inspections,
+    generate_section_07_performance,
+    generate_section_08_incidents,
+    generate_section_09_actions,
+)
+from . import section_cache
+from .snapshot import load_snapshot
+
+SECTIONS = [
+    ("00_Master_Index.pdf",         generate_cover),
+    ("01_Clause4_Organisation.pdf", generate_section_01_org),
+    ("02_Clause6_HIRA.pdf",         generate_section_02_hira),
+    ("03_Clause6_Compliance.pdf",   generate_section_03_compliance),
+    ("04_Clause7_Training.pdf",     generate_section_04_training),
+    ("05_Clause8_Operations.pdf",   generate_section_05_operations),
+    ("06_Clause9_Inspections.pdf",  generate_section_06_inspections),
+    ("07_Clause9_Performance.pdf",  generate_section_07_performance),
+    ("08_Clause10_Incidents.pdf",   generate_section_08_incidents),
+    ("09_Clause10_Actions.pdf",     generate_section_09_actions),
+]
+
+# Modules (core/kpi_cache.MODULE_MODELS) each section reads, for the section
+# cache. None = always re-rendered: the cover and profile print the
+# generation time.
+SECTION_MODULES = {
+    "00_Master_Index.pdf":         None,
+    "01_Clause4_Organisation.pdf": None,
+    "02_Clause6_HIRA.pdf":         ["hira"],
+    "03_Clause6_Compliance.pdf":   ["compliance", "users"],
+    "04_Clause7_Training.pdf":     ["training", "skill_categories", "users"],
+    "05_Clause8_Operations.pdf":   ["observations", "permits", "users", "locations"],
+    "06_Clause9_Inspections.pdf":  ["inspections", "inspection_templates", "users", "locations"],
+    "07_Clause9_Performance.pdf":  ["incidents"],
+    "08_Clause10_Incidents.pdf":   ["incidents", "users", "locations"],
+    "09_Clause10_Actions.pdf":     ["actions", "users"],
+}
+
+
+# ---------------------------------------------------------------------------
+# Section rendering
+# ---------------------------------------------------------------------------
+
+def _render_section(index, snap):
+    """Return ``(pdf_bytes, ok)``; a failed section becomes an error-stub PDF."""
+    filename, generator = SECTIONS[index]
+    try:
+        return generator(snap), True
+    except Exception as exc:
+        return _error_pdf(filename, exc), False
+
+
+# Never "fork": the pack is built inside a job worker, whose heartbeat thread
+# (jobs/queue.py) may hold a lock (logging, the DB driver) at the moment of
+# the fork — the child would deadlock on it. forkserver children start from a
+# clean single-threaded server.
+_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+# Set in each worker by the pool initializer.
+_child_snapshot = None
+
+
+def _init_child(pickled_snap):
+    # Workers start without Django; the snapshot's model instances can only
+    # be unpickled once the app registry is ready.
+    import django
+
+    django.setup()
+    global _child_snapshot
+    _child_snapshot = pickle.loads(pickled_snap)
+
+
+def _render_in_child(index):
+    """Pool entry point — renders from the worker's snapshot."""
+    return _render_section(index, _child_snapshot)
+
+
+def _pool_size():
+    """AUDIT_PACK_PROCESSES (default: up to 4 CPUs)."""
+    size = getattr(settings, "AUDIT_PACK_PROCESSES", None)
+    if size is None:
+        size = min(4, os.cpu_count() or 1)
+    return max(1, size)
+
+
+def _cached_sections(org, from_date, to_date):
+    """
+    Split SECTIONS into cache hits and misses. Returns ``(hits, paths)``:
+    hits maps filename → cached bytes; paths maps each miss's index to the
+    storage path its render should be saved under (None = don't cache).
+    """
+    hits, paths = {}, {}
+    use_cache = section_cache.enabled()
+    for i, (filename, _) in enumerate(SECTIONS):
+        modules = SECTION_MODULES.get(filename)
+        path = None
+        if use_cache and modules:
+            # Versions are read before the snapshot, so a write landing
+            # mid-render leaves this entry stale rather than wrongly fresh.
+            path = section_cache.section_path(org, filename, from_date, to_date, modules)
+            cached = section_cache.load(path)
+            if cached is not None:
+                hits[filename] = cached
+                continue
+        paths[i] = path
+    return hits, paths
+
+
+def _iter_sections(org, from_date, to_date, stats=None):
+    """Yield (filename, pdf_bytes) as each section is reused or rendered."""
+    stats = {} if stats is None else stats
+    hits, paths = _cached_sections(org, from_date, to_date)
+    stats["cached"] = len(hits)
+    stats["rendered"] = len(paths)
+    yield from hits.items()
+    if not paths:
+        return
+
+    for index, filename, (pdf_bytes, ok) in _render_sections(list(paths), org, from_date, to_date):
+        if ok and paths[index] is not None:
+            section_cache.store(paths[index], pdf_bytes)
+        yield filename, pdf_bytes
+
+
+def _render_sections(indexes, org, from_date, to_date):
+    """Yield (index, filename, (pdf_bytes, ok)) as each section finishes."""
+    snap = load_snapshot(org, from_date, to_date)
+    workers = min(_pool_size(), len(indexes))
+    if workers == 1:
+        for i in indexes:
+            yield i, SECTIONS[i][0], _render_section(i, snap)
+        return
+
+    ctx = multiprocessing.get_context(_START_METHOD)
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=ctx,
+        initializer=_init_child, initargs=(pickle.dumps(snap),),
+    ) as pool:
+        futures = {pool.submit(_render_in_child, i): i for i in indexes}
+        for future in as_completed(futures):
+            i = futures[future]
+            filename = SECTIONS[i][0]
+            try:
+                result = future.result()
+            except Exception as exc:   # worker crashed outright
+                result = _error_pdf(filename, exc), False
+            yield i, filename, result
+
+
+# ---------------------------------------------------------------------------
+# ZIP assembly
+# ---------------------------------------------------------------------------
+
+def write_pack(fileobj, org, from_date, to_date):
+    """
+    Stream the pack into ``fileobj``. Works with unseekable streams too —
+    zipfile falls back to data descriptors — so the ZIP can go straight to
+    a socket or upload stream.
+
+    Returns ``{"cached": n, "rendered": n}`` section counts.
+    """
+    stats = {}
+    with zipfile.ZipFile(fileobj, "w", zipfile.ZIP_DEFLATED) as zf:
+        for filename, pdf_bytes in _iter_sections(org, from_date, to_date, stats):
+            zf.writestr(filename, pdf_bytes)
+    return stats
+
+
+def build_pack_file(org, from_date, to_date):
+    """Return an open temp file (positioned at 0) holding the finished ZIP."""
+    tmp = tempfile.TemporaryFile(suffix=".zip")
+    write_pack(tmp, org, from_date, to_date)
+    tmp.seek(0)
+    return tmp
+
+
+def pack_filename(org, to_date) -> str:
+    safe = "".join(c for c in org.name if c.isalnum() or c in " _-")[:25].strip().replace(" ", "_")
+    return f"ISO45001_Pack_{safe}_{to_date.isoformat()}.zip"
+
+
+def _error_pdf(section_name: str, exc: Exception) -> bytes:
+    """Return a minimal PDF stub when a section generator fails."""
+    from io import BytesIO
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import ParagraphStyle
+    from reportlab.lib import colors
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+
+    buf = BytesIO()
+    doc = SimpleDocTemplate(buf, pagesize=A4)
+    story = [
+        Spacer(1, 50),
+        Paragraph(
+            f"Error generating: {section_name}",
+            ParagraphStyle("e", fontSize=12, textColor=colors.red, fontName="Helvetica-Bold"),
+        ),
+        Spacer(1, 10),
+        Paragraph(
+            str(exc),
+            ParagraphStyle("em", fontSize=9, textColor=colors.grey),
+        ),
+    ]
+    doc.build(story)
+    buf.seek(0)
+    return buf.read()
@@ -1,15 +1,20 @@
 """
 audit_export/pdf_sections.py
 ISO 45001 Evidence Pack — PDF generators for each section + master cover.
-Each function returns bytes (the complete PDF).
+Each function takes the pack's PackSnapshot (snapshot.py) and returns bytes
+(the complete PDF); none of them query the database.
 """
 from __future__ import annotations
 
+import functools
+from collections import Counter
 from io import BytesIO
-from datetime import date as date_type
 
 from django.utils import timezone as dj_tz
 
+from core.pdf import data_table, text_style
+from .snapshot import PackSnapshot
+
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.styles import ParagraphStyle
@@ -54,8 +59,9 @@ STATUS_CLR = {
 
 # ── Shared helpers ────────────────────────────────────────────────────────────
 
+@functools.cache
 def _S():
-    """Return dict of named ParagraphStyles."""
+    """Return dict of named ParagraphStyles (built once per process)."""
     return {
         "cover_h":  ParagraphStyle("ch",  fontSize=22, leading=28, textColor=DARK,   fontName="Helvetica-Bold", alignment=1),
         "cover_sub":ParagraphStyle("cs",  fontSize=11, leading=15, textColor=MUTED,  fontName="Helvetica-Bold", alignment=1),
@@ -136,13 +142,13 @@ def _stat_strip(story, items):
         cells.append([
             Paragraph(
                 str(value),
-                ParagraphStyle("sv", fontSize=15, fontName="Helvetica-Bold",
-                               textColor=clr or DARK, leading=19, alignment=1),
+                text_style(fontSize=15, fontName="Helvetica-Bold",
+                           textColor=clr or DARK, leading=19, alignment=1),
             ),
             Paragraph(
                 label,
-                ParagraphStyle("sl", fontSize=6, textColor=MUTED,
-                               fontName="Helvetica-Bold", alignment=1, leading=8),
+                text_style(fontSize=6, textColor=MUTED,
+                           fontName="Helvetica-Bold", alignment=1, leading=8),
             ),
         ])
     tbl = Table([cells], colWidths=[f"{100 // n}%"] * n)
@@ -171,15 +177,8 @@ def _build(doc, story, buf):
 
 # ── Cover / Master Index ──────────────────────────────────────────────────────
 
-def generate_cover(org, from_date: date_type, to_date: date_type) -> bytes:
-    from hira.models import HazardRegister, Hazard
-    from compliance.models import ComplianceItem
-    from training.models import AssessmentAttempt
-    from observations.models import Observation
-    from permits.models import Permit
-    from inspections.models import Inspection
-    from incidents.models import Incident
-    from actions.models import CorrectiveAction
+def generate_cover(snap: PackSnapshot) -> bytes:
+    org, from_date, to_date = snap.org, snap.from_date, snap.to_date
     from core.logo_utils import get_logo_for_pdf
 
     buf = BytesIO()
@@ -218,7 +217,7 @@ def generate_cover(org, from_date: date_type, to_date: date_type) -> bytes:
     story.append(Spacer(1, 6 * mm))
     story.append(Paragraph(
         "Generated by Vigilo Safety Platform \u00b7 Confidential",
-        ParagraphStyle("ci", fontSize=8, textColor=MUTED, alignment=1),
+        text_style(fontSize=8, textColor=MUTED, alignment=1),
     ))
     story.append(PageBreak())
 
@@ -233,56 +232,34 @@ def generate_cover(org, from_date: date_type, to_date: date_type) -> bytes:
     ))
     story.append(Spacer(1, 4 * mm))
 
-    # Fetch counts for evidence status column
-    hira_count = HazardRegister.objects.filter(
-        organization=org,
-        assessment_date__gte=from_date, assessment_date__lte=to_date,
-    ).count()
-    compliance_count = ComplianceItem.objects.filter(organization=org).count()
-    training_count = AssessmentAttempt.objects.filter(
-        organization=org,
-        submitted_at__date__gte=from_date, submitted_at__date__lte=to_date,
-    ).count()
-    obs_count = Observation.objects.filter(
-        organization=org,
-        date_observed__date__gte=from_date, date_observed__date__lte=to_date,
-    ).count()
-    permit_count = Permit.objects.filter(
-        organization=org,
-        created_at__date__gte=from_date, created_at__date__lte=to_date,
-    ).count()
-    insp_count = Inspection.objects.filter(
-        organization=org,
-        conducted_date__gte=from_date, conducted_date__lte=to_date,
-        status="completed",
-    ).count()
-    incident_count = Incident.objects.filter(
-        organization=org,
-        date_occurred__date__gte=from_date, date_occurred__date__lte=to_date,
-    ).count()
-    action_count = CorrectiveAction.objects.filter(
-        organization=org,
-        created_at__date__gte=from_date, created_at__date__lte=to_date,
-    ).count()
+    # Evidence status column — the same rows the sections render
+    hira_count = len(snap.registers)
+    compliance_count = len(snap.compliance_items)
+    training_count = len(snap.attempts)
+    obs_count = len(snap.observations)
+    permit_count = len(snap.permits)
+    insp_count = len(snap.inspections)
+    incident_count = len(snap.incidents)
+    action_count = len(snap.actions)
 
     def _evidence_tag(count, label):
         if count > 0:
             return Paragraph(
                 f"\u2713 {count} {label}",
-                ParagraphStyle("ev", fontSize=7, fontName="Helvetica-Bold",
-                               textColor=GREEN, leading=9),
+                text_style(fontSize=7, fontName="Helvetica-Bold",
+                           textColor=GREEN, leading=9),
             )
         return Paragraph(
             "\u26a0 No records",
-            ParagraphStyle("ev0", fontSize=7, fontName="Helvetica-Bold",
-                           textColor=AMBER, leading=9),
+            text_style(fontSize=7, fontName="Helvetica-Bold",
+                       textColor=AMBER, leading=9),
         )
 
     INDEX_ROWS = [
         ["File", "ISO 45001 Clause", "Evidence Section", "Status"],
         ["01", "Clause 4\nContext",
          "Organisation profile, user roster\nand active locations",
-         Paragraph("\u2713 Always included", ParagraphStyle("inc", fontSize=7, fontName="Helvetica-Bold", textColor=GREEN, leading=9))],
+         Paragraph("\u2713 Always included", text_style(fontSize=7, fontName="Helvetica-Bold", textColor=GREEN, leading=9))],
         ["02", "Clause 6.1\nHazard ID & Risk Assessment",
          "HIRA registers, hazard inventory\nand risk level breakdown",
          _evidence_tag(hira_count, "registers")],
@@ -333,10 +310,8 @@ def generate_cover(org, from_date: date_type, to_date: date_type) -> bytes:
 
 # ── Section 01 — Organisation Context (Clause 4) ─────────────────────────────
 
-def generate_section_01_org(org, from_date: date_type, to_date: date_type) -> bytes:
-    from django.contrib.auth import get_user_model
-    User = get_user_model()
-
+def generate_section_01_org(snap: PackSnapshot) -> bytes:
+    org, from_date, to_date = snap.org, snap.from_date, snap.to_date
     buf = BytesIO()
     s = _S()
     doc = _new_doc(buf)
@@ -349,11 +324,11 @@ def generate_section_01_org(org, from_date: date_type, to_date: date_type) -> by
         from_date, to_date,
     )
 
-    users = User.objects.filter(organization=org, is_active=True).order_by("role", "full_name")
-    total = users.count()
-    managers = users.filter(role__in=["manager", "safety_manager"]).count()
-    observers = users.filter(role__in=["observer", "action_owner"]).count()
-    contractors = users.filter(role="contractor").count()
+    users = snap.users
+    total = len(users)
+    managers = sum(1 for u in users if u.role in ("manager", "safety_manager"))
+    observers = sum(1 for u in users if u.role in ("observer", "action_owner"))
+    contractors = sum(1 for u in users if u.role == "contractor")
 
     _stat_strip(story, [
         (total,       "TOTAL ACTIVE USERS",    DARK),
@@ -403,9 +378,7 @@ def generate_section_01_org(org, from_date: date_type, to_date: date_type) -> by
         ])
 
     if len(rows) > 1:
-        tbl = Table(rows, colWidths=[60 * mm, 42 * mm, 72 * mm], repeatRows=1)
-        tbl.setStyle(TableStyle(_tbl_style()))
-        story.append(tbl)
+        story.extend(data_table(rows, [60 * mm, 42 * mm, 72 * mm], _tbl_style()))
     else:
         _no_data(story, s)
 
@@ -415,9 +388,8 @@ def generate_section_01_org(org, from_date: date_type, to_date: date_type) -> by
 
 # ── Section 02 — HIRA (Clause 6.1) ───────────────────────────────────────────
 
-def generate_section_02_hira(org, from_date: date_type, to_date: date_type) -> bytes:
-    from hira.models import HazardRegister, Hazard
-
+def generate_section_02_hira(snap: PackSnapshot) -> bytes:
+    org, from_date, to_date = snap.org, snap.from_date, snap.to_date
     buf = BytesIO()
     s = _S()
     doc = _new_doc(buf)
@@ -430,24 +402,14 @@ def generate_section_02_hira(org, from_date: date_type, to_date: date_type) -> b
         from_date, to_date,
     )
 
-    registers = HazardRegister.objects.filter(
-        organization=org,
-        assessment_date__gte=from_date,
-        assessment_date__lte=to_date,
-    ).prefetch_related("hazards").order_by("-assessment_date")
-
-    reg_ids = list(registers.values_list("id", flat=True))
-    hazards = list(Hazard.objects.filter(register_id__in=reg_ids).select_related("register", "action_owner"))
+    registers = snap.registers
+    hazards = snap.hazards
 
     approved = sum(1 for r in registers if r.status == "approved")
-    risk_counts = {"critical": 0, "high": 0, "medium": 0, "low": 0}
-    for h in hazards:
-        lvl = h.effective_risk_level
-        if lvl in risk_counts:
-            risk_counts[lvl] += 1
+    risk_counts = Counter(h.effective_risk_level for h in hazards)
 
     _stat_strip(story, [
-        (registers.count(),                             "REGISTERS",          DARK),
+        (len(registers),                                "REGISTERS",          DARK),
         (approved,                                      "APPROVED",           GREEN),
         (len(hazards),                                  "TOTAL HAZARDS",      AMBER),
         (risk_counts["critical"] + risk_counts["high"], "CRITICAL / HIGH",    RED),
@@ -467,25 +429,23 @@ def generate_section_02_hira(org, from_date: date_type, to_date: date_type) -> b
             Paragraph(reg.title[:50], s["body"]),
             Paragraph((reg.activity or "—")[:40], s["small"]),
             Paragraph(STATUS_LABELS.get(reg.status, reg.status), s["body"]),
-            Paragraph(str(reg.hazards.count()), s["center"]),
+            Paragraph(str(len(reg.hazards.all())), s["center"]),
             Paragraph(
                 highest.upper() if highest else "—",
-                ParagraphStyle("rl", fontSize=7, fontName="Helvetica-Bold",
-                               textColor=RISK_CLR.get(highest, TEXT), alignment=1),
+                text_style(fontSize=7, fontName="Helvetica-Bold",
+                           textColor=RISK_CLR.get(highest, TEXT), alignment=1),
             ),
             Paragraph(reg.assessment_date.strftime("%d %b %Y"), s["small"]),
         ])
 
     if len(rows) > 1:
         col_w = [8 * mm, 52 * mm, 38 * mm, 22 * mm, 10 * mm, 20 * mm, 24 * mm]
-        tbl = Table(rows, colWidths=col_w, repeatRows=1)
         style = _tbl_style()
         for idx, reg in enumerate(registers, 1):
             lvl = reg.highest_risk_level
             if lvl in RISK_BG_CLR:
                 style.append(("BACKGROUND", (5, idx), (5, idx), RISK_BG_CLR[lvl]))
-        tbl.setStyle(TableStyle(style))
-        story.append(tbl)
+        story.extend(data_table(rows, col_w, style))
     else:
         _no_data(story, s)
 
@@ -503,20 +463,19 @@ def generate_section_02_hira(org, from_date: date_type, to_date: date_type) -> b
             Paragraph(h.potential_harm[:60], s["small"]),
             Paragraph(
                 f"{h.initial_risk_score}\n{il.upper()}" if il else "—",
-                ParagraphStyle("ir", fontSize=7, fontName="Helvetica-Bold",
-                               textColor=RISK_CLR.get(il, TEXT), alignment=1),
+                text_style(fontSize=7, fontName="Helvetica-Bold",
+                           textColor=RISK_CLR.get(il, TEXT), alignment=1),
             ),
             Paragraph(h.get_primary_control_type_display() if h.primary_control_type else "—", s["small"]),
             Paragraph(
                 f"{h.residual_risk_score}\n{rl.upper()}" if rl else "N/A",
-                ParagraphStyle("rr", fontSize=7, fontName="Helvetica-Bold",
-                               textColor=RISK_CLR.get(rl, MUTED), alignment=1),
+                text_style(fontSize=7, fontName="Helvetica-Bold",
+                           textColor=RISK_CLR.get(rl, MUTED), alignment=1),
             ),
         ])
 
     if len(rows2) > 1:
         col_w2 = [24 * mm, 56 * mm, 42 * mm, 14 * mm, 22 * mm, 16 * mm]
-        tbl2 = Table(rows2, colWidths=col_w2, repeatRows=1)
         style2 = _tbl_style()
         for idx, h in enumerate(hazards, 1):
             il = h.initial_risk_level
@@ -525,8 +484,7 @@ def generate_section_02_hira(org, from_date: date_type, to_date: date_type) -> b
                 style2.append(("BACKGROUND", (3, idx), (3, idx), RISK_BG_CLR[il]))
             if rl in RISK_BG_CLR:
                 style2.append(("BACKGROUND", (5, idx), (5, idx), RISK_BG_CLR[rl]))
-        tbl2.setStyle(TableStyle(style2))
-        story.append(tbl2)
+        story.extend(data_table(rows2, col_w2, style2))
     else:
         _no_data(story, s)
 
@@ -536,9 +494,8 @@ def generate_section_02_hira(org, from_date: date_type, to_date: date_type) -> b
 
 # ── Section 03 — Compliance (Clause 6.1.3) ───────────────────────────────────
 
-def generate_section_03_compliance(org, from_date: date_type, to_date: date_type) -> bytes:
-    from compliance.models import ComplianceItem
-
+def generate_section_03_compliance(snap: PackSnapshot) -> bytes:
+    org, from_date, to_date = snap.org, snap.from_date, snap.to_date
     buf = BytesIO()
     s = _S()
     doc = _new_doc(buf)
@@ -551,11 +508,10 @@ def generate_section_03_compliance(org, from_date: date_type, to_date: date_type
         from_date, to_date,
     )
 
-    items = ComplianceItem.objects.filter(organization=org).select_related("assigned_to").order_by("due_date")
-    total = items.count()
-    complied = items.filter(status="complied").count()
-    overdue = items.filter(status="overdue").count()
-    pending = items.filter(status="pending").count()
+    items = snap.compliance_items
+    total = len(items)
+    complied = sum(1 for i in items if i.status == "complied")
+    overdue = sum(1 for i in items if i.status == "overdue")
     score = round(complied / total * 100) if total else 0
 
     _stat_strip(story, [
@@ -586,14 +542,13 @@ def generate_section_03_compliance(org, from_date: date_type, to_date: date_type
             Paragraph(item.due_date.strftime("%d %b %Y"), s["small"]),
             Paragraph(
                 status_lbl,
-                ParagraphStyle("st", fontSize=7, fontName="Helvetica-Bold", textColor=clr),
+                text_style(fontSize=7, fontName="Helvetica-Bold", textColor=clr),
             ),
             Paragraph(assignee[:25], s["small"]),
         ])
 
     if len(rows) > 1:
         col_w = [8 * mm, 50 * mm, 40 * mm, 18 * mm, 18 * mm, 18 * mm, 22 * mm]
-        tbl = Table(rows, colWidths=col_w, repeatRows=1)
         style = _tbl_style()
         for idx, item in enumerate(items, 1):
             bg = {
@@ -603,8 +558,7 @@ def generate_section_03_compliance(org, from_date: date_type, to_date: date_type
                 "not_applicable": GREY_BG,
             }.get(item.status, WHITE)
             style.append(("BACKGROUND", (5, idx), (5, idx), bg))
-        tbl.setStyle(TableStyle(style))
-        story.append(tbl)
+        story.extend(data_table(rows, col_w, style))
     else:
         _no_data(story, s)
 
@@ -614,9 +568,8 @@ def generate_section_03_compliance(org, from_date: date_type, to_date: date_type
 
 # ── Section 04 — Training & Competence (Clause 7.2) ──────────────────────────
 
-def generate_section_04_training(org, from_date: date_type, to_date: date_type) -> bytes:
-    from training.models import AssessmentAttempt, SkillProficiency, Skill
-
+def generate_section_04_training(snap: PackSnapshot) -> bytes:
+    org, from_date, to_date = snap.org, snap.from_date, snap.to_date
     buf = BytesIO()
     s = _S()
     doc = _new_doc(buf)
@@ -629,20 +582,12 @@ def generate_section_04_training(org, from_date: date_type, to_date: date_type)
         from_date, to_date,
     )
 
-    attempts = AssessmentAttempt.objects.filter(
-        organization=org,
-        submitted_at__date__gte=from_date,
-        submitted_at__date__lte=to_date,
-    ).select_related("user", "assessment__training_module").order_by("-submitted_at")
-
-    proficiencies = SkillProficiency.objects.filter(
-        organization=org,
-    ).select_related("user", "skill").order_by("user__full_name", "skill__name")
+    attempts = snap.attempts
+    proficiencies = snap.proficiencies
 
-    total_att = attempts.count()
-    passed = attempts.filter(passed=True).count()
+    total_att = len(attempts)
+    passed = sum(1 for a in attempts if a.passed)
     pass_rate = round(passed / total_att * 100) if total_att else 0
-    unique_skills = proficiencies.values("skill").distinct().count()
 
     _stat_strip(story, [
         (total_att,        "ASSESSMENT ATTEMPTS", DARK),
@@ -662,20 +607,18 @@ def generate_section_04_training(org, from_date: date_type, to_date: date_type)
             Paragraph(f"{att.score:.1f}%", s["center"]),
             Paragraph(
                 "PASS" if att.passed else "FAIL",
-                ParagraphStyle("pr", fontSize=7, fontName="Helvetica-Bold",
-                               textColor=GREEN if att.passed else RED, alignment=1),
+                text_style(fontSize=7, fontName="Helvetica-Bold",
+                           textColor=GREEN if att.passed else RED, alignment=1),
             ),
         ])
 
     if len(rows) > 1:
         col_w = [22 * mm, 50 * mm, 65 * mm, 18 * mm, 19 * mm]
-        tbl = Table(rows, colWidths=col_w, repeatRows=1)
         style = _tbl_style()
         for idx, att in enumerate(attempts, 1):
             bg = colors.HexColor("#dcfce7") if att.passed else colors.HexColor("#fee2e2")
             style.append(("BACKGROUND", (4, idx), (4, idx), bg))
-        tbl.setStyle(TableStyle(style))
-        story.append(tbl)
+        story.extend(data_table(rows, col_w, style))
     else:
         _no_data(story, s, "No assessment attempts found for the selected period.")
 
@@ -696,9 +639,7 @@ def generate_section_04_training(org, from_date: date_type, to_date: date_type)
 
     if len(rows2) > 1:
         col_w2 = [50 * mm, 45 * mm, 30 * mm, 30 * mm, 19 * mm]
-        tbl2 = Table(rows2, colWidths=col_w2, repeatRows=1)
-        tbl2.setStyle(TableStyle(_tbl_style()))
-        story.append(tbl2)
+        story.extend(data_table(rows2, col_w2, _tbl_style()))
     else:
         _no_data(story, s, "No skill proficiency records found.")
 
@@ -708,10 +649,8 @@ def generate_section_04_training(org, from_date: date_type, to_date: date_type)
 
 # ── Section 05 — Operations (Clause 8.1) ─────────────────────────────────────
 
-def generate_section_05_operations(org, from_date: date_type, to_date: date_type) -> bytes:
-    from observations.models import Observation
-    from permits.models import Permit
-
+def generate_section_05_operations(snap: PackSnapshot) -> bytes:
+    org, from_date, to_date = snap.org, snap.from_date, snap.to_date
     buf = BytesIO()
     s = _S()
     doc = _new_doc(buf)
@@ -724,23 +663,13 @@ def generate_section_05_operations(org, from_date: date_type, to_date: date_type
         from_date, to_date,
     )
 
-    observations = Observation.objects.filter(
-        organization=org,
-        date_observed__date__gte=from_date,
-        date_observed__date__lte=to_date,
-    ).select_related("location", "observer").order_by("-date_observed")
+    observations = snap.observations
+    permits = snap.permits
 
-    permits = Permit.objects.filter(
-        organization=org,
-        created_at__date__gte=from_date,
-        created_at__date__lte=to_date,
-    ).select_related("location", "requestor").order_by("-created_at")
-
-    obs_total = observations.count()
-    obs_high = observations.filter(severity="HIGH").count()
-    obs_closed = observations.filter(status="CLOSED").count()
-    ptw_total = permits.count()
-    ptw_approved = permits.filter(status__in=["APPROVED", "ACTIVE", "CLOSED"]).count()
+    obs_total = len(observations)
+    obs_high = sum(1 for o in observations if o.severity == "HIGH")
+    obs_closed = sum(1 for o in observations if o.status == "CLOSED")
+    ptw_total = len(permits)
 
     _stat_strip(story, [
         (obs_total,   "OBSERVATIONS",        DARK),
@@ -760,8 +689,8 @@ def generate_section_05_operations(org, from_date: date_type, to_date: date_type
             Paragraph(obs.title[:50], s["body"]),
             Paragraph(
                 sev,
-                ParagraphStyle("sv", fontSize=7, fontName="Helvetica-Bold",
-                               textColor=SEV_CLR.get(sev, TEXT), alignment=1),
+                text_style(fontSize=7, fontName="Helvetica-Bold",
+                           textColor=SEV_CLR.get(sev, TEXT), alignment=1),
             ),
             Paragraph(obs.get_status_display(), s["small"]),
             Paragraph(str(obs.location)[:25] if obs.location else "—", s["small"]),
@@ -770,7 +699,6 @@ def generate_section_05_operations(org, from_date: date_type, to_date: date_type
 
     if len(rows) > 1:
         col_w = [18 * mm, 58 * mm, 16 * mm, 32 * mm, 28 * mm, 22 * mm]
-        tbl = Table(rows, colWidths=col_w, repeatRows=1)
         style = _tbl_style()
         for idx, obs in enumerate(observations, 1):
             sev = obs.severity
@@ -780,8 +708,7 @@ def generate_section_05_operations(org, from_date: date_type, to_date: date_type
                 style.append(("BACKGROUND", (2, idx), (2, idx), colors.HexColor("#fef9c3")))
             else:
                 style.append(("BACKGROUND", (2, idx), (2, idx), colors.HexColor("#dcfce7")))
-        tbl.setStyle(TableStyle(style))
-        story.append(tbl)
+        story.extend(data_table(rows, col_w, style))
     else:
         _no_data(story, s)
 
@@ -808,7 +735,7 @@ def generate_section_05_operations(org, from_date: date_type, to_date: date_type
             Paragraph(p.title[:45], s["body"]),
             Paragraph(
                 p.status,
-                ParagraphStyle("ps", fontSize=7, fontName="Helvetica-Bold", textColor=st_clr),
+                text_style(fontSize=7, fontName="Helvetica-Bold", textColor=st_clr),
             ),
             Paragraph(p.requestor.full_name if p.requestor else "—", s["small"]),
             Paragraph(p.planned_start.strftime("%d %b %Y") if p.planned_start else "—", s["small"]),
@@ -816,9 +743,7 @@ def generate_section_05_operations(org, from_date: date_type, to_date: date_type
 
     if len(rows2) > 1:
         col_w2 = [26 * mm, 24 * mm, 60 * mm, 20 * mm, 28 * mm, 16 * mm]
-        tbl2 = Table(rows2, colWidths=col_w2, repeatRows=1)
-        tbl2.setStyle(TableStyle(_tbl_style()))
-        story.append(tbl2)
+        story.extend(data_table(rows2, col_w2, _tbl_style()))
     else:
         _no_data(story, s, "No permits to work found for the selected period.")
 
@@ -828,9 +753,8 @@ def generate_section_05_operations(org, from_date: date_type, to_date: date_type
 
 # ── Section 06 — Inspections (Clause 9.2) ────────────────────────────────────
 
-def generate_section_06_inspections(org, from_date: date_type, to_date: date_type) -> bytes:
-    from inspections.models import Inspection, InspectionFinding
-
+def generate_section_06_inspections(snap: PackSnapshot) -> bytes:
+    org, from_date, to_date = snap.org, snap.from_date, snap.to_date
     buf = BytesIO()
     s = _S()
     doc = _new_doc(buf)
@@ -843,14 +767,9 @@ def generate_section_06_inspections(org, from_date: date_type, to_date: date_typ
         from_date, to_date,
     )
 
-    inspections = Inspection.objects.filter(
-        organization=org,
-        conducted_date__gte=from_date,
-        conducted_date__lte=to_date,
-        status="completed",
-    ).select_related("template", "inspector", "location").order_by("-conducted_date")
+    inspections = snap.inspections
 
-    total = inspections.count()
+    total = len(inspections)
     scores = [i.score for i in inspections if i.score is not None]
     avg_score = round(sum(scores) / len(scores)) if scores else 0
     passed_90 = sum(1 for sc in scores if sc >= 90)
@@ -867,7 +786,7 @@ def generate_section_06_inspections(org, from_date: date_type, to_date: date_typ
     for insp in inspections:
         sc = insp.score
         sc_clr = GREEN if (sc or 0) >= 90 else (ORANGE if (sc or 0) >= 70 else RED)
-        finding_count = insp.findings.filter(response="FAIL").count()
+        finding_count = insp.fail_count
         rows.append([
             Paragraph(insp.conducted_date.strftime("%d %b %Y") if insp.conducted_date else "—", s["small"]),
             Paragraph(insp.title[:45], s["body"]),
@@ -876,19 +795,18 @@ def generate_section_06_inspections(org, from_date: date_type, to_date: date_typ
             Paragraph(insp.location_display[:25], s["small"]),
             Paragraph(
                 f"{sc:.0f}%" if sc is not None else "—",
-                ParagraphStyle("sc", fontSize=8, fontName="Helvetica-Bold",
-                               textColor=sc_clr, alignment=1),
+                text_style(fontSize=8, fontName="Helvetica-Bold",
+                           textColor=sc_clr, alignment=1),
             ),
             Paragraph(
                 f"{finding_count} fail" if finding_count else "\u2713 Pass",
-                ParagraphStyle("fc", fontSize=7, fontName="Helvetica-Bold",
-                               textColor=RED if finding_count else GREEN, alignment=1),
+                text_style(fontSize=7, fontName="Helvetica-Bold",
+                           textColor=RED if finding_count else GREEN, alignment=1),
             ),
         ])
 
     if len(rows) > 1:
         col_w = [18 * mm, 48 * mm, 30 * mm, 28 * mm, 22 * mm, 14 * mm, 14 * mm]
-        tbl = Table(rows, colWidths=col_w, repeatRows=1)
         style = _tbl_style()
         for idx, insp in enumerate(inspections, 1):
             sc = insp.score or 0
@@ -896,8 +814,7 @@ def generate_section_06_inspections(org, from_date: date_type, to_date: date_typ
                      else colors.HexColor("#fef9c3") if sc >= 70
                      else colors.HexColor("#fee2e2"))
             style.append(("BACKGROUND", (5, idx), (5, idx), sc_bg))
-        tbl.setStyle(TableStyle(style))
-        story.append(tbl)
+        story.extend(data_table(rows, col_w, style))
     else:
         _no_data(story, s, "No completed inspections found for the selected period.")
 
@@ -907,10 +824,8 @@ def generate_section_06_inspections(org, from_date: date_type, to_date: date_typ
 
 # ── Section 07 — Performance (Clause 9.1) ────────────────────────────────────
 
-def generate_section_07_performance(org, from_date: date_type, to_date: date_type) -> bytes:
-    from incidents.models import Incident, HoursWorked
-    from django.db.models import Count, Q
-
+def generate_section_07_performance(snap: PackSnapshot) -> bytes:
+    org, from_date, to_date = snap.org, snap.from_date, snap.to_date
     buf = BytesIO()
     s = _S()
     doc = _new_doc(buf)
@@ -923,25 +838,18 @@ def generate_section_07_performance(org, from_date: date_type, to_date: date_typ
         from_date, to_date,
     )
 
-    incidents = Incident.objects.filter(
-        organization=org,
-        date_occurred__date__gte=from_date,
-        date_occurred__date__lte=to_date,
-    )
+    RECORDABLE = ("lti", "mtc", "fac", "fatality")
+    incidents = snap.incidents
+    by_severity = Counter(inc.severity for inc in incidents)
 
-    total_inc = incidents.count()
-    ltis = incidents.filter(severity="lti").count()
-    fatalities = incidents.filter(severity="fatality").count()
-    recordable = incidents.filter(severity__in=["lti", "mtc", "fac", "fatality"]).count()
-    near_misses = incidents.filter(severity="near_miss").count()
+    total_inc = len(incidents)
+    ltis = by_severity["lti"]
+    fatalities = by_severity["fatality"]
+    recordable = sum(by_severity[sev] for sev in RECORDABLE)
+    near_misses = by_severity["near_miss"]
 
     # Total hours worked in period
-    hw_qs = HoursWorked.objects.filter(
-        organization=org,
-        year__gte=from_date.year,
-        year__lte=to_date.year,
-    )
-    total_hours = float(sum(hw.hours for hw in hw_qs)) if hw_qs.exists() else 0
+    total_hours = snap.total_hours
 
     ltifr = round((ltis + fatalities) * 1_000_000 / total_hours, 2) if total_hours > 0 else "N/A"
     trifr = round(recordable * 1_000_000 / total_hours, 2) if total_hours > 0 else "N/A"
@@ -959,8 +867,8 @@ def generate_section_07_performance(org, from_date: date_type, to_date: date_typ
         [Paragraph("Total Incidents Reported", s["label"]),      Paragraph(str(total_inc), s["bold"])],
         [Paragraph("Lost Time Injuries (LTI)", s["label"]),      Paragraph(str(ltis), s["bold"])],
         [Paragraph("Fatalities", s["label"]),                    Paragraph(str(fatalities), s["bold"])],
-        [Paragraph("Medical Treatment Cases (MTC)", s["label"]), Paragraph(str(incidents.filter(severity="mtc").count()), s["bold"])],
-        [Paragraph("First Aid Cases (FAC)", s["label"]),         Paragraph(str(incidents.filter(severity="fac").count()), s["bold"])],
+        [Paragraph("Medical Treatment Cases (MTC)", s["label"]), Paragraph(str(by_severity["mtc"]), s["bold"])],
+        [Paragraph("First Aid Cases (FAC)", s["label"]),         Paragraph(str(by_severity["fac"]), s["bold"])],
         [Paragraph("Near-Misses", s["label"]),                   Paragraph(str(near_misses), s["bold"])],
         [Paragraph("Total Hours Worked", s["label"]),            Paragraph(f"{total_hours:,.0f} hrs" if total_hours else "Not entered", s["bold"])],
         [Paragraph("LTIFR (per 1,000,000 hrs)", s["label"]),    Paragraph(str(ltifr), s["bold"])],
@@ -984,7 +892,11 @@ def generate_section_07_performance(org, from_date: date_type, to_date: date_typ
     # Monthly breakdown
     story.append(Paragraph("Monthly Breakdown", s["h2"]))
     from calendar import month_abbr
-    import itertools
+
+    by_month = {}
+    for inc in incidents:
+        key = (inc.date_occurred.year, inc.date_occurred.month)
+        by_month.setdefault(key, Counter())[inc.severity] += 1
 
     # Build year/month range
     months = []
@@ -998,21 +910,17 @@ def generate_section_07_performance(org, from_date: date_type, to_date: date_typ
 
     rows3 = [["Month", "Incidents", "LTIs", "Near-Miss", "Recordable", "Hrs Worked", "LTIFR", "TRIFR"]]
     for y, m in months:
-        mo_inc = incidents.filter(date_occurred__year=y, date_occurred__month=m)
-        mo_lti = mo_inc.filter(severity__in=["lti", "fatality"]).count()
-        mo_nm = mo_inc.filter(severity="near_miss").count()
-        mo_rec = mo_inc.filter(severity__in=["lti", "mtc", "fac", "fatality"]).count()
-        try:
-            hw_obj = HoursWorked.objects.get(organization=org, year=y, month=m)
-            mo_hrs = float(hw_obj.hours)
-        except HoursWorked.DoesNotExist:
-            mo_hrs = 0
+        mo_inc = by_month.get((y, m), Counter())
+        mo_lti = mo_inc["lti"] + mo_inc["fatality"]
+        mo_nm = mo_inc["near_miss"]
+        mo_rec = sum(mo_inc[sev] for sev in RECORDABLE)
+        mo_hrs = snap.hours_for(y, m)
         mo_ltifr = round(mo_lti * 1_000_000 / mo_hrs, 2) if mo_hrs > 0 else "—"
         mo_trifr = round(mo_rec * 1_000_000 / mo_hrs, 2) if mo_hrs > 0 else "—"
         rows3.append([
             Paragraph(f"{month_abbr[m]} {y}", s["small"]),
-            Paragraph(str(mo_inc.count()), s["center"]),
-            Paragraph(str(mo_lti), ParagraphStyle("ml", fontSize=7, textColor=RED if mo_lti > 0 else TEXT, alignment=1, fontName="Helvetica-Bold" if mo_lti > 0 else "Helvetica")),
+            Paragraph(str(sum(mo_inc.values())), s["center"]),
+            Paragraph(str(mo_lti), text_style(fontSize=7, textColor=RED if mo_lti > 0 else TEXT, alignment=1, fontName="Helvetica-Bold" if mo_lti > 0 else "Helvetica")),
             Paragraph(str(mo_nm), s["center"]),
             Paragraph(str(mo_rec), s["center"]),
             Paragraph(f"{mo_hrs:,.0f}" if mo_hrs else "—", s["center"]),
@@ -1021,9 +929,24 @@ def generate_section_07_performance(org, from_date: date_type, to_date: date_typ
         ])
 
     col_w3 = [20 * mm, 20 * mm, 14 * mm, 20 * mm, 22 * mm, 22 * mm, 28 * mm, 28 * mm]
-    tbl3 = Table(rows3, colWidths=col_w3, repeatRows=1)
-    tbl3.setStyle(TableStyle(_tbl_style()))
-    story.append(tbl3)
+    story.extend(data_table(rows3, col_w3, _tbl_style()))
+    story.append(Spacer(1, 6 * mm))
+
+    # Rolling 12-month trend (window reaches back before the period)
+    story.append(Paragraph("Rolling 12-Month Rates", s["h2"]))
+    rows4 = [["Month", "12-Mo Hrs", "12-Mo LTI", "12-Mo Recordable", "LTIFR", "TRIFR", "Severity Rate"]]
+    for r in snap.rolling_rates:
+        rows4.append([
+            Paragraph(r["label"], s["small"]),
+            Paragraph(f"{r['window_hours']:,.0f}" if r["window_hours"] else "—", s["center"]),
+            Paragraph(str(r["window_lti"]), s["center"]),
+            Paragraph(str(r["window_recordable"]), s["center"]),
+            Paragraph(str(r["ltifr"]) if r["ltifr"] is not None else "—", s["center"]),
+            Paragraph(str(r["trifr"]) if r["trifr"] is not None else "—", s["center"]),
+            Paragraph(str(r["severity_rate"]) if r["severity_rate"] is not None else "—", s["center"]),
+        ])
+    col_w4 = [22 * mm, 26 * mm, 22 * mm, 28 * mm, 24 * mm, 24 * mm, 28 * mm]
+    story.extend(data_table(rows4, col_w4, _tbl_style()))
 
     if total_hours == 0:
         story.append(Spacer(1, 3 * mm))
@@ -1039,9 +962,8 @@ def generate_section_07_performance(org, from_date: date_type, to_date: date_typ
 
 # ── Section 08 — Incidents (Clause 10.2) ─────────────────────────────────────
 
-def generate_section_08_incidents(org, from_date: date_type, to_date: date_type) -> bytes:
-    from incidents.models import Incident
-
+def generate_section_08_incidents(snap: PackSnapshot) -> bytes:
+    org, from_date, to_date = snap.org, snap.from_date, snap.to_date
     buf = BytesIO()
     s = _S()
     doc = _new_doc(buf)
@@ -1054,16 +976,12 @@ def generate_section_08_incidents(org, from_date: date_type, to_date: date_type)
         from_date, to_date,
     )
 
-    incidents = Incident.objects.filter(
-        organization=org,
-        date_occurred__date__gte=from_date,
-        date_occurred__date__lte=to_date,
-    ).select_related("reported_by", "investigated_by", "location").order_by("-date_occurred")
+    incidents = snap.incidents
 
-    total = incidents.count()
-    closed = incidents.filter(status="closed").count()
-    under_inv = incidents.filter(status="under_investigation").count()
-    rca_done = incidents.exclude(rca_root_cause="").count()
+    total = len(incidents)
+    closed = sum(1 for inc in incidents if inc.status == "closed")
+    under_inv = sum(1 for inc in incidents if inc.status == "under_investigation")
+    rca_done = sum(1 for inc in incidents if inc.rca_root_cause != "")
 
     _stat_strip(story, [
         (total,      "TOTAL INCIDENTS",    DARK),
@@ -1108,22 +1026,21 @@ def generate_section_08_incidents(org, from_date: date_type, to_date: date_type)
             Paragraph(TYPE_LABELS.get(inc.incident_type, inc.incident_type), s["small"]),
             Paragraph(
                 SEV_LABELS.get(sev, sev),
-                ParagraphStyle("sv", fontSize=7, fontName="Helvetica-Bold",
-                               textColor=SEV_CLRS.get(sev, TEXT)),
+                text_style(fontSize=7, fontName="Helvetica-Bold",
+                           textColor=SEV_CLRS.get(sev, TEXT)),
             ),
             Paragraph(STATUS_LABELS.get(status, status), s["small"]),
             Paragraph(location[:22], s["small"]),
             Paragraph(investigator[:20], s["small"]),
             Paragraph(
                 rca,
-                ParagraphStyle("rc", fontSize=9, fontName="Helvetica-Bold",
-                               textColor=rca_clr, alignment=1),
+                text_style(fontSize=9, fontName="Helvetica-Bold",
+                           textColor=rca_clr, alignment=1),
             ),
         ])
 
     if len(rows) > 1:
         col_w = [20 * mm, 18 * mm, 22 * mm, 18 * mm, 20 * mm, 28 * mm, 28 * mm, 10 * mm]
-        tbl = Table(rows, colWidths=col_w, repeatRows=1)
         style = _tbl_style()
         for idx, inc in enumerate(incidents, 1):
             sev_bg = {
@@ -1133,8 +1050,7 @@ def generate_section_08_incidents(org, from_date: date_type, to_date: date_type)
                 "fac":      colors.HexColor("#fef9c3"),
             }.get(inc.severity, WHITE)
             style.append(("BACKGROUND", (3, idx), (3, idx), sev_bg))
-        tbl.setStyle(TableStyle(style))
-        story.append(tbl)
+        story.extend(data_table(rows, col_w, style))
     else:
         _no_data(story, s)
 
@@ -1144,10 +1060,8 @@ def generate_section_08_incidents(org, from_date: date_type, to_date: date_type)
 
 # ── Section 09 — Corrective Actions (Clause 10.2) ────────────────────────────
 
-def generate_section_09_actions(org, from_date: date_type, to_date: date_type) -> bytes:
-    from actions.models import CorrectiveAction
-    from django.utils import timezone
-
+def generate_section_09_actions(snap: PackSnapshot) -> bytes:
+    org, from_date, to_date = snap.org, snap.from_date, snap.to_date
     buf = BytesIO()
     s = _S()
     doc = _new_doc(buf)
@@ -1160,14 +1074,10 @@ def generate_section_09_actions(org, from_date: date_type, to_date: date_type) -
         from_date, to_date,
     )
 
-    actions = CorrectiveAction.objects.filter(
-        organization=org,
-        created_at__date__gte=from_date,
-        created_at__date__lte=to_date,
-    ).select_related("assigned_to", "raised_by").order_by("due_date", "-created_at")
+    actions = snap.actions
 
-    total = actions.count()
-    closed = actions.filter(status="closed").count()
+    total = len(actions)
+    closed = sum(1 for a in actions if a.status == "closed")
     overdue = sum(1 for a in actions if a.is_overdue)
     on_time = sum(
         1 for a in actions
@@ -1218,31 +1128,29 @@ def generate_section_09_actions(org, from_date: date_type, to_date: date_type) -
             Paragraph(a.title[:55], s["body"]),
             Paragraph(
                 a.priority.upper(),
-                ParagraphStyle("pr", fontSize=7, fontName="Helvetica-Bold",
-                               textColor=PRIORITY_CLR.get(priority, TEXT)),
+                text_style(fontSize=7, fontName="Helvetica-Bold",
+                           textColor=PRIORITY_CLR.get(priority, TEXT)),
             ),
             Paragraph(STATUS_LABELS.get(status, status), s["small"]),
             Paragraph(assignee[:22], s["small"]),
             Paragraph(due, s["small"]),
             Paragraph(
                 on_time_flag,
-                ParagraphStyle("ot", fontSize=8, fontName="Helvetica-Bold",
-                               textColor=ot_clr, alignment=1),
+                text_style(fontSize=8, fontName="Helvetica-Bold",
+                           textColor=ot_clr, alignment=1),
             ),
         ])
 
     if len(rows) > 1:
         col_w = [14 * mm, 16 * mm, 55 * mm, 16 * mm, 26 * mm, 24 * mm, 16 * mm, 10 * mm]  # =177mm (small over is OK, RL trims)
         col_w = [14 * mm, 16 * mm, 52 * mm, 16 * mm, 26 * mm, 22 * mm, 16 * mm, 12 * mm]
-        tbl = Table(rows, colWidths=col_w, repeatRows=1)
         style = _tbl_style()
         for idx, a in enumerate(actions, 1):
             if a.status == "closed":
                 style.append(("BACKGROUND", (4, idx), (4, idx), colors.HexColor("#dcfce7")))
             elif a.is_overdue:
                 style.append(("BACKGROUND", (4, idx), (4, idx), colors.HexColor("#fee2e2")))
-        tbl.setStyle(TableStyle(style))
-        story.append(tbl)
+        story.extend(data_table(rows, col_w, style))
     else:
         _no_data(story, s)
 
@@ -0,0 +1,85 @@
+"""
+audit_export/section_cache.py — reuse section PDFs between pack runs.
+
+Each rendered section is kept in default storage under
+
+    audit_export/cache/<org_id>/<from>_<to>/<section>-<digest>.pdf
+
+where the digest covers the org name, the coverage period, today's date
+(overdue flags are date-relative) and the data version of every module the
+section reads (core/kpi_cache.data_version — bumped by the same post_save /
+post_delete receivers that invalidate dashboard KPIs). A rerun of the same
+period therefore re-renders only the sections whose source data changed;
+superseded files for a section are removed when its new PDF is stored.
+
+Module versions live in the cache backend, so with the per-process locmem
+backend a worker would never see web-side invalidations. The section cache
+is therefore off there unless AUDIT_PACK_CACHE forces it on.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.utils import timezone
+
+from core.kpi_cache import data_version
+from core.utils.caching import shared_cache_enabled
+
+logger = logging.getLogger(__name__)
+
+# Bump when a generator's layout changes so stale renders aren't reused.
+LAYOUT_VERSION = 3
+
+
+def enabled() -> bool:
+    return shared_cache_enabled("AUDIT_PACK_CACHE")
+
+
+def _dir(org, from_date, to_date):
+    return f"audit_export/cache/{org.pk}/{from_date.isoformat()}_{to_date.isoformat()}"
+
+
+def _stem(filename):
+    return filename.rsplit(".", 1)[0]
+
+
+def section_path(org, filename, from_date, to_date, modules) -> str:
+    """Storage path of this section's PDF at the current data version."""
+    raw = "|".join([
+        str(LAYOUT_VERSION), str(org.pk), org.name, filename,
+        from_date.isoformat(), to_date.isoformat(),
+        timezone.localdate().isoformat(),
+        data_version(org, modules),
+    ])
+    digest = hashlib.sha256(raw.encode()).hexdigest()[:20]
+    return f"{_dir(org, from_date, to_date)}/{_stem(filename)}-{digest}.pdf"
+
+
+def load(path):
+    """Return the cached PDF bytes, or None when missing / unreadable."""
+    try:
+        if not default_storage.exists(path):
+            return None
+        with default_storage.open(path, "rb") as fh:
+            return fh.read()
+    except Exception:
+        logger.warning("Could not read cached pack section %s", path, exc_info=True)
+        return None
+
+
+def store(path, pdf_bytes):
+    """Save a freshly rendered section and drop its superseded versions."""
+    try:
+        if not default_storage.exists(path):
+            path = default_storage.save(path, ContentFile(pdf_bytes))
+        folder, name = path.rsplit("/", 1)
+        prefix = name.rsplit("-", 1)[0] + "-"
+        _, files = default_storage.listdir(folder)
+        for other in files:
+            if other != name and other.startswith(prefix):
+                default_storage.delete(f"{folder}/{other}")
+    except Exception:
+        logger.warning("Could not store pack section %s", path, exc_info=True)
@@ -0,0 +1,167 @@
+"""
+audit_export/snapshot.py — one read of everything the Evidence Pack shows.
+
+load_snapshot() fetches the organisation's data for the coverage period in a
+fixed number of bulk queries (one per table, related rows joined or
+prefetched) and returns a frozen PackSnapshot. Every section generator in
+pdf_sections.py renders from that snapshot alone, so:
+
+  • the cover's evidence counts are len() of the same rows the sections list,
+  • incidents are read once for sections 07 and 08,
+  • hours worked is one query, looked up per month from a dict,
+  • pack worker processes (pack.py) never touch the database.
+
+The query count does not grow with the number of rows or months.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, fields
+from datetime import date as date_type
+from decimal import Decimal
+from types import MappingProxyType
+from typing import Any, Mapping
+
+from django.contrib.auth import get_user_model
+from django.db.models import Count, Prefetch, Q
+
+
+@dataclass(frozen=True)
+class PackSnapshot:
+    org: Any
+    from_date: date_type
+    to_date: date_type
+
+    users: tuple                 # active users, by role then name
+    registers: tuple             # HIRA registers assessed in the period
+    hazards: tuple               # hazards of those registers
+    compliance_items: tuple      # full register (cumulative)
+    attempts: tuple              # assessment attempts submitted in the period
+    proficiencies: tuple         # all current skill proficiencies (cumulative)
+    observations: tuple
+    permits: tuple
+    inspections: tuple           # completed, annotated with ``fail_count``
+    incidents: tuple             # shared by sections 07 and 08
+    hours_by_month: Mapping      # (year, month) -> Decimal hours
+    rolling_rates: tuple         # incidents.stats.get_rolling_rates() per month
+    actions: tuple
+
+    @property
+    def total_hours(self) -> float:
+        return float(sum(self.hours_by_month.values(), Decimal(0)))
+
+    def hours_for(self, year, month) -> float:
+        return float(self.hours_by_month.get((year, month), 0))
+
+    def __reduce__(self):
+        # Pack workers receive the snapshot pickled; a mappingproxy is not.
+        state = {f.name: getattr(self, f.name) for f in fields(self)}
+        state["hours_by_month"] = dict(self.hours_by_month)
+        return _unpickle_snapshot, (state,)
+
+
+def _unpickle_snapshot(state):
+    state["hours_by_month"] = MappingProxyType(state["hours_by_month"])
+    return PackSnapshot(**state)
+
+
+def load_snapshot(org, from_date: date_type, to_date: date_type) -> PackSnapshot:
+    from actions.models import CorrectiveAction
+    from compliance.models import ComplianceItem
+    from hira.models import Hazard, HazardRegister
+    from incidents.models import HoursWorked, Incident
+    from incidents.stats import get_rolling_rates
+    from inspections.models import Inspection, InspectionFinding
+    from observations.models import Observation
+    from permits.models import Permit
+    from training.models import AssessmentAttempt, SkillProficiency
+
+    User = get_user_model()
+
+    users = User.objects.filter(
+        organization=org, is_active=True,
+    ).order_by("role", "full_name")
+
+    registers = tuple(
+        HazardRegister.objects.filter(
+            organization=org,
+            assessment_date__gte=from_date,
+            assessment_date__lte=to_date,
+        ).prefetch_related(
+            Prefetch("hazards", queryset=Hazard.objects.select_related("action_owner")),
+        ).order_by("-assessment_date")
+    )
+    hazards = tuple(h for reg in registers for h in reg.hazards.all())
+
+    compliance_items = ComplianceItem.objects.filter(
+        organization=org,
+    ).select_related("assigned_to").order_by("due_date")
+
+    attempts = AssessmentAttempt.objects.filter(
+        organization=org,
+        submitted_at__date__gte=from_date,
+        submitted_at__date__lte=to_date,
+    ).select_related("user", "assessment__training_module").order_by("-submitted_at")
+
+    proficiencies = SkillProficiency.objects.filter(
+        organization=org,
+    ).select_related("user", "skill__category").order_by("user__full_name", "skill__name")
+
+    observations = Observation.objects.filter(
+        organization=org,
+        date_observed__date__gte=from_date,
+        date_observed__date__lte=to_date,
+    ).select_related("location", "observer").order_by("-date_observed")
+
+    permits = Permit.objects.filter(
+        organization=org,
+        created_at__date__gte=from_date,
+        created_at__date__lte=to_date,
+    ).select_related("location", "requestor").order_by("-created_at")
+
+    inspections = Inspection.objects.filter(
+        organization=org,
+        conducted_date__gte=from_date,
+        conducted_date__lte=to_date,
+        status="completed",
+    ).select_related("template", "inspector", "location").annotate(
+        fail_count=Count("findings", filter=Q(findings__response=InspectionFinding.RESP_FAIL)),
+    ).order_by("-conducted_date")
+
+    incidents = Incident.objects.filter(
+        organization=org,
+        date_occurred__date__gte=from_date,
+        date_occurred__date__lte=to_date,
+    ).select_related("reported_by", "investigated_by", "location").order_by("-date_occurred")
+
+    hours = HoursWorked.objects.filter(
+        organization=org,
+        year__gte=from_date.year,
+        year__lte=to_date.year,
+    ).values_list("year", "month", "hours")
+
+    actions = CorrectiveAction.objects.filter(
+        organization=org,
+        created_at__date__gte=from_date,
+        created_at__date__lte=to_date,
+    ).select_related("assigned_to", "raised_by").order_by("due_date", "-created_at")
+
+    return PackSnapshot(
+        org=org,
+        from_date=from_date,
+        to_date=to_date,
+        users=tuple(users),
+        registers=registers,
+        hazards=hazards,
+        compliance_items=tuple(compliance_items),
+        attempts=tuple(attempts),
+        proficiencies=tuple(proficiencies),
+        observations=tuple(observations),
+        permits=tuple(permits),
+        inspections=tuple(inspections),
+        incidents=tuple(incidents),
+        hours_by_month=MappingProxyType({(y, m): h for y, m, h in hours}),
+        rolling_rates=tuple(get_rolling_rates(
+            org, (from_date.year, from_date.month), (to_date.year, to_date.month),
+        )),
+        actions=tuple(actions),
+    )
@@ -0,0 +1,187 @@
+"""
+Unit tests for the audit_export app.
+Covers: ISO 45001 pack assembly (write_pack / build_pack_file) and its
+worker processes, the shared data snapshot (load_snapshot), incremental
+section caching.
+"""
+import io
+import os
+import shutil
+import tempfile
+import zipfile
+from dataclasses import FrozenInstanceError
+from datetime import date, datetime
+from decimal import Decimal
+
+from django.db import connection
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from audit_export.pack import SECTION_MODULES, SECTIONS, build_pack_file, write_pack
+from audit_export.snapshot import load_snapshot
+from core.models import Organization, Plan
+from incidents.models import HoursWorked, Incident
+
+
+def create_organization(domain="auditorg"):
+    Plan.objects.get_or_create(name="Trial", defaults={"price_monthly": 0})
+    return Organization.objects.create(name="Audit Org", domain=domain)
+
+
+class _Unseekable(io.RawIOBase):
+    """Write-only sink that behaves like a socket / upload stream."""
+
+    def __init__(self):
+        self.chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        self.chunks.append(bytes(b))
+        return len(b)
+
+
+class PackAssemblyTests(TestCase):
+
+    def setUp(self):
+        self.org = create_organization()
+        self.from_date = date(2025, 1, 1)
+        self.to_date = date(2025, 12, 31)
+
+    def test_build_pack_file_contains_every_section(self):
+        with build_pack_file(self.org, self.from_date, self.to_date) as fh:
+            names = zipfile.ZipFile(fh).namelist()
+        self.assertEqual(sorted(names), sorted(name for name, _ in SECTIONS))
+
+    def test_write_pack_streams_to_unseekable_sink(self):
+        sink = _Unseekable()
+        write_pack(sink, self.org, self.from_date, self.to_date)
+        self.assertGreater(len(sink.chunks), len(SECTIONS))
+        archive = zipfile.ZipFile(io.BytesIO(b"".join(sink.chunks)))
+        self.assertIsNone(archive.testzip())
+        self.assertTrue(archive.read("00_Master_Index.pdf").startswith(b"%PDF"))
+
+    @override_settings(AUDIT_PACK_PROCESSES=2)
+    def test_sections_render_in_worker_processes_without_forking(self):
+        import pickle
+        from audit_export import pack
+
+        self.assertNotEqual(pack._START_METHOD, "fork")
+        snap = load_snapshot(self.org, self.from_date, self.to_date)
+        self.assertEqual(pickle.loads(pickle.dumps(snap)).hours_by_month, snap.hours_by_month)
+
+        results = list(pack._render_sections(range(len(SECTIONS)), self.org, self.from_date, self.to_date))
+        self.assertEqual(len(results), len(SECTIONS))
+        for _, filename, (pdf_bytes, ok) in results:
+            self.assertTrue(ok, filename)
+            self.assertTrue(pdf_bytes.startswith(b"%PDF"))
+
+
+class SnapshotTests(TestCase):
+
+    def setUp(self):
+        self.org = create_organization("snaporg")
+        self.from_date = date(2025, 1, 1)
+        self.to_date = date(2025, 6, 30)
+
+    def _add_incidents(self, months):
+        for month in months:
+            HoursWorked.objects.create(organization=self.org, year=2025, month=month, hours=Decimal("10000"))
+            for severity in ("lti", "near_miss", "fac"):
+                Incident.objects.create(
+                    organization=self.org, title=f"{severity} {month}", description="x",
+                    severity=severity,
+                    date_occurred=timezone.make_aware(datetime(2025, month, 10)),
+                )
+
+    def _snapshot_queries(self):
+        with CaptureQueriesContext(connection) as ctx:
+            load_snapshot(self.org, self.from_date, self.to_date)
+        return len(ctx.captured_queries)
+
+    def test_query_count_does_not_grow_with_rows(self):
+        self._add_incidents([1])
+        few = self._snapshot_queries()
+        self._add_incidents([2, 3, 4, 5])
+        self.assertEqual(self._snapshot_queries(), few)
+
+    def test_sections_render_without_queries(self):
+        self._add_incidents([1, 2])
+        snap = load_snapshot(self.org, self.from_date, self.to_date)
+        self.assertEqual(len(snap.incidents), 6)
+        self.assertEqual(snap.hours_for(2025, 2), 10000.0)
+        self.assertEqual(snap.total_hours, 20000.0)
+        with self.assertNumQueries(0):
+            for _, generator in SECTIONS:
+                self.assertTrue(generator(snap).startswith(b"%PDF"))
+
+    def test_snapshot_is_immutable(self):
+        snap = load_snapshot(self.org, self.from_date, self.to_date)
+        with self.assertRaises(FrozenInstanceError):
+            snap.incidents = ()
+        with self.assertRaises(TypeError):
+            snap.hours_by_month[(2025, 1)] = 1
+
+
+_MEDIA_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(MEDIA_ROOT=_MEDIA_ROOT, AUDIT_PACK_CACHE=True)
+class SectionCacheTests(TestCase):
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(_MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        cache.clear()
+        self.org = create_organization("cacheorg")
+        self.from_date = date(2025, 1, 1)
+        self.to_date = date(2025, 12, 31)
+        self.always = sum(1 for modules in SECTION_MODULES.values() if not modules)
+
+    def _run(self):
+        sink = io.BytesIO()
+        stats = write_pack(sink, self.org, self.from_date, self.to_date)
+        self.assertEqual(len(zipfile.ZipFile(sink).namelist()), len(SECTIONS))
+        return stats
+
+    def test_rerun_reuses_unchanged_sections(self):
+        self.assertEqual(self._run(), {"cached": 0, "rendered": len(SECTIONS)})
+        self.assertEqual(self._run(), {"cached": len(SECTIONS) - self.always, "rendered": self.always})
+
+    def test_only_sections_reading_changed_data_rebuild(self):
+        self._run()
+        Incident.objects.create(
+            organization=self.org, title="Slip", description="x",
+            date_occurred=timezone.make_aware(datetime(2025, 3, 1)),
+        )
+        stats = self._run()
+        stale = sum(1 for modules in SECTION_MODULES.values() if modules and "incidents" in modules)
+        self.assertEqual(stats["rendered"], self.always + stale)
+
+    def test_renaming_a_template_or_skill_category_rebuilds_its_section(self):
+        from inspections.models import InspectionTemplate
+        from training.models import SkillCategory
+
+        template = InspectionTemplate.objects.create(organization=self.org, title="Fire walk")
+        category = SkillCategory.objects.create(organization=self.org, name="Lifting")
+        self._run()
+        template.title = "Fire walkdown"
+        template.save()
+        category.name = "Rigging"
+        category.save()
+        self.assertEqual(self._run()["rendered"], self.always + 2)
+
+    def test_superseded_section_files_are_removed(self):
+        self._run()
+        HoursWorked.objects.create(organization=self.org, year=2025, month=1, hours=Decimal("500"))
+        self._run()
+        folder = os.path.join(_MEDIA_ROOT, "audit_export", "cache", str(self.org.pk),
+                              f"{self.from_date.isoformat()}_{self.to_date.isoformat()}")
+        performance = [f for f in os.listdir(folder) if f.startswith("07_")]
+        self.assertEqual(len(performance), 1)
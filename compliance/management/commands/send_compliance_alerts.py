@@ -2,7 +2,8 @@
 Management command: send_compliance_alerts
 
 Sends email reminders to assigned users for compliance items due in
-60, 30, or 7 days. Also alerts managers for overdue items.
+60, 30, or 7 days, and daily once overdue. Safe to re-run: alerts already
+sent today are skipped and a crashed run resumes (core/alert_runs.py).
 
 Run daily via cron / EB scheduled task:
     python manage.py send_compliance_alerts
@@ -12,17 +13,15 @@ from django.utils import timezone
 from django.conf import settings
 
 from compliance.models import ComplianceItem
-from core.utils.email import send_brevo_email
+from core.alert_runs import AlertRunner
 
 
 def _site_url():
     return getattr(settings, "SITE_URL", "http://127.0.0.1:8000").rstrip("/")
 
 
-def _send_reminder(item, days_left):
-    if not item.assigned_to or not item.assigned_to.email:
-        return
-
+def _reminder(item, days_left):
+    """(subject, html) of the reminder for ``item``."""
     base = _site_url()
     detail_url = f"{base}/compliance/{item.pk}/"
     comply_url = f"{base}/compliance/{item.pk}/comply/"
@@ -87,7 +86,7 @@ def _send_reminder(item, days_left):
     </div>
     """
 
-    send_brevo_email(item.assigned_to.email, subject, html)
+    return subject, html
 
 
 class Command(BaseCommand):
@@ -104,14 +103,14 @@ class Command(BaseCommand):
 
         # Active items to alert on: pending (due soon) + overdue
         alert_items = ComplianceItem.objects.filter(
-            status__in=["pending", "overdue"]
+            status__in=["pending", "overdue"], assigned_to__isnull=False,
         ).select_related("assigned_to", "organization")
 
-        sent = 0
-        for item in alert_items:
-            days_left = (item.due_date - today).days
-            if days_left in (60, 30, 7) or days_left < 0:
-                _send_reminder(item, days_left)
-                sent += 1
+        with AlertRunner("send_compliance_alerts", today) as run:
+            for item in run.iterate("items", alert_items):
+                days_left = (item.due_date - today).days
+                if days_left in (60, 30, 7) or days_left < 0:
+                    subject, html = _reminder(item, days_left)
+                    run.notify("compliance.reminder", item, item.assigned_to.email, subject, html)
 
-        self.stdout.write(self.style.SUCCESS(f"Sent {sent} compliance alert emails."))
+        self.stdout.write(self.style.SUCCESS(f"Compliance alerts: {run.summary()}."))
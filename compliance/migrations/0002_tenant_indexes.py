@@ -0,0 +1,28 @@
+# Generated by Django 5.1 on 2026-10-17 02:02
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('compliance', '0001_initial'),
+        ('core', '0009_add_safety_manager_to_invitation_role'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='complianceitem',
+            index=models.Index(fields=['organization', 'status', 'due_date'], name='comp_org_status_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='complianceitem',
+            index=models.Index(fields=['organization', 'due_date'], name='comp_org_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='complianceitem',
+            index=models.Index(condition=models.Q(('status__in', ['pending', 'overdue'])), fields=['due_date'], name='comp_active_due_idx'),
+        ),
+    ]
@@ -51,6 +51,20 @@ class ComplianceItem(models.Model):
 
     class Meta:
         ordering = ["due_date"]
+        indexes = [
+            # Dashboard counts / status filter, listed by due date
+            models.Index(
+                fields=["organization", "status", "due_date"],
+                name="comp_org_status_due_idx",
+            ),
+            models.Index(fields=["organization", "due_date"], name="comp_org_due_idx"),
+            # send_compliance_alerts: only items still awaiting action
+            models.Index(
+                fields=["due_date"],
+                condition=models.Q(status__in=["pending", "overdue"]),
+                name="comp_active_due_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.title
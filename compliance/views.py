@@ -6,6 +6,7 @@ from django.utils import timezone
 
 from .models import ComplianceItem
 from .forms import ComplianceItemForm, MarkCompliedForm
+from core.kpi_cache import cached_kpis, invalidate
 
 
 def _org_required(request):
@@ -33,17 +34,14 @@ def dashboard(request):
     # Auto-mark overdue items (status still 'pending' but past due date)
     today = timezone.now().date()
     pending_overdue = items.filter(status="pending", due_date__lt=today)
-    pending_overdue.update(status="overdue")
+    if pending_overdue.update(status="overdue"):
+        invalidate(org, "compliance")  # bulk update fires no signals
     # Refresh queryset after update
     items = ComplianceItem.objects.filter(organization=org).select_related("assigned_to")
 
     # Stats
-    total       = items.count()
-    complied    = items.filter(status="complied").count()
-    overdue     = items.filter(status="overdue").count()
-    due_soon    = items.filter(status="pending", due_date__range=[today, today + timezone.timedelta(days=30)]).count()
-    pending     = items.filter(status="pending").count()
-    score       = round((complied / total * 100)) if total else 0
+    stats = cached_kpis(org, "compliance_dashboard", ("compliance",),
+                        lambda: _dashboard_stats(org, today))
 
     # Status filter
     status_filter = request.GET.get("status", "")
@@ -52,17 +50,26 @@ def dashboard(request):
 
     return render(request, "compliance/dashboard.html", {
         "items":         items,
-        "total":         total,
-        "complied":      complied,
-        "overdue":       overdue,
-        "due_soon":      due_soon,
-        "pending":       pending,
-        "score":         score,
+        **stats,
         "status_filter": status_filter,
         "today":         today,
     })
 
 
+def _dashboard_stats(org, today):
+    items = ComplianceItem.objects.filter(organization=org)
+    total    = items.count()
+    complied = items.filter(status="complied").count()
+    return {
+        "total":    total,
+        "complied": complied,
+        "overdue":  items.filter(status="overdue").count(),
+        "due_soon": items.filter(status="pending", due_date__range=[today, today + timezone.timedelta(days=30)]).count(),
+        "pending":  items.filter(status="pending").count(),
+        "score":    round((complied / total * 100)) if total else 0,
+    }
+
+
 # ---------------------------------------------------------------------------
 # Create
 # ---------------------------------------------------------------------------
@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.utils import timezone
-from .models import Organization, Plan, Subscription, DemoRequest, FreePlanRequest, ContractorInvite
+from .models import Organization, Plan, Subscription, DemoRequest, FreePlanRequest, ContractorInvite, OutboundEmail, AlertRun, SentNotification
 from users.models import CustomUser
 
 
@@ -167,3 +167,43 @@ class ContractorInviteAdmin(admin.ModelAdmin):
     list_display  = ("email", "organization", "is_used", "access_validity_days", "created_at", "expires_at")
     list_filter   = ("is_used", "organization")
     search_fields = ("email",)
+
+
+# ---------------------------------------------------------------------------
+# Email outbox
+# ---------------------------------------------------------------------------
+
+def retry_now(modeladmin, request, queryset):
+    queryset.exclude(status=OutboundEmail.STATUS_SENT).update(
+        status=OutboundEmail.STATUS_PENDING, next_attempt_at=timezone.now(),
+    )
+retry_now.short_description = "Retry selected emails now"
+
+
+@admin.register(OutboundEmail)
+class OutboundEmailAdmin(admin.ModelAdmin):
+    list_display  = ("to_email", "subject", "status", "attempts", "created_at", "sent_at")
+    list_filter   = ("status",)
+    search_fields = ("to_email", "subject")
+    ordering      = ("-created_at",)
+    date_hierarchy = "created_at"
+    actions       = [retry_now]
+    readonly_fields = ("dedupe_key", "provider_id", "last_error", "claimed_at", "created_at", "sent_at")
+
+
+@admin.register(AlertRun)
+class AlertRunAdmin(admin.ModelAdmin):
+    list_display  = ("command", "run_date", "status", "attempts", "scanned", "sent", "skipped", "failed", "duration")
+    list_filter   = ("status", "command")
+    ordering      = ("-started_at",)
+    date_hierarchy = "run_date"
+    readonly_fields = ("checkpoint", "last_error", "started_at", "finished_at")
+
+
+@admin.register(SentNotification)
+class SentNotificationAdmin(admin.ModelAdmin):
+    list_display  = ("kind", "object_ref", "recipient", "sent_on", "run")
+    list_filter   = ("kind",)
+    search_fields = ("object_ref", "recipient")
+    ordering      = ("-created_at",)
+    date_hierarchy = "sent_on"
@@ -0,0 +1,182 @@
+# core/alert_runs.py
+"""
+Idempotent, resumable alert runs for the alert management commands.
+
+    with AlertRunner("send_compliance_alerts") as run:
+        for item in run.iterate("items", ComplianceItem.objects.filter(...)):
+            run.notify("compliance.reminder", item, item.assigned_to.email, subject, html)
+    run.summary()   # "scanned 812, sent 40, skipped 3, failed 0 in 1.9s"
+
+  • Ledger — notify() writes a SentNotification row keyed by (kind, object,
+    recipient, day) and queues the email in the same transaction. An alert
+    already in the ledger is skipped, so a cron re-run or a resumed run
+    never double-sends. A message that cannot be queued rolls its ledger
+    row back and counts as failed; it is retried by the next run.
+  • Checkpoint — iterate() walks a queryset in primary-key order and
+    records the last key processed per stage on the AlertRun row every
+    ALERT_CHECKPOINT_EVERY objects. A run that crashed leaves its AlertRun
+    "running" / "failed"; the next run of the command that day resumes it
+    from the checkpoint instead of rescanning from the start. Once a send
+    fails, that stage's checkpoint stops advancing for the rest of the run,
+    so a resumed run scans the failed object again and retries it.
+  • Metrics — scanned / sent / skipped / failed and the duration are kept
+    on the AlertRun row (summed over resumed attempts) and printed by the
+    commands.
+"""
+from __future__ import annotations
+
+import logging
+import time
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from . import recipients
+from .models import AlertRun, SentNotification
+
+logger = logging.getLogger(__name__)
+
+SENT    = "sent"
+SKIPPED = "skipped"
+FAILED  = "failed"
+
+
+class _NotQueued(Exception):
+    pass
+
+
+def object_ref(obj):
+    """Ledger reference of a model instance (strings pass through)."""
+    if isinstance(obj, str):
+        return obj
+    return f"{obj._meta.label_lower}:{obj.pk}"
+
+
+class AlertRunner:
+    """One (possibly resumed) run of ``command`` for ``today``."""
+
+    def __init__(self, command, today=None, checkpoint_every=None):
+        self.today = today or timezone.now().date()
+        self.checkpoint_every = checkpoint_every or getattr(settings, "ALERT_CHECKPOINT_EVERY", 100)
+        run = (
+            AlertRun.objects
+            .filter(command=command, run_date=self.today)
+            .exclude(status=AlertRun.STATUS_COMPLETED)
+            .order_by("-started_at")
+            .first()
+        )
+        if run is None:
+            run = AlertRun.objects.create(command=command, run_date=self.today)
+            self.resumed = False
+        else:
+            run.status = AlertRun.STATUS_RUNNING
+            run.attempts += 1
+            run.save(update_fields=["status", "attempts"])
+            self.resumed = True
+        self.run = run
+        self._started = time.monotonic()
+        self._pending = 0
+        self._stage = None
+        self._held = set()      # stages with a failed send: checkpoint frozen
+
+    # ── Context manager ──────────────────────────────────────────────────
+
+    def __enter__(self):
+        # Each org's managers are resolved once per run (core/recipients.py).
+        self._recipients = recipients.batch()
+        self._recipients.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._recipients.__exit__(exc_type, exc, tb)
+        if exc_type is None:
+            self.finish()
+        else:
+            self.fail(exc)
+        return False
+
+    # ── Scanning ─────────────────────────────────────────────────────────
+
+    def iterate(self, stage, queryset, chunk_size=500):
+        """
+        Objects of ``queryset`` after this stage's checkpoint, in primary-key
+        order. The checkpoint advances as the caller asks for the next object,
+        so an object counts as processed once its loop body has finished —
+        unless a send in this stage has failed (see notify()).
+        """
+        last = self.run.checkpoint.get(stage)
+        if last is not None:
+            queryset = queryset.filter(pk__gt=last)
+        for obj in queryset.order_by("pk").iterator(chunk_size=chunk_size):
+            self.run.scanned += 1
+            self._stage = stage
+            yield obj
+            if stage not in self._held:
+                self.run.checkpoint[stage] = obj.pk
+            self._pending += 1
+            if self._pending >= self.checkpoint_every:
+                self.save()
+
+    # ── Sending ──────────────────────────────────────────────────────────
+
+    def notify(self, kind, obj, recipient, subject, html) -> str:
+        """
+        Queue one alert unless the ledger has it already. Returns SENT / SKIPPED / FAILED.
+
+        A failure holds the checkpoint of the stage being iterated where it is,
+        so a resumed run reaches ``obj`` again instead of starting past it.
+        """
+        from .utils.email import send_brevo_email
+
+        if not recipient:
+            return SKIPPED
+        try:
+            with transaction.atomic():
+                SentNotification.objects.create(
+                    kind=kind, object_ref=object_ref(obj), recipient=recipient,
+                    sent_on=self.today, run=self.run,
+                )
+                if not send_brevo_email(recipient, subject, html):
+                    raise _NotQueued
+        except IntegrityError:
+            self.run.skipped += 1
+            return SKIPPED
+        except _NotQueued:
+            logger.error("Alert %s for %s to %s could not be queued", kind, object_ref(obj), recipient)
+            self.run.failed += 1
+            if self._stage is not None:
+                self._held.add(self._stage)
+            return FAILED
+        self.run.sent += 1
+        return SENT
+
+    # ── Bookkeeping ──────────────────────────────────────────────────────
+
+    def save(self):
+        now = time.monotonic()
+        self.run.duration += now - self._started
+        self._started = now
+        self._pending = 0
+        self.run.save(update_fields=[
+            "checkpoint", "scanned", "sent", "skipped", "failed", "duration",
+            "status", "finished_at", "last_error",
+        ])
+
+    def finish(self):
+        self.run.status = AlertRun.STATUS_COMPLETED
+        self.run.finished_at = timezone.now()
+        self.save()
+
+    def fail(self, exc):
+        self.run.status = AlertRun.STATUS_FAILED
+        self.run.last_error = f"{type(exc).__name__}: {exc}"
+        self.save()
+
+    def summary(self) -> str:
+        r = self.run
+        resumed = f" (resumed, attempt {r.attempts})" if self.resumed else ""
+        return (
+            f"scanned {r.scanned}, sent {r.sent}, skipped {r.skipped}, "
+            f"failed {r.failed} in {r.duration:.1f}s{resumed}"
+        )
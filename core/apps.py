@@ -7,4 +7,6 @@ class CoreConfig(AppConfig):
     name = "core"
 
     def ready(self):
-        import core.signals  # noqa: F401 — registers signal handlers
+        from core import signals  # registers the @receiver handlers
+
+        signals.connect_receivers()
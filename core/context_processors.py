@@ -1,5 +1,5 @@
 # core/context_processors.py
-from django.utils import timezone
+from core import entitlements
 
 
 def trial_status(request):
@@ -10,28 +10,27 @@ def trial_status(request):
     if not request.user.is_authenticated:
         return {}
 
-    org = getattr(request, "organization", None)
-    if org is None:
+    ent = entitlements.for_request(request)
+    if ent is None or not ent.has_subscription:
         return {}
 
-    sub = getattr(org, "subscription", None)
-    if sub is None:
-        return {}
-
-    if sub.expires_at is None:
-        return {"trial_days_left": None}  # Not on a time-limited plan
-
-    remaining = (sub.expires_at - timezone.now()).days
-    return {"trial_days_left": max(remaining, 0)}
+    # None when not on a time-limited plan
+    return {"trial_days_left": ent.trial_days_left()}
 
 
 def organization_context(request):
-    """Injects current org and user into every template."""
-    org = None
+    """Injects current org, its entitlement snapshot and the user into every template."""
+    org = ent = None
     if request.user.is_authenticated:
-        org = getattr(request.user, "organization", None)
+        if hasattr(request, "organization"):
+            org = request.organization
+            ent = entitlements.for_request(request)
+        else:
+            org = getattr(request.user, "organization", None)
+            ent = entitlements.for_org(org)
 
     return {
         "current_org": org,
         "current_user": request.user,
+        "entitlements": ent,
     }
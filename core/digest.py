@@ -0,0 +1,360 @@
+# core/digest.py
+"""
+Daily safety digest — one email per person instead of one per item.
+
+The per-module alert commands (send_overdue_alerts, send_action_alerts,
+send_compliance_alerts, send_hira_review_alerts, send_inspection_alerts,
+send_appraisal_alerts) each scan their module and queue one email per item
+and recipient. ``manage.py send_daily_digest`` replaces them in the daily
+cron:
+
+  • flag_overdue() applies the status changes those commands made
+    (compliance items and inspections past due become "overdue");
+  • every collector scans its module once — one query, with manager CCs
+    from the cached lists in core/recipients.py — and yields
+    (recipient e-mails, DigestItem) for the same due / overdue / pending
+    triggers the per-item commands alert on;
+  • build_digests() groups the items per recipient and send_digests()
+    renders one digest each and queues it in the outbox, whose dispatcher
+    sends in parallel batches (EMAIL_DISPATCH_CONCURRENCY threads,
+    EMAIL_DISPATCH_BATCH rows, EMAIL_RATE_LIMIT).
+
+A re-run within EMAIL_DEDUPE_WINDOW queues nothing new: identical digests
+collapse in the outbox.
+"""
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date as date_type, timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.utils.html import escape
+
+from . import kpi_cache
+from .recipients import batch, recipients
+
+STATUS_OVERDUE = "overdue"
+STATUS_DUE     = "due"
+STATUS_PENDING = "pending"
+
+STATUS_LABELS = {STATUS_OVERDUE: "Overdue", STATUS_DUE: "Due soon", STATUS_PENDING: "Waiting on you"}
+STATUS_COLOURS = {STATUS_OVERDUE: "#dc2626", STATUS_DUE: "#ca8a04", STATUS_PENDING: "#1a2c52"}
+
+
+@dataclass(frozen=True)
+class DigestItem:
+    module: str         # COLLECTORS key
+    status: str         # STATUS_*
+    title: str
+    detail: str         # e.g. "3 days overdue", "due 12 Mar 2026"
+    path: str           # site-relative URL
+    days: int = 0       # days until due (negative = overdue); orders the digest
+
+
+@dataclass
+class Digest:
+    email: str
+    name: str = ""
+    items: list = field(default_factory=list)
+
+    def count(self, status):
+        return sum(1 for item in self.items if item.status == status)
+
+
+def _days(n):
+    return f"{n} day{'s' if n != 1 else ''}"
+
+
+def _when(days_left, due):
+    if days_left < 0:
+        return STATUS_OVERDUE, f"{_days(-days_left)} overdue"
+    if days_left == 0:
+        return STATUS_OVERDUE, "due today"
+    return STATUS_DUE, f"due in {_days(days_left)} ({due.strftime('%d %b %Y')})"
+
+
+# ── Overdue flagging ──────────────────────────────────────────────────────────
+
+def flag_overdue(today: date_type) -> dict:
+    """
+    Mark past-due compliance items and inspections overdue, as the per-item
+    commands did. Returns {module: rows updated}.
+    """
+    from compliance.models import ComplianceItem
+    from inspections.models import Inspection
+
+    updated = {}
+    for module, qs, status in (
+        ("compliance", ComplianceItem.objects.filter(status="pending", due_date__lt=today), "overdue"),
+        ("inspections", Inspection.objects.filter(
+            status__in=[Inspection.STATUS_SCHEDULED, Inspection.STATUS_IN_PROGRESS],
+            scheduled_date__lte=today,
+        ), Inspection.STATUS_OVERDUE),
+    ):
+        org_ids = set(qs.values_list("organization_id", flat=True))
+        updated[module] = qs.update(status=status)
+        # update() fires no signals — bump the KPI versions by hand.
+        for org_id in org_ids:
+            kpi_cache.invalidate(org_id, module)
+    return updated
+
+
+# ── Collectors — one scan per module ──────────────────────────────────────────
+
+def _observations(today):
+    from observations.models import Observation
+
+    overdue = (
+        Observation.objects
+        .filter(target_date__lt=today, assigned_to__isnull=False, is_archived=False)
+        .exclude(status__in=["CLOSED", "AWAITING_VERIFICATION"])
+        .select_related("assigned_to")
+        .order_by("target_date")
+    )
+    for obs in overdue:
+        days_left = (obs.target_date - today).days
+        yield recipients(obs.assigned_to), DigestItem(
+            "observations", STATUS_OVERDUE, f"#{obs.pk} {obs.title}",
+            f"{_days(-days_left)} overdue · {obs.get_severity_display()}",
+            f"/observations/{obs.pk}/rectify/", days_left,
+        )
+
+
+def _actions(today):
+    from django.db.models import Q
+
+    from actions.models import CorrectiveAction
+
+    # Alert thresholds: 7 days before due, then daily once overdue.
+    actions = (
+        CorrectiveAction.objects
+        .filter(Q(due_date=today + timedelta(days=7)) | Q(due_date__lt=today))
+        .exclude(status=CorrectiveAction.STATUS_CLOSED)
+        .select_related("assigned_to", "raised_by")
+    )
+    for action in actions:
+        days_left = (action.due_date - today).days
+        status, detail = _when(days_left, action.due_date)
+        yield recipients(action.assigned_to, action.raised_by, org=action.organization_id), DigestItem(
+            "actions", status, f"CA-{action.pk:04d} {action.title}",
+            f"{detail} · {action.get_priority_display()} priority",
+            f"/actions/{action.pk}/", days_left,
+        )
+
+
+def _compliance(today):
+    from django.db.models import Q
+
+    from compliance.models import ComplianceItem
+
+    thresholds = [today + timedelta(days=n) for n in (60, 30, 7)]
+    items = (
+        ComplianceItem.objects
+        .filter(status__in=["pending", "overdue"], assigned_to__isnull=False)
+        .filter(Q(due_date__in=thresholds) | Q(due_date__lt=today))
+        .select_related("assigned_to")
+    )
+    for item in items:
+        days_left = (item.due_date - today).days
+        status, detail = _when(days_left, item.due_date)
+        yield recipients(item.assigned_to), DigestItem(
+            "compliance", status, item.title, detail, f"/compliance/{item.pk}/", days_left,
+        )
+
+
+def _hira(today):
+    from django.db.models import Q
+
+    from hira.models import HazardRegister
+
+    registers = (
+        HazardRegister.objects
+        .filter(status__in=[HazardRegister.STATUS_APPROVED, HazardRegister.STATUS_EXPIRED])
+        .filter(
+            Q(next_review_date__in=[today + timedelta(days=n) for n in (30, 7)])
+            | Q(next_review_date__lt=today)
+        )
+        .select_related("assessed_by")
+    )
+    for register in registers:
+        days_left = (register.next_review_date - today).days
+        status, detail = _when(days_left, register.next_review_date)
+        yield recipients(register.assessed_by, org=register.organization_id), DigestItem(
+            "hira", status, register.title, f"review {detail}",
+            f"/hira/registers/{register.pk}/", days_left,
+        )
+
+
+def _inspections(today):
+    from django.db.models import Q
+
+    from inspections.models import Inspection
+
+    inspections = (
+        Inspection.objects
+        .filter(status__in=[Inspection.STATUS_SCHEDULED, Inspection.STATUS_IN_PROGRESS,
+                            Inspection.STATUS_OVERDUE])
+        .filter(
+            Q(scheduled_date__in=[today + timedelta(days=n) for n in (3, 1)])
+            | Q(scheduled_date__lte=today)
+        )
+        .select_related("inspector")
+    )
+    for insp in inspections:
+        days_left = (insp.scheduled_date - today).days
+        status, detail = _when(days_left, insp.scheduled_date)
+        yield recipients(insp.inspector, org=insp.organization_id), DigestItem(
+            "inspections", status, insp.title, detail,
+            f"/inspections/{insp.pk}/conduct/", days_left,
+        )
+
+
+def _appraisals(today):
+    from appraisals.models import AppraisalCycle, AppraisalRecord
+
+    Cycle, Record = AppraisalCycle, AppraisalRecord
+    records = (
+        Record.objects
+        .filter(cycle__status__in=[Cycle.STATUS_GOAL_SETTING, Cycle.STATUS_SELF_ASSESSMENT,
+                                   Cycle.STATUS_MANAGER_REVIEW, Cycle.STATUS_CALIBRATION])
+        .filter(status__in=[Record.STATUS_PENDING_GOALS, Record.STATUS_SELF_ASSESS,
+                            Record.STATUS_PENDING_REVIEW, Record.STATUS_MANAGER_REVIEWED])
+        .select_related("cycle", "employee", "reviewer")
+    )
+    for rec in records:
+        cycle = rec.cycle
+        if (cycle.status == Cycle.STATUS_GOAL_SETTING and rec.status == Record.STATUS_PENDING_GOALS
+                and (cycle.goal_setting_deadline - today).days == 3):
+            yield recipients(rec.employee), DigestItem(
+                "appraisals", STATUS_DUE, f"Set your goals — {cycle.name}",
+                f"due in 3 days ({cycle.goal_setting_deadline.strftime('%d %b %Y')})",
+                f"/appraisals/my/{rec.pk}/", 3,
+            )
+        elif (cycle.status == Cycle.STATUS_SELF_ASSESSMENT and rec.status == Record.STATUS_SELF_ASSESS
+                and (cycle.self_assessment_deadline - today).days == 3):
+            yield recipients(rec.employee), DigestItem(
+                "appraisals", STATUS_DUE, f"Complete your self-assessment — {cycle.name}",
+                f"due in 3 days ({cycle.self_assessment_deadline.strftime('%d %b %Y')})",
+                f"/appraisals/my/{rec.pk}/", 3,
+            )
+        elif cycle.status == Cycle.STATUS_MANAGER_REVIEW and rec.status == Record.STATUS_PENDING_REVIEW:
+            days_left = (cycle.review_deadline - today).days
+            if days_left in (7, 3, 1) or days_left < 0:
+                status, detail = _when(days_left, cycle.review_deadline)
+                yield recipients(rec.reviewer), DigestItem(
+                    "appraisals", status, f"Review {rec.employee.full_name} — {cycle.name}", detail,
+                    f"/appraisals/{cycle.pk}/records/{rec.pk}/review/", days_left,
+                )
+        elif rec.status == Record.STATUS_MANAGER_REVIEWED and (today - rec.updated_at.date()).days == 3:
+            yield recipients(rec.employee), DigestItem(
+                "appraisals", STATUS_PENDING, f"Acknowledge your appraisal — {cycle.name}",
+                "review published 3 days ago", f"/appraisals/my/{rec.pk}/", 0,
+            )
+
+
+# module -> (digest section heading, collector)
+COLLECTORS = {
+    "actions":      ("Corrective actions",     _actions),
+    "observations": ("Observations",           _observations),
+    "inspections":  ("Inspections",            _inspections),
+    "compliance":   ("Legal compliance",       _compliance),
+    "hira":         ("HIRA register reviews",  _hira),
+    "appraisals":   ("Appraisals",             _appraisals),
+}
+
+
+# ── Grouping / rendering / sending ────────────────────────────────────────────
+
+def build_digests(today: date_type, modules=None) -> list:
+    """One Digest per recipient holding every item collected for them."""
+    by_email = {}
+    with batch():
+        for module in modules or COLLECTORS:
+            _, collect = COLLECTORS[module]
+            for emails, item in collect(today):
+                for email in emails:
+                    by_email.setdefault(email, Digest(email)).items.append(item)
+
+    names = dict(
+        get_user_model().objects.filter(email__in=list(by_email))
+        .values_list("email", "full_name")
+    )
+    order = list(COLLECTORS)
+    for digest in by_email.values():
+        digest.name = names.get(digest.email) or ""
+        digest.items.sort(key=lambda i: (order.index(i.module), i.days, i.title))
+    return sorted(by_email.values(), key=lambda d: d.email)
+
+
+def _site_url():
+    return getattr(settings, "SITE_URL", "http://127.0.0.1:8000").rstrip("/")
+
+
+def digest_subject(digest: Digest) -> str:
+    parts = [
+        f"{n} {STATUS_LABELS[status].lower()}"
+        for status in (STATUS_OVERDUE, STATUS_DUE, STATUS_PENDING)
+        if (n := digest.count(status))
+    ]
+    return f"Your Vigilo safety digest — {', '.join(parts)}"
+
+
+def render_digest(digest: Digest) -> str:
+    base = _site_url()
+    sections = defaultdict(list)
+    for item in digest.items:
+        sections[item.module].append(item)
+
+    body = []
+    for module, items in sections.items():
+        heading = COLLECTORS[module][0]
+        rows = "".join(
+            f"""
+          <tr style="border-bottom:1px solid #e2e8f0;">
+            <td style="padding:8px 12px;width:96px;">
+              <span style="background:{STATUS_COLOURS[item.status]};color:#fff;padding:2px 8px;
+                           border-radius:4px;font-size:11px;white-space:nowrap;">{STATUS_LABELS[item.status]}</span>
+            </td>
+            <td style="padding:8px 12px;">
+              <a href="{base}{item.path}" style="color:#1a2c52;font-weight:600;text-decoration:none;">{escape(item.title)}</a>
+              <div style="color:#64748b;font-size:12px;">{escape(item.detail)}</div>
+            </td>
+          </tr>"""
+            for item in items
+        )
+        body.append(f"""
+        <h3 style="font-size:15px;color:#1a2c52;margin:20px 0 6px;">{heading} ({len(items)})</h3>
+        <table style="width:100%;border-collapse:collapse;font-size:14px;">{rows}
+        </table>""")
+
+    greeting = f"Hi {escape(digest.name)}," if digest.name else "Hi,"
+    return f"""
+    <div style="font-family:Arial,sans-serif;max-width:600px;margin:0 auto;">
+      <div style="background:#1a2c52;color:#fff;padding:20px 28px;border-radius:8px 8px 0 0;">
+        <h2 style="margin:0;font-size:18px;">Your daily safety digest</h2>
+      </div>
+      <div style="background:#f8fafc;padding:24px 28px;border:1px solid #e2e8f0;
+                  border-top:none;border-radius:0 0 8px 8px;">
+        <p style="color:#212529;">{greeting}</p>
+        <p style="color:#212529;">Here is everything that needs your attention today.</p>
+        {"".join(body)}
+        <hr style="border:none;border-top:1px solid #e2e8f0;margin:24px 0 12px;">
+        <p style="font-size:12px;color:#94a3b8;margin:0;">
+          Vigilo Safety Platform — daily digest. Do not reply to this email.
+        </p>
+      </div>
+    </div>
+    """
+
+
+def send_digests(digests) -> int:
+    """Queue one email per digest; the outbox dispatcher delivers them."""
+    from .utils.email import send_brevo_email
+
+    queued = 0
+    for digest in digests:
+        if send_brevo_email(digest.email, digest_subject(digest), render_digest(digest)):
+            queued += 1
+    return queued
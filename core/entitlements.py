@@ -0,0 +1,131 @@
+# core/entitlements.py
+"""
+Per-org entitlement snapshot: plan, expiry, plan limits and logo flag.
+
+SubscriptionMiddleware, the trial_status / organization_context context
+processors and the plan-limit checks all need the org's subscription on
+every request. for_request(request) resolves it once per request from a
+cached snapshot (one subscription + plan + org query on a miss), so a warm
+page render costs no subscription queries at all.
+
+The snapshot is dropped whenever a Subscription, Plan or Organization is
+saved or deleted (core/signals.py) — immediately and again after commit, so
+a concurrent request cannot re-cache the pre-commit state.
+ENTITLEMENTS_CACHE_TIMEOUT bounds staleness for anything the receivers
+cannot see (a bulk ``update()``). Expiry is compared against the clock on
+each call, never cached as a flag.
+
+With the per-process locmem backend other workers would never see that
+delete (a renewed subscription would still redirect to billing), so the
+snapshot is then only kept per request unless ENTITLEMENTS_CACHE forces the
+shared cache on.
+
+    ent = entitlements.for_request(request)
+    ent.is_expired(), ent.trial_days_left(), ent.max_users, ent.has_logo
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from .utils.caching import shared_cache_enabled
+
+
+@dataclass(frozen=True)
+class Entitlements:
+    org_id: int
+    org_name: str = ""
+    has_logo: bool = False
+    plan: str | None = None             # None: the org has no subscription
+    is_active: bool = False
+    expires_at: datetime | None = None  # None: no expiry
+    max_users: int | None = None        # None: unlimited
+    max_observations: int | None = None
+
+    @property
+    def has_subscription(self):
+        return self.plan is not None
+
+    @property
+    def is_trial(self):
+        return (self.plan or "").lower() == "trial"
+
+    def is_expired(self, now=None):
+        if self.expires_at is None:
+            return False
+        return (now or timezone.now()) > self.expires_at
+
+    def trial_days_left(self, now=None):
+        """Whole days until expiry (never negative); None without an expiry."""
+        if self.expires_at is None:
+            return None
+        return max((self.expires_at - (now or timezone.now())).days, 0)
+
+
+def _timeout():
+    return getattr(settings, "ENTITLEMENTS_CACHE_TIMEOUT", 60)
+
+
+def _key(org_id):
+    return f"entitlements:{org_id}"
+
+
+def _snapshot(org_id):
+    from .models import Organization, Subscription
+
+    sub = (
+        Subscription.objects
+        .select_related("plan", "organization")
+        .filter(organization_id=org_id)
+        .first()
+    )
+    if sub is None:
+        org = Organization.objects.filter(pk=org_id).first()
+        if org is None:
+            return None
+        return Entitlements(org_id=org.pk, org_name=org.name, has_logo=bool(org.logo))
+    return Entitlements(
+        org_id=org_id,
+        org_name=sub.organization.name,
+        has_logo=bool(sub.organization.logo),
+        plan=sub.plan.name,
+        is_active=sub.is_active,
+        expires_at=sub.expires_at,
+        max_users=sub.plan.max_users,
+        max_observations=sub.plan.max_observations,
+    )
+
+
+def for_org(org) -> Entitlements | None:
+    """Snapshot for ``org`` (instance or id); None if there is no such org."""
+    org_id = getattr(org, "pk", org)
+    if org_id is None:
+        return None
+    if not shared_cache_enabled("ENTITLEMENTS_CACHE"):
+        return _snapshot(org_id)
+    snapshot = cache.get(_key(org_id))
+    if snapshot is None:
+        snapshot = _snapshot(org_id)
+        if snapshot is not None:
+            cache.set(_key(org_id), snapshot, timeout=_timeout())
+    return snapshot
+
+
+def for_request(request) -> Entitlements | None:
+    """Snapshot of ``request.organization``, resolved once per request."""
+    if not hasattr(request, "_entitlements"):
+        request._entitlements = for_org(getattr(request, "organization", None))
+    return request._entitlements
+
+
+def forget(*org_ids):
+    """Drop the snapshots of ``org_ids`` now and once the transaction commits."""
+    keys = [_key(org_id) for org_id in org_ids if org_id is not None]
+    if keys:
+        cache.delete_many(keys)
+        transaction.on_commit(lambda: cache.delete_many(keys))
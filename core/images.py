@@ -0,0 +1,204 @@
+# core/images.py
+"""
+Upload pipeline for photo fields: clean originals plus downscaled variants.
+
+Camera originals (often 5–20 MB, EXIF-rotated, with GPS tags) are cleaned
+once when uploaded:
+
+  • the EXIF orientation is applied to the pixels and all EXIF / XMP
+    metadata is dropped (the original is only re-encoded when it carried
+    any — clean files are stored byte-for-byte);
+  • a ``thumb`` (320 px long edge) and ``medium`` (1280 px) variant is
+    written beside it in both WebP (pages) and JPEG (PDFs):
+
+        incidents/photos/IMG_0042.jpg
+        incidents/photos/IMG_0042.thumb.webp
+        incidents/photos/IMG_0042.thumb.jpg
+        incidents/photos/IMG_0042.medium.webp
+        incidents/photos/IMG_0042.medium.jpg
+
+Variants are found by name, so pages never query for them: templates use
+``{{ obj.photo|variant:'thumb' }}`` (core/templatetags/media_tags.py) and
+PDFs read variant_bytes(). The pre_save / post_save receivers for
+IMAGE_FIELDS live in core/signals.py.
+
+Photos uploaded before this pipeline have no variants until
+``manage.py build_image_variants`` has run.
+"""
+from __future__ import annotations
+
+import posixpath
+from dataclasses import dataclass, field
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+
+# model label -> ImageFields run through the pipeline
+IMAGE_FIELDS = {
+    "observations.Observation":      ("photo_before", "photo_after"),
+    "inspections.InspectionFinding": ("photo",),
+    "incidents.Incident":            ("photo_1", "photo_2"),
+}
+
+# variant -> longest edge in pixels (never upscaled)
+SIZES = {"thumb": 320, "medium": 1280}
+
+# extension -> (Pillow format, save options)
+FORMATS = {
+    "webp": ("WEBP", {"quality": 80}),
+    "jpg":  ("JPEG", {"quality": 82, "optimize": True, "progressive": True}),
+}
+
+ORIGINAL_QUALITY = 92
+
+# Formats Pillow opens but should write back as something else.
+_SAVE_AS = {"MPO": "JPEG"}
+
+
+def variant_name(name, size, ext="webp"):
+    """Storage name of a variant: ``a/b/IMG.jpg`` -> ``a/b/IMG.thumb.webp``."""
+    root, _ = posixpath.splitext(name)
+    return f"{root}.{size}.{ext}"
+
+
+def variant_url(fieldfile, size, ext="webp"):
+    if not fieldfile or not fieldfile.name:
+        return ""
+    return fieldfile.storage.url(variant_name(fieldfile.name, size, ext))
+
+
+@dataclass
+class Rendered:
+    original: bytes | None = None          # cleaned original; None = keep as is
+    variants: dict = field(default_factory=dict)   # (size, ext) -> bytes
+
+
+def _has_metadata(img):
+    return bool(img.getexif()) or "xmp" in img.info or "XML:com.adobe.xmp" in img.info
+
+
+def _encode(img, fmt, **params):
+    buf = BytesIO()
+    img.save(buf, format=fmt, **params)
+    return buf.getvalue()
+
+
+def _for_webp(img):
+    if img.mode in ("RGB", "RGBA"):
+        return img
+    return img.convert("RGBA" if img.has_transparency_data else "RGB")
+
+
+def _flatten(img):
+    """RGB copy for JPEG: transparency composited onto white."""
+    from PIL import Image
+
+    if img.mode in ("RGBA", "LA", "P"):
+        rgba = img.convert("RGBA")
+        background = Image.new("RGB", rgba.size, "white")
+        background.paste(rgba, mask=rgba.getchannel("A"))
+        return background
+    return img.convert("RGB") if img.mode != "RGB" else img
+
+
+def render(data, sizes=None):
+    """
+    Clean ``data`` (image bytes) and build its variants. Raises on bytes
+    Pillow cannot decode.
+    """
+    from PIL import Image, ImageOps
+
+    with Image.open(BytesIO(data)) as src:
+        fmt = _SAVE_AS.get(src.format, src.format)
+        dirty = _has_metadata(src)
+        icc = src.info.get("icc_profile")
+        img = ImageOps.exif_transpose(src)
+        img.load()
+
+    out = Rendered()
+    if dirty:
+        params = {"icc_profile": icc} if icc else {}
+        if fmt == "JPEG":
+            params["quality"] = ORIGINAL_QUALITY
+            img_out = _flatten(img)
+        else:
+            img_out = img
+        out.original = _encode(img_out, fmt, **params)
+
+    # Largest first so each smaller variant is resampled from the previous.
+    current = img
+    for size, edge in sorted((sizes or SIZES).items(), key=lambda kv: -kv[1]):
+        current = current.copy()
+        current.thumbnail((edge, edge), Image.LANCZOS)
+        for ext, (variant_fmt, params) in FORMATS.items():
+            frame = _flatten(current) if variant_fmt == "JPEG" else _for_webp(current)
+            out.variants[(size, ext)] = _encode(frame, variant_fmt, **params)
+    return out
+
+
+# ── Storage ───────────────────────────────────────────────────────────────────
+
+def write_variants(storage, name, variants):
+    """Save rendered variants beside ``name``, replacing any existing ones."""
+    for (size, ext), data in variants.items():
+        target = variant_name(name, size, ext)
+        storage.delete(target)
+        storage.save(target, ContentFile(data))
+
+
+def prepare_upload(fieldfile):
+    """
+    For an uncommitted upload: swap in the cleaned original and return the
+    variants to write once the final name is known (None if the file is
+    not an image Pillow can read).
+    """
+    try:
+        fieldfile.open("rb")
+        fieldfile.seek(0)
+        data = fieldfile.read()
+        rendered = render(data)
+    except Exception:
+        return None
+    if rendered.original is not None:
+        fieldfile.file = ContentFile(rendered.original, name=fieldfile.name)
+    return rendered.variants
+
+
+def rebuild(fieldfile) -> bool:
+    """
+    Clean a stored original in place and (re)write its variants. Returns
+    False when the file is missing or unreadable. The original keeps its
+    name; callers must persist ``fieldfile.name`` if the storage changed it.
+    """
+    storage, name = fieldfile.storage, fieldfile.name
+    try:
+        with storage.open(name, "rb") as f:
+            rendered = render(f.read())
+    except Exception:
+        return False
+    if rendered.original is not None:
+        storage.delete(name)
+        fieldfile.name = storage.save(name, ContentFile(rendered.original))
+    write_variants(storage, fieldfile.name, rendered.variants)
+    return True
+
+
+def variant_bytes(fieldfile, size="medium", ext="jpg"):
+    """
+    Bytes of a stored variant; rendered from the original when it has not
+    been built yet. None if neither can be read.
+    """
+    if not fieldfile or not fieldfile.name:
+        return None
+    storage = fieldfile.storage
+    try:
+        with storage.open(variant_name(fieldfile.name, size, ext), "rb") as f:
+            return f.read()
+    except Exception:
+        pass
+    try:
+        with storage.open(fieldfile.name, "rb") as f:
+            rendered = render(f.read(), sizes={size: SIZES[size]})
+        return rendered.variants[(size, ext)]
+    except Exception:
+        return None
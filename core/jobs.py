@@ -0,0 +1,11 @@
+"""core/jobs.py — background job handlers (see jobs/registry.py)."""
+from jobs.registry import register
+
+
+@register("core.dispatch_outbox")
+def dispatch_outbox(job):
+    from .outbox import dispatch_pending, requeue_stuck, schedule_retries
+
+    requeue_stuck()
+    dispatch_pending()
+    schedule_retries()
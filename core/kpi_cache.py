@@ -0,0 +1,159 @@
+# core/kpi_cache.py
+"""
+Tenant-scoped cache for dashboard KPIs.
+
+Every dashboard caches its computed numbers / chart HTML under a key built
+from the organization, the KPI scope (role or user) and the current
+*version* of every module the dashboard reads from:
+
+    kpi:<org_id>:<name>:<scope>:<date>:<md5 of "module=ver,module=ver,...">
+
+A module's version lives in its own key (``kpi:ver:<org_id>:<module>``) and
+is bumped by post_save / post_delete receivers (core/signals.py) on the
+models listed in MODULE_MODELS, both at once and again after commit.
+Bumping a version orphans every entry that depended on it, so
+invalidation needs neither key scans nor delete_pattern
+and behaves the same on the locmem, file-based and Redis backends. Orphaned
+entries simply age out via KPI_CACHE_TIMEOUT.
+
+The same versions double as data versions for the ISO 45001 pack section
+cache (audit_export/section_cache.py) via ``data_version()``.
+
+Bulk ``QuerySet.update()`` calls fire no signals — views that auto-flag
+overdue rows must call ``invalidate()`` themselves when rows changed.
+"""
+from __future__ import annotations
+
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import transaction
+from django.utils import timezone
+
+# module → models whose writes change that module's KPIs
+MODULE_MODELS = {
+    "observations":         ["observations.Observation"],
+    "permits":              ["permits.Permit"],
+    "hira":                 ["hira.HazardRegister", "hira.Hazard"],
+    "compliance":           ["compliance.ComplianceItem"],
+    "training":             [
+        "training.TrainingModule", "training.Assessment",
+        "training.AssessmentAttempt", "training.SkillProficiency", "training.Skill",
+    ],
+    "actions":              ["actions.CorrectiveAction"],
+    "incidents":            ["incidents.Incident", "incidents.HoursWorked"],
+    "inspections":          ["inspections.Inspection", "inspections.InspectionFinding"],
+    "inspection_templates": ["inspections.InspectionTemplate"],
+    "appraisals":           ["appraisals.AppraisalCycle", "appraisals.AppraisalRecord"],
+    "skill_categories":     ["training.SkillCategory"],
+    "users":                ["users.CustomUser"],
+    "locations":            ["observations.Location"],
+}
+
+# Models without a direct organization FK: dotted path to the org id.
+_ORG_PATHS = {
+    "hira.Hazard":                   "register.organization_id",
+    "inspections.InspectionFinding": "inspection.organization_id",
+    "appraisals.AppraisalRecord":    "cycle.organization_id",
+}
+
+
+def _timeout():
+    return getattr(settings, "KPI_CACHE_TIMEOUT", 300)
+
+
+def _org_id(org):
+    return getattr(org, "pk", org)
+
+
+def _version_key(org_id, module):
+    return f"kpi:ver:{org_id}:{module}"
+
+
+def _fresh_version():
+    # Time-based so a version key that was evicted and recreated can never
+    # collide with a value some still-cached entry was built under.
+    return int(timezone.now().timestamp() * 1000)
+
+
+# ---------------------------------------------------------------------------
+# Read side
+# ---------------------------------------------------------------------------
+
+def _versions(org_id, modules):
+    keys = {_version_key(org_id, m): m for m in modules}
+    found = cache.get_many(list(keys))
+    missing = {k: _fresh_version() for k in keys if k not in found}
+    if missing:
+        # Versions never expire on their own; only invalidate() moves them.
+        cache.set_many(missing, timeout=None)
+        found.update(missing)
+    stamp = ",".join(f"{keys[k]}={found[k]}" for k in sorted(keys))
+    return hashlib.md5(stamp.encode()).hexdigest()
+
+
+def cached_kpis(org, name, modules, compute, scope="org"):
+    """
+    Return ``compute()`` for this org/dashboard/scope, cached until any of
+    ``modules`` is invalidated. ``scope`` separates role- or user-specific
+    numbers (e.g. ``"manager"`` or ``f"user:{user.pk}"``).
+
+    The current date is part of the key so date-relative KPIs ("overdue",
+    "due in 30 days") roll over at midnight without an explicit bust.
+    """
+    org_id = _org_id(org)
+    today = timezone.localdate().isoformat()
+    key = f"kpi:{org_id}:{name}:{scope}:{today}:{_versions(org_id, modules)}"
+
+    value = cache.get(key)
+    if value is None:
+        value = compute()
+        cache.set(key, value, timeout=_timeout())
+    return value
+
+
+def data_version(org, modules):
+    """Opaque token that changes whenever any of ``modules`` is invalidated."""
+    return _versions(_org_id(org), modules)
+
+
+# ---------------------------------------------------------------------------
+# Write side
+# ---------------------------------------------------------------------------
+
+def _bump(org_id, modules):
+    for module in modules:
+        key = _version_key(org_id, module)
+        try:
+            cache.incr(key)
+        except ValueError:
+            # Key missing (evicted / never read) — any fresh value will do.
+            cache.set(key, _fresh_version(), timeout=None)
+
+
+def invalidate(org, *modules):
+    """
+    Bump the version of each module so dependent KPI entries are skipped —
+    now and again once the transaction commits, so an entry a concurrent
+    request computed from pre-commit rows is orphaned too.
+    """
+    org_id = _org_id(org)
+    if org_id is None:
+        return
+    _bump(org_id, modules)
+    transaction.on_commit(lambda: _bump(org_id, modules))
+
+
+def org_id_for_instance(instance):
+    """Resolve the owning organization id of a tracked model instance."""
+    path = _ORG_PATHS.get(instance._meta.label, "organization_id")
+    obj = instance
+    try:
+        for attr in path.split("."):
+            obj = getattr(obj, attr)
+    except ObjectDoesNotExist:
+        # Parent already gone in a cascade delete; its own signal invalidates.
+        return None
+    return obj
@@ -2,25 +2,147 @@
 """
 Shared helpers for embedding org logos in PDF and Excel exports.
 Works with both local storage and S3 (reads via Django's storage API).
+
+Logo bytes and the resized Excel header image are kept in a per-process
+LRU (LOGO_CACHE_MAX_BYTES) keyed by (file name, modified time), so an
+export or a page load does not go back to storage for an unchanged logo.
+The modified time itself is re-checked at most every
+LOGO_CACHE_REVALIDATE_SECONDS per file — a replaced logo shows up in other
+worker processes within that window.
 """
 from __future__ import annotations
 
+import hashlib
+import mimetypes
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
 from io import BytesIO
 from typing import Optional
 
+from django.conf import settings
 
-def _read_logo_bytes(org) -> Optional[bytes]:
-    """Read raw logo bytes from storage.  Returns None if no logo or any error."""
+EXCEL_LOGO_HEIGHT = 48      # pixels (≈ 36pt header row)
+
+
+@dataclass(frozen=True)
+class Logo:
+    data: bytes
+    etag: str               # strong: digest of the bytes
+    content_type: str
+    size: tuple             # (width, height) in pixels
+
+
+class _LRU:
+    """Thread-safe LRU bounded by the total byte size of its values."""
+
+    def __init__(self):
+        self._items = OrderedDict()      # key -> (value, nbytes)
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            self._items.move_to_end(key)
+            return item[0]
+
+    def set(self, key, value, nbytes):
+        limit = getattr(settings, "LOGO_CACHE_MAX_BYTES", 16 * 1024 * 1024)
+        if nbytes > limit:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._items[key] = (value, nbytes)
+            self._bytes += nbytes
+            while self._bytes > limit:
+                _, (_, dropped) = self._items.popitem(last=False)
+                self._bytes -= dropped
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._bytes = 0
+
+
+_cache = _LRU()
+_versions = {}              # file name -> (modified timestamp | None, checked at)
+
+
+def _version(logo):
+    """Modified time of the logo file (None when storage cannot tell)."""
+    ttl = getattr(settings, "LOGO_CACHE_REVALIDATE_SECONDS", 60)
+    now = time.monotonic()
+    hit = _versions.get(logo.name)
+    if hit is not None and now - hit[1] < ttl:
+        return hit[0]
+    try:
+        version = logo.storage.get_modified_time(logo.name).timestamp()
+    except Exception:
+        version = None
+    if len(_versions) > 1024:
+        _versions.clear()
+    _versions[logo.name] = (version, now)
+    return version
+
+
+def forget_logo(name):
+    """Drop the cached version of ``name`` (after replacing or removing it)."""
+    _versions.pop(name, None)
+
+
+def clear_logo_cache():
+    _cache.clear()
+    _versions.clear()
+
+
+def _load(logo) -> Optional[Logo]:
+    try:
+        with logo.open("rb") as f:
+            data = f.read()
+        from PIL import Image as PILImage
+
+        with PILImage.open(BytesIO(data)) as pil:
+            size = pil.size
+    except Exception:
+        return None
+    content_type, _ = mimetypes.guess_type(logo.name)
+    return Logo(
+        data=data,
+        etag=f'"{hashlib.sha256(data).hexdigest()[:32]}"',
+        content_type=content_type or "image/png",
+        size=size,
+    )
+
+
+def get_logo(org) -> Optional[Logo]:
+    """The org's logo (cached). Returns None if no logo or any error."""
     if not org:
         return None
     logo = getattr(org, "logo", None)
     if not logo or not logo.name:
         return None
-    try:
-        with logo.open("rb") as f:
-            return f.read()
-    except Exception:
-        return None
+    version = _version(logo)
+    if version is None:
+        return _load(logo)
+    key = (logo.name, version, "raw")
+    cached = _cache.get(key)
+    if cached is None:
+        cached = _load(logo)
+        if cached is not None:
+            _cache.set(key, cached, len(cached.data))
+    return cached
+
+
+def _read_logo_bytes(org) -> Optional[bytes]:
+    """Raw logo bytes.  Returns None if no logo or any error."""
+    logo = get_logo(org)
+    return logo.data if logo else None
 
 
 def get_logo_for_pdf(org, max_width_pt: float, max_height_pt: float):
@@ -33,21 +155,36 @@ def get_logo_for_pdf(org, max_width_pt: float, max_height_pt: float):
         if logo_img:
             story.append(logo_img)
     """
-    logo_bytes = _read_logo_bytes(org)
-    if not logo_bytes:
+    logo = get_logo(org)
+    if not logo:
         return None
     try:
-        from PIL import Image as PILImage
         from reportlab.platypus import Image as RLImage
 
-        pil = PILImage.open(BytesIO(logo_bytes))
-        orig_w, orig_h = pil.size
+        orig_w, orig_h = logo.size
         ratio = min(max_width_pt / orig_w, max_height_pt / orig_h)
-        return RLImage(BytesIO(logo_bytes), width=orig_w * ratio, height=orig_h * ratio)
+        return RLImage(BytesIO(logo.data), width=orig_w * ratio, height=orig_h * ratio)
     except Exception:
         return None
 
 
+def _excel_png(logo, target_h):
+    """(png bytes, width, height) of the logo scaled to ``target_h`` pixels."""
+    from PIL import Image as PILImage
+
+    orig_w, orig_h = logo.size
+    scale = target_h / orig_h
+    new_w = int(orig_w * scale)
+
+    with PILImage.open(BytesIO(logo.data)) as pil:
+        pil_resized = pil.resize((new_w, target_h), PILImage.LANCZOS)
+
+    # openpyxl needs a file-like object; save resized PIL image as PNG
+    buf = BytesIO()
+    pil_resized.save(buf, format="PNG")
+    return buf.getvalue(), new_w, target_h
+
+
 def get_logo_for_excel(org):
     """
     Return an openpyxl Image object ready to be anchored in a worksheet.
@@ -59,29 +196,21 @@ def get_logo_for_excel(org):
             xl_img.anchor = "A1"
             ws.add_image(xl_img)
     """
-    logo_bytes = _read_logo_bytes(org)
-    if not logo_bytes:
+    logo = get_logo(org)
+    if not logo:
         return None
     try:
         from openpyxl.drawing.image import Image as XLImage
-        from PIL import Image as PILImage
-
-        # Scale down to a standard header height (≈ 48px / 36pt) preserving aspect ratio
-        pil = PILImage.open(BytesIO(logo_bytes))
-        orig_w, orig_h = pil.size
-        target_h = 48          # pixels
-        scale = target_h / orig_h
-        new_w = int(orig_w * scale)
-        new_h = target_h
-
-        pil_resized = pil.resize((new_w, new_h), PILImage.LANCZOS)
 
-        # openpyxl needs a file-like object; save resized PIL image as PNG into BytesIO
-        buf = BytesIO()
-        pil_resized.save(buf, format="PNG")
-        buf.seek(0)
+        # Scale down to a standard header height preserving aspect ratio
+        key = (org.logo.name, logo.etag, "excel", EXCEL_LOGO_HEIGHT)
+        resized = _cache.get(key)
+        if resized is None:
+            resized = _excel_png(logo, EXCEL_LOGO_HEIGHT)
+            _cache.set(key, resized, len(resized[0]))
+        png, new_w, new_h = resized
 
-        xl_img = XLImage(buf)
+        xl_img = XLImage(BytesIO(png))
         xl_img.width = new_w
         xl_img.height = new_h
         return xl_img
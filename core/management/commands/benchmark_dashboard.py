@@ -0,0 +1,168 @@
+"""
+Measure the post-login landing page (core:app_dashboard) of a large tenant:
+query count and latency with a cold KPI cache and with a warm one.
+
+Every run seeds a throwaway test database (created and destroyed by the
+command, never the configured one) with one tenant holding N rows spread
+over observations, corrective actions, HIRA hazards, compliance items,
+permits and inspections, then requests the page through the test client
+and keeps the fastest of a few requests:
+
+    python manage.py benchmark_dashboard                 # 100k rows
+    python manage.py benchmark_dashboard --rows 10000 --rows 100000 --repeat 5
+"""
+import time
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+# Share of the tenant's rows per module.
+MIX = {
+    "observations": 0.35,
+    "actions":      0.20,
+    "hazards":      0.20,
+    "compliance":   0.10,
+    "permits":      0.10,
+    "inspections":  0.05,
+}
+BATCH = 2_000
+
+
+def _seed(count):
+    from django.contrib.auth import get_user_model
+    from django.utils import timezone
+
+    from core.models import Organization, Plan
+    from actions.models import CorrectiveAction
+    from compliance.models import ComplianceItem
+    from hira.models import Hazard, HazardRegister
+    from inspections.models import Inspection, InspectionTemplate
+    from observations.models import Location, Observation
+    from permits.models import Permit
+
+    User = get_user_model()
+    Plan.objects.get_or_create(name="Trial", defaults={"price_monthly": 0})
+    org = Organization.objects.create(name=f"Bench {count}", domain=f"dashbench{count}")
+    user = User.objects.create_user(
+        email=f"dashbench{count}@example.com", password="x",
+        organization=org, full_name="Bench Manager", role="manager",
+    )
+    today = date.today()
+    now = timezone.now()
+    n = {module: int(count * share) for module, share in MIX.items()}
+    location = Location.objects.create(organization=org, name="Bay 3")
+
+    obs_statuses = ("OPEN", "IN_PROGRESS", "AWAITING_VERIFICATION", "CLOSED")
+    Observation.objects.bulk_create((
+        Observation(organization=org, location=location, observer=user, title=f"Observation {i}",
+                    description="-", status=obs_statuses[i % 4],
+                    assigned_to=user if i % 5 == 0 else None,
+                    target_date=today + timedelta(days=i % 60 - 30))
+        for i in range(n["observations"])
+    ), batch_size=BATCH)
+
+    ca_statuses = [s for s, _ in CorrectiveAction.STATUS_CHOICES]
+    CorrectiveAction.objects.bulk_create((
+        CorrectiveAction(organization=org, title=f"Action {i}", status=ca_statuses[i % len(ca_statuses)],
+                         assigned_to=user if i % 7 == 0 else None,
+                         due_date=today + timedelta(days=i % 60 - 30))
+        for i in range(n["actions"])
+    ), batch_size=BATCH)
+
+    registers = HazardRegister.objects.bulk_create(
+        HazardRegister(organization=org, title=f"Register {r}", activity="Maintenance",
+                       assessment_date=today, assessed_by=user, status="approved",
+                       next_review_date=today + timedelta(days=r % 60 - 30))
+        for r in range(max(1, n["hazards"] // 100))
+    )
+    levels = ("low", "medium", "high", "critical")
+    Hazard.objects.bulk_create((
+        Hazard(register=registers[i % len(registers)], order=i, hazard_description=f"Hazard {i}",
+               potential_harm="Crush injury", effective_risk_level=levels[i % 4],
+               action_required=i % 3 == 0, action_owner=user if i % 9 == 0 else None)
+        for i in range(n["hazards"])
+    ), batch_size=BATCH)
+
+    comp_statuses = ("pending", "complied", "overdue")
+    ComplianceItem.objects.bulk_create((
+        ComplianceItem(organization=org, title=f"Obligation {i}", status=comp_statuses[i % 3],
+                       due_date=today + timedelta(days=i % 90 - 30))
+        for i in range(n["compliance"])
+    ), batch_size=BATCH)
+
+    permit_statuses = ("DRAFT", "SUBMITTED", "APPROVED", "ACTIVE", "CLOSED")
+    Permit.objects.bulk_create((
+        Permit(organization=org, permit_number=f"PTW-BENCH-{i:07d}", work_type="hot_work",
+               title=f"Permit {i}", description="-", location=location, requestor=user,
+               status=permit_statuses[i % 5], planned_start=now, planned_end=now + timedelta(hours=8))
+        for i in range(n["permits"])
+    ), batch_size=BATCH)
+
+    template = InspectionTemplate.objects.create(organization=org, title="Walk", created_by=user)
+    insp_statuses = ("scheduled", "in_progress", "completed")
+    Inspection.objects.bulk_create((
+        Inspection(organization=org, template=template, title=f"Inspection {i}", inspector=user,
+                   scheduled_date=today + timedelta(days=i % 60), status=insp_statuses[i % 3],
+                   created_by=user)
+        for i in range(n["inspections"])
+    ), batch_size=BATCH)
+    return user
+
+
+def _measure(client, url, repeat, cold):
+    from django.core.cache import cache
+    from django.test.utils import CaptureQueriesContext
+
+    best = queries = None
+    for _ in range(repeat):
+        if cold:
+            cache.clear()
+        else:
+            client.get(url)
+        with CaptureQueriesContext(connection) as ctx:
+            started = time.perf_counter()
+            response = client.get(url)
+            elapsed = time.perf_counter() - started
+        assert response.status_code == 200, response.status_code
+        best = elapsed if best is None else min(best, elapsed)
+        queries = len(ctx)
+    return queries, best
+
+
+class Command(BaseCommand):
+    help = "Benchmark query count and latency of the app dashboard for a large tenant"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows", type=int, action="append",
+            help="Rows in the tenant (repeatable; default 100000).",
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=3,
+            help="Requests per measurement; the fastest is reported (default 3).",
+        )
+
+    def handle(self, *args, **options):
+        from django.test import Client
+        from django.test.utils import setup_test_environment, teardown_test_environment
+        from django.urls import reverse
+
+        counts = options["rows"] or [100_000]
+        repeat = max(1, options["repeat"])
+
+        old_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        setup_test_environment()
+        try:
+            url = reverse("core:app_dashboard")
+            self.stdout.write(f"{'rows':>8}  {'cache':<5} {'queries':>7} {'ms':>8}")
+            for count in counts:
+                client = Client()
+                client.force_login(_seed(count))
+                for label, cold in (("cold", True), ("warm", False)):
+                    queries, best = _measure(client, url, repeat, cold)
+                    self.stdout.write(f"{count:>8}  {label:<5} {queries:>7} {best * 1000:>8.1f}")
+        finally:
+            teardown_test_environment()
+            connection.creation.destroy_test_db(old_name, verbosity=0)
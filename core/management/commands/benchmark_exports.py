@@ -0,0 +1,116 @@
+"""
+Compare the write-only XlsxExport writer against an in-memory styled
+Workbook (how the HIRA / observations Excel exports used to be built).
+
+Each run happens in a forked child so its peak RSS is measured on its own.
+Rows are synthetic and shaped like the HIRA export (29 columns, wrapped
+text, a styled risk column), so no database or tenant data is needed:
+
+    python manage.py benchmark_exports --rows 10000 --rows 100000
+"""
+import multiprocessing
+import resource
+import tempfile
+import time
+
+from django.core.management.base import BaseCommand
+
+COLUMNS = 29
+RISK_COL = 19
+LEVELS = ("Low", "Medium", "High", "Critical")
+RISK_FILLS = {"Low": "D1FAE5", "Medium": "FEF9C3", "High": "FFEDD5", "Critical": "FEE2E2"}
+
+
+def _rows(count):
+    text = "Controls in place: guarding, permit to work, toolbox talk. " * 2
+    for i in range(count):
+        row = [i, f"Register {i // 8}", "Activity", "Bay 3", "2026-01-01"]
+        row += [f"Value {c}" if c % 3 else text for c in range(5, COLUMNS)]
+        row[RISK_COL] = LEVELS[i % 4]
+        yield row
+
+
+def _legacy(count, out):
+    from openpyxl import Workbook
+    from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+
+    wb = Workbook()
+    ws = wb.active
+    thin = Side(style="thin", color="DEE2E6")
+    for r, row in enumerate(_rows(count), start=1):
+        fill = PatternFill("solid", fgColor="F8F9FB" if r % 2 else "FFFFFF")
+        for c, value in enumerate(row, start=1):
+            cell = ws.cell(row=r, column=c, value=value)
+            cell.fill = fill
+            cell.border = Border(left=thin, right=thin, top=thin, bottom=thin)
+            cell.alignment = Alignment(vertical="top", wrap_text=True)
+            cell.font = Font(size=9)
+        risk = ws.cell(row=r, column=RISK_COL + 1)
+        risk.fill = PatternFill("solid", fgColor=RISK_FILLS[row[RISK_COL]])
+        risk.font = Font(bold=True, size=9)
+        ws.row_dimensions[r].height = 36
+    wb.save(out)
+
+
+def _write_only(count, out):
+    from openpyxl.styles import Alignment, Border, Font, NamedStyle, PatternFill, Side
+
+    from core.utils.exports import XlsxExport
+
+    thin = Side(style="thin", color="DEE2E6")
+    border = Border(left=thin, right=thin, top=thin, bottom=thin)
+    top = Alignment(vertical="top", wrap_text=True)
+    styles = [
+        NamedStyle(name, fill=PatternFill("solid", fgColor=bg), font=Font(size=9),
+                   border=border, alignment=top)
+        for name, bg in (("bench_odd", "F8F9FB"), ("bench_even", "FFFFFF"))
+    ] + [
+        NamedStyle(f"bench_{level}", fill=PatternFill("solid", fgColor=bg),
+                   font=Font(bold=True, size=9), border=border, alignment=top)
+        for level, bg in RISK_FILLS.items()
+    ]
+    xl = XlsxExport("Bench", styles=styles, row_height=36)
+    for r, row in enumerate(_rows(count), start=1):
+        xl.append(row, style="bench_odd" if r % 2 else "bench_even",
+                  styles={RISK_COL: f"bench_{row[RISK_COL]}"})
+    xl.wb.save(out)
+
+
+WRITERS = {"in-memory": _legacy, "write-only": _write_only}
+
+
+def _measure(name, count, queue):
+    base_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    with tempfile.TemporaryFile() as out:
+        started = time.perf_counter()
+        WRITERS[name](count, out)
+        elapsed = time.perf_counter() - started
+        size = out.tell()
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    queue.put((elapsed, (peak_kb - base_kb) / 1024, size / 1024 / 1024))
+
+
+class Command(BaseCommand):
+    help = "Benchmark time and peak RSS of the Excel export writers"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows", type=int, action="append",
+            help="Row count to benchmark (repeatable; default 1000 and 10000).",
+        )
+
+    def handle(self, *args, **options):
+        counts = options["rows"] or [1_000, 10_000]
+        ctx = multiprocessing.get_context("fork")
+
+        self.stdout.write(f"{'rows':>8}  {'writer':<11} {'seconds':>8} {'peak RSS MB':>12} {'file MB':>8}")
+        for count in counts:
+            for name in WRITERS:
+                queue = ctx.Queue()
+                child = ctx.Process(target=_measure, args=(name, count, queue))
+                child.start()
+                elapsed, rss_mb, file_mb = queue.get()
+                child.join()
+                self.stdout.write(
+                    f"{count:>8}  {name:<11} {elapsed:>8.2f} {rss_mb:>12.1f} {file_mb:>8.1f}"
+                )
@@ -0,0 +1,132 @@
+"""
+Time each PDF report at a given table size, to track PDF latency across
+releases.
+
+Every run seeds a throwaway test database (created and destroyed by the
+command, never the configured one) with one tenant whose inspection,
+HIRA register, appraisal and audit-pack HIRA section each carry N rows,
+then renders every report a few times and keeps the fastest:
+
+    python manage.py benchmark_pdfs                      # 10, 1k and 10k rows
+    python manage.py benchmark_pdfs --rows 50000 --repeat 1
+"""
+import time
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+
+def _seed(count):
+    from django.contrib.auth import get_user_model
+
+    from core.models import Organization, Plan
+    from appraisals.models import AppraisalCategory, AppraisalCycle, AppraisalItem, AppraisalRecord
+    from hira.models import Hazard, HazardRegister
+    from inspections.models import (
+        Inspection, InspectionFinding, InspectionItem, InspectionTemplate, TemplateSection,
+    )
+
+    User = get_user_model()
+    Plan.objects.get_or_create(name="Trial", defaults={"price_monthly": 0})
+    org = Organization.objects.create(name=f"Bench {count}", domain=f"bench{count}")
+    user = User.objects.create_user(
+        email=f"bench{count}@example.com", password="x",
+        organization=org, full_name="Bench Manager", role="manager",
+    )
+    today = date.today()
+    text = "Guarding, permit to work and toolbox talk in place before the task starts."
+
+    template = InspectionTemplate.objects.create(organization=org, title="Bench template", created_by=user)
+    sections = TemplateSection.objects.bulk_create(
+        TemplateSection(template=template, title=f"Section {s}", order=s) for s in range(10)
+    )
+    items = InspectionItem.objects.bulk_create(
+        InspectionItem(section=sections[i % 10], question=f"Check {i}: {text}", order=i)
+        for i in range(count)
+    )
+    inspection = Inspection.objects.create(
+        organization=org, template=template, title="Bench inspection", inspector=user,
+        location_text="Bay 3", scheduled_date=today, conducted_date=today,
+        status="completed", created_by=user,
+    )
+    responses = ("pass", "pass", "fail", "na")
+    InspectionFinding.objects.bulk_create(
+        InspectionFinding(inspection=inspection, template_item=item,
+                          response=responses[i % 4], notes=text if i % 4 == 2 else "")
+        for i, item in enumerate(items)
+    )
+
+    register = HazardRegister.objects.create(
+        organization=org, title="Bench register", activity="Maintenance",
+        assessment_date=today, assessed_by=user,
+    )
+    Hazard.objects.bulk_create(
+        Hazard(register=register, order=i, hazard_description=f"Hazard {i}: {text}",
+               potential_harm="Crush injury", controls_description=text)
+        for i in range(count)
+    )
+
+    cycle = AppraisalCycle.objects.create(
+        organization=org, name="Bench cycle", start_date=today, end_date=today + timedelta(days=365),
+        goal_setting_deadline=today, self_assessment_deadline=today, review_deadline=today,
+        created_by=user,
+    )
+    category = AppraisalCategory.objects.create(cycle=cycle, name="Goals", weight=100)
+    record = AppraisalRecord.objects.create(cycle=cycle, employee=user, reviewer=user)
+    AppraisalItem.objects.bulk_create(
+        AppraisalItem(record=record, category=category, title=f"Goal {i}: {text}",
+                      approved_by_manager=True, created_by=user)
+        for i in range(count)
+    )
+    return org, inspection, register, record
+
+
+def _reports(org, inspection, register, record):
+    from appraisals.pdf import generate_appraisal_pdf
+    from audit_export.pdf_sections import generate_section_02_hira
+    from audit_export.snapshot import load_snapshot
+    from hira.pdf_report import generate_hira_pdf
+    from inspections.pdf import generate_inspection_pdf
+
+    today = date.today()
+    return {
+        "inspection": lambda: generate_inspection_pdf(inspection, org),
+        "hira": lambda: generate_hira_pdf(register),
+        "appraisal": lambda: generate_appraisal_pdf(record),
+        "pack §02": lambda: generate_section_02_hira(load_snapshot(org, today, today)),
+    }
+
+
+class Command(BaseCommand):
+    help = "Benchmark PDF report generation at 10 / 1k / 10k table rows"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows", type=int, action="append",
+            help="Table rows per report (repeatable; default 10, 1000 and 10000).",
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=3,
+            help="Renders per report; the fastest is reported (default 3).",
+        )
+
+    def handle(self, *args, **options):
+        counts = options["rows"] or [10, 1_000, 10_000]
+        repeat = max(1, options["repeat"])
+
+        old_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            self.stdout.write(f"{'rows':>8}  {'report':<11} {'seconds':>8} {'PDF KB':>9}")
+            for count in counts:
+                for name, render in _reports(*_seed(count)).items():
+                    best = None
+                    for _ in range(repeat):
+                        started = time.perf_counter()
+                        pdf = render()
+                        elapsed = time.perf_counter() - started
+                        best = elapsed if best is None else min(best, elapsed)
+                    self.stdout.write(f"{count:>8}  {name:<11} {best:>8.2f} {len(pdf) / 1024:>9.0f}")
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
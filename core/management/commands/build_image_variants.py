@@ -0,0 +1,46 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from core import images
+
+
+class Command(BaseCommand):
+    help = "Clean stored photo originals and build their thumb / medium variants"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--model", action="append", choices=sorted(images.IMAGE_FIELDS),
+            help="Model to process (repeatable; default all).",
+        )
+        parser.add_argument(
+            "--force", action="store_true",
+            help="Rebuild photos that already have variants.",
+        )
+
+    def handle(self, *args, **options):
+        for label in options["model"] or images.IMAGE_FIELDS:
+            model = apps.get_model(label)
+            built = skipped = failed = 0
+            for name in images.IMAGE_FIELDS[label]:
+                qs = (
+                    model._default_manager.exclude(Q(**{f"{name}__isnull": True}) | Q(**{name: ""}))
+                    .only("pk", name).order_by("pk")
+                )
+                for obj in qs.iterator(chunk_size=200):
+                    fieldfile = getattr(obj, name)
+                    stored = fieldfile.name
+                    if not options["force"] and fieldfile.storage.exists(
+                        images.variant_name(stored, "thumb")
+                    ):
+                        skipped += 1
+                        continue
+                    if not images.rebuild(fieldfile):
+                        failed += 1
+                        continue
+                    if fieldfile.name != stored:
+                        # Bulk update: re-saving would run the upload pipeline again.
+                        model._default_manager.filter(pk=obj.pk).update(**{name: fieldfile.name})
+                    built += 1
+            self.stdout.write(f"{label}: {built} built, {skipped} skipped, {failed} unreadable")
+        self.stdout.write(self.style.SUCCESS("Image variants built."))
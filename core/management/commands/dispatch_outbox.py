@@ -0,0 +1,24 @@
+"""
+Management command: dispatch_outbox
+
+Delivers every due message in the transactional email outbox. Workers do
+this automatically (core/jobs.py); run it by hand or from cron when no
+`run_workers` process is available.
+
+    python manage.py dispatch_outbox
+"""
+from django.core.management.base import BaseCommand
+
+from core.outbox import dispatch_pending, requeue_stuck
+
+
+class Command(BaseCommand):
+    help = "Deliver pending transactional emails from the outbox."
+
+    def handle(self, *args, **options):
+        requeued = requeue_stuck()
+        totals = dispatch_pending()
+        self.stdout.write(self.style.SUCCESS(
+            f"Done. {totals['sent']} sent, {totals['retry']} to retry, "
+            f"{totals['failed']} failed, {requeued} stuck message(s) requeued."
+        ))
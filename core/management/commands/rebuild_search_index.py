@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core import search
+from core.models import Organization
+
+
+class Command(BaseCommand):
+    help = "Rebuild full-text search entries (all organizations, or one with --org)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--org", type=int, help="Organization id to rebuild.")
+        parser.add_argument(
+            "--kind", action="append", choices=sorted(search.SOURCES),
+            help="Source to rebuild (repeatable; default all).",
+        )
+
+    def handle(self, *args, **options):
+        org = None
+        if options["org"]:
+            try:
+                org = Organization.objects.get(pk=options["org"])
+            except Organization.DoesNotExist:
+                raise CommandError(f"Organization {options['org']} not found.")
+
+        counts = search.rebuild(org=org, kinds=options["kind"])
+        for kind, count in counts.items():
+            self.stdout.write(f"{kind}: {count} indexed")
+        self.stdout.write(self.style.SUCCESS("Search index rebuilt."))
@@ -0,0 +1,61 @@
+# core/management/commands/send_daily_digest.py
+"""
+Sends one consolidated safety digest per person: every overdue, due-soon
+and pending item across observations, corrective actions, inspections,
+legal compliance, HIRA reviews and appraisals (see core/digest.py).
+
+Replaces the per-item alert commands in the daily cron:
+    python manage.py send_daily_digest
+
+Options:
+    --dry-run    List the digests that would be sent; change and send nothing.
+    --module     Only collect these modules (repeatable).
+"""
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core import digest
+
+
+class Command(BaseCommand):
+    help = "Send each user one daily digest of their due, overdue and pending safety items."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run", action="store_true",
+            help="List the digests that would be sent without changing or sending anything.",
+        )
+        parser.add_argument(
+            "--module", action="append", choices=list(digest.COLLECTORS),
+            help="Module to collect (repeatable; default all).",
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options["dry_run"]
+        today   = timezone.now().date()
+
+        if not dry_run:
+            for module, count in digest.flag_overdue(today).items():
+                if count:
+                    self.stdout.write(f"Marked {count} {module} item(s) overdue.")
+
+        digests = digest.build_digests(today, options["module"])
+        items   = sum(len(d.items) for d in digests)
+
+        for d in digests:
+            self.stdout.write(
+                f"  {'[DRY RUN] ' if dry_run else ''}{d.email}: {len(d.items)} item(s) — "
+                f"{d.count(digest.STATUS_OVERDUE)} overdue, {d.count(digest.STATUS_DUE)} due soon, "
+                f"{d.count(digest.STATUS_PENDING)} pending"
+            )
+
+        if dry_run:
+            self.stdout.write(self.style.WARNING(
+                f"Dry run complete — {len(digests)} digest(s) covering {items} item alert(s)."
+            ))
+            return
+
+        queued = digest.send_digests(digests)
+        self.stdout.write(self.style.SUCCESS(
+            f"Done. {queued} digest(s) queued in place of {items} individual alert(s)."
+        ))
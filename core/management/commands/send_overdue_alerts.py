@@ -8,6 +8,9 @@ Run daily via cron or Render cron job:
 
 Render cron schedule:  0 8 * * *   (8 AM IST every day)
 
+Re-runs are safe: alerts already sent today are skipped, and a run that
+crashed resumes from its checkpoint (core/alert_runs.py).
+
 Options:
     --dry-run    Print what would be sent without actually sending emails.
 """
@@ -15,7 +18,8 @@ from django.core.management.base import BaseCommand
 from django.utils import timezone
 
 from observations.models import Observation
-from core.utils.email import send_overdue_alert
+from core.alert_runs import FAILED, AlertRunner
+from core.utils.email import overdue_alert_email
 
 
 class Command(BaseCommand):
@@ -45,9 +49,7 @@ class Command(BaseCommand):
             .order_by("organization", "target_date")
         )
 
-        total  = overdue_qs.count()
-        sent   = 0
-        failed = 0
+        total = overdue_qs.count()
 
         if total == 0:
             self.stdout.write(self.style.SUCCESS("No overdue observations found."))
@@ -55,30 +57,27 @@ class Command(BaseCommand):
 
         self.stdout.write(f"Found {total} overdue observation(s).\n")
 
-        for obs in overdue_qs:
-            assignee     = obs.assigned_to
-            days_overdue = (today - obs.target_date).days
-
-            self.stdout.write(
-                f"  {'[DRY RUN] Would send' if dry_run else 'Sending'} → "
-                f"Obs #{obs.pk} | {obs.title[:40]} | "
-                f"{days_overdue}d overdue | "
-                f"→ {assignee.email}"
-            )
-
-            if not dry_run:
-                ok = send_overdue_alert(obs)
-                if ok:
-                    sent += 1
-                else:
-                    failed += 1
-                    self.stderr.write(f"    ✗ Failed to send to {assignee.email}")
-
         if dry_run:
+            for obs in overdue_qs:
+                self._describe(obs, today, "[DRY RUN] Would send")
             self.stdout.write(self.style.WARNING(
                 f"\nDry run complete — {total} email(s) would have been sent."
             ))
-        else:
-            self.stdout.write(self.style.SUCCESS(
-                f"\nDone — {sent} sent, {failed} failed out of {total} total."
-            ))
+            return
+
+        with AlertRunner("send_overdue_alerts", today) as run:
+            for obs in run.iterate("observations", overdue_qs):
+                self._describe(obs, today, "Sending")
+                outcome = run.notify("observations.overdue", obs, *overdue_alert_email(obs))
+                if outcome == FAILED:
+                    self.stderr.write(f"    ✗ Failed to send to {obs.assigned_to.email}")
+
+        self.stdout.write(self.style.SUCCESS(f"\nDone — {run.summary()}."))
+
+    def _describe(self, obs, today, verb):
+        self.stdout.write(
+            f"  {verb} → "
+            f"Obs #{obs.pk} | {obs.title[:40]} | "
+            f"{(today - obs.target_date).days}d overdue | "
+            f"→ {obs.assigned_to.email}"
+        )
@@ -0,0 +1,230 @@
+# core/metrics.py
+"""
+Per-request performance instrumentation.
+
+RequestMetricsMiddleware (core/middleware.py) opens a RequestRecorder around
+every request:
+  • DB time / query count — via connection.execute_wrapper()
+  • Template time        — via a thin wrapper around Template.render
+  • Wall time            — perf_counter around get_response()
+
+Finished records are tagged with the resolved view name + organization id,
+emitted as a Server-Timing header, checked against the per-view query budget
+and folded into a bounded in-process aggregate (``registry``) that staff can
+inspect at /ops/request-metrics/.
+
+The aggregate is per worker process — with 3 gunicorn workers each one keeps
+its own numbers, which is fine for spotting regressions.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import ExitStack
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Optional
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+_current: ContextVar[Optional["RequestRecorder"]] = ContextVar("request_recorder", default=None)
+
+
+# ---------------------------------------------------------------------------
+# Recorder
+# ---------------------------------------------------------------------------
+
+@dataclass
+class RequestRecord:
+    view_name: str
+    org_id: Optional[int]
+    method: str
+    path: str
+    status: int
+    queries: int
+    db_ms: float
+    template_ms: float
+    wall_ms: float
+    over_budget: bool = False
+
+
+class RequestRecorder:
+    """Accumulates timings for the request currently being served."""
+
+    def __init__(self):
+        self.queries = 0
+        self.db_ms = 0.0
+        self.template_ms = 0.0
+        self._template_depth = 0
+        self._stack = ExitStack()
+        self._started = 0.0
+        self.wall_ms = 0.0
+
+    # ── DB ────────────────────────────────────────────────────────────────────
+
+    def _db_wrapper(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_ms += (time.perf_counter() - start) * 1000
+            self.queries += 1
+
+    # ── Lifecycle ─────────────────────────────────────────────────────────────
+
+    def __enter__(self):
+        for conn in connections.all():
+            self._stack.enter_context(conn.execute_wrapper(self._db_wrapper))
+        self._token = _current.set(self)
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.wall_ms = (time.perf_counter() - self._started) * 1000
+        _current.reset(self._token)
+        self._stack.close()
+        return False
+
+    def server_timing(self) -> str:
+        return (
+            f'db;dur={self.db_ms:.1f};desc="{self.queries} queries", '
+            f"tpl;dur={self.template_ms:.1f}, "
+            f"total;dur={self.wall_ms:.1f}"
+        )
+
+
+def current_recorder() -> Optional[RequestRecorder]:
+    return _current.get()
+
+
+# ---------------------------------------------------------------------------
+# Template timing
+# ---------------------------------------------------------------------------
+
+_template_timer_installed = False
+
+
+def install_template_timer():
+    """
+    Wrap django.template.base.Template.render once per process so nested
+    renders ({% include %}, inclusion tags) are only counted at the outermost
+    level. A no-op outside a recorded request.
+    """
+    global _template_timer_installed
+    if _template_timer_installed:
+        return
+    from django.template.base import Template
+
+    original_render = Template.render
+
+    def timed_render(self, context):
+        rec = _current.get()
+        if rec is None:
+            return original_render(self, context)
+        rec._template_depth += 1
+        start = time.perf_counter()
+        try:
+            return original_render(self, context)
+        finally:
+            rec._template_depth -= 1
+            if rec._template_depth == 0:
+                rec.template_ms += (time.perf_counter() - start) * 1000
+
+    Template.render = timed_render
+    _template_timer_installed = True
+
+
+# ---------------------------------------------------------------------------
+# Query budgets
+# ---------------------------------------------------------------------------
+
+def query_budget_for(view_name: str) -> Optional[int]:
+    """Per-view budget from REQUEST_QUERY_BUDGETS, else the default (None = off)."""
+    budgets = getattr(settings, "REQUEST_QUERY_BUDGETS", {})
+    if view_name in budgets:
+        return budgets[view_name]
+    return getattr(settings, "REQUEST_QUERY_BUDGET_DEFAULT", None)
+
+
+# ---------------------------------------------------------------------------
+# Rolling in-process aggregate
+# ---------------------------------------------------------------------------
+
+@dataclass
+class ViewStats:
+    view_name: str
+    count: int = 0
+    over_budget: int = 0
+    total_queries: int = 0
+    max_queries: int = 0
+    total_db_ms: float = 0.0
+    total_template_ms: float = 0.0
+    total_wall_ms: float = 0.0
+    wall_samples: deque = field(default_factory=lambda: deque(maxlen=200))
+
+    def add(self, rec: RequestRecord):
+        self.count += 1
+        self.over_budget += int(rec.over_budget)
+        self.total_queries += rec.queries
+        self.max_queries = max(self.max_queries, rec.queries)
+        self.total_db_ms += rec.db_ms
+        self.total_template_ms += rec.template_ms
+        self.total_wall_ms += rec.wall_ms
+        self.wall_samples.append(rec.wall_ms)
+
+    def summary(self) -> dict:
+        samples = sorted(self.wall_samples)
+        p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))] if samples else 0.0
+        n = self.count or 1
+        return {
+            "view_name":       self.view_name,
+            "count":           self.count,
+            "over_budget":     self.over_budget,
+            "avg_queries":     round(self.total_queries / n, 1),
+            "max_queries":     self.max_queries,
+            "avg_db_ms":       round(self.total_db_ms / n, 1),
+            "avg_template_ms": round(self.total_template_ms / n, 1),
+            "avg_wall_ms":     round(self.total_wall_ms / n, 1),
+            "p95_wall_ms":     round(p95, 1),
+            "budget":          query_budget_for(self.view_name),
+        }
+
+
+class MetricsRegistry:
+    """Thread-safe, bounded store of per-view stats and the most recent requests."""
+
+    def __init__(self, recent_size=100):
+        self._lock = threading.Lock()
+        self._views: dict[str, ViewStats] = {}
+        self.recent: deque = deque(maxlen=recent_size)
+
+    def add(self, rec: RequestRecord):
+        with self._lock:
+            stats = self._views.get(rec.view_name)
+            if stats is None:
+                stats = self._views[rec.view_name] = ViewStats(rec.view_name)
+            stats.add(rec)
+            self.recent.append(rec)
+
+    def snapshot(self) -> list[dict]:
+        """Per-view summaries, slowest average wall time first."""
+        with self._lock:
+            rows = [s.summary() for s in self._views.values()]
+        return sorted(rows, key=lambda r: r["avg_wall_ms"], reverse=True)
+
+    def recent_records(self) -> list[RequestRecord]:
+        with self._lock:
+            return list(reversed(self.recent))
+
+    def reset(self):
+        with self._lock:
+            self._views.clear()
+            self.recent.clear()
+
+
+registry = MetricsRegistry()
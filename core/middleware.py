@@ -17,11 +17,25 @@ from django.shortcuts import redirect
 from django.urls import reverse
 from django.utils import timezone
 
+from core import entitlements
+
 
 class SubscriptionMiddleware:
+    """
+    Contractor restrictions and the expired-subscription redirect to billing.
+    The subscription is read from the cached entitlement snapshot
+    (core/entitlements.py), not queried per request.
+    """
 
     def __init__(self, get_response):
         self.get_response = get_response
+        self._billing_paths = None
+
+    def _allowed_when_expired(self):
+        # Resolved on first use: the URLconf is not loaded yet in __init__.
+        if self._billing_paths is None:
+            self._billing_paths = frozenset((reverse("core:billing"), reverse("logout")))
+        return self._billing_paths
 
     def __call__(self, request):
         if request.user.is_authenticated and request.organization:
@@ -45,14 +59,69 @@ class SubscriptionMiddleware:
 
             # ── Subscription expiry check ────────────────────────────────
             else:
-                sub = getattr(request.organization, "subscription", None)
-
-                if sub is not None and sub.is_expired():
-                    allowed = [
-                        reverse("core:billing"),
-                        reverse("logout"),
-                    ]
-                    if request.path not in allowed:
+                ent = entitlements.for_request(request)
+
+                if ent is not None and ent.is_expired():
+                    if request.path not in self._allowed_when_expired():
                         return redirect("core:billing")
 
         return self.get_response(request)
+
+
+class RequestMetricsMiddleware:
+    """
+    Records query count, DB time, template time and wall time per request.
+
+    Adds a Server-Timing header, logs a warning when a view exceeds its query
+    budget (settings.REQUEST_QUERY_BUDGETS / REQUEST_QUERY_BUDGET_DEFAULT) and
+    feeds the in-process aggregate in core.metrics.registry.
+    Place it right after WhiteNoiseMiddleware: static files are served
+    before it runs, while session, auth, organization and subscription
+    lookups are still measured. The view name and org id are read once
+    the response is back.
+    """
+
+    def __init__(self, get_response):
+        from django.conf import settings
+        from core.metrics import install_template_timer
+
+        self.get_response = get_response
+        self.enabled = getattr(settings, "REQUEST_METRICS_ENABLED", True)
+        if self.enabled:
+            install_template_timer()
+
+    def __call__(self, request):
+        if not self.enabled:
+            return self.get_response(request)
+
+        from core.metrics import RequestRecord, RequestRecorder, logger, query_budget_for, registry
+
+        with RequestRecorder() as rec:
+            response = self.get_response(request)
+
+        match = getattr(request, "resolver_match", None)
+        view_name = (match.view_name if match else None) or "<unresolved>"
+        org = getattr(request, "organization", None)
+
+        budget = query_budget_for(view_name)
+        over_budget = budget is not None and rec.queries > budget
+        if over_budget:
+            logger.warning(
+                "Query budget exceeded: %s ran %d queries (budget %d) in %.0f ms [org=%s]",
+                view_name, rec.queries, budget, rec.wall_ms, org.pk if org else None,
+            )
+
+        registry.add(RequestRecord(
+            view_name=view_name,
+            org_id=org.pk if org else None,
+            method=request.method,
+            path=request.path,
+            status=response.status_code,
+            queries=rec.queries,
+            db_ms=rec.db_ms,
+            template_ms=rec.template_ms,
+            wall_ms=rec.wall_ms,
+            over_budget=over_budget,
+        ))
+        response["Server-Timing"] = rec.server_timing()
+        return response
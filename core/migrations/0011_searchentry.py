@@ -0,0 +1,156 @@
+# Generated by Django 5.1 on 2026-10-17 02:52
+
+import re
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+POSTGRES_FORWARD = [
+    """
+    ALTER TABLE core_searchentry ADD COLUMN document tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(body, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX searchentry_document_gin ON core_searchentry USING GIN (document)",
+]
+POSTGRES_REVERSE = [
+    "DROP INDEX IF EXISTS searchentry_document_gin",
+    "ALTER TABLE core_searchentry DROP COLUMN IF EXISTS document",
+]
+
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE core_searchentry_fts USING fts5(
+        title, body, content='core_searchentry', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER core_searchentry_ai AFTER INSERT ON core_searchentry BEGIN
+        INSERT INTO core_searchentry_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+    END
+    """,
+    """
+    CREATE TRIGGER core_searchentry_ad AFTER DELETE ON core_searchentry BEGIN
+        INSERT INTO core_searchentry_fts(core_searchentry_fts, rowid, title, body)
+        VALUES ('delete', old.id, old.title, old.body);
+    END
+    """,
+    """
+    CREATE TRIGGER core_searchentry_au AFTER UPDATE ON core_searchentry BEGIN
+        INSERT INTO core_searchentry_fts(core_searchentry_fts, rowid, title, body)
+        VALUES ('delete', old.id, old.title, old.body);
+        INSERT INTO core_searchentry_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+    END
+    """,
+]
+SQLITE_REVERSE = [
+    "DROP TRIGGER IF EXISTS core_searchentry_au",
+    "DROP TRIGGER IF EXISTS core_searchentry_ad",
+    "DROP TRIGGER IF EXISTS core_searchentry_ai",
+    "DROP TABLE IF EXISTS core_searchentry_fts",
+]
+
+DDL = {
+    "postgresql": (POSTGRES_FORWARD, POSTGRES_REVERSE),
+    "sqlite":     (SQLITE_FORWARD, SQLITE_REVERSE),
+}
+
+
+def _run(schema_editor, statements):
+    for sql in statements:
+        schema_editor.execute(sql)
+
+
+def create_fulltext_index(apps, schema_editor):
+    """Native index for the current backend; other backends search with LIKE."""
+    forward, _ = DDL.get(schema_editor.connection.vendor, ((), ()))
+    _run(schema_editor, forward)
+
+
+def drop_fulltext_index(apps, schema_editor):
+    _, reverse = DDL.get(schema_editor.connection.vendor, ((), ()))
+    _run(schema_editor, reverse)
+
+
+# Backfill frozen at this migration's schema: it must not import
+# core.search, whose SOURCES follow the current models' field names.
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+def _fold(*parts):
+    return " ".join(_WORD.findall(" ".join(p for p in parts if p)))
+
+
+def _observation_entry(o):
+    loc, observer = o.location, o.observer
+    return o.title, _fold(
+        o.description,
+        loc.name if loc else "", loc.area if loc else "",
+        observer.full_name if observer else "", observer.email if observer else "",
+    )
+
+
+BACKFILL = [
+    # kind, model, select_related, instance -> (title, body)
+    ("observation", ("observations", "Observation"), ("location", "observer"), _observation_entry),
+    ("incident", ("incidents", "Incident"), (), lambda i: (
+        i.title, _fold(i.reference_no, i.description, i.location_text, i.injured_person_name),
+    )),
+    ("employee", ("users", "CustomUser"), (), lambda u: (
+        u.full_name, _fold(u.email, u.employee_id, u.trade, u.company),
+    )),
+]
+
+
+def backfill_search_entries(apps, schema_editor):
+    SearchEntry = apps.get_model("core", "SearchEntry")
+    for kind, model, related, entry in BACKFILL:
+        rows = (
+            apps.get_model(*model).objects
+            .filter(organization_id__isnull=False)
+            .select_related(*related).order_by("pk")
+        )
+        batch = []
+        for obj in rows.iterator(chunk_size=500):
+            title, body = entry(obj)
+            batch.append(SearchEntry(
+                kind=kind, object_id=obj.pk, organization_id=obj.organization_id,
+                title=_fold(title), body=body,
+            ))
+            if len(batch) >= 500:
+                SearchEntry.objects.bulk_create(batch)
+                batch.clear()
+        SearchEntry.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_outboundemail'),
+        ('incidents', '0002_tenant_indexes'),
+        ('observations', '0004_tenant_indexes'),
+        ('users', '0007_customuser_reports_to'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(max_length=20)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('title', models.TextField(blank=True)),
+                ('body', models.TextField(blank=True)),
+                ('organization', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.organization')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['organization', 'kind'], name='searchentry_org_kind_idx')],
+                'constraints': [models.UniqueConstraint(fields=('kind', 'object_id'), name='searchentry_object_uniq')],
+            },
+        ),
+        migrations.RunPython(create_fulltext_index, drop_fulltext_index),
+        migrations.RunPython(backfill_search_entries, migrations.RunPython.noop),
+    ]
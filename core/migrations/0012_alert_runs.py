@@ -0,0 +1,54 @@
+# Generated by Django 5.1 on 2026-10-17 03:36
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_searchentry'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AlertRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('command', models.CharField(max_length=60)),
+                ('run_date', models.DateField()),
+                ('status', models.CharField(choices=[('running', 'Running'), ('completed', 'Completed'), ('failed', 'Failed')], default='running', max_length=10)),
+                ('checkpoint', models.JSONField(blank=True, default=dict)),
+                ('attempts', models.PositiveSmallIntegerField(default=1)),
+                ('scanned', models.PositiveIntegerField(default=0)),
+                ('sent', models.PositiveIntegerField(default=0)),
+                ('skipped', models.PositiveIntegerField(default=0)),
+                ('failed', models.PositiveIntegerField(default=0)),
+                ('duration', models.FloatField(default=0, help_text='Seconds, summed over attempts.')),
+                ('last_error', models.TextField(blank=True)),
+                ('started_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['-started_at'],
+                'indexes': [models.Index(fields=['command', 'run_date'], name='alertrun_command_date_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='SentNotification',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(max_length=40)),
+                ('object_ref', models.CharField(help_text='"<app_label.model>:<pk>"', max_length=80)),
+                ('recipient', models.EmailField(max_length=254)),
+                ('sent_on', models.DateField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('run', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='notifications', to='core.alertrun')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['sent_on'], name='sentnotification_date_idx')],
+                'constraints': [models.UniqueConstraint(fields=('kind', 'object_ref', 'recipient', 'sent_on'), name='sentnotification_uniq')],
+            },
+        ),
+    ]
@@ -182,3 +182,165 @@ class Subscription(models.Model):
         
     def __str__(self):
         return f"{self.organization} — {self.plan}"
+
+
+class OutboundEmail(models.Model):
+    """
+    Transactional email outbox.
+
+    Rows are written by core.utils.email.send_brevo_email() inside the
+    caller's transaction and delivered by core.outbox.dispatch_pending()
+    from a background worker, so web requests never wait on Brevo.
+    """
+
+    STATUS_PENDING = "pending"
+    STATUS_SENDING = "sending"
+    STATUS_SENT    = "sent"
+    STATUS_FAILED  = "failed"
+
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "Pending"),
+        (STATUS_SENDING, "Sending"),
+        (STATUS_SENT,    "Sent"),
+        (STATUS_FAILED,  "Failed"),
+    ]
+
+    to_email        = models.EmailField()
+    subject         = models.CharField(max_length=500)
+    html_content    = models.TextField()
+    # sha256 of recipient + subject + body + time bucket — identical messages
+    # queued within EMAIL_DEDUPE_WINDOW collapse into one row (failed rows
+    # excluded, so a message that failed can be sent again).
+    dedupe_key      = models.CharField(max_length=64)
+
+    status          = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts        = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error      = models.TextField(blank=True)
+    provider_id     = models.CharField(max_length=200, blank=True,
+                                       help_text="Message id returned by the email provider.")
+    claimed_at      = models.DateTimeField(null=True, blank=True)
+
+    created_at      = models.DateTimeField(auto_now_add=True)
+    sent_at         = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(
+                fields=["next_attempt_at", "id"],
+                condition=models.Q(status="pending"),
+                name="outbox_due_idx",
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["dedupe_key"],
+                condition=~models.Q(status="failed"),
+                name="outbox_dedupe_uniq",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.to_email} — {self.subject} ({self.status})"
+
+
+class SearchEntry(models.Model):
+    """
+    One full-text search document per searchable row (see core/search.py).
+
+    The native index is not a Django field: a generated tsvector column with
+    a GIN index on PostgreSQL, an FTS5 shadow table on SQLite — both created
+    in migration 0011.
+    """
+
+    organization = models.ForeignKey(Organization, on_delete=models.CASCADE, related_name="+")
+    kind         = models.CharField(max_length=20)
+    object_id    = models.PositiveBigIntegerField()
+    title        = models.TextField(blank=True)
+    body         = models.TextField(blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["kind", "object_id"], name="searchentry_object_uniq"),
+        ]
+        indexes = [
+            models.Index(fields=["organization", "kind"], name="searchentry_org_kind_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} #{self.object_id}"
+
+
+class AlertRun(models.Model):
+    """
+    One run of an alert command (see core/alert_runs.py): its resume
+    checkpoint and metrics. A run that crashed is picked up by the next run
+    of the same command on the same day.
+    """
+
+    STATUS_RUNNING   = "running"
+    STATUS_COMPLETED = "completed"
+    STATUS_FAILED    = "failed"
+
+    STATUS_CHOICES = [
+        (STATUS_RUNNING,   "Running"),
+        (STATUS_COMPLETED, "Completed"),
+        (STATUS_FAILED,    "Failed"),
+    ]
+
+    command     = models.CharField(max_length=60)
+    run_date    = models.DateField()
+    status      = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_RUNNING)
+    # stage name -> last primary key fully processed
+    checkpoint  = models.JSONField(default=dict, blank=True)
+    attempts    = models.PositiveSmallIntegerField(default=1)
+
+    scanned     = models.PositiveIntegerField(default=0)
+    sent        = models.PositiveIntegerField(default=0)
+    skipped     = models.PositiveIntegerField(default=0)
+    failed      = models.PositiveIntegerField(default=0)
+    duration    = models.FloatField(default=0, help_text="Seconds, summed over attempts.")
+    last_error  = models.TextField(blank=True)
+
+    started_at  = models.DateTimeField(default=timezone.now)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-started_at"]
+        indexes = [
+            models.Index(fields=["command", "run_date"], name="alertrun_command_date_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.command} {self.run_date} ({self.status})"
+
+
+class SentNotification(models.Model):
+    """
+    Ledger of alert emails queued by alert runs: one row per (kind, object,
+    recipient, day), written in the same transaction as the outbox row, so
+    a re-run or resumed run never queues the same alert twice.
+    """
+
+    kind       = models.CharField(max_length=40)
+    object_ref = models.CharField(max_length=80, help_text='"<app_label.model>:<pk>"')
+    recipient  = models.EmailField()
+    sent_on    = models.DateField()
+    run        = models.ForeignKey(AlertRun, on_delete=models.SET_NULL, null=True, blank=True,
+                                   related_name="notifications")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["kind", "object_ref", "recipient", "sent_on"],
+                name="sentnotification_uniq",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["sent_on"], name="sentnotification_date_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} {self.object_ref} → {self.recipient} ({self.sent_on})"
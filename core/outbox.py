@@ -0,0 +1,296 @@
+# core/outbox.py
+"""
+Transactional email outbox — queueing, transports and the dispatcher.
+
+    queue_email(to, subject, html)      # inside the caller's transaction
+    dispatch_pending()                  # from a worker / `dispatch_outbox`
+
+send_brevo_email() (core/utils/email.py) is the public entry point and calls
+queue_email(). Once the surrounding transaction commits a single
+"core.dispatch_outbox" job is queued (jobs app); the worker then drains the
+outbox:
+
+  • claims due rows (FOR UPDATE SKIP LOCKED on Postgres),
+  • sends them on a thread pool through one shared, pooled transport,
+  • throttled by a token bucket (EMAIL_RATE_LIMIT messages/second),
+  • retries failures with exponential backoff up to EMAIL_MAX_ATTEMPTS,
+  • records status / provider message id / last error per row.
+
+The transport is chosen by EMAIL_TRANSPORT (dotted path). LocMemTransport
+keeps messages in memory for tests, like Django's locmem email backend.
+"""
+import hashlib
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import OutboundEmail
+
+logger = logging.getLogger(__name__)
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+# ---------------------------------------------------------------------------
+# Transports
+# ---------------------------------------------------------------------------
+
+class BrevoTransport:
+    """
+    Brevo transactional API. One ApiClient (and its urllib3 connection pool,
+    sized to the dispatcher's concurrency) is shared by every send in the
+    process instead of being rebuilt per message.
+    """
+
+    def __init__(self):
+        import sib_api_v3_sdk
+
+        configuration = sib_api_v3_sdk.Configuration()
+        configuration.api_key["api-key"] = settings.BREVO_API_KEY
+        configuration.connection_pool_maxsize = _setting("EMAIL_DISPATCH_CONCURRENCY", 4)
+        self._sdk = sib_api_v3_sdk
+        self._api = sib_api_v3_sdk.TransactionalEmailsApi(sib_api_v3_sdk.ApiClient(configuration))
+        self._sender = _sender()
+
+    def send(self, to_email, subject, html_content):
+        """Send one message; return the provider message id. Raises on failure."""
+        message = self._sdk.SendSmtpEmail(
+            to=[{"email": to_email}],
+            subject=subject,
+            html_content=html_content,
+            sender=self._sender,
+        )
+        response = self._api.send_transac_email(message)
+        return getattr(response, "message_id", "") or ""
+
+
+class LocMemTransport:
+    """Stores sent messages in ``LocMemTransport.outbox``; used by tests."""
+
+    outbox = []
+    fail_for = set()   # recipients that should raise, to exercise retries
+
+    def send(self, to_email, subject, html_content):
+        if to_email in self.fail_for:
+            raise ConnectionError(f"stub failure for {to_email}")
+        LocMemTransport.outbox.append(
+            {"to": to_email, "subject": subject, "html": html_content}
+        )
+        return f"<locmem-{len(LocMemTransport.outbox)}>"
+
+
+def _sender():
+    from_raw = settings.DEFAULT_FROM_EMAIL
+    if "<" in from_raw:
+        from_name, from_addr = from_raw.split("<", 1)
+        return {"name": from_name.strip(), "email": from_addr.rstrip(">").strip()}
+    return {"name": "SafetySuite", "email": from_raw.strip()}
+
+
+_transport = None
+_transport_lock = threading.Lock()
+
+
+def get_transport():
+    """Process-wide transport instance (built lazily, reused by every send)."""
+    global _transport
+    with _transport_lock:
+        if _transport is None:
+            path = _setting("EMAIL_TRANSPORT", "core.outbox.BrevoTransport")
+            _transport = import_string(path)()
+        return _transport
+
+
+def reset_transport():
+    """Drop the cached transport (settings changes in tests)."""
+    global _transport
+    with _transport_lock:
+        _transport = None
+
+
+# ---------------------------------------------------------------------------
+# Queueing
+# ---------------------------------------------------------------------------
+
+def _dedupe_key(to_email, subject, html_content):
+    window = max(1, _setting("EMAIL_DEDUPE_WINDOW", 3600))
+    bucket = int(time.time() // window)
+    raw = "\x1f".join([to_email.strip().lower(), subject, html_content, str(bucket)])
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def queue_email(to_email, subject, html_content):
+    """
+    Add a message to the outbox. Returns False when an identical message is
+    already queued or sent within the dedupe window.
+    """
+    try:
+        with transaction.atomic():
+            OutboundEmail.objects.create(
+                to_email=to_email,
+                subject=subject[:500],
+                html_content=html_content,
+                dedupe_key=_dedupe_key(to_email, subject, html_content),
+            )
+    except IntegrityError:
+        logger.info("Duplicate email to %s suppressed -- %s", to_email, subject)
+        return False
+
+    transaction.on_commit(_schedule_dispatch)
+    return True
+
+
+def _schedule_dispatch(run_after=None):
+    """
+    Make sure a dispatch job runs no later than ``run_after`` (default: now).
+
+    A queued job that is due by then already covers it. A later one — the
+    wake-up for a backed-off retry — is pulled forward instead, so new mail
+    never waits behind a retry's backoff.
+    """
+    from jobs.models import Job
+    from jobs.queue import enqueue
+
+    run_after = run_after or timezone.now()
+    queued = Job.objects.filter(kind="core.dispatch_outbox", status=Job.STATUS_QUEUED)
+    if queued.filter(run_after__lte=run_after).exists():
+        return
+    if not queued.update(run_after=run_after):
+        enqueue("core.dispatch_outbox", max_attempts=1, run_after=run_after)
+
+
+def schedule_retries():
+    """After a dispatch run, wake the workers again when the next retry falls due."""
+    next_due = (
+        OutboundEmail.objects
+        .filter(status=OutboundEmail.STATUS_PENDING)
+        .order_by("next_attempt_at")
+        .values_list("next_attempt_at", flat=True)
+        .first()
+    )
+    if next_due is not None:
+        _schedule_dispatch(run_after=next_due)
+
+
+# ---------------------------------------------------------------------------
+# Dispatch
+# ---------------------------------------------------------------------------
+
+class RateLimiter:
+    """Thread-safe token bucket allowing ``rate`` acquisitions per second."""
+
+    def __init__(self, rate):
+        self.rate = float(rate)
+        self._tokens = self.rate
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.rate, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def _claim_batch(limit):
+    now = timezone.now()
+    with transaction.atomic():
+        ids = list(
+            OutboundEmail.objects
+            .select_for_update(skip_locked=True)
+            .filter(status=OutboundEmail.STATUS_PENDING, next_attempt_at__lte=now)
+            .order_by("next_attempt_at", "id")
+            .values_list("id", flat=True)[:limit]
+        )
+        OutboundEmail.objects.filter(
+            id__in=ids, status=OutboundEmail.STATUS_PENDING
+        ).update(status=OutboundEmail.STATUS_SENDING, claimed_at=now)
+    # claimed_at pins the batch to this run even where rows can't be locked.
+    return list(OutboundEmail.objects.filter(
+        id__in=ids, status=OutboundEmail.STATUS_SENDING, claimed_at=now,
+    ))
+
+
+def _record_result(msg, provider_id=None, error=None):
+    msg.attempts += 1
+    if error is None:
+        msg.status      = OutboundEmail.STATUS_SENT
+        msg.sent_at     = timezone.now()
+        msg.provider_id = provider_id or ""
+        msg.last_error  = ""
+        logger.info("Email sent to %s -- %s", msg.to_email, msg.subject)
+    elif msg.attempts >= _setting("EMAIL_MAX_ATTEMPTS", 5):
+        msg.status     = OutboundEmail.STATUS_FAILED
+        msg.last_error = error
+        logger.error("Brevo email failed to %s after %s attempts: %s",
+                     msg.to_email, msg.attempts, error)
+    else:
+        delay = _setting("EMAIL_RETRY_BACKOFF", 60) * 2 ** (msg.attempts - 1)
+        msg.status          = OutboundEmail.STATUS_PENDING
+        msg.next_attempt_at = timezone.now() + timedelta(seconds=delay)
+        msg.last_error      = error
+        logger.warning("Brevo email to %s failed (attempt %s), retrying in %ss: %s",
+                       msg.to_email, msg.attempts, delay, error)
+    msg.save(update_fields=[
+        "status", "attempts", "sent_at", "provider_id", "last_error", "next_attempt_at",
+    ])
+
+
+def dispatch_pending(batch_size=None, transport=None):
+    """
+    Deliver every due outbox row. Returns ``{"sent": n, "retry": n, "failed": n}``.
+
+    Only the provider calls run on the thread pool; all ORM writes happen on
+    the calling thread.
+    """
+    batch_size = batch_size or _setting("EMAIL_DISPATCH_BATCH", 100)
+    transport = transport or get_transport()
+    limiter = RateLimiter(_setting("EMAIL_RATE_LIMIT", 10))
+    totals = {"sent": 0, "retry": 0, "failed": 0}
+
+    def _send(msg):
+        limiter.acquire()
+        try:
+            return transport.send(msg.to_email, msg.subject, msg.html_content), None
+        except Exception as exc:
+            return None, f"{type(exc).__name__}: {exc}"
+
+    with ThreadPoolExecutor(max_workers=_setting("EMAIL_DISPATCH_CONCURRENCY", 4)) as pool:
+        while True:
+            batch = _claim_batch(batch_size)
+            if not batch:
+                break
+            for msg, (provider_id, error) in zip(batch, pool.map(_send, batch)):
+                _record_result(msg, provider_id, error)
+                if msg.status == OutboundEmail.STATUS_SENT:
+                    totals["sent"] += 1
+                elif msg.status == OutboundEmail.STATUS_FAILED:
+                    totals["failed"] += 1
+                else:
+                    totals["retry"] += 1
+    return totals
+
+
+def requeue_stuck(older_than=timedelta(minutes=30)):
+    """Return rows left in 'sending' by a crashed dispatcher to the queue."""
+    return OutboundEmail.objects.filter(
+        status=OutboundEmail.STATUS_SENDING,
+        claimed_at__lt=timezone.now() - older_than,
+    ).update(status=OutboundEmail.STATUS_PENDING)
@@ -0,0 +1,128 @@
+# core/pdf.py
+"""
+Shared ReportLab building blocks for the PDF reports.
+
+  • sample_style(name) — ReportLab's sample stylesheet, built once.
+  • text_style(**kw) — a ParagraphStyle from a process-wide cache keyed by
+    its attributes, so per-cell styles (a coloured risk label, a response
+    badge) are built once per process instead of once per row. Styles are
+    never mutated after creation, so sharing them between threads and
+    documents is safe.
+  • data_table(rows, ...) — list-style tables as LongTable flowables. Past
+    TABLE_CHUNK_ROWS data rows the table is emitted in chunks, each with the
+    header repeated: ReportLab re-measures every remaining row each time a
+    table splits across a page, so one 10k-row Table costs O(rows × pages)
+    while bounded chunks stay linear.
+
+Report modules keep their own palettes and page templates; stylesheet
+builders are wrapped in functools.cache so they run once per process.
+"""
+from __future__ import annotations
+
+import functools
+import threading
+
+from reportlab.lib import colors
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.platypus import LongTable, TableStyle
+
+# Even, so ROWBACKGROUNDS zebra striping lines up across chunks.
+TABLE_CHUNK_ROWS = 200
+
+_styles = {}
+_styles_lock = threading.Lock()
+
+
+def _key_part(value):
+    if isinstance(value, colors.Color):
+        return ("color", value.hexval())
+    if isinstance(value, ParagraphStyle):
+        return ("style", id(value))
+    return value
+
+
+@functools.cache
+def _sample_stylesheet():
+    return getSampleStyleSheet()
+
+
+def sample_style(name="Normal") -> ParagraphStyle:
+    """A style from ReportLab's sample stylesheet, built once per process."""
+    return _sample_stylesheet()[name]
+
+
+def text_style(**attrs) -> ParagraphStyle:
+    """
+    A cached ParagraphStyle with ``attrs`` (ParagraphStyle keywords, e.g.
+    fontSize=7, fontName="Helvetica-Bold", textColor=RED, alignment=1).
+    """
+    key = tuple(sorted((name, _key_part(value)) for name, value in attrs.items()))
+    style = _styles.get(key)
+    if style is None:
+        with _styles_lock:
+            style = _styles.get(key)
+            if style is None:
+                style = ParagraphStyle(f"cached-{len(_styles)}", **attrs)
+                _styles[key] = style
+    return style
+
+
+# ── Tables ────────────────────────────────────────────────────────────────────
+
+def _rows_of(command, nrows):
+    """(first, last) absolute rows of a cell-range style command, or None."""
+    if len(command) < 3 or not isinstance(command[1], (tuple, list)):
+        return None
+    (_, r0), (_, r1) = command[1], command[2]
+    if isinstance(r0, str) or isinstance(r1, str):      # "splitfirst" / "splitlast"
+        return None
+    return (r0 if r0 >= 0 else nrows + r0), (r1 if r1 >= 0 else nrows + r1)
+
+
+def _chunk_style(style, nrows, header, first, last):
+    """
+    ``style`` commands (whole-table coordinates) restricted to data rows
+    ``first``..``last`` and re-based onto a chunk of header + those rows.
+    """
+    out = []
+    for command in style:
+        rows = _rows_of(command, nrows)
+        if rows is None:
+            out.append(command)
+            continue
+        r0, r1 = rows
+        if r1 < header:                                  # header-only
+            out.append(command)
+            continue
+        lo, hi = max(r0, first), min(r1, last)
+        if lo > hi:
+            continue
+        shift = first - header
+        start = r0 if r0 < header else lo - shift
+        (c0, _), (c1, _) = command[1], command[2]
+        out.append((command[0], (c0, start), (c1, hi - shift), *command[3:]))
+    return out
+
+
+def data_table(rows, col_widths, style=(), repeat_rows=1, chunk_rows=TABLE_CHUNK_ROWS, **kwargs):
+    """
+    Flowables for a list table: ``rows`` includes the ``repeat_rows`` header
+    rows and ``style`` uses whole-table coordinates (row-specific commands
+    such as per-cell BACKGROUNDs are fine — they follow their row into its
+    chunk). Returns a list; extend the story with it.
+    """
+    style = list(style.getCommands() if isinstance(style, TableStyle) else style)
+    header, body = rows[:repeat_rows], rows[repeat_rows:]
+    if len(body) <= chunk_rows:
+        return [LongTable(rows, colWidths=col_widths, repeatRows=repeat_rows,
+                          style=TableStyle(style), **kwargs)]
+
+    nrows = len(rows)
+    tables = []
+    for start in range(0, len(body), chunk_rows):
+        part = body[start:start + chunk_rows]
+        first = repeat_rows + start
+        chunk = _chunk_style(style, nrows, repeat_rows, first, first + len(part) - 1)
+        tables.append(LongTable(header + part, colWidths=col_widths, repeatRows=repeat_rows,
+                                style=TableStyle(chunk), **kwargs))
+    return tables
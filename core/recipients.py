@@ -0,0 +1,101 @@
+# core/recipients.py
+"""
+Role-based recipient resolution for notifications and alert commands.
+
+Every action event, HIRA review alert and inspection alert CCs the org's
+managers and safety managers. manager_emails(org) resolves them with one
+indexed ``role__in`` query (users_org_active_role_idx) and caches the list
+per org, so a command alerting on hundreds of rows of the same tenant
+queries users once. The entry is dropped after commit whenever a user of
+that org is saved or deleted (core/signals.py); RECIPIENTS_CACHE_TIMEOUT
+bounds staleness for anything the receivers cannot see (a user moved to
+another org, a bulk ``update()``).
+
+With the per-process locmem backend other workers would never see that
+delete, so the shared cache is off there unless RECIPIENTS_CACHE forces it
+on. Alert runs and digests still resolve each org once: inside batch() the
+lists are memoised for the duration of the block.
+
+    recipients(action.assigned_to, action.raised_by, org=action.organization)
+    -> ["owner@…", "raiser@…", "manager@…", …]
+"""
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+
+from .utils.caching import shared_cache_enabled
+
+MANAGER_ROLES = ("manager", "safety_manager")
+
+# {org_id: emails} inside batch(); None outside.
+_batch: ContextVar[dict | None] = ContextVar("recipients_batch", default=None)
+
+
+def _timeout():
+    return getattr(settings, "RECIPIENTS_CACHE_TIMEOUT", 15 * 60)
+
+
+def _key(org_id):
+    return f"recipients:managers:{org_id}"
+
+
+def manager_emails(org) -> list:
+    """E-mail addresses of the org's active managers and safety managers."""
+    org_id = getattr(org, "pk", org)
+    if org_id is None:
+        return []
+    memo = _batch.get()
+    if memo is not None and org_id in memo:
+        return list(memo[org_id])
+    shared = shared_cache_enabled("RECIPIENTS_CACHE")
+    emails = cache.get(_key(org_id)) if shared else None
+    if emails is None:
+        emails = list(
+            get_user_model().objects.filter(
+                organization_id=org_id, is_active=True, role__in=MANAGER_ROLES,
+            ).exclude(email=None).exclude(email="")
+            .order_by("pk").values_list("email", flat=True)
+        )
+        if shared:
+            cache.set(_key(org_id), emails, timeout=_timeout())
+    if memo is not None:
+        memo[org_id] = emails
+    return list(emails)
+
+
+@contextmanager
+def batch():
+    """Resolve each org's managers at most once inside the block (one alert run or digest)."""
+    token = _batch.set({})
+    try:
+        yield
+    finally:
+        _batch.reset(token)
+
+
+def recipients(*people, org=None) -> list:
+    """
+    Unique e-mail addresses, in order, of ``people`` (users or addresses;
+    None and e-mail-less users are skipped) followed by the managers of
+    ``org`` when given.
+    """
+    emails = []
+    for person in people:
+        email = getattr(person, "email", person)
+        if email and email not in emails:
+            emails.append(email)
+    if org is not None:
+        emails += [e for e in manager_emails(org) if e not in emails]
+    return emails
+
+
+def forget_org(org_id):
+    """Drop the cached manager list of ``org_id`` once the transaction commits."""
+    if org_id is not None:
+        transaction.on_commit(lambda: cache.delete(_key(org_id)))
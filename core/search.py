@@ -0,0 +1,347 @@
+# core/search.py
+"""
+Tenant-scoped full-text search over free-text modules.
+
+Every searchable row has one SearchEntry (kind, object_id, organization,
+title, body). The entry table carries a native full-text index:
+
+  • PostgreSQL — a generated ``document`` tsvector column (title weighted A,
+    body B) with a GIN index; ranked with ts_rank.
+  • SQLite — an external-content FTS5 table (core_searchentry_fts) kept in
+    step with the entry table by triggers; ranked with bm25.
+  • anything else — per-term icontains over the entry table, unranked.
+
+The DDL for both lives in core/migrations/0011_searchentry.py.
+
+Queries are split into word terms that must all match; every term is a
+prefix ("weld sca" finds "welding scaffold"). A query the index cannot
+match at all is retried as substrings, so infix fragments of emails and
+employee ids still find their rows. Text is stored with
+punctuation folded to spaces so emails and employee ids tokenise the same
+way on every backend.
+
+Entries are written by post_save / post_delete receivers (core/signals.py)
+for the models in SOURCES, plus DEPENDENTS: saving a Location reindexes its
+observations; saving a user whose indexed name / email changed reindexes
+the observations they reported. Bulk ``QuerySet.update()`` fires no signals
+— run ``manage.py rebuild_search_index`` after bulk text changes.
+"""
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Callable
+
+from django.apps import apps as global_apps
+from django.conf import settings
+from django.db import connection
+from django.db.models import FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+# Terms beyond this are ignored — keeps tsquery / MATCH expressions bounded.
+MAX_TERMS = 8
+
+
+def _fold(*parts) -> str:
+    """Join text parts with punctuation folded to single spaces."""
+    return " ".join(_WORD.findall(" ".join(p for p in parts if p)))
+
+
+@dataclass(frozen=True)
+class Source:
+    model: str                       # "app_label.ModelName"
+    title: Callable                  # instance -> str (ranked above body)
+    body: Callable                   # instance -> str
+    select_related: tuple = ()
+    org_field: str = "organization_id"
+
+
+SOURCES = {
+    "observation": Source(
+        "observations.Observation",
+        title=lambda o: o.title,
+        body=lambda o: _fold(
+            o.description,
+            o.location.name if o.location_id else "",
+            o.location.area if o.location_id else "",
+            o.observer.full_name if o.observer_id else "",
+            o.observer.email if o.observer_id else "",
+        ),
+        select_related=("location", "observer"),
+    ),
+    "incident": Source(
+        "incidents.Incident",
+        title=lambda i: i.title,
+        body=lambda i: _fold(i.reference_no, i.description, i.location_text, i.injured_person_name),
+    ),
+    "employee": Source(
+        "users.CustomUser",
+        title=lambda u: u.full_name,
+        body=lambda u: _fold(u.email, u.employee_id, u.trade, u.company),
+    ),
+}
+
+# model label -> [(kind, FK field on that kind's model)] reindexed on save
+DEPENDENTS = {
+    "observations.Location": [("observation", "location")],
+    "users.CustomUser":      [("observation", "observer")],
+}
+
+
+def _limit():
+    return getattr(settings, "SEARCH_RESULT_LIMIT", 1000)
+
+
+def kind_for(instance):
+    label = instance._meta.label
+    for kind, source in SOURCES.items():
+        if source.model == label:
+            return kind
+    return None
+
+
+# ── Indexing ──────────────────────────────────────────────────────────────────
+
+def _entry_fields(source, instance):
+    return {
+        "organization_id": getattr(instance, source.org_field),
+        "title": _fold(source.title(instance)),
+        "body": _fold(source.body(instance)),
+    }
+
+
+def index_instance(instance) -> bool:
+    """
+    Create / refresh the entry for ``instance``. Returns True when the
+    indexed text changed. Rows without an organization are not indexed.
+    """
+    from .models import SearchEntry
+
+    kind = kind_for(instance)
+    source = SOURCES[kind]
+    fields = _entry_fields(source, instance)
+    if fields["organization_id"] is None:
+        remove_instance(instance)
+        return False
+
+    current = (
+        SearchEntry.objects.filter(kind=kind, object_id=instance.pk)
+        .values("organization_id", "title", "body").first()
+    )
+    if current == fields:
+        return False
+    SearchEntry.objects.update_or_create(kind=kind, object_id=instance.pk, defaults=fields)
+    return True
+
+
+def remove_instance(instance):
+    from .models import SearchEntry
+
+    SearchEntry.objects.filter(kind=kind_for(instance), object_id=instance.pk).delete()
+
+
+def reindex_dependents(instance):
+    """Refresh the entries whose text embeds ``instance`` (see DEPENDENTS)."""
+    for kind, fk in DEPENDENTS.get(instance._meta.label, ()):
+        model = global_apps.get_model(SOURCES[kind].model)
+        reindex(kind, model._default_manager.filter(**{fk: instance}))
+
+
+def reindex(kind, queryset, batch_size=500) -> int:
+    """
+    Rewrite the entries of every row in ``queryset`` — delete + bulk insert
+    in batches. Returns the number of rows indexed.
+    """
+    from .models import SearchEntry
+
+    source = SOURCES[kind]
+    queryset = queryset.select_related(*source.select_related).order_by("pk")
+
+    count = 0
+    batch = []
+
+    def flush():
+        SearchEntry.objects.filter(kind=kind, object_id__in=[e.object_id for e in batch]).delete()
+        SearchEntry.objects.bulk_create(batch)
+        batch.clear()
+
+    for obj in queryset.iterator(chunk_size=batch_size):
+        fields = _entry_fields(source, obj)
+        if fields["organization_id"] is None:
+            continue
+        batch.append(SearchEntry(kind=kind, object_id=obj.pk, **fields))
+        count += 1
+        if len(batch) >= batch_size:
+            flush()
+    if batch:
+        flush()
+    return count
+
+
+def rebuild(org=None, kinds=None) -> dict:
+    """Reindex every source (or ``kinds``), optionally for one organization."""
+    from .models import SearchEntry
+
+    counts = {}
+    for kind in kinds or SOURCES:
+        source = SOURCES[kind]
+        model = global_apps.get_model(source.model)
+        qs = model._default_manager.all()
+        stale = SearchEntry.objects.filter(kind=kind)
+        if org is not None:
+            qs = qs.filter(**{source.org_field: org.pk})
+            stale = stale.filter(organization_id=org.pk)
+        stale.delete()
+        counts[kind] = reindex(kind, qs)
+    return counts
+
+
+# ── Querying ──────────────────────────────────────────────────────────────────
+
+def _terms(query):
+    return _WORD.findall(query.lower())[:MAX_TERMS]
+
+
+def _within_sql(column, within):
+    """SQL restricting ``column`` to the primary keys of queryset ``within``."""
+    if within is None:
+        return "", []
+    sql, params = within.order_by().values("pk").query.sql_with_params()
+    return f"AND {column} IN ({sql})", list(params)
+
+
+def _native_postgresql(terms):
+    """(join, (match, params), (rank, params)) over ``core_searchentry e``."""
+    tsquery = " & ".join(f"{t}:*" for t in terms)
+    return (
+        "",
+        ("e.document @@ to_tsquery('simple', %s)", [tsquery]),
+        # float8, so the rank read back into a cursor compares equal in SQL
+        ("-CAST(ts_rank(e.document, to_tsquery('simple', %s)) AS double precision)", [tsquery]),
+    )
+
+
+def _native_sqlite(terms):
+    match = " ".join(f'"{t}"*' for t in terms)
+    return (
+        "JOIN core_searchentry_fts ON core_searchentry_fts.rowid = e.id",
+        ("core_searchentry_fts MATCH %s", [match]),
+        ("bm25(core_searchentry_fts, 10.0, 1.0)", []),
+    )
+
+
+_NATIVE = {
+    "postgresql": _native_postgresql,
+    "sqlite":     _native_sqlite,
+}
+
+
+def _top_sql(native, org_id, kind, limit, within=None):
+    """SELECT of the best ``limit`` matching object ids, best first."""
+    join, (match, match_params), (rank, rank_params) = native
+    restrict, params = _within_sql("e.object_id", within)
+    return (
+        f"""
+        SELECT e.object_id FROM core_searchentry e {join}
+        WHERE {match}
+          AND e.organization_id = %s AND e.kind = %s
+          {restrict}
+        ORDER BY {rank}, e.object_id DESC
+        LIMIT %s
+        """,
+        [*match_params, org_id, kind, *params, *rank_params, limit],
+    )
+
+
+def _rank_sql(native, org_id, kind, model):
+    """Scalar subquery: rank of the outer ``model`` row (lower is better)."""
+    join, (match, match_params), (rank, rank_params) = native
+    qn = connection.ops.quote_name
+    outer = f"{qn(model._meta.db_table)}.{qn(model._meta.pk.column)}"
+    return (
+        f"""
+        (SELECT {rank} FROM core_searchentry e {join}
+         WHERE {match}
+           AND e.organization_id = %s AND e.kind = %s AND e.object_id = {outer})
+        """,
+        [*rank_params, *match_params, org_id, kind],
+    )
+
+
+def _like_entries(org_id, kind, terms, within=None):
+    from .models import SearchEntry
+
+    qs = SearchEntry.objects.filter(organization_id=org_id, kind=kind)
+    if within is not None:
+        qs = qs.filter(object_id__in=within.order_by().values("pk"))
+    for term in terms:
+        qs = qs.filter(Q(title__icontains=term) | Q(body__icontains=term))
+    return qs.order_by("-object_id")
+
+
+def _ids_like(org_id, kind, terms, limit, within=None):
+    return list(_like_entries(org_id, kind, terms, within).values_list("object_id", flat=True)[:limit])
+
+
+def search_ids(org, kind, query, limit=None, within=None) -> list:
+    """
+    Primary keys of ``kind`` rows in ``org`` matching ``query``, best first.
+    ``within`` (a queryset of the source model) is applied inside the index
+    query, so the result limit counts only rows the caller can show.
+
+    When the native index finds nothing — every term is matched as a word
+    prefix, so the middle of a word ("cme" in "acme", "0123" in "EMP-10123")
+    never matches — the terms are retried as substrings (icontains).
+    """
+    terms = _terms(query)
+    if not terms or org is None:
+        return []
+    limit = limit or _limit()
+    ids = []
+    native = _NATIVE.get(connection.vendor)
+    if native is not None:
+        with connection.cursor() as cursor:
+            cursor.execute(*_top_sql(native(terms), org.pk, kind, limit, within))
+            ids = [row[0] for row in cursor.fetchall()]
+    return ids or _ids_like(org.pk, kind, terms, limit, within)
+
+
+def search(queryset, org, kind, query):
+    """
+    ``queryset`` narrowed to the rows matching ``query``, annotated with
+    ``search_rank`` (lower is better) and ordered by it (top
+    SEARCH_RESULT_LIMIT matches among the rows ``queryset`` selects). Empty
+    queries return it unchanged.
+
+    Matching and ranking run inside the page query — an id subquery plus a
+    correlated rank lookup on the entry — so each page costs the same
+    whatever the result limit. Substring fallback rows all rank 0.
+    """
+    terms = _terms(query)
+    if not terms:
+        return queryset
+    if org is None:
+        return queryset.none()
+    native = _NATIVE.get(connection.vendor)
+    if native is not None:
+        parts = native(terms)
+        matched = queryset.filter(pk__in=RawSQL(*_top_sql(parts, org.pk, kind, _limit(), queryset)))
+        if matched.exists():
+            rank = RawSQL(*_rank_sql(parts, org.pk, kind, queryset.model), output_field=FloatField())
+            return matched.annotate(search_rank=rank).order_by(*SEARCH_ORDERING)
+    like = _like_entries(org.pk, kind, terms, queryset).values("object_id")[:_limit()]
+    return (queryset.filter(pk__in=like)
+            .annotate(search_rank=Value(0.0, output_field=FloatField()))
+            .order_by(*SEARCH_ORDERING))
+
+
+# Keyset ordering for search() results (core.utils.pagination); equal ranks
+# newest first, as in the index query.
+SEARCH_ORDERING = ("search_rank", "-id")
+
+
+def is_ranked(queryset) -> bool:
+    """True when ``queryset`` came from search() with a real query."""
+    return "search_rank" in queryset.query.annotations
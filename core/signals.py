@@ -1,6 +1,9 @@
 # core/signals.py
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
+
+from . import entitlements, images, recipients, search
+from .kpi_cache import MODULE_MODELS, invalidate, org_id_for_instance
 from .models import Organization, Subscription, Plan
 
 
@@ -18,3 +21,126 @@ def create_trial_subscription(sender, instance, created, **kwargs):
             organization=instance,
             defaults={"plan": trial_plan},
         )
+
+
+def _login_only(kwargs):
+    # Logins touch last_login only; nothing any cache or index shows.
+    return kwargs.get("update_fields") == frozenset({"last_login"})
+
+
+# ---------------------------------------------------------------------------
+# Dashboard KPI cache invalidation (see core/kpi_cache.py)
+# ---------------------------------------------------------------------------
+
+def _make_kpi_invalidator(module):
+    def _invalidate_kpis(sender, instance, **kwargs):
+        if _login_only(kwargs):
+            return
+        invalidate(org_id_for_instance(instance), module)
+    return _invalidate_kpis
+
+
+# ---------------------------------------------------------------------------
+# Full-text search entries (see core/search.py)
+# ---------------------------------------------------------------------------
+
+def _index_search_entry(sender, instance, **kwargs):
+    if _login_only(kwargs):
+        return
+    indexed = search.kind_for(instance) is not None
+    changed = search.index_instance(instance) if indexed else True
+    if changed:
+        search.reindex_dependents(instance)
+
+
+def _remove_search_entry(sender, instance, **kwargs):
+    search.remove_instance(instance)
+
+
+# ---------------------------------------------------------------------------
+# Photo uploads: clean originals and build variants (see core/images.py)
+# ---------------------------------------------------------------------------
+
+def _prepare_images(sender, instance, **kwargs):
+    pending = {}
+    for name in images.IMAGE_FIELDS[sender._meta.label]:
+        fieldfile = getattr(instance, name)
+        if fieldfile and not fieldfile._committed:
+            variants = images.prepare_upload(fieldfile)
+            if variants:
+                pending[name] = variants
+    instance._pending_image_variants = pending
+
+
+def _write_image_variants(sender, instance, **kwargs):
+    pending = getattr(instance, "_pending_image_variants", None)
+    if not pending:
+        return
+    for name, variants in pending.items():
+        fieldfile = getattr(instance, name)
+        images.write_variants(fieldfile.storage, fieldfile.name, variants)
+    instance._pending_image_variants = {}
+
+
+# ---------------------------------------------------------------------------
+# Cached manager recipient lists (see core/recipients.py)
+# ---------------------------------------------------------------------------
+
+@receiver(post_save, sender="users.CustomUser", dispatch_uid="recipients:users.CustomUser:save")
+@receiver(post_delete, sender="users.CustomUser", dispatch_uid="recipients:users.CustomUser:delete")
+def forget_recipients(sender, instance, **kwargs):
+    if _login_only(kwargs):
+        return
+    recipients.forget_org(instance.organization_id)
+
+
+# ---------------------------------------------------------------------------
+# Cached entitlement snapshots (see core/entitlements.py)
+# ---------------------------------------------------------------------------
+
+@receiver([post_save, post_delete], sender=Organization, dispatch_uid="entitlements:org")
+def forget_org_entitlements(sender, instance, **kwargs):
+    entitlements.forget(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=Subscription, dispatch_uid="entitlements:subscription")
+def forget_subscription_entitlements(sender, instance, **kwargs):
+    entitlements.forget(instance.organization_id)
+
+
+@receiver([post_save, post_delete], sender=Plan, dispatch_uid="entitlements:plan")
+def forget_plan_entitlements(sender, instance, **kwargs):
+    entitlements.forget(*Subscription.objects.filter(
+        plan_id=instance.pk,
+    ).values_list("organization_id", flat=True))
+
+
+# ---------------------------------------------------------------------------
+# Registry-driven receivers — one per model listed in kpi_cache.MODULE_MODELS,
+# search.SOURCES / DEPENDENTS and images.IMAGE_FIELDS. Called from
+# CoreConfig.ready().
+# ---------------------------------------------------------------------------
+
+def connect_receivers():
+    for module, labels in MODULE_MODELS.items():
+        handler = _make_kpi_invalidator(module)
+        for label in labels:
+            post_save.connect(handler, sender=label, weak=False,
+                              dispatch_uid=f"kpi_cache:{label}:save")
+            post_delete.connect(handler, sender=label, weak=False,
+                                dispatch_uid=f"kpi_cache:{label}:delete")
+
+    for source in search.SOURCES.values():
+        post_save.connect(_index_search_entry, sender=source.model,
+                          dispatch_uid=f"search:{source.model}:save")
+        post_delete.connect(_remove_search_entry, sender=source.model,
+                            dispatch_uid=f"search:{source.model}:delete")
+    for label in search.DEPENDENTS:
+        post_save.connect(_index_search_entry, sender=label,
+                          dispatch_uid=f"search:{label}:save")
+
+    for label in images.IMAGE_FIELDS:
+        pre_save.connect(_prepare_images, sender=label,
+                         dispatch_uid=f"images:{label}:prepare")
+        post_save.connect(_write_image_variants, sender=label,
+                          dispatch_uid=f"images:{label}:variants")
@@ -0,0 +1,28 @@
+from django import template
+from django.utils.html import format_html
+
+from core.images import variant_url
+
+register = template.Library()
+
+
+@register.filter
+def variant(fieldfile, size):
+    """URL of a photo variant: {{ obj.photo|variant:"thumb" }} (WebP; "medium.jpg" for JPEG)."""
+    size, _, ext = size.partition(".")
+    return variant_url(fieldfile, size, ext or "webp")
+
+
+@register.filter
+def variant_src(fieldfile, size):
+    """
+    ``src`` attribute for a photo variant that falls back to the original:
+    <img {{ obj.photo|variant_src:"thumb" }} alt="...">
+
+    Photos stored before build_image_variants ran, and uploads Pillow could
+    not read, have no variants; the browser then swaps in the original.
+    """
+    return format_html(
+        'src="{}" data-original="{}" onerror="this.onerror=null;this.src=this.dataset.original"',
+        variant(fieldfile, size), fieldfile.url,
+    )
@@ -3,23 +3,38 @@ Unit tests for the core app.
 Covers: Organization, Plan, Subscription, UserInvite, DemoRequest models;
 OrganizationSignupForm, AcceptInviteForm; OrganizationMiddleware,
 SubscriptionMiddleware; org_required guard; create_trial_subscription signal;
-downgrade_expired_subscriptions management command.
+downgrade_expired_subscriptions management command; tenant index query plans;
+RequestMetricsMiddleware and the staff request-metrics page; dashboard KPI cache;
+transactional email outbox; streaming CSV / XLSX exports; full-text search;
+keyset pagination; photo upload variants; shared PDF rendering core;
+cached manager recipient lists; daily safety digest; alert run ledger,
+checkpoint / resume and metrics; cached entitlement snapshots; app dashboard
+KPI aggregates.
 """
+import shutil
+import tempfile
 from datetime import timedelta
-from io import StringIO
+from io import BytesIO, StringIO
+from urllib.parse import parse_qs
 from unittest.mock import MagicMock
 
 from django.contrib.auth import get_user_model
 from django.core.exceptions import PermissionDenied
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.core.management import call_command
-from django.test import RequestFactory, TestCase
+from django.test import RequestFactory, TestCase, override_settings
 from django.urls import reverse
 from django.utils import timezone
 
 from core.forms import AcceptInviteForm, OrganizationSignupForm
 from core.middleware import OrganizationMiddleware, SubscriptionMiddleware
-from core.models import DemoRequest, Organization, Plan, Subscription, UserInvite
+from core import images, search
+from core.models import (
+    DemoRequest, Organization, OutboundEmail, Plan, SearchEntry, Subscription, UserInvite,
+)
+from core.utils.exports import XlsxExport, iter_csv, person_name, stream_csv
 from core.utils.guards import org_required
+from core.utils.pagination import paginate_keyset
 
 User = get_user_model()
 
@@ -473,3 +488,1326 @@ class DowngradeExpiredSubscriptionsCommandTests(TestCase):
         err = StringIO()
         call_command("downgrade_expired_subscriptions", stderr=err)
         self.assertIn("Free plan not found", err.getvalue())
+
+
+# ---------------------------------------------------------------------------
+# Tenant indexes — EXPLAIN the hot list / dashboard querysets
+# ---------------------------------------------------------------------------
+
+class TenantIndexQueryPlanTests(TestCase):
+    """
+    Each hot queryset must be answered from its composite tenant index rather
+    than a full table scan. Small test tables would tempt the Postgres planner
+    into a seq scan, so it is disabled there for the duration of the check.
+    """
+
+    def setUp(self):
+        from observations.models import Location
+        self.org = create_organization()
+        self.user = User.objects.create_user(
+            email="idx@example.com", password="pass", organization=self.org
+        )
+        self.location = Location.objects.create(organization=self.org, name="Plant")
+        self.today = timezone.now().date()
+
+    def assertUsesIndex(self, qs, *index_names):
+        """Pass if the plan touches any of ``index_names``."""
+        from django.db import connection
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL enable_seqscan = off")
+        plan = qs.explain()
+        self.assertTrue(
+            any(name in plan for name in index_names),
+            msg=f"none of {index_names} used:\n{plan}",
+        )
+
+    def test_observation_list_uses_live_date_index(self):
+        from observations.models import Observation
+        qs = (
+            Observation.objects
+            .filter(is_archived=False, organization=self.org)
+            .order_by("-date_observed")
+        )
+        self.assertUsesIndex(qs, "obs_org_live_date_idx")
+
+    def test_observation_open_count_uses_status_index(self):
+        from observations.models import Observation
+        qs = Observation.objects.filter(
+            organization=self.org,
+            status__in=["OPEN", "IN_PROGRESS"],
+            target_date__lt=self.today,
+        )
+        self.assertUsesIndex(qs, "obs_org_status_target_idx")
+
+    def test_action_list_uses_status_due_index(self):
+        from actions.models import CorrectiveAction
+        qs = CorrectiveAction.objects.filter(organization=self.org, status="open")
+        self.assertUsesIndex(qs, "ca_org_status_due_idx")
+
+    def test_incident_list_uses_date_index(self):
+        from incidents.models import Incident
+        qs = Incident.objects.filter(organization=self.org).order_by("-date_occurred")
+        self.assertUsesIndex(qs, "inc_org_date_idx")
+
+    def test_permit_list_uses_status_created_index(self):
+        from permits.models import Permit
+        qs = Permit.objects.filter(organization=self.org, status="SUBMITTED")
+        self.assertUsesIndex(qs, "permit_org_status_created_idx")
+
+    def test_inspection_overdue_flagging_uses_status_index(self):
+        from inspections.models import Inspection
+        qs = Inspection.objects.filter(
+            organization=self.org,
+            status__in=[Inspection.STATUS_SCHEDULED, Inspection.STATUS_IN_PROGRESS],
+            scheduled_date__lt=self.today,
+        )
+        # Either tenant index is acceptable; SQLite prefers the date range one.
+        self.assertUsesIndex(qs, "insp_org_status_sched_idx", "insp_org_sched_idx")
+
+    def test_compliance_due_soon_uses_status_due_index(self):
+        from compliance.models import ComplianceItem
+        qs = ComplianceItem.objects.filter(
+            organization=self.org,
+            status="pending",
+            due_date__range=[self.today, self.today + timedelta(days=30)],
+        )
+        self.assertUsesIndex(qs, "comp_org_status_due_idx")
+
+    def test_hira_review_due_uses_status_review_index(self):
+        from hira.models import HazardRegister
+        qs = HazardRegister.objects.filter(
+            organization=self.org, status="approved", next_review_date__lte=self.today,
+        )
+        self.assertUsesIndex(qs, "hira_reg_org_status_rev_idx")
+
+    def test_action_list_keyset_order_uses_due_sort_index(self):
+        from actions.models import CorrectiveAction
+        qs = (
+            CorrectiveAction.objects.filter(organization=self.org)
+            .annotate(due_sort=CorrectiveAction.DUE_SORT)
+            .order_by("due_sort", "-id")
+        )
+        self.assertUsesIndex(qs, "ca_org_due_sort_idx")
+
+    def test_training_attempts_use_org_submitted_index(self):
+        from training.models import AssessmentAttempt
+        qs = AssessmentAttempt.objects.filter(organization=self.org).order_by("-submitted_at")
+        self.assertUsesIndex(qs, "attempt_org_submitted_idx")
+
+
+# ---------------------------------------------------------------------------
+# RequestMetricsMiddleware
+# ---------------------------------------------------------------------------
+
+class RequestMetricsMiddlewareTests(TestCase):
+
+    def setUp(self):
+        from core.metrics import registry
+        self.registry = registry
+        self.registry.reset()
+        self.org = create_organization()
+        self.user = User.objects.create_user(
+            email="metrics@example.com", password="pass", organization=self.org
+        )
+        self.client.force_login(self.user)
+
+    def test_sets_server_timing_header(self):
+        response = self.client.get(reverse("core:app_dashboard"))
+        header = response["Server-Timing"]
+        self.assertIn("db;dur=", header)
+        self.assertIn("tpl;dur=", header)
+        self.assertIn("total;dur=", header)
+
+    def test_records_view_name_and_org(self):
+        self.client.get(reverse("core:app_dashboard"))
+        rec = self.registry.recent_records()[0]
+        self.assertEqual(rec.view_name, "core:app_dashboard")
+        self.assertEqual(rec.org_id, self.org.pk)
+        self.assertGreater(rec.queries, 0)
+        self.assertGreater(rec.template_ms, 0)
+        summary = {s["view_name"]: s for s in self.registry.snapshot()}
+        self.assertEqual(summary["core:app_dashboard"]["count"], 1)
+
+    def test_logs_warning_when_budget_exceeded(self):
+        with self.settings(REQUEST_QUERY_BUDGETS={"core:app_dashboard": 1}):
+            with self.assertLogs("core.metrics", level="WARNING") as logs:
+                self.client.get(reverse("core:app_dashboard"))
+        self.assertIn("core:app_dashboard", logs.output[0])
+        self.assertTrue(self.registry.recent_records()[0].over_budget)
+
+    def test_counts_session_and_auth_queries(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(reverse("core:app_dashboard"))
+        rec = self.registry.recent_records()[0]
+        self.assertEqual(rec.queries, len(ctx))
+        self.assertTrue(any("django_session" in q["sql"] for q in ctx.captured_queries))
+
+    def test_disabled_budget_default_never_flags_a_view(self):
+        with self.settings(REQUEST_QUERY_BUDGETS={}, REQUEST_QUERY_BUDGET_DEFAULT=None):
+            with self.assertNoLogs("core.metrics", level="WARNING"):
+                self.client.get(reverse("core:app_dashboard"))
+        self.assertFalse(self.registry.recent_records()[0].over_budget)
+        with self.settings(REQUEST_QUERY_BUDGETS={}, REQUEST_QUERY_BUDGET_DEFAULT=1):
+            with self.assertLogs("core.metrics", level="WARNING"):
+                self.client.get(reverse("core:app_dashboard"))
+
+    def test_static_files_are_served_before_metrics(self):
+        from django.conf import settings
+
+        middleware = settings.MIDDLEWARE
+        self.assertLess(
+            middleware.index("whitenoise.middleware.WhiteNoiseMiddleware"),
+            middleware.index("core.middleware.RequestMetricsMiddleware"),
+        )
+
+    def test_metrics_page_is_staff_only(self):
+        response = self.client.get(reverse("core:request_metrics"))
+        self.assertEqual(response.status_code, 403)
+        self.user.is_staff = True
+        self.user.save()
+        response = self.client.get(reverse("core:request_metrics"))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "core:request_metrics")
+
+
+# ---------------------------------------------------------------------------
+# Dashboard KPI cache
+# ---------------------------------------------------------------------------
+
+class KpiCacheTests(TestCase):
+
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        self.org = create_organization()
+        self.other_org = create_organization(name="Other Org", domain="otherorg")
+        self.user = User.objects.create_user(
+            email="kpi@example.com", password="pass", organization=self.org,
+            role="manager",
+        )
+
+    def _counter(self):
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return {"n": len(calls)}
+        return compute, calls
+
+    def test_second_read_is_served_from_cache(self):
+        from core.kpi_cache import cached_kpis
+        compute, calls = self._counter()
+        cached_kpis(self.org, "test", ("compliance",), compute)
+        cached_kpis(self.org, "test", ("compliance",), compute)
+        self.assertEqual(len(calls), 1)
+
+    def test_scope_and_org_are_part_of_the_key(self):
+        from core.kpi_cache import cached_kpis
+        compute, calls = self._counter()
+        cached_kpis(self.org, "test", ("compliance",), compute, scope="user:1")
+        cached_kpis(self.org, "test", ("compliance",), compute, scope="user:2")
+        cached_kpis(self.other_org, "test", ("compliance",), compute, scope="user:1")
+        self.assertEqual(len(calls), 3)
+
+    def test_model_save_and_delete_invalidate_only_that_org(self):
+        from compliance.models import ComplianceItem
+        from core.kpi_cache import cached_kpis
+        compute, calls = self._counter()
+        read = lambda org: cached_kpis(org, "test", ("compliance",), compute)  # noqa: E731
+
+        read(self.org)
+        read(self.other_org)
+        item = ComplianceItem.objects.create(
+            organization=self.org, title="Fire NOC", due_date=timezone.now().date(),
+        )
+        read(self.org)
+        read(self.other_org)
+        self.assertEqual(len(calls), 3)
+
+        item.delete()
+        read(self.org)
+        self.assertEqual(len(calls), 4)
+
+    def test_entry_cached_before_commit_is_dropped_after_commit(self):
+        from compliance.models import ComplianceItem
+        from core.kpi_cache import cached_kpis
+        compute, calls = self._counter()
+        read = lambda: cached_kpis(self.org, "test", ("compliance",), compute)  # noqa: E731
+
+        read()
+        with self.captureOnCommitCallbacks(execute=True):
+            ComplianceItem.objects.create(
+                organization=self.org, title="Fire NOC", due_date=timezone.now().date(),
+            )
+            read()                      # a concurrent reader caching pre-commit rows
+        self.assertEqual(len(calls), 2)
+        read()
+        self.assertEqual(len(calls), 3)
+
+    def test_unrelated_module_write_keeps_cache(self):
+        from compliance.models import ComplianceItem
+        from core.kpi_cache import cached_kpis
+        compute, calls = self._counter()
+        cached_kpis(self.org, "test", ("permits",), compute)
+        ComplianceItem.objects.create(
+            organization=self.org, title="Fire NOC", due_date=timezone.now().date(),
+        )
+        cached_kpis(self.org, "test", ("permits",), compute)
+        self.assertEqual(len(calls), 1)
+
+    def test_compliance_dashboard_reflects_new_item(self):
+        from compliance.models import ComplianceItem
+        self.client.force_login(self.user)
+        url = reverse("compliance:dashboard")
+        self.assertEqual(self.client.get(url).context["total"], 0)
+        ComplianceItem.objects.create(
+            organization=self.org, title="Fire NOC",
+            due_date=timezone.now().date() + timedelta(days=60),
+        )
+        self.assertEqual(self.client.get(url).context["total"], 1)
+
+    def test_chart_dashboards_cache_data_not_plotly_bundles(self):
+        import pickle
+        from django.core.cache import cache
+        from observations.views import _dashboard_data
+        from training.views import _manager_dashboard_context
+
+        self.assertLess(len(pickle.dumps(_dashboard_data(self.org, "monthly"))), 10_000)
+        self.assertLess(len(pickle.dumps(_manager_dashboard_context(self.org))), 200_000)
+
+        self.client.force_login(self.user)
+        for name in ("observations:dashboard", "training:dashboard"):
+            cache.clear()
+            html = self.client.get(reverse(name)).content.decode()
+            self.assertEqual(html.count("cdn.plot.ly/plotly-"), 1, name)
+            self.assertLess(len(html), 1_000_000, name)
+
+    def test_compliance_auto_overdue_flag_busts_cache(self):
+        from compliance.models import ComplianceItem
+        self.client.force_login(self.user)
+        url = reverse("compliance:dashboard")
+        item = ComplianceItem.objects.create(
+            organization=self.org, title="Fire NOC",
+            due_date=timezone.now().date() + timedelta(days=60),
+        )
+        self.assertEqual(self.client.get(url).context["overdue"], 0)
+        # Simulate the due date passing without firing signals
+        ComplianceItem.objects.filter(pk=item.pk).update(
+            due_date=timezone.now().date() - timedelta(days=1)
+        )
+        self.assertEqual(self.client.get(url).context["overdue"], 1)
+
+
+# ---------------------------------------------------------------------------
+# Email outbox
+# ---------------------------------------------------------------------------
+
+@override_settings(
+    EMAIL_TRANSPORT="core.outbox.LocMemTransport",
+    EMAIL_RATE_LIMIT=0,
+    EMAIL_MAX_ATTEMPTS=2,
+    EMAIL_RETRY_BACKOFF=60,
+)
+class EmailOutboxTests(TestCase):
+
+    def setUp(self):
+        from core.outbox import LocMemTransport, reset_transport
+        reset_transport()
+        LocMemTransport.outbox = []
+        LocMemTransport.fail_for = set()
+        self.stub = LocMemTransport
+
+    def tearDown(self):
+        from core.outbox import reset_transport
+        reset_transport()
+
+    def test_send_brevo_email_queues_instead_of_sending(self):
+        from core.utils.email import send_brevo_email
+        self.assertTrue(send_brevo_email("a@example.com", "Hello", "<p>hi</p>"))
+        msg = OutboundEmail.objects.get()
+        self.assertEqual(msg.status, OutboundEmail.STATUS_PENDING)
+        self.assertEqual(self.stub.outbox, [])
+
+    def test_identical_messages_are_deduplicated(self):
+        from core.outbox import queue_email
+        self.assertTrue(queue_email("a@example.com", "Hello", "<p>hi</p>"))
+        self.assertFalse(queue_email("A@example.com", "Hello", "<p>hi</p>"))
+        self.assertTrue(queue_email("a@example.com", "Hello", "<p>changed</p>"))
+        self.assertEqual(OutboundEmail.objects.count(), 2)
+
+    def test_commit_schedules_one_dispatch_job(self):
+        from core.outbox import queue_email
+        from jobs.models import Job
+        with self.captureOnCommitCallbacks(execute=True):
+            queue_email("a@example.com", "One", "<p>1</p>")
+            queue_email("b@example.com", "Two", "<p>2</p>")
+        self.assertEqual(Job.objects.filter(kind="core.dispatch_outbox").count(), 1)
+
+    def test_new_mail_is_not_held_behind_a_pending_retry(self):
+        from core.outbox import queue_email, schedule_retries
+        from jobs.models import Job
+        self.stub.fail_for = {"bad@example.com"}
+        queue_email("bad@example.com", "Hello", "<p>hi</p>")
+        OutboundEmail.objects.update(next_attempt_at=timezone.now() + timedelta(minutes=8))
+        schedule_retries()
+        retry = Job.objects.get(kind="core.dispatch_outbox")
+        self.assertGreater(retry.run_after, timezone.now() + timedelta(minutes=7))
+
+        before = timezone.now()
+        with self.captureOnCommitCallbacks(execute=True):
+            queue_email("new@example.com", "Invite", "<p>join</p>")
+        job = Job.objects.get(kind="core.dispatch_outbox", status=Job.STATUS_QUEUED)
+        self.assertLessEqual(job.run_after, timezone.now())
+        self.assertGreaterEqual(job.run_after, before)
+
+    def test_failed_message_can_be_queued_again(self):
+        from core.outbox import queue_email
+        queue_email("a@example.com", "Hello", "<p>hi</p>")
+        OutboundEmail.objects.update(status=OutboundEmail.STATUS_FAILED)
+        self.assertTrue(queue_email("a@example.com", "Hello", "<p>hi</p>"))
+        self.assertFalse(queue_email("a@example.com", "Hello", "<p>hi</p>"))
+        self.assertEqual(OutboundEmail.objects.count(), 2)
+
+    def test_dispatch_sends_and_records_status(self):
+        from core.outbox import dispatch_pending, queue_email
+        for i in range(5):
+            queue_email(f"user{i}@example.com", "Hello", "<p>hi</p>")
+        totals = dispatch_pending(batch_size=2)
+        self.assertEqual(totals, {"sent": 5, "retry": 0, "failed": 0})
+        self.assertEqual(len(self.stub.outbox), 5)
+        msg = OutboundEmail.objects.first()
+        self.assertEqual(msg.status, OutboundEmail.STATUS_SENT)
+        self.assertTrue(msg.provider_id.startswith("<locmem-"))
+        self.assertIsNotNone(msg.sent_at)
+
+    def test_failures_back_off_then_fail(self):
+        from core.outbox import dispatch_pending, queue_email
+        self.stub.fail_for = {"bad@example.com"}
+        queue_email("bad@example.com", "Hello", "<p>hi</p>")
+
+        self.assertEqual(dispatch_pending()["retry"], 1)
+        msg = OutboundEmail.objects.get()
+        self.assertEqual(msg.status, OutboundEmail.STATUS_PENDING)
+        self.assertEqual(msg.attempts, 1)
+        self.assertGreater(msg.next_attempt_at, timezone.now() + timedelta(seconds=50))
+        self.assertIn("ConnectionError", msg.last_error)
+
+        # Not due yet — nothing happens until the backoff elapses.
+        self.assertEqual(dispatch_pending(), {"sent": 0, "retry": 0, "failed": 0})
+        OutboundEmail.objects.update(next_attempt_at=timezone.now())
+        self.assertEqual(dispatch_pending()["failed"], 1)
+        self.assertEqual(OutboundEmail.objects.get().status, OutboundEmail.STATUS_FAILED)
+
+    def test_dispatch_job_drains_outbox(self):
+        from core.outbox import queue_email
+        from jobs.queue import work
+        with self.captureOnCommitCallbacks(execute=True):
+            queue_email("a@example.com", "Hello", "<p>hi</p>")
+        work("test-worker", once=True)
+        self.assertEqual(len(self.stub.outbox), 1)
+
+    def test_rate_limiter_throttles(self):
+        import time
+        from core.outbox import RateLimiter
+        limiter = RateLimiter(50)
+        start = time.monotonic()
+        for _ in range(60):
+            limiter.acquire()
+        self.assertGreaterEqual(time.monotonic() - start, 0.15)
+
+
+# ---------------------------------------------------------------------------
+# Streaming CSV exports
+# ---------------------------------------------------------------------------
+
+class StreamingCsvTests(TestCase):
+
+    def test_header_is_sent_before_rows_are_read(self):
+        def rows():
+            raise AssertionError("rows read before the header was sent")
+            yield  # pragma: no cover
+
+        chunks = iter_csv(["A", "B"], rows())
+        self.assertEqual(next(chunks), "A,B\r\n")
+
+    def test_rows_are_flushed_in_batches(self):
+        chunks = list(iter_csv(["N"], ([i] for i in range(5)), flush_rows=2))
+        self.assertEqual(chunks, ["N\r\n", "0\r\n1\r\n", "2\r\n3\r\n", "4\r\n"])
+
+    def test_stream_csv_response(self):
+        response = stream_csv("x.csv", ["Name"], [["a,b"]])
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Disposition"], 'attachment; filename="x.csv"')
+        self.assertEqual(b"".join(response.streaming_content), b'Name\r\n"a,b"\r\n')
+
+    def test_person_name_matches_get_full_name(self):
+        self.assertEqual(person_name("", "a@b.com", "E1", 7), "a@b.com")
+        self.assertEqual(person_name("", "", "", 7), "Worker 7")
+        self.assertEqual(person_name(None, None, None, None), "")
+
+
+class XlsxExportTests(TestCase):
+
+    def _load(self, response):
+        from openpyxl import load_workbook
+        import io
+
+        return load_workbook(io.BytesIO(b"".join(response.streaming_content))).active
+
+    def test_write_only_sheet_with_header_styles_and_freeze(self):
+        xl = XlsxExport("Sheet", widths=[5, 20], row_height=30, freeze_column=2)
+        xl.logo_header(create_organization(), "Export")   # no logo: writes nothing
+        self.assertEqual(xl.header(["ID", "Name"]), 1)
+        xl.append([1, "Alpha"])
+        xl.append([2, "Beta"], styles={1: "xl_note"})
+        response = xl.response("sheet.xlsx")
+
+        self.assertEqual(response["Content-Disposition"], 'attachment; filename="sheet.xlsx"')
+        ws = self._load(response)
+        self.assertEqual([[c.value for c in row] for row in ws.iter_rows()],
+                         [["ID", "Name"], [1, "Alpha"], [2, "Beta"]])
+        self.assertEqual(ws.freeze_panes, "B2")
+        self.assertEqual(ws.column_dimensions["B"].width, 20)
+        self.assertEqual(ws.sheet_format.defaultRowHeight, 30)
+        self.assertEqual((ws["A1"].style, ws["A3"].style, ws["B3"].style),
+                         ("xl_header", "Normal", "xl_note"))
+
+
+# ---------------------------------------------------------------------------
+# Full-text search
+# ---------------------------------------------------------------------------
+
+class FullTextSearchTests(TestCase):
+
+    def setUp(self):
+        from observations.models import Location, Observation
+
+        create_trial_plan()
+        self.org = create_organization("Search Org", "searchorg")
+        self.other = create_organization("Other Org", "otherorg")
+        self.manager = User.objects.create_user(
+            email="boss@searchorg.com", password="pass1234", organization=self.org,
+            role="manager", full_name="Bea Boss",
+        )
+        self.observer = User.objects.create_user(
+            email="olga.observer@searchorg.com", password="pass1234", organization=self.org,
+            full_name="Olga Observer", employee_id="EMP-0042",
+        )
+        self.location = Location.objects.create(organization=self.org, name="Loading Bay")
+        self.scaffold = Observation.objects.create(
+            organization=self.org, location=self.location, observer=self.observer,
+            title="Scaffold missing toe boards", description="Level 3 east side",
+        )
+        self.welding = Observation.objects.create(
+            organization=self.org, location=self.location, observer=self.observer,
+            title="Hot work permit", description="Welding near scaffold sheeting",
+        )
+        other_loc = Location.objects.create(organization=self.other, name="Yard")
+        Observation.objects.create(
+            organization=self.other, location=other_loc, title="Scaffold tag expired",
+            description="-",
+        )
+
+    def ids(self, kind, query, org=None):
+        return search.search_ids(org or self.org, kind, query)
+
+    def test_prefix_terms_all_must_match_and_title_ranks_first(self):
+        self.assertEqual(self.ids("observation", "scaff"), [self.scaffold.pk, self.welding.pk])
+        self.assertEqual(self.ids("observation", "weld scaff"), [self.welding.pk])
+        self.assertEqual(self.ids("observation", "crane"), [])
+        self.assertEqual(self.ids("observation", "  ,; "), [])
+
+    def test_results_are_tenant_scoped(self):
+        self.assertEqual(len(self.ids("observation", "scaffold", org=self.other)), 1)
+        self.assertNotIn(self.scaffold.pk, self.ids("observation", "scaffold", org=self.other))
+
+    def test_save_and_delete_keep_entries_current(self):
+        self.scaffold.title = "Guardrail missing"
+        self.scaffold.save()
+        self.assertEqual(self.ids("observation", "guardrail"), [self.scaffold.pk])
+        self.assertEqual(self.ids("observation", "toe"), [])
+        self.welding.delete()
+        self.assertFalse(SearchEntry.objects.filter(kind="observation", object_id=self.welding.pk).exists())
+
+    def test_location_and_observer_changes_reindex_observations(self):
+        self.location.name = "Dock Four"
+        self.location.save()
+        self.assertEqual(len(self.ids("observation", "dock")), 2)
+        self.observer.full_name = "Olga Inspector"
+        self.observer.save()
+        self.assertEqual(len(self.ids("observation", "inspector")), 2)
+
+    def test_login_does_not_reindex(self):
+        self.observer.last_login = timezone.now()
+        with self.assertNumQueries(1):
+            self.observer.save(update_fields=["last_login"])
+
+    def test_employee_email_and_id_tokens(self):
+        self.assertEqual(self.ids("employee", "olga.observer@searchorg"), [self.observer.pk])
+        self.assertEqual(self.ids("employee", "EMP-0042"), [self.observer.pk])
+
+    def test_infix_fragments_fall_back_to_substring_match(self):
+        self.assertEqual(self.ids("employee", "042"), [self.observer.pk])
+        self.assertEqual(self.ids("employee", "bserver"), [self.observer.pk])
+        self.assertEqual(self.ids("observation", "affold"), [self.welding.pk, self.scaffold.pk])
+        self.assertEqual(self.ids("employee", "zzz"), [])
+
+    def test_result_limit_counts_only_rows_the_caller_selects(self):
+        from observations.models import Observation
+
+        visible = Observation.objects.filter(organization=self.org).exclude(pk=self.scaffold.pk)
+        with self.settings(SEARCH_RESULT_LIMIT=1):
+            found = search.search(visible, self.org, "observation", "scaffold")
+        self.assertEqual([o.pk for o in found], [self.welding.pk])
+
+    def test_search_ranks_inside_the_page_query(self):
+        from observations.models import Observation
+
+        found = search.search(Observation.objects.all(), self.org, "observation", "scaff")
+        self.assertEqual([o.pk for o in found], [self.scaffold.pk, self.welding.pk])
+        self.assertLess(found[0].search_rank, found[1].search_rank)
+        self.assertNotIn("CASE", str(found.query))
+
+        fallback = search.search(Observation.objects.all(), self.org, "observation", "affold")
+        self.assertEqual([o.pk for o in fallback], [self.welding.pk, self.scaffold.pk])
+        self.assertTrue(search.is_ranked(fallback))
+
+    def test_migration_backfill_matches_live_index(self):
+        import importlib
+        from django.apps import apps
+
+        live = sorted(SearchEntry.objects.values_list("kind", "object_id", "title", "body"))
+        SearchEntry.objects.all().delete()
+        importlib.import_module("core.migrations.0011_searchentry").backfill_search_entries(apps, None)
+        self.assertEqual(sorted(SearchEntry.objects.values_list("kind", "object_id", "title", "body")), live)
+
+    def test_like_backend_matches_native(self):
+        terms = search._terms("weld scaff")
+        self.assertEqual(search._ids_like(self.org.pk, "observation", terms, 10), [self.welding.pk])
+
+    def test_rebuild_command_restores_entries(self):
+        SearchEntry.objects.all().delete()
+        out = StringIO()
+        call_command("rebuild_search_index", org=self.org.pk, stdout=out)
+        self.assertIn("observation: 2 indexed", out.getvalue())
+        self.assertEqual(self.ids("observation", "scaffold"), [self.scaffold.pk, self.welding.pk])
+
+    def test_list_views_use_search(self):
+        from incidents.models import Incident
+
+        Incident.objects.create(organization=self.org, title="Forklift collision", description="Bay 2")
+        self.client.force_login(self.manager)
+
+        response = self.client.get(reverse("observations:observation_list"), {"q": "weld"})
+        self.assertEqual([o.pk for o in response.context["observations"]], [self.welding.pk])
+
+        response = self.client.get(reverse("incidents:list"), {"q": "forkl"})
+        self.assertEqual([i.title for i in response.context["incidents"]], ["Forklift collision"])
+
+        response = self.client.get(reverse("core:employee_directory"), {"q": "olga"})
+        self.assertEqual(list(response.context["employees"]), [self.observer])
+
+
+class KeysetPaginationTests(TestCase):
+
+    def setUp(self):
+        from observations.models import Location, Observation
+
+        create_trial_plan()
+        self.org = create_organization("Pager Org", "pagerorg")
+        location = Location.objects.create(organization=self.org, name="Yard")
+        self.manager = User.objects.create_user(
+            email="boss@pagerorg.com", password="pass1234", organization=self.org, role="manager",
+        )
+        # 25 rows sharing three timestamps — the id tie-breaker decides order.
+        base = timezone.now().replace(microsecond=123456)
+        self.rows = [
+            Observation.objects.create(
+                organization=self.org, location=location, title=f"Obs {i}", description="-",
+                date_observed=base - timedelta(days=i % 3),
+            )
+            for i in range(25)
+        ]
+        self.expected = sorted(self.rows, key=lambda o: (o.date_observed, o.pk), reverse=True)
+        self.factory = RequestFactory()
+
+    def page(self, query="", per_page=10):
+        from observations.models import Observation
+
+        request = self.factory.get("/", parse_qs(query))
+        qs = Observation.objects.filter(organization=self.org)
+        return paginate_keyset(request, qs, ("-date_observed", "-id"), per_page=per_page)
+
+    def test_forward_and_backward_walk(self):
+        first = self.page()
+        second = self.page(first.next_query)
+        third = self.page(second.next_query)
+        self.assertEqual(list(first) + list(second) + list(third), self.expected)
+        self.assertFalse(first.has_previous)
+        self.assertFalse(third.has_next)
+
+        back = self.page(third.previous_query)
+        self.assertEqual(list(back), list(second))
+        self.assertEqual(list(self.page(back.previous_query)), list(first))
+
+    def test_short_backward_page_restarts_at_first_page(self):
+        second = self.page(self.page(per_page=10).next_query, per_page=10)
+        # Step back with a larger page size: fewer rows remain than fit.
+        back = self.page(second.previous_query, per_page=15)
+        self.assertEqual(list(back), self.expected[:15])
+        self.assertFalse(back.has_previous)
+
+    def test_other_params_are_kept_and_bad_tokens_restart(self):
+        first = self.page("status=open")
+        self.assertEqual(parse_qs(first.next_query)["status"], ["open"])
+        tampered = self.page("cursor=" + parse_qs(first.next_query)["cursor"][0][:-2] + "xx")
+        self.assertEqual(list(tampered), self.expected[:10])
+
+    def test_later_pages_cost_the_same_queries(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        self.client.force_login(self.manager)
+        url = reverse("observations:observation_list")
+        self.client.get(url)                                 # warm the per-org caches
+        with CaptureQueriesContext(connection) as first:
+            response = self.client.get(url)
+        with self.assertNumQueries(len(first.captured_queries)):
+            self.client.get(url + "?" + response.context["page_obj"].next_query)
+
+    def test_search_results_page_in_rank_order(self):
+        self.client.force_login(self.manager)
+        url = reverse("observations:observation_list")
+        response = self.client.get(url, {"q": "obs"})
+        first = list(response.context["observations"])
+        response = self.client.get(url + "?" + response.context["page_obj"].next_query)
+        self.assertEqual(len(first + list(response.context["observations"])), 20)
+        self.assertEqual(response.request["QUERY_STRING"].count("q=obs"), 1)
+
+    def test_action_list_sorts_undated_last(self):
+        from actions.models import CorrectiveAction
+
+        undated = CorrectiveAction.objects.create(organization=self.org, title="No date")
+        soon = CorrectiveAction.objects.create(
+            organization=self.org, title="Soon", due_date=timezone.localdate(),
+        )
+        self.client.force_login(self.manager)
+        response = self.client.get(reverse("actions:list"))
+        self.assertEqual(list(response.context["page_obj"]), [soon, undated])
+
+
+_MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def _camera_jpeg(width=2000, height=1000, orientation=6):
+    """A JPEG shaped like a phone photo: EXIF-rotated, with a camera tag."""
+    from PIL import Image
+
+    exif = Image.Exif()
+    exif[0x0112] = orientation          # Orientation
+    exif[0x0110] = "Field Phone 12"     # Model
+    buf = BytesIO()
+    Image.new("RGB", (width, height), "orange").save(buf, "JPEG", exif=exif.tobytes())
+    return buf.getvalue()
+
+
+@override_settings(MEDIA_ROOT=_MEDIA_ROOT)
+class ImageVariantTests(TestCase):
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(_MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        from observations.models import Location
+
+        create_trial_plan()
+        self.org = create_organization("Photo Org", "photoorg")
+        self.location = Location.objects.create(organization=self.org, name="Gate")
+
+    def observation(self, data, name="IMG_0001.jpg"):
+        from observations.models import Observation
+
+        return Observation.objects.create(
+            organization=self.org, location=self.location, title="Photo", description="-",
+            photo_before=SimpleUploadedFile(name, data, content_type="image/jpeg"),
+        )
+
+    def open_stored(self, name):
+        from django.core.files.storage import default_storage
+        from PIL import Image
+
+        with default_storage.open(name, "rb") as f:
+            return Image.open(BytesIO(f.read()))
+
+    def test_upload_strips_exif_and_writes_variants(self):
+        obs = self.observation(_camera_jpeg())
+        original = self.open_stored(obs.photo_before.name)
+        self.assertEqual(original.size, (1000, 2000))
+        self.assertFalse(original.getexif())
+
+        for size, edge in images.SIZES.items():
+            for ext, (fmt, _) in images.FORMATS.items():
+                variant = self.open_stored(images.variant_name(obs.photo_before.name, size, ext))
+                self.assertEqual(variant.format, fmt)
+                self.assertEqual(variant.size, (edge // 2, edge))
+
+    def test_clean_originals_are_stored_unchanged(self):
+        from PIL import Image
+
+        buf = BytesIO()
+        Image.new("RGB", (200, 100), "blue").save(buf, "PNG")
+        obs = self.observation(buf.getvalue(), name="diagram.png")
+        with obs.photo_before.open("rb") as f:
+            self.assertEqual(f.read(), buf.getvalue())
+        # Smaller than both variant sizes: never upscaled.
+        thumb = self.open_stored(images.variant_name(obs.photo_before.name, "thumb"))
+        self.assertEqual(thumb.size, (200, 100))
+
+    def test_variant_filter_and_pdf_bytes(self):
+        from django.template import Context, Template
+
+        obs = self.observation(_camera_jpeg())
+        html = Template("{% load media_tags %}{{ p|variant:'thumb' }} {{ p|variant:'medium.jpg' }}").render(
+            Context({"p": obs.photo_before})
+        )
+        stem = obs.photo_before.url.rsplit(".", 1)[0]
+        self.assertEqual(html, f"{stem}.thumb.webp {stem}.medium.jpg")
+        self.assertTrue(images.variant_bytes(obs.photo_before).startswith(b"\xff\xd8"))
+
+    def test_unreadable_upload_is_kept_and_falls_back_to_the_original(self):
+        from django.core.files.storage import default_storage
+        from django.template import Context, Template
+
+        obs = self.observation(b"not really a jpeg", name="scan.jpg")
+        with obs.photo_before.open("rb") as f:
+            self.assertEqual(f.read(), b"not really a jpeg")
+        self.assertFalse(default_storage.exists(images.variant_name(obs.photo_before.name, "thumb")))
+
+        html = Template("{% load media_tags %}<img {{ p|variant_src:'thumb' }}>").render(
+            Context({"p": obs.photo_before})
+        )
+        stem = obs.photo_before.url.rsplit(".", 1)[0]
+        self.assertIn(f'src="{stem}.thumb.webp"', html)
+        self.assertIn(f'data-original="{obs.photo_before.url}"', html)
+        self.assertIn("this.src=this.dataset.original", html)
+
+    def test_backfill_command_builds_missing_variants(self):
+        from django.core.files.storage import default_storage
+        from observations.models import Observation
+
+        obs = self.observation(_camera_jpeg())
+        default_storage.delete(images.variant_name(obs.photo_before.name, "thumb"))
+        # A pre-pipeline upload: EXIF still on the stored original.
+        name = default_storage.save("observations/before/legacy.jpg", BytesIO(_camera_jpeg()))
+        Observation.objects.filter(pk=obs.pk).update(photo_after=name)
+
+        out = StringIO()
+        call_command("build_image_variants", model=["observations.Observation"], stdout=out)
+        self.assertIn("2 built", out.getvalue())
+        self.assertTrue(default_storage.exists(images.variant_name(name, "medium", "jpg")))
+        self.assertFalse(self.open_stored(name).getexif())
+
+        out = StringIO()
+        call_command("build_image_variants", model=["observations.Observation"], stdout=out)
+        self.assertIn("0 built, 2 skipped", out.getvalue())
+
+
+class PdfCoreTests(TestCase):
+    def test_text_style_is_cached_by_attributes(self):
+        from reportlab.lib import colors
+        from core.pdf import sample_style, text_style
+
+        a = text_style(fontSize=7, textColor=colors.HexColor("#dc2626"), parent=sample_style())
+        b = text_style(parent=sample_style(), textColor=colors.HexColor("#DC2626"), fontSize=7)
+        self.assertIs(a, b)
+        self.assertIsNot(a, text_style(fontSize=8, textColor=colors.HexColor("#dc2626")))
+        self.assertEqual(a.fontSize, 7)
+
+    def test_data_table_chunks_and_rebases_row_styles(self):
+        from reportlab.platypus import LongTable
+        from core.pdf import data_table
+
+        rows = [["#", "Item"]] + [[str(i), f"row {i}"] for i in range(1, 6)]
+        style = [
+            ("BACKGROUND", (0, 0), (-1, 0), "navy"),
+            ("GRID", (0, 0), (-1, -1), 0.3, "grey"),
+            ("BACKGROUND", (1, 4), (1, 4), "red"),          # data row 4
+        ]
+        tables = data_table(rows, [20, 100], style, chunk_rows=2)
+
+        self.assertEqual(len(tables), 3)
+        self.assertTrue(all(isinstance(t, LongTable) for t in tables))
+        self.assertEqual([t._cellvalues[0] for t in tables], [rows[0]] * 3)
+        self.assertEqual(tables[2]._cellvalues[1:], [rows[5]])
+        red = [c for t in tables for c in t._bkgrndcmds if c[3] == "red"]
+        self.assertEqual(len(red), 1)
+        self.assertIn(red[0], tables[1]._bkgrndcmds)          # rows 3-4 -> chunk 2, row 2
+        self.assertEqual(red[0][1:3], ((1, 2), (1, 2)))
+
+    def test_long_table_builds_across_pages(self):
+        from reportlab.lib.pagesizes import A4
+        from reportlab.platypus import SimpleDocTemplate
+        from core.pdf import data_table
+
+        rows = [["#", "Item"]] + [[str(i), f"row {i}"] for i in range(450)]
+        buf = BytesIO()
+        doc = SimpleDocTemplate(buf, pagesize=A4)
+        doc.build(data_table(rows, [40, 300], [("GRID", (0, 0), (-1, -1), 0.3, "grey")]))
+        self.assertTrue(buf.getvalue().startswith(b"%PDF"))
+        self.assertGreater(doc.page, 5)
+
+
+@override_settings(RECIPIENTS_CACHE=True)
+class RecipientTests(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+
+        cache.clear()
+        self.org = create_organization()
+        self.manager = User.objects.create_user(email="m@testorg.com", password="x", organization=self.org, role="manager")
+        self.safety = User.objects.create_user(email="s@testorg.com", password="x", organization=self.org, role="safety_manager")
+        self.owner = User.objects.create_user(email="o@testorg.com", password="x", organization=self.org, role="action_owner")
+        User.objects.create_user(email="gone@testorg.com", password="x", organization=self.org, role="manager", is_active=False)
+        other = create_organization("Other", "other")
+        User.objects.create_user(email="m@other.com", password="x", organization=other, role="manager")
+
+    def test_recipients_cached_per_org(self):
+        from core.recipients import recipients
+
+        with self.assertNumQueries(1):
+            self.assertEqual(recipients(org=self.org), ["m@testorg.com", "s@testorg.com"])
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                recipients(self.owner, None, self.manager, "extra@x.com", org=self.org),
+                ["o@testorg.com", "m@testorg.com", "extra@x.com", "s@testorg.com"],
+            )
+
+    def test_role_and_active_changes_drop_the_list(self):
+        from core.recipients import manager_emails
+
+        manager_emails(self.org)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.owner.role = "safety_manager"
+            self.owner.save()
+        self.assertIn("o@testorg.com", manager_emails(self.org))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.manager.is_active = False
+            self.manager.save()
+        self.assertNotIn("m@testorg.com", manager_emails(self.org))
+
+        # Logins do not touch the cached list.
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.safety.save(update_fields=["last_login"])
+        self.assertEqual(callbacks, [])
+
+    @override_settings(RECIPIENTS_CACHE=None)
+    def test_locmem_backend_memoises_per_batch_only(self):
+        from core.recipients import batch, manager_emails
+
+        # Other workers would never see this process's deletes: no shared entry.
+        with self.assertNumQueries(2):
+            manager_emails(self.org)
+            manager_emails(self.org)
+        with batch(), self.assertNumQueries(1):
+            manager_emails(self.org)
+            self.assertEqual(manager_emails(self.org.pk), ["m@testorg.com", "s@testorg.com"])
+
+
+class DailyDigestTests(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        from actions.models import CorrectiveAction
+        from compliance.models import ComplianceItem
+        from inspections.models import Inspection, InspectionTemplate
+        from observations.models import Location, Observation
+
+        cache.clear()
+        self.org = create_organization()
+        self.manager = User.objects.create_user(
+            email="boss@testorg.com", password="x", organization=self.org, role="manager", full_name="Boss",
+        )
+        self.owner = User.objects.create_user(
+            email="owner@testorg.com", password="x", organization=self.org, role="action_owner", full_name="Olu",
+        )
+        today = timezone.now().date()
+        for days in (-3, -1, 7, 20):                       # 20: not a threshold day
+            CorrectiveAction.objects.create(
+                organization=self.org, title=f"Fix guard {days}", assigned_to=self.owner,
+                due_date=today + timedelta(days=days),
+            )
+        location = Location.objects.create(organization=self.org, name="Yard")
+        Observation.objects.create(
+            organization=self.org, location=location, title="Trip hazard <b>", description="-",
+            assigned_to=self.owner, target_date=today - timedelta(days=2),
+        )
+        self.compliance = ComplianceItem.objects.create(
+            organization=self.org, title="Boiler certificate", due_date=today - timedelta(days=1),
+            assigned_to=self.owner,
+        )
+        template = InspectionTemplate.objects.create(organization=self.org, title="Walk", created_by=self.manager)
+        self.inspection = Inspection.objects.create(
+            organization=self.org, template=template, title="Weekly walk", inspector=self.owner,
+            scheduled_date=today - timedelta(days=1), created_by=self.manager,
+        )
+
+    def test_one_digest_per_recipient(self):
+        from core import digest
+
+        digests = {d.email: d for d in digest.build_digests(timezone.now().date())}
+        self.assertEqual(set(digests), {"owner@testorg.com", "boss@testorg.com"})
+        owner = digests["owner@testorg.com"]
+        self.assertEqual([i.module for i in owner.items],
+                         ["actions"] * 3 + ["observations", "inspections", "compliance"])
+        self.assertEqual((owner.count(digest.STATUS_OVERDUE), owner.count(digest.STATUS_DUE)), (5, 1))
+        self.assertEqual([i.module for i in digests["boss@testorg.com"].items], ["actions"] * 3 + ["inspections"])
+
+        html = digest.render_digest(owner)
+        self.assertIn("Hi Olu,", html)
+        self.assertIn("Trip hazard &lt;b&gt;", html)
+        self.assertEqual(digest.digest_subject(owner), "Your Vigilo safety digest — 5 overdue, 1 due soon")
+
+    def test_collection_queries_do_not_grow_with_items(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from actions.models import CorrectiveAction
+        from core import digest
+
+        today = timezone.now().date()
+        digest.build_digests(today)                          # warm the recipient cache
+        with CaptureQueriesContext(connection) as before:
+            digest.build_digests(today)
+        CorrectiveAction.objects.bulk_create(
+            CorrectiveAction(organization=self.org, title=f"More {i}", assigned_to=self.owner,
+                             due_date=today - timedelta(days=1))
+            for i in range(25)
+        )
+        with CaptureQueriesContext(connection) as after:
+            digest.build_digests(today)
+        self.assertEqual(len(after), len(before))
+
+    def test_command_flags_overdue_and_queues_one_email_each(self):
+        out = StringIO()
+        call_command("send_daily_digest", stdout=out)
+        self.assertEqual(
+            sorted(OutboundEmail.objects.values_list("to_email", flat=True)),
+            ["boss@testorg.com", "owner@testorg.com"],
+        )
+        self.assertIn("2 digest(s) queued in place of 10 individual alert(s)", out.getvalue())
+        self.compliance.refresh_from_db()
+        self.inspection.refresh_from_db()
+        self.assertEqual(self.compliance.status, "overdue")
+        self.assertEqual(self.inspection.status, "overdue")
+
+        # A re-run the same day collapses in the outbox.
+        call_command("send_daily_digest", stdout=StringIO())
+        self.assertEqual(OutboundEmail.objects.count(), 2)
+
+    def test_dry_run_changes_nothing(self):
+        out = StringIO()
+        call_command("send_daily_digest", "--dry-run", "--module", "actions", stdout=out)
+        self.assertIn("[DRY RUN] owner@testorg.com: 3 item(s)", out.getvalue())
+        self.assertFalse(OutboundEmail.objects.exists())
+        self.compliance.refresh_from_db()
+        self.assertEqual(self.compliance.status, "pending")
+
+
+# ── Alert runs ────────────────────────────────────────────────────────────────
+
+class AlertRunTests(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        from actions.models import CorrectiveAction
+
+        cache.clear()
+        self.org = create_organization()
+        self.manager = User.objects.create_user(
+            email="boss@testorg.com", password="x", organization=self.org, role="manager",
+        )
+        self.owner = User.objects.create_user(
+            email="owner@testorg.com", password="x", organization=self.org, role="action_owner",
+        )
+        today = timezone.now().date()
+        self.actions = [
+            CorrectiveAction.objects.create(
+                organization=self.org, title=f"Fix guard {i}", assigned_to=self.owner,
+                due_date=today - timedelta(days=i + 1),
+            )
+            for i in range(5)
+        ]
+
+    def test_rerun_skips_alerts_in_the_ledger(self):
+        from core.models import AlertRun, SentNotification
+
+        call_command("send_action_alerts", stdout=StringIO())
+        self.assertEqual(SentNotification.objects.count(), 10)     # owner + manager per action
+        queued = OutboundEmail.objects.count()
+
+        out = StringIO()
+        call_command("send_action_alerts", stdout=out)
+        self.assertEqual(SentNotification.objects.count(), 10)
+        self.assertEqual(OutboundEmail.objects.count(), queued)
+        first, second = AlertRun.objects.filter(command="send_action_alerts").order_by("pk")
+        self.assertEqual((first.scanned, first.sent, first.skipped), (5, 10, 0))
+        self.assertEqual((second.scanned, second.sent, second.skipped), (5, 0, 10))
+        self.assertEqual(second.status, AlertRun.STATUS_COMPLETED)
+        self.assertIn("scanned 5, sent 0, skipped 10, failed 0", out.getvalue())
+
+    def test_crashed_run_resumes_from_checkpoint(self):
+        from actions.models import CorrectiveAction
+        from core.alert_runs import AlertRunner
+        from core.models import AlertRun
+
+        qs = CorrectiveAction.objects.filter(organization=self.org)
+        seen = []
+        with self.assertRaises(RuntimeError):
+            with AlertRunner("test_alerts", checkpoint_every=2) as run:
+                for action in run.iterate("actions", qs):
+                    if len(seen) == 3:
+                        raise RuntimeError("provider down")
+                    seen.append(action.pk)
+                    run.notify("actions.due", action, "owner@testorg.com", "s", "<p>x</p>")
+
+        crashed = AlertRun.objects.get(command="test_alerts")
+        self.assertEqual(crashed.status, AlertRun.STATUS_FAILED)
+        self.assertEqual(crashed.checkpoint, {"actions": seen[-1]})
+        self.assertEqual(crashed.last_error, "RuntimeError: provider down")
+
+        with AlertRunner("test_alerts", checkpoint_every=2) as run:
+            resumed = []
+            for action in run.iterate("actions", qs):
+                resumed.append(action.pk)
+                run.notify("actions.due", action, "owner@testorg.com", "s", "<p>x</p>")
+        self.assertTrue(run.resumed)
+        self.assertEqual(resumed, [a.pk for a in self.actions[3:]])
+
+        crashed.refresh_from_db()
+        self.assertEqual((crashed.pk, crashed.status, crashed.attempts), (run.run.pk, AlertRun.STATUS_COMPLETED, 2))
+        self.assertEqual((crashed.scanned, crashed.sent, crashed.skipped), (6, 5, 0))
+        self.assertGreater(crashed.duration, 0)
+
+    def test_resumed_run_retries_sends_that_failed_before_the_crash(self):
+        from unittest import mock
+        from actions.models import CorrectiveAction
+        from core.alert_runs import AlertRunner
+        from core.models import AlertRun, SentNotification
+        from core.utils.email import send_brevo_email as real_send
+
+        qs = CorrectiveAction.objects.filter(organization=self.org)
+        failing = self.actions[2]
+
+        def flaky_send(recipient, subject, html):
+            return subject != f"s{failing.pk}" and real_send(recipient, subject, html)
+
+        with self.assertRaises(RuntimeError), self.assertLogs("core.alert_runs", "ERROR"), \
+                mock.patch("core.utils.email.send_brevo_email", side_effect=flaky_send):
+            with AlertRunner("test_alerts", checkpoint_every=1) as run:
+                for action in run.iterate("actions", qs):
+                    if action == self.actions[4]:
+                        raise RuntimeError("provider down")
+                    run.notify("actions.due", action, "owner@testorg.com", f"s{action.pk}", "<p>x</p>")
+
+        crashed = AlertRun.objects.get(command="test_alerts")
+        self.assertEqual(crashed.failed, 1)
+        # Held at the last object before the failed send, not at the crash.
+        self.assertEqual(crashed.checkpoint, {"actions": self.actions[1].pk})
+
+        with AlertRunner("test_alerts", checkpoint_every=1) as run:
+            resumed = []
+            for action in run.iterate("actions", qs):
+                resumed.append(action.pk)
+                run.notify("actions.due", action, "owner@testorg.com", f"s{action.pk}", "<p>x</p>")
+        self.assertEqual(resumed, [a.pk for a in self.actions[2:]])
+        self.assertEqual((run.run.sent, run.run.skipped), (5, 1))
+        self.assertTrue(SentNotification.objects.filter(object_ref=f"actions.correctiveaction:{failing.pk}").exists())
+
+    def test_unqueued_alert_counts_as_failed_without_ledger_row(self):
+        from unittest import mock
+        from core.alert_runs import FAILED, AlertRunner
+        from core.models import SentNotification
+
+        with mock.patch("core.utils.email.send_brevo_email", return_value=False), \
+                self.assertLogs("core.alert_runs", "ERROR"):
+            with AlertRunner("test_alerts") as run:
+                result = run.notify("actions.due", self.actions[0], "owner@testorg.com", "s", "<p>x</p>")
+        self.assertEqual(result, FAILED)
+        self.assertEqual(run.run.failed, 1)
+        self.assertFalse(SentNotification.objects.exists())
+
+        # The next run retries it.
+        with AlertRunner("test_alerts") as run:
+            run.notify("actions.due", self.actions[0], "owner@testorg.com", "s", "<p>x</p>")
+        self.assertEqual(run.run.sent, 1)
+
+
+# ── Entitlement snapshots ─────────────────────────────────────────────────────
+
+@override_settings(ENTITLEMENTS_CACHE=True)
+class EntitlementTests(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+
+        cache.clear()
+        self.factory = RequestFactory()
+        self.org = create_organization()
+        self.user = User.objects.create_user(
+            email="u@example.com", password="pass", organization=self.org, role="manager",
+        )
+
+    def _request(self, path="/some/view/"):
+        request = self.factory.get(path)
+        request.user = User.objects.select_related("organization").get(pk=self.user.pk)
+        request.organization = request.user.organization
+        return request
+
+    def _render(self, request):
+        from core.context_processors import organization_context, trial_status
+
+        response = SubscriptionMiddleware(MagicMock(return_value="response"))(request)
+        return response, {**organization_context(request), **trial_status(request)}
+
+    def test_warm_request_runs_no_subscription_queries(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        sub = Subscription.objects.get(organization=self.org)
+        sub.expires_at = timezone.now() + timedelta(days=5, hours=1)
+        sub.save()
+        self._render(self._request())                      # warm the snapshot
+
+        request = self._request()
+        with CaptureQueriesContext(connection) as ctx:
+            response, context = self._render(request)
+        self.assertEqual(len(ctx), 0)
+        self.assertEqual(response, "response")
+        self.assertEqual(context["trial_days_left"], 5)
+        self.assertEqual(context["entitlements"].plan, "Trial")
+        self.assertTrue(context["entitlements"].is_trial)
+
+    def test_saves_drop_the_snapshot(self):
+        from core import entitlements
+
+        self.assertIsNone(entitlements.for_org(self.org).max_users)
+
+        plan = Plan.objects.get(name="Trial")
+        plan.max_users = 5
+        plan.save()
+        self.assertEqual(entitlements.for_org(self.org).max_users, 5)
+
+        self.org.name = "Renamed"
+        self.org.save()
+        self.assertEqual(entitlements.for_org(self.org.pk).org_name, "Renamed")
+
+        sub = Subscription.objects.get(organization=self.org)
+        sub.expires_at = timezone.now() - timedelta(days=1)
+        sub.save()
+        response, context = self._render(self._request())
+        self.assertEqual(response.status_code, 302)
+        self.assertIn("billing", response["Location"])
+        self.assertEqual(context["trial_days_left"], 0)
+
+        sub.delete()
+        ent = entitlements.for_org(self.org)
+        self.assertFalse(ent.has_subscription)
+        self.assertEqual(self._render(self._request())[1].get("trial_days_left", "absent"), "absent")
+
+    @override_settings(ENTITLEMENTS_CACHE=None)
+    def test_locmem_backend_keeps_snapshots_per_request_only(self):
+        from core import entitlements
+
+        sub = Subscription.objects.get(organization=self.org)
+        sub.expires_at = timezone.now() - timedelta(days=1)
+        sub.save()
+        request = self._request()
+        self.assertTrue(entitlements.for_request(request).is_expired())
+        with self.assertNumQueries(0):
+            entitlements.for_request(request)
+
+        # Renewed through another worker, whose delete this process never sees.
+        Subscription.objects.filter(pk=sub.pk).update(expires_at=timezone.now() + timedelta(days=30))
+        response, _ = self._render(self._request())
+        self.assertEqual(response, "response")
+
+
+# ── App dashboard ─────────────────────────────────────────────────────────────
+
+class AppDashboardTests(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+        from actions.models import CorrectiveAction
+        from compliance.models import ComplianceItem
+        from hira.models import Hazard, HazardRegister
+
+        cache.clear()
+        self.org = create_organization()
+        self.user = User.objects.create_user(
+            email="boss@testorg.com", password="x", organization=self.org, role="manager",
+        )
+        self.today = timezone.now().date()
+        for days, status in ((-2, "open"), (-1, "closed"), (3, "pending_verification")):
+            CorrectiveAction.objects.create(
+                organization=self.org, title=f"Fix {days}", status=status,
+                assigned_to=self.user, due_date=self.today + timedelta(days=days),
+            )
+        for status in ("complied", "complied", "overdue", "pending"):
+            ComplianceItem.objects.create(
+                organization=self.org, title=f"Duty {status}", status=status,
+                due_date=self.today + timedelta(days=10),
+            )
+        register = HazardRegister.objects.create(
+            organization=self.org, title="Workshop", activity="Grinding", assessment_date=self.today,
+            assessed_by=self.user, status="approved", next_review_date=self.today,
+        )
+        HazardRegister.objects.create(
+            organization=self.org, title="Empty", activity="-", assessment_date=self.today,
+        )
+        Hazard.objects.bulk_create(
+            Hazard(register=register, order=i, hazard_description=f"H{i}", potential_harm="-",
+                   effective_risk_level=level, action_required=True,
+                   action_owner=self.user if i == 0 else None)
+            for i, level in enumerate(("critical", "high", "high", "low"))
+        )
+
+    def _kpis(self):
+        from core.views import _app_dashboard_kpis
+        return _app_dashboard_kpis(self.org, self.user, True, self.today)
+
+    def test_one_query_per_module(self):
+        from core.views import APP_DASHBOARD_MODULES
+
+        with self.assertNumQueries(len(APP_DASHBOARD_MODULES)):
+            kpis = self._kpis()
+        self.assertEqual(
+            {k: kpis[k] for k in ("ca_open", "ca_overdue", "ca_mine", "ca_pending_verification")},
+            {"ca_open": 2, "ca_overdue": 1, "ca_mine": 2, "ca_pending_verification": 1},
+        )
+        self.assertEqual((kpis["comp_score"], kpis["comp_overdue"], kpis["comp_due_soon"]), (50, 1, 1))
+        self.assertEqual(
+            {k: kpis[k] for k in ("hira_total", "hira_review_due", "hira_critical", "hira_high", "hira_actions_mine")},
+            {"hira_total": 2, "hira_review_due": 1, "hira_critical": 1, "hira_high": 2, "hira_actions_mine": 1},
+        )
+
+    def test_page_is_cached_per_user_until_a_write(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from actions.models import CorrectiveAction
+
+        self.client.force_login(self.user)
+        url = reverse("core:app_dashboard")
+        with CaptureQueriesContext(connection) as cold:
+            self.assertEqual(self.client.get(url).context["ca_open"], 2)
+        with CaptureQueriesContext(connection) as warm:
+            self.client.get(url)
+        self.assertFalse(any("actions_correctiveaction" in q["sql"] and "COUNT" in q["sql"]
+                             for q in warm.captured_queries))
+        self.assertLess(len(warm), len(cold))
+
+        CorrectiveAction.objects.create(organization=self.org, title="New", assigned_to=self.user)
+        response = self.client.get(url)
+        self.assertEqual((response.context["ca_open"], response.context["ca_mine"]), (3, 3))
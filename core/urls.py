@@ -23,4 +23,5 @@ urlpatterns = [
     path("manage-team/", views.manage_team_view, name="manage_team"),
     path("employees/", views.employee_directory_view, name="employee_directory"),
     path("employees/<int:user_id>/toggle-active/", views.toggle_employee_active_view, name="toggle_employee_active"),
+    path("ops/request-metrics/", views.request_metrics_view, name="request_metrics"),
 ]
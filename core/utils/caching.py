@@ -0,0 +1,17 @@
+# core/utils/caching.py
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+
+
+def shared_cache_enabled(setting_name) -> bool:
+    """
+    Whether a cache that relies on invalidation (a delete, a version bump
+    in the cache) is on. ``setting_name`` set to True / False wins; None
+    means on unless the default backend is per-process locmem, whose deletes
+    other workers never see.
+    """
+    setting = getattr(settings, setting_name, None)
+    if setting is not None:
+        return bool(setting)
+    return not isinstance(caches["default"], LocMemCache)
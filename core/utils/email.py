@@ -13,42 +13,21 @@ logger = logging.getLogger(__name__)
 
 def send_brevo_email(to_email: str, subject: str, html_content: str) -> bool:
     """
-    Send a transactional email via Brevo.
-    Returns True on success, False on failure (never raises).
+    Queue a transactional email for delivery via Brevo.
+
+    The message is written to the outbox (core.outbox) as part of the
+    current transaction and sent by a background worker, so callers never
+    wait on the Brevo API. Identical messages within EMAIL_DEDUPE_WINDOW are
+    collapsed. Returns True once queued, False on failure (never raises).
     """
+    if not to_email:
+        return False
     try:
-        import sib_api_v3_sdk
-        from sib_api_v3_sdk.rest import ApiException
-
-        configuration = sib_api_v3_sdk.Configuration()
-        configuration.api_key["api-key"] = settings.BREVO_API_KEY
-
-        api = sib_api_v3_sdk.TransactionalEmailsApi(
-            sib_api_v3_sdk.ApiClient(configuration)
-        )
-
-        from_raw = settings.DEFAULT_FROM_EMAIL
-        if "<" in from_raw:
-            from_name, from_addr = from_raw.split("<", 1)
-            from_addr = from_addr.rstrip(">").strip()
-            from_name = from_name.strip()
-        else:
-            from_addr = from_raw.strip()
-            from_name = "SafetySuite"
-
-        message = sib_api_v3_sdk.SendSmtpEmail(
-            to=[{"email": to_email}],
-            subject=subject,
-            html_content=html_content,
-            sender={"name": from_name, "email": from_addr},
-        )
-
-        api.send_transac_email(message)
-        logger.info("Email sent to %s -- %s", to_email, subject)
+        from core.outbox import queue_email
+        queue_email(to_email, subject, html_content)
         return True
-
     except Exception as exc:
-        logger.error("Brevo email failed to %s: %s", to_email, exc)
+        logger.error("Could not queue email to %s: %s", to_email, exc)
         return False
 
 
@@ -139,12 +118,17 @@ def send_high_risk_alert(observation) -> bool:
 def send_overdue_alert(observation) -> bool:
     """
     Notify the assigned user that their observation is overdue.
-
-    Called from the send_overdue_alerts management command (daily cron).
     """
     if not observation.assigned_to:
         return False
+    return send_brevo_email(*overdue_alert_email(observation))
 
+
+def overdue_alert_email(observation):
+    """
+    (to_email, subject, html) of the overdue alert for an assigned
+    observation. Queued by the send_overdue_alerts management command.
+    """
     to_email = observation.assigned_to.email
     name     = observation.assigned_to.get_full_name()
     base     = _site_url()
@@ -218,7 +202,7 @@ def send_overdue_alert(observation) -> bool:
     </div>
     """
 
-    return send_brevo_email(to_email, subject, html)
+    return to_email, subject, html
 
 
 # ---------------------------------------------------------------------------
@@ -4,11 +4,14 @@ from django.contrib.auth import login
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.core.exceptions import PermissionDenied
+from django.db.models import Count, Q
 from django.urls import reverse
 from django.template.loader import render_to_string
 from django.utils import timezone
 
+from . import entitlements
 from .models import Organization, Plan, Subscription, UserInvite, ContractorInvite
+from .search import search
 from .forms import (
     OrganizationSignupForm,
     InviteUserForm, AcceptInviteForm,
@@ -40,9 +43,129 @@ def help_view(request):
     return render(request, "help.html", {})
 
 
+APP_DASHBOARD_MODULES = (
+    "observations", "permits", "hira", "compliance", "training",
+    "actions", "incidents", "inspections", "appraisals",
+)
+
+
+def _app_dashboard_kpis(org, user, is_manager, today):
+    """
+    Every count shown on the app dashboard (cached per org + user).
+    One conditional-aggregate query per module.
+    """
+    kpis = {}
+    open_statuses = ["OPEN", "IN_PROGRESS"]
+
+    # ── Observations ──────────────────────────────────────────────────────────
+    from observations.models import Observation
+    kpis.update(Observation.objects.filter(organization=org).aggregate(
+        obs_open=Count("id", filter=Q(status__in=open_statuses)),
+        obs_overdue=Count("id", filter=Q(status__in=open_statuses, target_date__lt=today)),
+        obs_awaiting=Count("id", filter=Q(status="AWAITING_VERIFICATION")),
+        obs_mine=Count("id", filter=Q(status__in=open_statuses, assigned_to=user)),
+    ))
+
+    # ── Permits ───────────────────────────────────────────────────────────────
+    from permits.models import Permit
+    kpis.update(Permit.objects.filter(organization=org).aggregate(
+        permit_active=Count("id", filter=Q(status__in=["APPROVED", "ACTIVE"])),
+        permit_submitted=Count("id", filter=Q(status="SUBMITTED")),
+        permit_mine=Count("id", filter=Q(
+            requestor=user, status__in=["DRAFT", "SUBMITTED", "APPROVED", "ACTIVE"],
+        )),
+    ))
+
+    # ── HIRA ──────────────────────────────────────────────────────────────────
+    # Registers LEFT JOIN hazards: register counts are distinct, hazard
+    # counts are per joined row.
+    from hira.models import HazardRegister
+    kpis.update(HazardRegister.objects.filter(organization=org).aggregate(
+        hira_total=Count("id", distinct=True),
+        hira_review_due=Count("id", distinct=True, filter=Q(
+            status="approved", next_review_date__lte=today,
+        )),
+        hira_critical=Count("hazards", filter=Q(hazards__effective_risk_level="critical")),
+        hira_high=Count("hazards", filter=Q(hazards__effective_risk_level="high")),
+        hira_actions_mine=Count("hazards", filter=Q(
+            hazards__action_required=True, hazards__action_owner=user,
+        )),
+    ))
+
+    # ── Compliance ────────────────────────────────────────────────────────────
+    from compliance.models import ComplianceItem
+    comp = ComplianceItem.objects.filter(organization=org).aggregate(
+        total=Count("id"),
+        complied=Count("id", filter=Q(status="complied")),
+        comp_overdue=Count("id", filter=Q(status="overdue")),
+        comp_due_soon=Count("id", filter=Q(
+            status="pending", due_date__range=[today, today + timezone.timedelta(days=30)],
+        )),
+    )
+    total_comp, complied = comp.pop("total"), comp.pop("complied")
+    kpis.update(comp)
+    kpis["comp_score"] = round(complied / total_comp * 100) if total_comp else 0
+
+    # ── Training ──────────────────────────────────────────────────────────────
+    from training.models import TrainingModule
+    kpis["training_modules"] = TrainingModule.objects.filter(organization=org).count()
+
+    # ── Corrective Actions ────────────────────────────────────────────────────
+    from actions.models import CorrectiveAction
+    kpis.update(CorrectiveAction.objects.filter(organization=org).exclude(
+        status=CorrectiveAction.STATUS_CLOSED,
+    ).aggregate(
+        ca_open=Count("id"),
+        ca_overdue=Count("id", filter=Q(due_date__lt=today)),
+        ca_mine=Count("id", filter=Q(assigned_to=user)),
+        ca_pending_verification=Count("id", filter=Q(
+            status=CorrectiveAction.STATUS_PENDING_VERIFICATION,
+        )),
+    ))
+
+    from incidents.models import Incident
+    kpis.update(Incident.objects.filter(organization=org).aggregate(
+        inc_open=Count("id", filter=~Q(status=Incident.STATUS_CLOSED)),
+        inc_investigating=Count("id", filter=Q(status=Incident.STATUS_INVESTIGATING)),
+    ))
+
+    from inspections.models import Inspection
+    kpis.update(Inspection.objects.filter(organization=org).aggregate(
+        insp_scheduled=Count("id", filter=Q(status=Inspection.STATUS_SCHEDULED)),
+        insp_overdue=Count("id", filter=Q(status=Inspection.STATUS_OVERDUE)),
+    ))
+
+    # ── Appraisals ────────────────────────────────────────────────────────────
+    try:
+        from appraisals.models import AppraisalCycle, AppraisalRecord
+        appr = AppraisalCycle.objects.filter(organization=org).aggregate(
+            appr_active_cycles=Count("id", distinct=True, filter=Q(status__in=[
+                AppraisalCycle.STATUS_GOAL_SETTING,
+                AppraisalCycle.STATUS_SELF_ASSESSMENT,
+                AppraisalCycle.STATUS_MANAGER_REVIEW,
+                AppraisalCycle.STATUS_CALIBRATION,
+            ])),
+            appr_reviews_pending=Count("records", filter=Q(
+                records__status=AppraisalRecord.STATUS_PENDING_REVIEW, records__reviewer=user,
+            )),
+            appr_pending_ack=Count("records", filter=Q(
+                records__status=AppraisalRecord.STATUS_MANAGER_REVIEWED, records__employee=user,
+            )),
+        )
+        if not is_manager:
+            appr["appr_reviews_pending"] = 0
+        kpis.update(appr)
+    except Exception:
+        pass
+
+    return kpis
+
+
 @login_required
 def app_dashboard_view(request):
     """Post-login landing page — live KPIs + module quick-actions."""
+    from core.kpi_cache import cached_kpis, invalidate
+
     user = request.user
     org  = getattr(request, "organization", None)
     today = timezone.now().date()
@@ -53,130 +176,59 @@ def app_dashboard_view(request):
 
     is_manager = user.is_manager or user.is_safety_manager
 
-    # ── Observations ──────────────────────────────────────────────────────────
+    # Auto-flag overdue inspections (bulk update fires no signals)
+    from inspections.models import Inspection
+    insp_qs = Inspection.objects.filter(organization=org)
+    flagged = insp_qs.filter(
+        scheduled_date__lt=today,
+        status__in=[Inspection.STATUS_SCHEDULED, Inspection.STATUS_IN_PROGRESS],
+    ).update(status=Inspection.STATUS_OVERDUE)
+    if flagged:
+        invalidate(org, "inspections")
+
+    ctx.update(cached_kpis(
+        org, "app_dashboard", APP_DASHBOARD_MODULES,
+        lambda: _app_dashboard_kpis(org, user, is_manager, today),
+        scope=f"user:{user.pk}",
+    ))
+
+    # Short "my items" lists stay live — each is a single indexed LIMIT query.
     from observations.models import Observation
-    obs_qs = Observation.objects.filter(organization=org)
-    ctx["obs_open"]       = obs_qs.filter(status__in=["OPEN", "IN_PROGRESS"]).count()
-    ctx["obs_overdue"]    = obs_qs.filter(
-        status__in=["OPEN", "IN_PROGRESS"],
-        target_date__lt=today,
-    ).count()
-    ctx["obs_awaiting"]   = obs_qs.filter(status="AWAITING_VERIFICATION").count()
-    ctx["obs_mine"]       = obs_qs.filter(
-        assigned_to=user,
-        status__in=["OPEN", "IN_PROGRESS"],
-    ).count()
-    ctx["obs_recent"]     = obs_qs.filter(
+    ctx["obs_recent"] = Observation.objects.filter(
+        organization=org,
         assigned_to=user,
         status__in=["OPEN", "IN_PROGRESS"],
     ).select_related("location").order_by("-date_observed")[:3]
 
-    # ── Permits ───────────────────────────────────────────────────────────────
     from permits.models import Permit
-    permit_qs = Permit.objects.filter(organization=org)
-    ctx["permit_active"]    = permit_qs.filter(status__in=["APPROVED", "ACTIVE"]).count()
-    ctx["permit_submitted"] = permit_qs.filter(status="SUBMITTED").count()
-    ctx["permit_mine"]      = permit_qs.filter(
-        requestor=user,
-        status__in=["DRAFT", "SUBMITTED", "APPROVED", "ACTIVE"],
-    ).count()
-    ctx["permit_recent"]    = permit_qs.filter(
+    ctx["permit_recent"] = Permit.objects.filter(
+        organization=org,
         requestor=user,
         status__in=["DRAFT", "SUBMITTED", "APPROVED", "ACTIVE"],
     ).order_by("-id")[:3]
 
-    # ── HIRA ──────────────────────────────────────────────────────────────────
-    from hira.models import HazardRegister, Hazard
-    hira_qs = HazardRegister.objects.filter(organization=org)
-    all_hazards = Hazard.objects.filter(register__organization=org)
-    ctx["hira_total"]    = hira_qs.count()
-    ctx["hira_critical"] = sum(1 for h in all_hazards if h.effective_risk_level == "critical")
-    ctx["hira_high"]     = sum(1 for h in all_hazards if h.effective_risk_level == "high")
-    ctx["hira_actions_mine"] = all_hazards.filter(
-        action_required=True, action_owner=user
-    ).count()
-    ctx["hira_review_due"] = hira_qs.filter(
-        status="approved",
-        next_review_date__lte=today,
-    ).count()
-
-    # ── Compliance ────────────────────────────────────────────────────────────
-    from compliance.models import ComplianceItem
-    comp_qs = ComplianceItem.objects.filter(organization=org)
-    ctx["comp_overdue"]  = comp_qs.filter(status="overdue").count()
-    ctx["comp_due_soon"] = comp_qs.filter(
-        status="pending",
-        due_date__range=[today, today + timezone.timedelta(days=30)],
-    ).count()
-    ctx["comp_score"]    = 0
-    total_comp = comp_qs.count()
-    if total_comp:
-        ctx["comp_score"] = round(comp_qs.filter(status="complied").count() / total_comp * 100)
-
-    # ── Training ──────────────────────────────────────────────────────────────
-    from training.models import TrainingModule, AssessmentAttempt
-    ctx["training_modules"] = TrainingModule.objects.filter(organization=org).count()
-    ctx["my_attempts"]      = AssessmentAttempt.objects.filter(
+    from training.models import AssessmentAttempt
+    ctx["my_attempts"] = AssessmentAttempt.objects.filter(
         user=user
     ).select_related("assessment__training_module").order_by("-submitted_at")[:3]
 
-    # ── Corrective Actions ────────────────────────────────────────────────────
     from actions.models import CorrectiveAction
-    ca_qs = CorrectiveAction.objects.filter(organization=org)
-    ctx["ca_open"]     = ca_qs.exclude(status=CorrectiveAction.STATUS_CLOSED).count()
-    ctx["ca_overdue"]  = sum(1 for a in ca_qs.exclude(status=CorrectiveAction.STATUS_CLOSED) if a.is_overdue)
-    ctx["ca_mine"]     = ca_qs.filter(
-        assigned_to=user,
-    ).exclude(status=CorrectiveAction.STATUS_CLOSED).count()
-    ctx["ca_pending_verification"] = ca_qs.filter(
-        status=CorrectiveAction.STATUS_PENDING_VERIFICATION
-    ).count()
-    ctx["ca_mine_list"] = ca_qs.filter(
+    ctx["ca_mine_list"] = CorrectiveAction.objects.filter(
+        organization=org,
         assigned_to=user,
     ).exclude(status=CorrectiveAction.STATUS_CLOSED).order_by("due_date")[:5]
 
     from incidents.models import Incident
-    inc_qs = Incident.objects.filter(organization=org)
-    ctx["inc_open"]          = inc_qs.exclude(status=Incident.STATUS_CLOSED).count()
-    ctx["inc_investigating"]  = inc_qs.filter(status=Incident.STATUS_INVESTIGATING).count()
-    ctx["inc_recent"]        = inc_qs.exclude(status=Incident.STATUS_CLOSED).order_by("-date_occurred")[:5]
+    ctx["inc_recent"] = Incident.objects.filter(
+        organization=org,
+    ).exclude(status=Incident.STATUS_CLOSED).order_by("-date_occurred")[:5]
 
-    from inspections.models import Inspection
-    insp_qs = Inspection.objects.filter(organization=org)
-    today   = __import__("datetime").date.today()
-    # Auto-flag overdue
-    insp_qs.filter(
-        scheduled_date__lt=today,
-        status__in=[Inspection.STATUS_SCHEDULED, Inspection.STATUS_IN_PROGRESS],
-    ).update(status=Inspection.STATUS_OVERDUE)
-    ctx["insp_scheduled"] = insp_qs.filter(status=Inspection.STATUS_SCHEDULED).count()
-    ctx["insp_overdue"]   = insp_qs.filter(status=Inspection.STATUS_OVERDUE).count()
-    ctx["insp_upcoming"]  = insp_qs.filter(
+    ctx["insp_upcoming"] = insp_qs.filter(
         status=Inspection.STATUS_SCHEDULED
     ).order_by("scheduled_date")[:4]
 
-    # ── Appraisals ────────────────────────────────────────────────────────────
     try:
-        from appraisals.models import AppraisalCycle, AppraisalRecord
-        appr_cycle_qs = AppraisalCycle.objects.filter(organization=org)
-        ctx["appr_active_cycles"] = appr_cycle_qs.filter(
-            status__in=[
-                AppraisalCycle.STATUS_GOAL_SETTING,
-                AppraisalCycle.STATUS_SELF_ASSESSMENT,
-                AppraisalCycle.STATUS_MANAGER_REVIEW,
-                AppraisalCycle.STATUS_CALIBRATION,
-            ]
-        ).count()
-        ctx["appr_reviews_pending"] = AppraisalRecord.objects.filter(
-            cycle__organization=org,
-            status=AppraisalRecord.STATUS_PENDING_REVIEW,
-            reviewer=user,
-        ).count() if is_manager else 0
-        ctx["appr_pending_ack"] = AppraisalRecord.objects.filter(
-            cycle__organization=org,
-            status=AppraisalRecord.STATUS_MANAGER_REVIEWED,
-            employee=user,
-        ).count()
+        from appraisals.models import AppraisalRecord
         ctx["my_appraisal"] = (
             AppraisalRecord.objects
             .filter(employee=user)
@@ -311,10 +363,10 @@ def invite_user(request):
         return redirect("home")
 
     # Check subscription user limit
-    subscription = getattr(org, "subscription", None)
-    if subscription and subscription.plan.max_users is not None:
+    ent = entitlements.for_request(request)
+    if ent and ent.max_users is not None:
         current_count = CustomUser.objects.filter(organization=org).count()
-        if current_count >= subscription.plan.max_users:
+        if current_count >= ent.max_users:
             messages.error(
                 request,
                 "User limit reached for your current plan. Upgrade to invite more members.",
@@ -706,23 +758,21 @@ def employee_directory_view(request):
 
     show_inactive = request.GET.get("inactive") == "1"
     role_filter   = request.GET.get("role", "")
-    search        = request.GET.get("q", "").strip()
+    q             = request.GET.get("q", "").strip()
 
     qs = CustomUser.objects.filter(organization=org)
     if not show_inactive:
         qs = qs.filter(is_active=True)
     if role_filter:
         qs = qs.filter(role=role_filter)
-    if search:
-        qs = qs.filter(full_name__icontains=search) | qs.filter(email__icontains=search) | qs.filter(employee_id__icontains=search)
-
     qs = qs.select_related("reports_to").order_by("full_name", "employee_id")
+    qs = search(qs, org, "employee", q)   # name / email / employee id, ranked
 
     return render(request, "core/employee_directory.html", {
         "employees":     qs,
         "role_choices":  CustomUser.ROLE_CHOICES,
         "role_filter":   role_filter,
-        "search":        search,
+        "search":        q,
         "show_inactive": show_inactive,
         "total_active":  CustomUser.objects.filter(organization=org, is_active=True).count(),
         "total_inactive": CustomUser.objects.filter(organization=org, is_active=False).count(),
@@ -747,3 +797,25 @@ def toggle_employee_active_view(request, user_id):
         messages.success(request, f"{employee.get_full_name()} has been {state}.")
 
     return redirect("core:employee_directory")
+
+
+# ---------------------------------------------------------------------------
+# Request metrics (staff only)
+# ---------------------------------------------------------------------------
+
+@login_required
+def request_metrics_view(request):
+    """Staff: rolling per-view query / latency aggregate for this worker process."""
+    if not request.user.is_staff:
+        raise PermissionDenied
+    from core.metrics import registry
+
+    if request.method == "POST" and request.POST.get("reset"):
+        registry.reset()
+        messages.success(request, "Request metrics reset.")
+        return redirect("core:request_metrics")
+
+    return render(request, "core/request_metrics.html", {
+        "views":  registry.snapshot(),
+        "recent": registry.recent_records()[:50],
+    })
@@ -0,0 +1,24 @@
+#!/bin/sh
+# docker-entrypoint.sh — container roles, mirroring the Procfile:
+#
+#   web      gunicorn only
+#   worker   background job workers only (manage.py run_workers)
+#   all      both in one container (default), for single-container deploys
+#
+# Anything else is executed as given, e.g. `docker run <image> python manage.py migrate`.
+set -e
+
+web() {
+    exec gunicorn safety_inspection.wsgi:application \
+        --bind 0.0.0.0:8000 \
+        --workers 3 \
+        --timeout 120
+}
+
+case "${1:-all}" in
+    web)    web ;;
+    worker) exec python manage.py run_workers ;;
+    all)    python manage.py run_workers &
+            web ;;
+    *)      exec "$@" ;;
+esac
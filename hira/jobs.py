@@ -0,0 +1,29 @@
+"""hira/jobs.py — background job handlers (see jobs/registry.py)."""
+from datetime import date
+
+from jobs.registry import JobResult, register
+
+from .models import HazardRegister
+from .pdf_report import generate_hira_pdf
+from .views import build_excel
+
+
+@register("hira.export_excel")
+def export_excel(job):
+    return JobResult(
+        filename=f"HIRA-export-{date.today()}.xlsx",
+        file=build_excel(job.organization).save(),
+    )
+
+
+@register("hira.register_pdf")
+def register_pdf(job):
+    hazard_register = (
+        HazardRegister.objects
+        .prefetch_related("hazards__action_owner")
+        .get(pk=job.params["pk"], organization=job.organization)
+    )
+    return JobResult(
+        filename=f"HIRA-{hazard_register.pk:04d}-Rev{hazard_register.revision_no}.pdf",
+        content=generate_hira_pdf(hazard_register),
+    )
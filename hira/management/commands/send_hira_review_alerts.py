@@ -12,34 +12,21 @@ from django.utils import timezone
 from django.conf import settings
 
 from hira.models import HazardRegister
-from core.utils.email import send_brevo_email
+from core.recipients import recipients as resolve_recipients
+from core.alert_runs import SENT, AlertRunner
 
 
 def _site_url():
     return getattr(settings, "SITE_URL", "http://127.0.0.1:8000").rstrip("/")
 
 
-def _send_review_alert(register, days_left):
-    """Send review alert email to assessed_by + org managers."""
-    from django.contrib.auth import get_user_model
-    User = get_user_model()
-
-    recipients = []
-    if register.assessed_by and register.assessed_by.email:
-        recipients.append(register.assessed_by.email)
-
+def _send_review_alert(run, register, days_left):
+    """Queue the review alert to assessed_by + org managers; returns how many were sent."""
     # CC all active managers / safety managers in same org
-    manager_emails = [
-        u.email for u in User.objects.filter(
-            organization=register.organization, is_active=True,
-        ) if (u.is_manager or u.is_safety_manager) and u.email
-    ]
-    for e in manager_emails:
-        if e not in recipients:
-            recipients.append(e)
+    recipients = resolve_recipients(register.assessed_by, org=register.organization)
 
     if not recipients:
-        return
+        return 0
 
     base = _site_url()
     detail_url = f"{base}/hira/registers/{register.pk}/"
@@ -115,24 +102,17 @@ def _send_review_alert(register, days_left):
     </div>
     """
 
-    for email in recipients:
-        try:
-            send_brevo_email(
-                to_email=email,
-                subject=subject,
-                html_content=html_body,
-            )
-        except Exception:
-            pass
+    return sum(
+        run.notify("hira.review_due", register, email, subject, html_body) == SENT
+        for email in recipients
+    )
 
 
 class Command(BaseCommand):
     help = "Send HIRA review due / overdue alerts to assessed-by users and managers."
 
     def handle(self, *args, **options):
-        today    = timezone.now().date()
-        sent     = 0
-        skipped  = 0
+        today = timezone.now().date()
 
         # Only alert on approved registers with a next_review_date
         registers = (
@@ -145,25 +125,17 @@ class Command(BaseCommand):
         )
 
         ALERT_DAYS = {30, 7}   # days-before thresholds
-        for register in registers:
-            days_left = (register.next_review_date - today).days
-
-            should_alert = (days_left in ALERT_DAYS) or (days_left < 0)
-            if should_alert:
-                try:
-                    _send_review_alert(register, days_left)
-                    sent += 1
+        with AlertRunner("send_hira_review_alerts", today) as run:
+            for register in run.iterate("registers", registers):
+                days_left = (register.next_review_date - today).days
+
+                should_alert = (days_left in ALERT_DAYS) or (days_left < 0)
+                if should_alert:
+                    sent = _send_review_alert(run, register, days_left)
                     self.stdout.write(
                         self.style.SUCCESS(
-                            f"  Sent alert for register #{register.pk} — {days_left} days"
+                            f"  Register #{register.pk} — {days_left} days: {sent} email(s) sent"
                         )
                     )
-                except Exception as exc:
-                    skipped += 1
-                    self.stdout.write(
-                        self.style.WARNING(f"  Error on #{register.pk}: {exc}")
-                    )
 
-        self.stdout.write(
-            self.style.SUCCESS(f"Done. {sent} alert(s) sent, {skipped} skipped.")
-        )
+        self.stdout.write(self.style.SUCCESS(f"Done. HIRA review alerts: {run.summary()}."))
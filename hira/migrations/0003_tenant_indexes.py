@@ -0,0 +1,34 @@
+# Generated by Django 5.1 on 2026-10-17 02:02
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('compliance', '0002_tenant_indexes'),
+        ('core', '0009_add_safety_manager_to_invitation_role'),
+        ('hira', '0002_phase2'),
+        ('observations', '0003_alter_location_options'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='hazard',
+            index=models.Index(fields=['register', 'order'], name='hazard_register_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='hazard',
+            index=models.Index(condition=models.Q(('action_required', True)), fields=['action_owner'], name='hazard_open_action_owner_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='hazardregister',
+            index=models.Index(fields=['organization', 'status', 'next_review_date'], name='hira_reg_org_status_rev_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='hazardregister',
+            index=models.Index(fields=['organization', '-assessment_date'], name='hira_reg_org_assessed_idx'),
+        ),
+    ]
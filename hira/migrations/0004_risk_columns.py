@@ -0,0 +1,90 @@
+# Generated by Django 5.1 on 2026-10-17 02:28
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Case, F, IntegerField, Q, Value, When
+
+
+def _level(score_field):
+    """SQL CASE mirroring hira.models.compute_risk_level()."""
+    return Case(
+        When(**{f"{score_field}__isnull": True}, then=Value(None)),
+        When(**{f"{score_field}__lte": 4}, then=Value("low")),
+        When(**{f"{score_field}__lte": 9}, then=Value("medium")),
+        When(**{f"{score_field}__lte": 16}, then=Value("high")),
+        default=Value("critical"),
+    )
+
+
+def backfill_risk_columns(apps, schema_editor):
+    """Set-based backfill: three UPDATEs, however many hazards exist."""
+    Hazard = apps.get_model("hira", "Hazard")
+    assessed = Q(residual_likelihood__gt=0, residual_severity__gt=0)
+    Hazard.objects.update(
+        initial_risk_score=F("initial_likelihood") * F("initial_severity"),
+        residual_risk_score=Case(
+            When(assessed, then=F("residual_likelihood") * F("residual_severity")),
+            default=Value(None), output_field=IntegerField(),
+        ),
+    )
+    Hazard.objects.update(
+        initial_risk_level=_level("initial_risk_score"),
+        residual_risk_level=_level("residual_risk_score"),
+        effective_risk_score=Case(
+            When(residual_risk_score__isnull=False, then=F("residual_risk_score")),
+            default=F("initial_risk_score"),
+        ),
+    )
+    Hazard.objects.update(effective_risk_level=_level("effective_risk_score"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('compliance', '0002_tenant_indexes'),
+        ('hira', '0003_tenant_indexes'),
+        ('observations', '0004_tenant_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='hazard',
+            name='effective_risk_level',
+            field=models.CharField(choices=[('low', 'Low'), ('medium', 'Medium'), ('high', 'High'), ('critical', 'Critical')], default='medium', editable=False, max_length=10),
+        ),
+        migrations.AddField(
+            model_name='hazard',
+            name='effective_risk_score',
+            field=models.PositiveSmallIntegerField(default=9, editable=False),
+        ),
+        migrations.AddField(
+            model_name='hazard',
+            name='initial_risk_level',
+            field=models.CharField(choices=[('low', 'Low'), ('medium', 'Medium'), ('high', 'High'), ('critical', 'Critical')], default='medium', editable=False, max_length=10),
+        ),
+        migrations.AddField(
+            model_name='hazard',
+            name='initial_risk_score',
+            field=models.PositiveSmallIntegerField(default=9, editable=False),
+        ),
+        migrations.AddField(
+            model_name='hazard',
+            name='residual_risk_level',
+            field=models.CharField(blank=True, choices=[('low', 'Low'), ('medium', 'Medium'), ('high', 'High'), ('critical', 'Critical')], editable=False, max_length=10, null=True),
+        ),
+        migrations.AddField(
+            model_name='hazard',
+            name='residual_risk_score',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_risk_columns, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='hazard',
+            index=models.Index(fields=['register', 'effective_risk_level'], name='hazard_register_risk_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='hazard',
+            index=models.Index(fields=['register', 'effective_risk_score'], name='hazard_register_score_idx'),
+        ),
+    ]
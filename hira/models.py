@@ -34,6 +34,13 @@ def compute_risk_level(score):
     return "critical"
 
 
+RISK_LEVEL_CHOICES = [
+    ("low",      "Low"),
+    ("medium",   "Medium"),
+    ("high",     "High"),
+    ("critical", "Critical"),
+]
+
 RISK_LEVEL_LABELS = {
     "low":      "Low",
     "medium":   "Medium",
@@ -88,21 +95,36 @@ class HazardRegister(models.Model):
 
     class Meta:
         ordering = ["-assessment_date", "-created_at"]
+        indexes = [
+            # Dashboard counts, review-due checks and send_hira_review_alerts
+            models.Index(
+                fields=["organization", "status", "next_review_date"],
+                name="hira_reg_org_status_rev_idx",
+            ),
+            models.Index(
+                fields=["organization", "-assessment_date"],
+                name="hira_reg_org_assessed_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.title} (Rev {self.revision_no})"
 
     @property
     def highest_risk_level(self):
-        """Highest effective risk level across all hazards in this register."""
-        hazards = list(self.hazards.all())
-        if not hazards:
-            return None
-        priority = ["critical", "high", "medium", "low"]
-        for level in priority:
-            if any(h.effective_risk_level == level for h in hazards):
-                return level
-        return None
+        """
+        Highest effective risk level across all hazards in this register.
+        Uses a ``max_risk_score`` annotation
+        (``Max("hazards__effective_risk_score")``) or prefetched hazards
+        when present, otherwise one MAX() query.
+        """
+        if hasattr(self, "max_risk_score"):
+            return compute_risk_level(self.max_risk_score)
+        if "hazards" in getattr(self, "_prefetched_objects_cache", {}):
+            scores = [h.effective_risk_score for h in self.hazards.all()]
+            return compute_risk_level(max(scores)) if scores else None
+        top = self.hazards.aggregate(top=models.Max("effective_risk_score"))["top"]
+        return compute_risk_level(top)
 
     @property
     def is_review_due(self):
@@ -176,6 +198,15 @@ class Hazard(models.Model):
     )
     action_due_date       = models.DateField(null=True, blank=True)
 
+    # ── Stored risk — derived from the ratings above by save() ─────────────
+    # Persisted so dashboards can count by level with one GROUP BY.
+    initial_risk_score    = models.PositiveSmallIntegerField(default=9, editable=False)
+    initial_risk_level    = models.CharField(max_length=10, choices=RISK_LEVEL_CHOICES, default="medium", editable=False)
+    residual_risk_score   = models.PositiveSmallIntegerField(null=True, blank=True, editable=False)
+    residual_risk_level   = models.CharField(max_length=10, choices=RISK_LEVEL_CHOICES, null=True, blank=True, editable=False)
+    effective_risk_score  = models.PositiveSmallIntegerField(default=9, editable=False)
+    effective_risk_level  = models.CharField(max_length=10, choices=RISK_LEVEL_CHOICES, default="medium", editable=False)
+
     # ── Phase 2: cross-module linkage ─────────────────────────────────────
     linked_observations   = models.ManyToManyField(
         "observations.Observation",
@@ -191,31 +222,49 @@ class Hazard(models.Model):
 
     class Meta:
         ordering = ["order", "id"]
+        indexes = [
+            models.Index(fields=["register", "order"], name="hazard_register_order_idx"),
+            # "HIRA actions assigned to me"
+            models.Index(
+                fields=["action_owner"],
+                condition=models.Q(action_required=True),
+                name="hazard_open_action_owner_idx",
+            ),
+            # Risk-level counts per register / org, highest risk per register
+            models.Index(fields=["register", "effective_risk_level"], name="hazard_register_risk_idx"),
+            models.Index(fields=["register", "effective_risk_score"], name="hazard_register_score_idx"),
+        ]
 
     def __str__(self):
         return f"{self.get_category_display()}: {self.hazard_description[:60]}"
 
     # ── Risk computations ──────────────────────────────────────────────────
 
-    @property
-    def initial_risk_score(self):
-        return self.initial_likelihood * self.initial_severity
-
-    @property
-    def initial_risk_level(self):
-        return compute_risk_level(self.initial_risk_score)
+    RISK_FIELDS = [
+        "initial_risk_score", "initial_risk_level",
+        "residual_risk_score", "residual_risk_level",
+        "effective_risk_score", "effective_risk_level",
+    ]
 
-    @property
-    def residual_risk_score(self):
+    def sync_risk(self):
+        """
+        Recompute the stored risk columns from the L×S ratings. save() calls
+        this; bulk_create() / bulk_update() callers must call it themselves.
+        Effective risk is residual if assessed, else initial.
+        """
+        self.initial_risk_score = self.initial_likelihood * self.initial_severity
+        self.initial_risk_level = compute_risk_level(self.initial_risk_score)
         if self.residual_likelihood and self.residual_severity:
-            return self.residual_likelihood * self.residual_severity
-        return None
-
-    @property
-    def residual_risk_level(self):
-        return compute_risk_level(self.residual_risk_score)
-
-    @property
-    def effective_risk_level(self):
-        """Residual if assessed, else initial."""
-        return self.residual_risk_level or self.initial_risk_level
+            self.residual_risk_score = self.residual_likelihood * self.residual_severity
+        else:
+            self.residual_risk_score = None
+        self.residual_risk_level = compute_risk_level(self.residual_risk_score)
+        self.effective_risk_score = self.residual_risk_score or self.initial_risk_score
+        self.effective_risk_level = self.residual_risk_level or self.initial_risk_level
+
+    def save(self, *args, **kwargs):
+        self.sync_risk()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            kwargs["update_fields"] = {*update_fields, *self.RISK_FIELDS}
+        super().save(*args, **kwargs)
@@ -27,6 +27,7 @@ from reportlab.platypus import (
 )
 
 from core.logo_utils import get_logo_for_pdf
+from core.pdf import data_table, text_style
 from .models import RISK_LEVEL_COLORS, RISK_LEVEL_LABELS
 
 # ── Palette ───────────────────────────────────────────────────────────────────
@@ -65,12 +66,15 @@ STYLES = {
     "section":       _s("sec", fontSize=9,  fontName="Helvetica-Bold", textColor=BRAND_DARK, leading=12, spaceBefore=4),
     "meta_label":    _s("ml",  fontSize=7,  fontName="Helvetica-Bold", textColor=LABEL_GREY, leading=10),
     "meta_value":    _s("mv",  fontSize=8,  leading=11),
+    "meta_title":    _s("t",   fontSize=11, fontName="Helvetica-Bold", textColor=BRAND_DARK, leading=14),
+    "meta_status":   _s("s",   fontSize=9,  fontName="Helvetica-Bold", textColor=BRAND_ORANGE, leading=12),
     "col_header":    _s("ch",  fontSize=7.5,fontName="Helvetica-Bold", textColor=colors.white, alignment=TA_CENTER, leading=10),
     "cell":          _s("ce",  fontSize=7.5,leading=11),
     "cell_center":   _s("cc",  fontSize=7.5,leading=11, alignment=TA_CENTER),
     "risk_badge":    _s("rb",  fontSize=7,  fontName="Helvetica-Bold", alignment=TA_CENTER, leading=10),
     "footer":        _s("ft",  fontSize=6.5,textColor=LABEL_GREY, leading=9),
     "control_type":  _s("ct",  fontSize=6.5,fontName="Helvetica-Bold", textColor=BRAND_DARK, leading=9),
+    "legend_label":  _s("ll",  fontSize=7,  fontName="Helvetica-Bold", textColor=LABEL_GREY, leading=9, alignment=TA_LEFT),
 }
 
 CONTROL_ABBR = {
@@ -108,6 +112,8 @@ def generate_hira_pdf(register) -> bytes:
     generated_at = timezone.localtime(timezone.now()).strftime("%d %b %Y  %H:%M")
 
     # ── Page template ─────────────────────────────────────────────────────────
+    logo_img = get_logo_for_pdf(org, 3 * cm, 1.4 * cm)
+
     def _draw(canvas, doc):
         canvas.saveState()
 
@@ -116,7 +122,6 @@ def generate_hira_pdf(register) -> bytes:
         canvas.rect(0, PAGE_H - 2.2 * cm, PAGE_W, 2.2 * cm, fill=1, stroke=0)
 
         # Logo
-        logo_img = get_logo_for_pdf(org, 3 * cm, 1.4 * cm)
         lx = MARGIN
         if logo_img:
             logo_img.drawOn(canvas, lx, PAGE_H - 1.9 * cm)
@@ -177,11 +182,9 @@ def generate_hira_pdf(register) -> bytes:
     meta_rows = [
         [
             Paragraph("ASSESSMENT TITLE", STYLES["meta_label"]),
-            Paragraph(register.title, ParagraphStyle("t", fontSize=11, fontName="Helvetica-Bold",
-                                                      textColor=BRAND_DARK, leading=14)),
+            Paragraph(register.title, STYLES["meta_title"]),
             Paragraph("STATUS", STYLES["meta_label"]),
-            Paragraph(register.get_status_display(), ParagraphStyle("s", fontSize=9,
-                      fontName="Helvetica-Bold", textColor=BRAND_ORANGE, leading=12)),
+            Paragraph(register.get_status_display(), STYLES["meta_status"]),
         ],
         [
             Paragraph("ACTIVITY / WORK AREA", STYLES["meta_label"]),
@@ -283,8 +286,7 @@ def generate_hira_pdf(register) -> bytes:
             ]
             rows.append(row)
 
-        tbl = Table(rows, colWidths=cws, repeatRows=1)
-        tbl.setStyle(TableStyle([
+        story.extend(data_table(rows, cws, [
             # Header row
             ("BACKGROUND",    (0, 0), (-1, 0), BRAND_DARK),
             ("TEXTCOLOR",     (0, 0), (-1, 0), colors.white),
@@ -304,7 +306,6 @@ def generate_hira_pdf(register) -> bytes:
             ("GRID",          (0, 0), (-1, -1), 0.5, MID_GREY),
             ("LINEBELOW",     (0, 0), (-1, 0), 1.5, BRAND_DARK),
         ]))
-        story.append(tbl)
 
     # ── Risk matrix legend ────────────────────────────────────────────────────
     story.append(Spacer(1, 0.6 * cm))
@@ -319,8 +320,8 @@ def generate_hira_pdf(register) -> bytes:
     ]
     legend_cells = []
     for label, bg, fg in legend_items:
-        p = Paragraph(f'<b>{label}</b>', ParagraphStyle("lg", fontSize=7, fontName="Helvetica-Bold",
-                      textColor=fg, alignment=TA_CENTER, leading=9))
+        p = Paragraph(f'<b>{label}</b>', text_style(fontSize=7, fontName="Helvetica-Bold",
+                                                    textColor=fg, alignment=TA_CENTER, leading=9))
         t = Table([[p]], colWidths=[2.8 * cm], rowHeights=[0.5 * cm])
         t.setStyle(TableStyle([
             ("BACKGROUND",    (0, 0), (-1, -1), bg),
@@ -332,10 +333,7 @@ def generate_hira_pdf(register) -> bytes:
         ]))
         legend_cells.append(t)
 
-    legend_label = Paragraph("Risk Level Legend:", ParagraphStyle(
-        "ll", fontSize=7, fontName="Helvetica-Bold", textColor=LABEL_GREY,
-        leading=9, alignment=TA_LEFT,
-    ))
+    legend_label = Paragraph("Risk Level Legend:", STYLES["legend_label"])
     legend_row = Table(
         [[legend_label] + legend_cells],
         colWidths=[2.8 * cm, 2.8 * cm, 2.8 * cm, 2.8 * cm, 2.8 * cm],
@@ -0,0 +1,209 @@
+"""
+Unit tests for the hira app.
+Covers: stored Hazard risk columns (sync on save, backfill migration),
+HazardRegister.highest_risk_level, dashboard risk-level counts, streamed
+CSV / Excel exports.
+"""
+import csv
+import importlib
+import io
+
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.db.models import Max
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from core.models import Organization, Plan
+from hira.models import Hazard, HazardRegister
+from hira.views import EXPORT_HEADERS
+
+User = get_user_model()
+
+backfill_risk_columns = importlib.import_module(
+    "hira.migrations.0004_risk_columns"
+).backfill_risk_columns
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def create_org_and_manager(domain="hiraorg"):
+    Plan.objects.get_or_create(name="Trial", defaults={"price_monthly": 0})
+    org = Organization.objects.create(name="HIRA Org", domain=domain)
+    user = User.objects.create_user(
+        email=f"manager@{domain}.com", password="pass1234", organization=org, role="manager",
+    )
+    return org, user
+
+
+def create_hazard(register, likelihood, severity, residual=None):
+    residual_likelihood, residual_severity = residual or (None, None)
+    return Hazard.objects.create(
+        register=register,
+        hazard_description="Hazard",
+        potential_harm="Harm",
+        controls_description="Controls",
+        initial_likelihood=likelihood,
+        initial_severity=severity,
+        residual_likelihood=residual_likelihood,
+        residual_severity=residual_severity,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Stored risk columns
+# ---------------------------------------------------------------------------
+
+class HazardRiskColumnTests(TestCase):
+
+    def setUp(self):
+        self.org, self.user = create_org_and_manager()
+        self.register = HazardRegister.objects.create(
+            organization=self.org, title="Workshop", activity="Grinding",
+        )
+
+    def test_initial_only_hazard(self):
+        h = create_hazard(self.register, 4, 5)
+        self.assertEqual((h.initial_risk_score, h.initial_risk_level), (20, "critical"))
+        self.assertIsNone(h.residual_risk_score)
+        self.assertIsNone(h.residual_risk_level)
+        self.assertEqual((h.effective_risk_score, h.effective_risk_level), (20, "critical"))
+
+    def test_residual_overrides_initial(self):
+        h = create_hazard(self.register, 4, 5, residual=(1, 3))
+        self.assertEqual((h.residual_risk_score, h.residual_risk_level), (3, "low"))
+        self.assertEqual((h.effective_risk_score, h.effective_risk_level), (3, "low"))
+
+    def test_update_fields_save_keeps_columns_in_sync(self):
+        h = create_hazard(self.register, 1, 1)
+        h.initial_severity = 5
+        h.save(update_fields=["initial_severity"])
+        h.refresh_from_db()
+        self.assertEqual((h.effective_risk_score, h.effective_risk_level), (5, "medium"))
+
+    def test_backfill_recomputes_every_row(self):
+        create_hazard(self.register, 3, 3)
+        create_hazard(self.register, 2, 2, residual=(4, 4))
+        Hazard.objects.update(
+            initial_risk_score=0, initial_risk_level="low",
+            effective_risk_score=0, effective_risk_level="low",
+            residual_risk_score=None, residual_risk_level=None,
+        )
+        backfill_risk_columns(apps, None)
+        rows = list(Hazard.objects.order_by("id").values_list(
+            "initial_risk_level", "residual_risk_score", "residual_risk_level",
+            "effective_risk_score", "effective_risk_level",
+        ))
+        self.assertEqual(rows, [
+            ("medium", None, None, 9, "medium"),
+            ("low", 16, "high", 16, "high"),
+        ])
+
+
+# ---------------------------------------------------------------------------
+# Highest risk / dashboard counts
+# ---------------------------------------------------------------------------
+
+class RiskAggregationTests(TestCase):
+
+    def setUp(self):
+        self.org, self.user = create_org_and_manager("hiraagg")
+        self.register = HazardRegister.objects.create(
+            organization=self.org, title="Site", activity="Lifting",
+        )
+        create_hazard(self.register, 5, 5)                   # critical
+        create_hazard(self.register, 4, 4)                   # high
+        create_hazard(self.register, 5, 5, residual=(1, 2))  # low after controls
+
+    def test_highest_risk_level_sources_agree(self):
+        annotated = HazardRegister.objects.annotate(
+            max_risk_score=Max("hazards__effective_risk_score"),
+        ).get(pk=self.register.pk)
+        prefetched = HazardRegister.objects.prefetch_related("hazards").get(pk=self.register.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(annotated.highest_risk_level, "critical")
+            self.assertEqual(prefetched.highest_risk_level, "critical")
+        self.assertEqual(self.register.highest_risk_level, "critical")
+
+    def test_empty_register_has_no_highest_risk(self):
+        empty = HazardRegister.objects.create(organization=self.org, title="Empty", activity="-")
+        self.assertIsNone(empty.highest_risk_level)
+
+    def test_dashboard_counts_by_level(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("hira:dashboard"))
+        self.assertEqual(response.status_code, 200)
+        ctx = response.context
+        self.assertEqual(
+            (ctx["critical_count"], ctx["high_count"], ctx["medium_count"], ctx["low_count"]),
+            (1, 1, 0, 1),
+        )
+
+
+# ---------------------------------------------------------------------------
+# CSV / Excel export
+# ---------------------------------------------------------------------------
+
+class ExportTests(TestCase):
+
+    def setUp(self):
+        self.org, self.user = create_org_and_manager("hiraexport")
+        self.user.full_name = "Mia Manager"
+        self.user.save()
+        first = HazardRegister.objects.create(
+            organization=self.org, title="Workshop", activity="Grinding",
+            assessed_by=self.user,
+        )
+        create_hazard(first, 4, 5)
+        owned = create_hazard(first, 2, 3, residual=(1, 2))
+        owned.action_required = True
+        owned.action_owner = self.user
+        owned.save()
+        HazardRegister.objects.create(organization=self.org, title="Empty", activity="-")
+        self.client.force_login(self.user)
+
+    def test_csv_streams_one_row_per_hazard(self):
+        response = self.client.get(reverse("hira:export_csv"))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+
+        body = b"".join(response.streaming_content).decode()
+        rows = list(csv.reader(io.StringIO(body)))
+        self.assertEqual(rows[0], EXPORT_HEADERS)
+        self.assertEqual(len(rows), 4)
+
+        by_title = {}
+        for row in rows[1:]:
+            by_title.setdefault(row[1], []).append(row)
+        first, second = by_title["Workshop"]
+        self.assertEqual(first[8], "Mia Manager")                    # Assessed By
+        self.assertEqual((first[11], first[19], first[25]), ("1", "Critical", ""))
+        self.assertEqual((second[11], second[24], second[25]), ("2", "2", "Low"))
+        self.assertEqual((second[26], second[27]), ("Yes", "Mia Manager"))
+        empty, = by_title["Empty"]
+        self.assertEqual(empty[11:], [""] * (len(EXPORT_HEADERS) - 11))
+
+    def test_excel_is_styled_and_frozen(self):
+        import tempfile
+        from openpyxl import load_workbook
+        from jobs.models import Job
+        from jobs.queue import work
+
+        response = self.client.get(reverse("hira:export_excel"))
+        job = Job.objects.get(kind="hira.export_excel")
+        self.assertRedirects(response, reverse("jobs:detail", args=[job.pk]))
+        with tempfile.TemporaryDirectory() as media, override_settings(MEDIA_ROOT=media):
+            work("test-worker", once=True)
+            response = self.client.get(reverse("jobs:download", args=[job.pk]))
+            self.assertEqual(response.status_code, 200)
+            ws = load_workbook(io.BytesIO(b"".join(response.streaming_content)))["HIRA Register"]
+
+        self.assertEqual([c.value for c in ws[1]], EXPORT_HEADERS)
+        self.assertEqual(ws.freeze_panes, "L2")
+        self.assertEqual(ws.max_row, 4)
+        risk_styles = {ws.cell(row=r, column=20).style for r in range(2, 5)}
+        self.assertIn("hira_risk_critical", risk_styles)
+        action_styles = {ws.cell(row=r, column=27).style for r in range(2, 5)}
+        self.assertIn("hira_action", action_styles)
@@ -1,18 +1,18 @@
 # hira/views.py
-import csv
 from datetime import date
 
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.core.exceptions import PermissionDenied
-from django.db.models import Count, Q
-from django.http import HttpResponse
+from django.db.models import Count, Max, Q
 from django.shortcuts import get_object_or_404, redirect, render
 from django.utils import timezone
 
 from .forms import HazardFormSet, HazardRegisterForm
 from .models import Hazard, HazardRegister
-from .pdf_report import generate_hira_pdf
+from core.kpi_cache import cached_kpis, invalidate
+from core.utils.exports import XlsxExport, iter_values, person_name, stream_csv
+from jobs.views import enqueue_for_request
 
 
 # ── Guards ────────────────────────────────────────────────────────────────────
@@ -44,21 +44,41 @@ def _get_compliance_items(org):
     ).order_by("title")
 
 
+def _with_hazard_stats(registers):
+    """Annotate hazard_count / max_risk_score (read by highest_risk_level)."""
+    return registers.annotate(
+        hazard_count=Count("hazards"),
+        max_risk_score=Max("hazards__effective_risk_score"),
+    )
+
+
 # ── Dashboard ─────────────────────────────────────────────────────────────────
 
 @login_required
 def dashboard(request):
     org = _org(request)
-    registers = HazardRegister.objects.filter(organization=org).prefetch_related("hazards")
 
     # Auto-expire approved registers whose review date has passed
     today = timezone.now().date()
-    registers.filter(
+    expired_now = HazardRegister.objects.filter(
+        organization=org,
         status=HazardRegister.STATUS_APPROVED,
         next_review_date__lt=today,
     ).update(status=HazardRegister.STATUS_EXPIRED)
+    if expired_now:
+        invalidate(org, "hira")
+
+    kpis = cached_kpis(org, "hira_dashboard", ("hira",), lambda: _dashboard_kpis(org, today))
+
+    recent = (
+        _with_hazard_stats(HazardRegister.objects.filter(organization=org))
+        .order_by("-updated_at")[:8]
+    )
+    return render(request, "hira/dashboard.html", {**kpis, "recent": recent})
+
 
-    registers = HazardRegister.objects.filter(organization=org).prefetch_related("hazards")
+def _dashboard_kpis(org, today):
+    registers = HazardRegister.objects.filter(organization=org)
 
     total       = registers.count()
     approved    = registers.filter(status="approved").count()
@@ -69,20 +89,23 @@ def dashboard(request):
         next_review_date__range=[today, today + timezone.timedelta(days=30)],
     ).count()
 
-    # Count hazards by effective risk level
+    # Count hazards by effective risk level (one GROUP BY on the stored column)
     all_hazards = Hazard.objects.filter(register__organization=org)
-    critical_count = sum(1 for h in all_hazards if h.effective_risk_level == "critical")
-    high_count     = sum(1 for h in all_hazards if h.effective_risk_level == "high")
-    medium_count   = sum(1 for h in all_hazards if h.effective_risk_level == "medium")
-    low_count      = sum(1 for h in all_hazards if h.effective_risk_level == "low")
+    by_level = dict(
+        all_hazards.order_by()
+        .values_list("effective_risk_level")
+        .annotate(n=Count("id"))
+    )
+    critical_count = by_level.get("critical", 0)
+    high_count     = by_level.get("high", 0)
+    medium_count   = by_level.get("medium", 0)
+    low_count      = by_level.get("low", 0)
 
     # Open actions
     open_actions = all_hazards.filter(action_required=True, action_owner__isnull=False)
     overdue_actions = [h for h in open_actions if h.action_due_date and h.action_due_date < today]
 
-    recent = registers.order_by("-updated_at")[:8]
-
-    return render(request, "hira/dashboard.html", {
+    return {
         "total":           total,
         "approved":        approved,
         "draft":           draft,
@@ -94,8 +117,7 @@ def dashboard(request):
         "low_count":       low_count,
         "open_actions":    open_actions.count(),
         "overdue_actions": len(overdue_actions),
-        "recent":          recent,
-    })
+    }
 
 
 # ── Register list ─────────────────────────────────────────────────────────────
@@ -103,7 +125,7 @@ def dashboard(request):
 @login_required
 def register_list(request):
     org = _org(request)
-    qs  = HazardRegister.objects.filter(organization=org).prefetch_related("hazards")
+    qs  = _with_hazard_stats(HazardRegister.objects.filter(organization=org))
 
     status_filter = request.GET.get("status", "")
     if status_filter:
@@ -291,15 +313,9 @@ def register_delete(request, pk):
 @login_required
 def register_pdf(request, pk):
     org      = _org(request)
-    register = get_object_or_404(
-        HazardRegister.objects.prefetch_related("hazards__action_owner"),
-        pk=pk, organization=org,
-    )
-    pdf_bytes = generate_hira_pdf(register)
-    filename  = f"HIRA-{register.pk:04d}-Rev{register.revision_no}.pdf"
-    response  = HttpResponse(pdf_bytes, content_type="application/pdf")
-    response["Content-Disposition"] = f'attachment; filename="{filename}"'
-    return response
+    register = get_object_or_404(HazardRegister, pk=pk, organization=org)
+    # Rendered by a background worker (hira/jobs.py).
+    return enqueue_for_request(request, "hira.register_pdf", params={"pk": register.pk})
 
 
 # ── Export helpers ────────────────────────────────────────────────────────────
@@ -323,54 +339,85 @@ EXPORT_HEADERS = [
 ]
 
 
-def _hazard_row(register, hazard, hazard_num):
-    """Return a flat list of cell values for one hazard row."""
-    reg_fields = [
-        register.pk,
-        register.title,
-        register.activity,
-        register.location_text or "",
-        register.assessment_date.strftime("%Y-%m-%d"),
-        register.next_review_date.strftime("%Y-%m-%d") if register.next_review_date else "",
-        register.get_status_display(),
-        register.revision_no,
-        register.assessed_by.get_full_name() if register.assessed_by else "",
-        register.approved_by.get_full_name() if register.approved_by else "",
-        timezone.localtime(register.approved_at).strftime("%Y-%m-%d %H:%M") if register.approved_at else "",
-    ]
-    if hazard is None:
-        return reg_fields + [""] * (len(EXPORT_HEADERS) - 11)
-
-    return reg_fields + [
-        hazard_num,
-        hazard.get_category_display(),
-        hazard.hazard_description,
-        hazard.potential_harm,
-        hazard.get_who_might_be_harmed_display(),
-        hazard.initial_likelihood,
-        hazard.initial_severity,
-        hazard.initial_risk_score,
-        hazard.initial_risk_level.title() if hazard.initial_risk_level else "",
-        hazard.get_primary_control_type_display(),
-        hazard.controls_description,
-        hazard.residual_likelihood or "",
-        hazard.residual_severity or "",
-        hazard.residual_risk_score or "",
-        hazard.residual_risk_level.title() if hazard.residual_risk_level else "",
-        "Yes" if hazard.action_required else "No",
-        hazard.action_owner.get_full_name() if hazard.action_owner else "",
-        hazard.action_due_date.strftime("%Y-%m-%d") if hazard.action_due_date else "",
-    ]
-
-
-def _export_queryset(org):
-    return (
+_USER_COLS = ("full_name", "email", "employee_id", "id")
+
+_EXPORT_VALUES = (
+    "pk", "title", "activity", "location_text", "assessment_date", "next_review_date",
+    "status", "revision_no", "approved_at",
+    *(f"assessed_by__{c}" for c in _USER_COLS),
+    *(f"approved_by__{c}" for c in _USER_COLS),
+    "hazards__id", "hazards__category", "hazards__hazard_description", "hazards__potential_harm",
+    "hazards__who_might_be_harmed", "hazards__initial_likelihood", "hazards__initial_severity",
+    "hazards__initial_risk_score", "hazards__initial_risk_level",
+    "hazards__primary_control_type", "hazards__controls_description",
+    "hazards__residual_likelihood", "hazards__residual_severity",
+    "hazards__residual_risk_score", "hazards__residual_risk_level",
+    "hazards__action_required", "hazards__action_due_date",
+    *(f"hazards__action_owner__{c}" for c in _USER_COLS),
+)
+
+
+def _export_rows(org):
+    """
+    Flat EXPORT_HEADERS rows streamed from one LEFT JOIN of registers to
+    hazards, numbered per register (a register without hazards yields one
+    register-only row). No model instances are built.
+    """
+    qs = (
         HazardRegister.objects
         .filter(organization=org)
-        .prefetch_related("hazards__action_owner")
-        .select_related("assessed_by", "approved_by")
-        .order_by("-assessment_date", "pk")
+        .order_by("-assessment_date", "pk", "hazards__order", "hazards__id")
     )
+    status_labels   = dict(HazardRegister.STATUS_CHOICES)
+    category_labels = dict(Hazard.CATEGORY_CHOICES)
+    who_labels      = dict(Hazard.WHO_CHOICES)
+    control_labels  = dict(Hazard.CONTROL_TYPE_CHOICES)
+
+    def person(r, prefix):
+        return person_name(*(r[f"{prefix}__{c}"] for c in _USER_COLS))
+
+    register_pk, hazard_num = None, 0
+    for r in iter_values(qs, *_EXPORT_VALUES):
+        if r["pk"] != register_pk:
+            register_pk, hazard_num = r["pk"], 0
+        reg_fields = [
+            r["pk"],
+            r["title"],
+            r["activity"],
+            r["location_text"] or "",
+            r["assessment_date"].strftime("%Y-%m-%d"),
+            r["next_review_date"].strftime("%Y-%m-%d") if r["next_review_date"] else "",
+            status_labels.get(r["status"], r["status"]),
+            r["revision_no"],
+            person(r, "assessed_by"),
+            person(r, "approved_by"),
+            timezone.localtime(r["approved_at"]).strftime("%Y-%m-%d %H:%M") if r["approved_at"] else "",
+        ]
+        if r["hazards__id"] is None:
+            yield reg_fields + [""] * (len(EXPORT_HEADERS) - 11)
+            continue
+
+        hazard_num += 1
+        yield reg_fields + [
+            hazard_num,
+            category_labels.get(r["hazards__category"], r["hazards__category"]),
+            r["hazards__hazard_description"],
+            r["hazards__potential_harm"],
+            who_labels.get(r["hazards__who_might_be_harmed"], r["hazards__who_might_be_harmed"]),
+            r["hazards__initial_likelihood"],
+            r["hazards__initial_severity"],
+            r["hazards__initial_risk_score"],
+            (r["hazards__initial_risk_level"] or "").title(),
+            control_labels.get(r["hazards__primary_control_type"], r["hazards__primary_control_type"]),
+            r["hazards__controls_description"],
+            r["hazards__residual_likelihood"] or "",
+            r["hazards__residual_severity"] or "",
+            r["hazards__residual_risk_score"] or "",
+            (r["hazards__residual_risk_level"] or "").title(),
+            "Yes" if r["hazards__action_required"] else "No",
+            person(r, "hazards__action_owner"),
+            r["hazards__action_due_date"].strftime("%Y-%m-%d") if r["hazards__action_due_date"] else "",
+        ]
 
 
 # ── CSV export ────────────────────────────────────────────────────────────────
@@ -379,155 +426,113 @@ def _export_queryset(org):
 def export_csv(request):
     org = _org(request)
     _manager_required(request)
-
-    response = HttpResponse(content_type="text/csv")
-    response["Content-Disposition"] = (
-        f'attachment; filename="HIRA-export-{date.today()}.csv"'
-    )
-    writer = csv.writer(response)
-    writer.writerow(EXPORT_HEADERS)
-
-    for register in _export_queryset(org):
-        hazards = list(register.hazards.all())
-        if hazards:
-            for i, h in enumerate(hazards, 1):
-                writer.writerow(_hazard_row(register, h, i))
-        else:
-            writer.writerow(_hazard_row(register, None, None))
-
-    return response
+    return stream_csv(f"HIRA-export-{date.today()}.csv", EXPORT_HEADERS, _export_rows(org))
 
 
 # ── Excel export ──────────────────────────────────────────────────────────────
 
-@login_required
-def export_excel(request):
-    org = _org(request)
-    _manager_required(request)
+# Header colour groups: (first, last) 1-based column → (bg hex, fg hex)
+_EXCEL_GROUPS = {
+    "register": ((1, 11),  ("1E3A5F", "FFFFFF")),
+    "hazard":   ((12, 16), ("334155", "FFFFFF")),
+    "initial":  ((17, 20), ("7F1D1D", "FFFFFF")),
+    "controls": ((21, 22), ("14532D", "FFFFFF")),
+    "residual": ((23, 26), ("7C2D12", "FFFFFF")),
+    "action":   ((27, 29), ("78350F", "FFFFFF")),
+}
+
+_EXCEL_RISK_FILLS = {
+    "critical": ("FEE2E2", "991B1B"),
+    "high":     ("FFEDD5", "9A3412"),
+    "medium":   ("FEF9C3", "854D0E"),
+    "low":      ("D1FAE5", "065F46"),
+}
+
+_EXCEL_WIDTHS = [
+    8,  30, 28, 18, 14, 14, 14,  8, 22, 22, 18,   # Register (11)
+    6,  18, 40, 35, 16,                             # Hazard info (5)
+    12, 12, 10, 12,                                 # Initial risk (4)
+    20, 45,                                         # Controls (2)
+    14, 14, 12, 14,                                 # Residual risk (4)
+    12, 22, 14,                                     # Action (3)
+]
 
-    from openpyxl import Workbook
-    from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-    from openpyxl.utils import get_column_letter
-    from core.logo_utils import get_logo_for_excel
+# 0-based columns of the Excel-highlighted values in an _export_rows() row
+_COL_HAZARD_NUM, _COL_INITIAL_LEVEL, _COL_RESIDUAL_LEVEL, _COL_ACTION = 11, 19, 25, 26
 
-    RISK_FILLS = {
-        "critical": ("FEE2E2", "991B1B"),
-        "high":     ("FFEDD5", "9A3412"),
-        "medium":   ("FEF9C3", "854D0E"),
-        "low":      ("D1FAE5", "065F46"),
-    }
 
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "HIRA Register"
-
-    # ── Logo + org header ─────────────────────────────────────────────────────
-    xl_logo = get_logo_for_excel(org)
-    DATA_START_ROW = 1
-
-    if xl_logo:
-        xl_logo.anchor = "A1"
-        ws.add_image(xl_logo)
-        for r in range(1, 4):
-            ws.row_dimensions[r].height = 14
-        ws["B1"] = org.name
-        ws["B1"].font = Font(bold=True, size=13, color="0E1729")
-        ws["B2"] = "Hazard Identification & Risk Assessment (HIRA) Export"
-        ws["B2"].font = Font(size=9, color="64748B")
-        ws["B3"] = f"Exported: {date.today().strftime('%d %b %Y')}  |  ISO 45001 Aligned"
-        ws["B3"].font = Font(size=9, color="94A3B8")
-        ws.row_dimensions[4].height = 6
-        DATA_START_ROW = 5
-
-    # ── Column headers ────────────────────────────────────────────────────────
+def _excel_styles():
+    from openpyxl.styles import Alignment, Border, Font, NamedStyle, PatternFill, Side
+
     thin   = Side(style="thin", color="DEE2E6")
     border = Border(left=thin, right=thin, top=thin, bottom=thin)
-
-    # Group colour definitions: (bg hex, fg hex) per column index (1-based)
-    group_colors = {}
-    for i in range(1, 12):   group_colors[i] = ("1E3A5F", "FFFFFF")  # Register
-    for i in range(12, 17):  group_colors[i] = ("334155", "FFFFFF")  # Hazard info
-    for i in range(17, 21):  group_colors[i] = ("7F1D1D", "FFFFFF")  # Initial risk
-    for i in range(21, 23):  group_colors[i] = ("14532D", "FFFFFF")  # Controls
-    for i in range(23, 27):  group_colors[i] = ("7C2D12", "FFFFFF")  # Residual risk
-    for i in range(27, 30):  group_colors[i] = ("78350F", "FFFFFF")  # Action
-
-    for col_idx, header in enumerate(EXPORT_HEADERS, start=1):
-        bg, fg = group_colors.get(col_idx, ("0E1729", "FFFFFF"))
-        cell = ws.cell(row=DATA_START_ROW, column=col_idx, value=header)
-        cell.fill = PatternFill("solid", fgColor=bg)
-        cell.font = Font(bold=True, color=fg, size=9)
-        cell.alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
-        cell.border = border
-    ws.row_dimensions[DATA_START_ROW].height = 30
-
-    # ── Data rows ─────────────────────────────────────────────────────────────
-    row_num = DATA_START_ROW + 1
-    alt_fill   = PatternFill("solid", fgColor="F8F9FB")
-    white_fill = PatternFill("solid", fgColor="FFFFFF")
-
-    for reg_idx, register in enumerate(_export_queryset(org)):
-        hazards = list(register.hazards.all())
-        rows_to_write = [(i + 1, h) for i, h in enumerate(hazards)] if hazards else [(None, None)]
-        fill = alt_fill if reg_idx % 2 == 0 else white_fill
-
-        for h_num, hazard in rows_to_write:
-            row_data = _hazard_row(register, hazard, h_num)
-
-            for col_idx, value in enumerate(row_data, start=1):
-                cell = ws.cell(row=row_num, column=col_idx, value=value)
-                cell.fill = fill
-                cell.border = border
-                cell.alignment = Alignment(vertical="top", wrap_text=True)
-                cell.font = Font(size=9)
-
-            # Colour risk level cells
-            if hazard:
-                init_level = hazard.initial_risk_level
-                if init_level in RISK_FILLS:
-                    bg, fg = RISK_FILLS[init_level]
-                    c = ws.cell(row=row_num, column=20)
-                    c.fill = PatternFill("solid", fgColor=bg)
-                    c.font = Font(bold=True, color=fg, size=9)
-
-                res_level = hazard.residual_risk_level
-                if res_level and res_level in RISK_FILLS:
-                    bg, fg = RISK_FILLS[res_level]
-                    c = ws.cell(row=row_num, column=26)
-                    c.fill = PatternFill("solid", fgColor=bg)
-                    c.font = Font(bold=True, color=fg, size=9)
-
-                if hazard.action_required:
-                    c = ws.cell(row=row_num, column=27)
-                    c.fill = PatternFill("solid", fgColor="FFF7ED")
-                    c.font = Font(bold=True, color="EA580C", size=9)
-
-            ws.row_dimensions[row_num].height = 36
-            row_num += 1
-
-    # ── Column widths ─────────────────────────────────────────────────────────
-    col_widths = [
-        8,  30, 28, 18, 14, 14, 14,  8, 22, 22, 18,   # Register (11)
-        6,  18, 40, 35, 16,                             # Hazard info (5)
-        12, 12, 10, 12,                                 # Initial risk (4)
-        20, 45,                                         # Controls (2)
-        14, 14, 12, 14,                                 # Residual risk (4)
-        12, 22, 14,                                     # Action (3)
+    top    = Alignment(vertical="top", wrap_text=True)
+
+    def cell(name, bg, font):
+        return NamedStyle(name, fill=PatternFill("solid", fgColor=bg), font=font,
+                          border=border, alignment=top)
+
+    styles = [
+        NamedStyle(
+            f"hira_hdr_{group}",
+            fill=PatternFill("solid", fgColor=bg),
+            font=Font(bold=True, color=fg, size=9),
+            alignment=Alignment(horizontal="center", vertical="center", wrap_text=True),
+            border=border,
+        )
+        for group, (_, (bg, fg)) in _EXCEL_GROUPS.items()
+    ]
+    styles += [
+        cell("hira_cell_alt", "F8F9FB", Font(size=9)),
+        cell("hira_cell", "FFFFFF", Font(size=9)),
+        cell("hira_action", "FFF7ED", Font(bold=True, color="EA580C", size=9)),
+    ]
+    styles += [
+        cell(f"hira_risk_{level}", bg, Font(bold=True, color=fg, size=9))
+        for level, (bg, fg) in _EXCEL_RISK_FILLS.items()
     ]
-    for i, w in enumerate(col_widths, start=1):
-        ws.column_dimensions[get_column_letter(i)].width = w
+    return styles
 
-    # Freeze header row + register columns
-    ws.freeze_panes = ws.cell(row=DATA_START_ROW + 1, column=12)
 
-    response = HttpResponse(
-        content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+def build_excel(org):
+    """The org's registers and hazards as an XlsxExport (built by hira/jobs.py)."""
+    xl = XlsxExport(
+        "HIRA Register", widths=_EXCEL_WIDTHS, styles=_excel_styles(),
+        row_height=36, freeze_column=12,   # header row + register columns
     )
-    response["Content-Disposition"] = (
-        f'attachment; filename="HIRA-export-{date.today()}.xlsx"'
+    xl.logo_header(
+        org, "Hazard Identification & Risk Assessment (HIRA) Export",
+        f"Exported: {date.today().strftime('%d %b %Y')}  |  ISO 45001 Aligned",
     )
-    wb.save(response)
-    return response
+    header_styles = {
+        col - 1: f"hira_hdr_{group}"
+        for group, ((first, last), _) in _EXCEL_GROUPS.items()
+        for col in range(first, last + 1)
+    }
+    xl.header(EXPORT_HEADERS, styles=header_styles, height=30)
+
+    register_pk, reg_idx = None, -1
+    for row in _export_rows(org):
+        if row[0] != register_pk:
+            register_pk, reg_idx = row[0], reg_idx + 1
+        overrides = {}
+        if row[_COL_HAZARD_NUM] != "":
+            for col in (_COL_INITIAL_LEVEL, _COL_RESIDUAL_LEVEL):
+                level = row[col].lower()
+                if level in _EXCEL_RISK_FILLS:
+                    overrides[col] = f"hira_risk_{level}"
+            if row[_COL_ACTION] == "Yes":
+                overrides[_COL_ACTION] = "hira_action"
+        xl.append(row, style="hira_cell_alt" if reg_idx % 2 == 0 else "hira_cell", styles=overrides)
+    return xl
+
+
+@login_required
+def export_excel(request):
+    _org(request)
+    _manager_required(request)
+    # A large tenant's workbook can outlive a web worker's timeout.
+    return enqueue_for_request(request, "hira.export_excel")
 
 
 # ── Risk Matrix ───────────────────────────────────────────────────────────────
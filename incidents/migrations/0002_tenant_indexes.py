@@ -0,0 +1,21 @@
+# Generated by Django 5.1 on 2026-10-17 02:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('incidents', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='incident',
+            index=models.Index(fields=['organization', '-date_occurred'], name='inc_org_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='incident',
+            index=models.Index(fields=['organization', 'status'], name='inc_org_status_idx'),
+        ),
+    ]
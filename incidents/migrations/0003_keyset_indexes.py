@@ -0,0 +1,26 @@
+# Generated by Django 5.1 on 2026-10-17 02:57
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_searchentry'),
+        ('hira', '0004_risk_columns'),
+        ('incidents', '0002_tenant_indexes'),
+        ('observations', '0005_keyset_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='incident',
+            name='inc_org_date_idx',
+        ),
+        migrations.AddIndex(
+            model_name='incident',
+            index=models.Index(fields=['organization', '-date_occurred', '-id'], name='inc_org_date_idx'),
+        ),
+    ]
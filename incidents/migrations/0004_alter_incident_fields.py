@@ -0,0 +1,46 @@
+# Generated by Django 5.1 on 2026-10-17 05:02
+#
+# Model state only (help_text, the implicit id's verbose_name): no schema
+# change. Kept apart from the index migrations.
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('incidents', '0003_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='hoursworked',
+            name='id',
+            field=models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID'),
+        ),
+        migrations.AlterField(
+            model_name='incident',
+            name='contributing_factors',
+            field=models.TextField(blank=True, help_text='Environmental, organisational or human factors that contributed'),
+        ),
+        migrations.AlterField(
+            model_name='incident',
+            name='id',
+            field=models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID'),
+        ),
+        migrations.AlterField(
+            model_name='incident',
+            name='immediate_cause',
+            field=models.TextField(blank=True, help_text='Unsafe act or unsafe condition that directly caused the incident'),
+        ),
+        migrations.AlterField(
+            model_name='incident',
+            name='property_damage_est',
+            field=models.DecimalField(blank=True, decimal_places=2, help_text='Estimated cost of property/equipment damage', max_digits=12, null=True),
+        ),
+        migrations.AlterField(
+            model_name='incident',
+            name='rca_root_cause',
+            field=models.TextField(blank=True, help_text='Final root cause conclusion'),
+        ),
+    ]
@@ -172,6 +172,17 @@ class Incident(models.Model):
 
     class Meta:
         ordering = ["-date_occurred"]
+        indexes = [
+            # incident_list + yearly stats (date_occurred__year is a range scan)
+            models.Index(
+                fields=["organization", "-date_occurred", "-id"],
+                name="inc_org_date_idx",
+            ),
+            models.Index(
+                fields=["organization", "status"],
+                name="inc_org_status_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.reference_no}: {self.title}"
@@ -1,13 +1,18 @@
 # incidents/stats.py
-from django.db.models import Sum, Count, Q
+"""
+Incident statistics. Every function here reads incidents through one
+conditional-aggregation query grouped by month (``_monthly_counts``) and
+hours worked through one query (``_monthly_hours``), whatever the span.
+"""
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import ExtractMonth, ExtractYear
+
 from .models import Incident, HoursWorked
 
+MONTH_LABELS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun",
+                "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
 
-def _total_hours(org, year):
-    result = HoursWorked.objects.filter(
-        organization=org, year=year
-    ).aggregate(total=Sum("hours"))["total"]
-    return float(result or 0)
+RECORDABLE = (Incident.SEV_LTI, Incident.SEV_MTC, Incident.SEV_FAC, Incident.SEV_FATALITY)
 
 
 def _rate(count, hours, multiplier=1_000_000):
@@ -16,22 +21,72 @@ def _rate(count, hours, multiplier=1_000_000):
     return round(count * multiplier / hours, 2)
 
 
-def calculate_stats(org, year):
-    qs = Incident.objects.filter(organization=org, date_occurred__year=year)
+def _months(first, last):
+    """Inclusive list of (year, month) from ``first`` to ``last``."""
+    y, m = first
+    out = []
+    while (y, m) <= last:
+        out.append((y, m))
+        y, m = (y + 1, 1) if m == 12 else (y, m + 1)
+    return out
+
+
+def _monthly_counts(org, first_year, last_year):
+    """
+    {(year, month): row} for every month with incidents, where row holds the
+    total, a count per severity and ``days`` lost — one GROUP BY query.
+    """
+    rows = (
+        Incident.objects
+        .filter(organization=org, date_occurred__year__gte=first_year,
+                date_occurred__year__lte=last_year)
+        .annotate(y=ExtractYear("date_occurred"), m=ExtractMonth("date_occurred"))
+        .values("y", "m")
+        .annotate(
+            total=Count("id"),
+            days=Sum("days_lost"),
+            **{sev: Count("id", filter=Q(severity=sev)) for sev, _ in Incident.SEVERITY_CHOICES},
+        )
+        .order_by()
+    )
+    return {(r.pop("y"), r.pop("m")): r for r in rows}
+
+
+def _monthly_hours(org, first_year, last_year):
+    """{(year, month): hours} — one query."""
+    return {
+        (y, m): float(h)
+        for y, m, h in HoursWorked.objects.filter(
+            organization=org, year__gte=first_year, year__lte=last_year,
+        ).values_list("year", "month", "hours")
+    }
+
 
-    total_hours = _total_hours(org, year)
+def _sum(rows, key):
+    return sum((r.get(key) or 0) for r in rows)
 
-    lti_count  = qs.filter(severity=Incident.SEV_LTI).count()
-    mtc_count  = qs.filter(severity=Incident.SEV_MTC).count()
-    fac_count  = qs.filter(severity=Incident.SEV_FAC).count()
-    fatal_count= qs.filter(severity=Incident.SEV_FATALITY).count()
-    nm_count   = qs.filter(severity=Incident.SEV_NEAR_MISS).count()
+
+def calculate_stats(org, year, counts=None):
+    """
+    Year-to-date totals and rates. ``counts`` is a ``_monthly_counts`` result
+    for ``year`` already fetched by the caller, saving the grouped query.
+    """
+    if counts is None:
+        counts = _monthly_counts(org, year, year)
+    months = counts.values()
+    total_hours = sum(_monthly_hours(org, year, year).values())
+
+    lti_count  = _sum(months, Incident.SEV_LTI)
+    mtc_count  = _sum(months, Incident.SEV_MTC)
+    fac_count  = _sum(months, Incident.SEV_FAC)
+    fatal_count= _sum(months, Incident.SEV_FATALITY)
+    nm_count   = _sum(months, Incident.SEV_NEAR_MISS)
     recordable = lti_count + mtc_count + fac_count + fatal_count
 
-    days_lost  = qs.aggregate(total=Sum("days_lost"))["total"] or 0
+    days_lost  = _sum(months, "days")
 
     return {
-        "total":        qs.count(),
+        "total":        _sum(months, "total"),
         "fatalities":   fatal_count,
         "lti":          lti_count,
         "mtc":          mtc_count,
@@ -47,22 +102,83 @@ def calculate_stats(org, year):
     }
 
 
-def get_monthly_trend(org, year):
-    """Returns list of 12 dicts with month label + counts by severity group."""
-    MONTH_LABELS = ["Jan","Feb","Mar","Apr","May","Jun",
-                    "Jul","Aug","Sep","Oct","Nov","Dec"]
+def get_monthly_trend(org, year, counts=None):
+    """
+    Returns list of 12 dicts with month label + counts by severity group.
+    ``counts`` as for ``calculate_stats``.
+    """
+    if counts is None:
+        counts = _monthly_counts(org, year, year)
     results = []
     for m in range(1, 13):
-        qs = Incident.objects.filter(
-            organization=org, date_occurred__year=year, date_occurred__month=m
-        )
+        row = counts.get((year, m), {})
         results.append({
             "month":     MONTH_LABELS[m - 1],
-            "total":     qs.count(),
-            "lti":       qs.filter(severity__in=[Incident.SEV_LTI, Incident.SEV_FATALITY]).count(),
-            "mtc_fac":   qs.filter(severity__in=[Incident.SEV_MTC, Incident.SEV_FAC]).count(),
-            "near_miss": qs.filter(severity=Incident.SEV_NEAR_MISS).count(),
-            "property":  qs.filter(severity=Incident.SEV_PROPERTY).count(),
+            "total":     row.get("total", 0),
+            "lti":       row.get(Incident.SEV_LTI, 0) + row.get(Incident.SEV_FATALITY, 0),
+            "mtc_fac":   row.get(Incident.SEV_MTC, 0) + row.get(Incident.SEV_FAC, 0),
+            "near_miss": row.get(Incident.SEV_NEAR_MISS, 0),
+            "property":  row.get(Incident.SEV_PROPERTY, 0),
+        })
+    return results
+
+
+def get_rolling_rates(org, first, last, window=12):
+    """
+    Rolling ``window``-month frequency rates for each month from ``first`` to
+    ``last`` — (year, month) tuples, or plain years meaning Jan..Dec.
+
+    Each row: year, month, label, the month's own incidents / lti (LTI +
+    fatality) / recordable / days_lost / hours, and the trailing-window
+    sums and rates ``ltifr``, ``trifr``, ``severity_rate`` (None while the
+    window has no hours entered). Two queries for any span.
+    """
+    if isinstance(first, int):
+        first = (first, 1)
+    if isinstance(last, int):
+        last = (last, 12)
+
+    lead = _months(first, last)
+    # Reach back far enough to fill the first month's window.
+    start = lead[0]
+    for _ in range(window - 1):
+        y, m = start
+        start = (y - 1, 12) if m == 1 else (y, m - 1)
+    span = _months(start, last)
+
+    counts = _monthly_counts(org, start[0], last[0])
+    hours = _monthly_hours(org, start[0], last[0])
+
+    series = []
+    for y, m in span:
+        row = counts.get((y, m), {})
+        series.append({
+            "year":       y,
+            "month":      m,
+            "label":      f"{MONTH_LABELS[m - 1]} {y}",
+            "incidents":  row.get("total", 0),
+            "lti":        row.get(Incident.SEV_LTI, 0) + row.get(Incident.SEV_FATALITY, 0),
+            "recordable": sum(row.get(sev, 0) for sev in RECORDABLE),
+            "days_lost":  row.get("days") or 0,
+            "hours":      hours.get((y, m), 0.0),
+        })
+
+    results = []
+    offset = len(span) - len(lead)
+    for i in range(offset, len(span)):
+        trailing = series[i - window + 1:i + 1]
+        w_hours = sum(r["hours"] for r in trailing)
+        w_lti = sum(r["lti"] for r in trailing)
+        w_rec = sum(r["recordable"] for r in trailing)
+        w_days = sum(r["days_lost"] for r in trailing)
+        results.append({
+            **series[i],
+            "window_hours":  w_hours,
+            "window_lti":    w_lti,
+            "window_recordable": w_rec,
+            "ltifr":         _rate(w_lti, w_hours),
+            "trifr":         _rate(w_rec, w_hours),
+            "severity_rate": _rate(w_days, w_hours),
         })
     return results
 
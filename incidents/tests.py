@@ -1,3 +1,142 @@
+"""
+Unit tests for the incidents app.
+Covers: calculate_stats / get_monthly_trend aggregation, constant query
+counts, rolling 12-month LTIFR / TRIFR / severity windows, stats page.
+"""
+from datetime import datetime
+
+from django.contrib.auth import get_user_model
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from core.models import Organization, Plan
+from incidents.models import HoursWorked, Incident
+from incidents.stats import _monthly_counts, calculate_stats, get_monthly_trend, get_rolling_rates
+
+User = get_user_model()
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def create_org_and_manager(domain="incorg"):
+    Plan.objects.get_or_create(name="Trial", defaults={"price_monthly": 0})
+    org = Organization.objects.create(name="Incident Org", domain=domain)
+    user = User.objects.create_user(
+        email=f"manager@{domain}.com", password="pass1234", organization=org, role="manager",
+    )
+    return org, user
+
+
+def create_incident(org, year, month, severity, days_lost=0):
+    return Incident.objects.create(
+        organization=org,
+        title="Incident",
+        description="Details",
+        severity=severity,
+        days_lost=days_lost,
+        date_occurred=timezone.make_aware(datetime(year, month, 15, 10, 0)),
+    )
+
+
+# ---------------------------------------------------------------------------
+# Yearly stats / monthly trend
+# ---------------------------------------------------------------------------
+
+class IncidentStatsTests(TestCase):
+
+    def setUp(self):
+        self.org, self.user = create_org_and_manager()
+        create_incident(self.org, 2025, 1, Incident.SEV_LTI, days_lost=4)
+        create_incident(self.org, 2025, 1, Incident.SEV_NEAR_MISS)
+        create_incident(self.org, 2025, 3, Incident.SEV_MTC)
+        create_incident(self.org, 2025, 3, Incident.SEV_FATALITY, days_lost=6)
+        create_incident(self.org, 2024, 12, Incident.SEV_LTI, days_lost=9)   # other year
+        HoursWorked.objects.create(organization=self.org, year=2025, month=1, hours=100_000)
+        HoursWorked.objects.create(organization=self.org, year=2025, month=3, hours=100_000)
+
+    def test_calculate_stats(self):
+        stats = calculate_stats(self.org, 2025)
+        self.assertEqual(stats["total"], 4)
+        self.assertEqual((stats["lti"], stats["mtc"], stats["fatalities"]), (1, 1, 1))
+        self.assertEqual(stats["near_miss"], 1)
+        self.assertEqual(stats["recordable"], 3)
+        self.assertEqual(stats["days_lost"], 10)
+        self.assertEqual(stats["total_hours"], 200_000)
+        self.assertEqual(stats["ltifr"], 5.0)
+        self.assertEqual(stats["trifr"], 15.0)
+
+    def test_no_hours_gives_no_rates(self):
+        stats = calculate_stats(self.org, 2024)
+        self.assertEqual(stats["lti"], 1)
+        self.assertIsNone(stats["ltifr"])
+
+    def test_monthly_trend(self):
+        trend = get_monthly_trend(self.org, 2025)
+        self.assertEqual(len(trend), 12)
+        self.assertEqual(trend[0], {
+            "month": "Jan", "total": 2, "lti": 1, "mtc_fac": 0, "near_miss": 1, "property": 0,
+        })
+        self.assertEqual((trend[2]["lti"], trend[2]["mtc_fac"]), (1, 1))
+        self.assertEqual(trend[1]["total"], 0)
+
+    def test_query_counts_are_constant(self):
+        with self.assertNumQueries(2):
+            calculate_stats(self.org, 2025)
+        with self.assertNumQueries(1):
+            get_monthly_trend(self.org, 2025)
+        with self.assertNumQueries(2):
+            get_rolling_rates(self.org, 2020, 2025)
+
+    def test_shared_month_counts_are_not_refetched(self):
+        counts = _monthly_counts(self.org, 2025, 2025)
+        with self.assertNumQueries(1):
+            stats = calculate_stats(self.org, 2025, counts)
+        with self.assertNumQueries(0):
+            trend = get_monthly_trend(self.org, 2025, counts)
+        self.assertEqual(stats, calculate_stats(self.org, 2025))
+        self.assertEqual(trend, get_monthly_trend(self.org, 2025))
+
+
+# ---------------------------------------------------------------------------
+# Rolling rates
+# ---------------------------------------------------------------------------
+
+class RollingRatesTests(TestCase):
+
+    def setUp(self):
+        self.org, self.user = create_org_and_manager("incroll")
+        for m in range(1, 13):
+            HoursWorked.objects.create(organization=self.org, year=2024, month=m, hours=10_000)
+            HoursWorked.objects.create(organization=self.org, year=2025, month=m, hours=10_000)
+        create_incident(self.org, 2024, 6, Incident.SEV_LTI, days_lost=5)
+        create_incident(self.org, 2025, 2, Incident.SEV_FAC)
+
+    def test_window_reaches_back_before_first_month(self):
+        rows = get_rolling_rates(self.org, (2025, 1), (2025, 6))
+        self.assertEqual([r["label"] for r in rows][:2], ["Jan 2025", "Feb 2025"])
+        jan = rows[0]
+        self.assertEqual(jan["window_hours"], 120_000)
+        self.assertEqual((jan["window_lti"], jan["window_recordable"]), (1, 1))
+        self.assertEqual(jan["ltifr"], round(1_000_000 / 120_000, 2))
+        self.assertEqual(jan["severity_rate"], round(5 * 1_000_000 / 120_000, 2))
+
+    def test_incident_drops_out_after_window(self):
+        rows = {(r["year"], r["month"]): r for r in get_rolling_rates(self.org, 2025, 2025)}
+        self.assertEqual(rows[(2025, 5)]["window_lti"], 1)     # Jun 2024 .. May 2025
+        self.assertEqual(rows[(2025, 6)]["window_lti"], 0)     # Jul 2024 .. Jun 2025
+        self.assertEqual(rows[(2025, 6)]["window_recordable"], 1)
+        self.assertEqual(rows[(2025, 2)]["recordable"], 1)
+
+    def test_no_hours_gives_no_rates(self):
+        rows = get_rolling_rates(self.org, 2020, 2020)
+        self.assertEqual(len(rows), 12)
+        self.assertTrue(all(r["ltifr"] is None for r in rows))
 
-# Create your tests here.
+    def test_stats_page_renders_rolling_chart(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("incidents:stats"), {"year": 2025})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context["rolling_plot"])
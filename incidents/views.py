@@ -10,6 +10,8 @@ from .forms import (
     InvestigateForm, RCAForm,
 )
 from .models import HoursWorked, Incident
+from core.search import SEARCH_ORDERING, is_ranked, search
+from core.utils.pagination import paginate_keyset
 
 
 # ── Guards ────────────────────────────────────────────────────────────────────
@@ -57,6 +59,7 @@ def incident_list(request):
     type_filter     = request.GET.get("type", "")
     severity_filter = request.GET.get("severity", "")
     status_filter   = request.GET.get("status", "")
+    q               = request.GET.get("q", "").strip()
 
     if type_filter:
         qs = qs.filter(incident_type=type_filter)
@@ -64,9 +67,14 @@ def incident_list(request):
         qs = qs.filter(severity=severity_filter)
     if status_filter:
         qs = qs.filter(status=status_filter)
+    qs = search(qs, org, "incident", q)
+    ordering = SEARCH_ORDERING if is_ranked(qs) else ("-date_occurred", "-id")
+    page_obj = paginate_keyset(request, qs, ordering)
 
     return render(request, "incidents/incident_list.html", {
-        "incidents":       qs,
+        "incidents":       page_obj,
+        "page_obj":        page_obj,
+        "q":               q,
         "type_filter":     type_filter,
         "severity_filter": severity_filter,
         "status_filter":   status_filter,
@@ -313,7 +321,10 @@ def incident_stats(request):
     org = _org(request)
     _manager_required(request)
 
-    from .stats import calculate_stats, get_monthly_trend, get_type_breakdown, get_location_breakdown
+    from .stats import (
+        _monthly_counts, calculate_stats, get_monthly_trend, get_rolling_rates,
+        get_type_breakdown, get_location_breakdown,
+    )
     from django.utils import timezone as tz
     import pandas as pd
     import plotly.express as px
@@ -322,10 +333,15 @@ def incident_stats(request):
     current_year = tz.now().year
     year = int(request.GET.get("year", current_year))
 
-    stats         = calculate_stats(org, year)
-    monthly_rows  = get_monthly_trend(org, year)
+    # One grouped month query feeds both the headline stats and the trend
+    counts        = _monthly_counts(org, year, year)
+    stats         = calculate_stats(org, year, counts)
+    monthly_rows  = get_monthly_trend(org, year, counts)
     type_rows     = get_type_breakdown(org, year)
     location_rows = get_location_breakdown(org, year)
+    # Three years of rolling rates, up to this month for the current year
+    rolling_end   = (year, tz.now().month) if year == current_year else (year, 12)
+    rolling_rows  = get_rolling_rates(org, (year - 2, 1), rolling_end)
 
     # ── 1. Monthly stacked bar ────────────────────────────────────────────────
     months = [r["month"] for r in monthly_rows]
@@ -408,6 +424,34 @@ def incident_stats(request):
     else:
         location_plot = ""
 
+    # ── 4. Rolling 12-month LTIFR / TRIFR ─────────────────────────────────────
+    if any(r["window_hours"] for r in rolling_rows):
+        rolling_fig = px.line(
+            pd.DataFrame({
+                "Month": [r["label"] for r in rolling_rows] * 2,
+                "Rate":  (
+                    [r["ltifr"] for r in rolling_rows] +
+                    [r["trifr"] for r in rolling_rows]
+                ),
+                "Series": ["LTIFR"] * len(rolling_rows) + ["TRIFR"] * len(rolling_rows),
+            }),
+            x="Month", y="Rate", color="Series", markers=True,
+            title="Rolling 12-Month LTIFR / TRIFR (per 1,000,000 hrs)",
+            color_discrete_map={"LTIFR": "#dc2626", "TRIFR": "#ea580c"},
+        )
+        rolling_fig.update_layout(
+            plot_bgcolor="white",
+            paper_bgcolor="white",
+            legend=dict(orientation="h", yanchor="bottom", y=-0.35, xanchor="center", x=0.5),
+            margin=dict(t=50, b=60, l=40, r=20),
+            xaxis=dict(showgrid=False),
+            yaxis=dict(gridcolor="#f1f5f9"),
+        )
+        rolling_fig.update_layout(modebar_add=["toImage"])
+        rolling_plot = pio.to_html(rolling_fig, full_html=False)
+    else:
+        rolling_plot = ""
+
     # ── Hours worked form ─────────────────────────────────────────────────────
     hw_form = HoursWorkedForm(initial={"year": year, "month": tz.now().month})
     if request.method == "POST":
@@ -427,6 +471,7 @@ def incident_stats(request):
         "monthly_plot":   pio.to_html(monthly_fig, full_html=False),
         "type_plot":      type_plot,
         "location_plot":  location_plot,
+        "rolling_plot":   rolling_plot,
         "hw_form":        hw_form,
         "year":           year,
         "year_range":     range(current_year - 3, current_year + 1),
@@ -0,0 +1,15 @@
+"""inspections/jobs.py — background job handlers (see jobs/registry.py)."""
+from jobs.registry import JobResult, register
+
+from .models import Inspection
+from .pdf import generate_inspection_pdf
+
+
+@register("inspections.pdf")
+def inspection_pdf(job):
+    org        = job.organization
+    inspection = Inspection.objects.get(pk=job.params["pk"], organization=org)
+    return JobResult(
+        filename=f"inspection_{inspection.pk}.pdf",
+        content=generate_inspection_pdf(inspection, org),
+    )
@@ -0,0 +1,29 @@
+# Generated by Django 5.1 on 2026-10-17 02:02
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_add_safety_manager_to_invitation_role'),
+        ('inspections', '0001_initial'),
+        ('observations', '0003_alter_location_options'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='inspection',
+            index=models.Index(fields=['organization', 'status', 'scheduled_date'], name='insp_org_status_sched_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='inspection',
+            index=models.Index(fields=['organization', '-scheduled_date'], name='insp_org_sched_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='inspection',
+            index=models.Index(condition=models.Q(('status', 'completed'), _negated=True), fields=['scheduled_date'], name='insp_open_sched_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.1 on 2026-10-17 02:57
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_searchentry'),
+        ('inspections', '0002_tenant_indexes'),
+        ('observations', '0005_keyset_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='inspection',
+            name='insp_org_sched_idx',
+        ),
+        migrations.AddIndex(
+            model_name='inspection',
+            index=models.Index(fields=['organization', '-scheduled_date', '-id'], name='insp_org_sched_idx'),
+        ),
+    ]
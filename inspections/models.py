@@ -119,6 +119,23 @@ class Inspection(models.Model):
 
     class Meta:
         ordering = ["-scheduled_date", "-created_at"]
+        indexes = [
+            # inspection_list + overdue auto-flagging per tenant
+            models.Index(
+                fields=["organization", "status", "scheduled_date"],
+                name="insp_org_status_sched_idx",
+            ),
+            models.Index(
+                fields=["organization", "-scheduled_date", "-id"],
+                name="insp_org_sched_idx",
+            ),
+            # send_inspection_alerts: only rows that are not yet completed
+            models.Index(
+                fields=["scheduled_date"],
+                condition=~models.Q(status="completed"),
+                name="insp_open_sched_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.title
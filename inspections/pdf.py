@@ -1,17 +1,69 @@
+import functools
 from io import BytesIO
-from django.http import HttpResponse
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.styles import ParagraphStyle
 from reportlab.lib.units import mm
 from reportlab.platypus import (
     SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, HRFlowable
 )
 
+from core.pdf import data_table, text_style
 from .models import InspectionFinding
 
+# ── Colour palette ──
+DARK    = colors.HexColor("#1a2c52")
+GREEN   = colors.HexColor("#16a34a")
+RED     = colors.HexColor("#dc2626")
+ORANGE  = colors.HexColor("#ea580c")
+GREY_BG = colors.HexColor("#f8f9fb")
+BORDER  = colors.HexColor("#e2e8f0")
+
+RESP_COLOURS = {
+    InspectionFinding.RESP_PASS: colors.HexColor("#dcfce7"),
+    InspectionFinding.RESP_FAIL: colors.HexColor("#fee2e2"),
+    InspectionFinding.RESP_NA:   colors.HexColor("#f1f5f9"),
+}
+RESP_TEXT_COLOURS = {
+    InspectionFinding.RESP_PASS: GREEN,
+    InspectionFinding.RESP_FAIL: RED,
+    InspectionFinding.RESP_NA:   colors.HexColor("#64748b"),
+}
+
+FINDINGS_TABLE_STYLE = [
+    ("BACKGROUND",    (0,0), (-1,0), DARK),
+    ("TEXTCOLOR",     (0,0), (-1,0), colors.white),
+    ("FONTNAME",      (0,0), (-1,0), "Helvetica-Bold"),
+    ("FONTSIZE",      (0,0), (-1,0), 8),
+    ("ROWBACKGROUNDS",(0,1), (-1,-1), [colors.white, GREY_BG]),
+    ("BOX",           (0,0), (-1,-1), 0.5, BORDER),
+    ("INNERGRID",     (0,0), (-1,-1), 0.3, BORDER),
+    ("TOPPADDING",    (0,0), (-1,-1), 5),
+    ("BOTTOMPADDING", (0,0), (-1,-1), 5),
+    ("LEFTPADDING",   (0,0), (-1,-1), 6),
+    ("RIGHTPADDING",  (0,0), (-1,-1), 6),
+    ("VALIGN",        (0,0), (-1,-1), "TOP"),
+]
+
+
+@functools.cache
+def _styles():
+    return {
+        "h1": ParagraphStyle("h1", fontSize=16, leading=20, textColor=DARK, spaceAfter=2, fontName="Helvetica-Bold"),
+        "h2": ParagraphStyle("h2", fontSize=11, leading=14, textColor=DARK, spaceAfter=4, fontName="Helvetica-Bold"),
+        "small_label": ParagraphStyle("lbl", fontSize=7, textColor=colors.HexColor("#6c757d"),
+                                      fontName="Helvetica-Bold", spaceAfter=1, leading=9),
+        "body": ParagraphStyle("body", fontSize=9, leading=13, textColor=colors.HexColor("#212529")),
+        "small": ParagraphStyle("small", fontSize=8, leading=11, textColor=colors.HexColor("#64748b")),
+        "rpt": ParagraphStyle("rpt", fontSize=9, fontName="Helvetica-Bold",
+                              textColor=colors.HexColor("#94a3b8"), alignment=2),
+        "score": ParagraphStyle("sc", fontSize=22, alignment=2, fontName="Helvetica-Bold"),
+        "warn": ParagraphStyle("warn", fontSize=9, textColor=ORANGE, fontName="Helvetica-Bold"),
+        "footer": ParagraphStyle("footer", fontSize=7, textColor=colors.HexColor("#94a3b8"), alignment=1),
+    }
+
 
-def generate_inspection_pdf(inspection, org):
+def generate_inspection_pdf(inspection, org) -> bytes:
     buf = BytesIO()
     doc = SimpleDocTemplate(
         buf, pagesize=A4,
@@ -19,31 +71,16 @@ def generate_inspection_pdf(inspection, org):
         topMargin=16*mm, bottomMargin=16*mm,
     )
 
-    styles  = getSampleStyleSheet()
+    st      = _styles()
     story   = []
 
-    # ── Colour palette ──
-    DARK    = colors.HexColor("#1a2c52")
-    GREEN   = colors.HexColor("#16a34a")
-    RED     = colors.HexColor("#dc2626")
-    ORANGE  = colors.HexColor("#ea580c")
-    GREY_BG = colors.HexColor("#f8f9fb")
-    BORDER  = colors.HexColor("#e2e8f0")
-
-    h1 = ParagraphStyle("h1", fontSize=16, leading=20, textColor=DARK, spaceAfter=2, fontName="Helvetica-Bold")
-    h2 = ParagraphStyle("h2", fontSize=11, leading=14, textColor=DARK, spaceAfter=4, fontName="Helvetica-Bold")
-    small_label = ParagraphStyle("lbl", fontSize=7, textColor=colors.HexColor("#6c757d"),
-                                 fontName="Helvetica-Bold", spaceAfter=1, leading=9)
-    body = ParagraphStyle("body", fontSize=9, leading=13, textColor=colors.HexColor("#212529"))
-    small = ParagraphStyle("small", fontSize=8, leading=11, textColor=colors.HexColor("#64748b"))
+    h1, h2, body, small = st["h1"], st["h2"], st["body"], st["small"]
+    small_label = st["small_label"]
 
     # ── Header ──
     header_data = [[
         Paragraph(org.name if org else "Vigilo", h1),
-        Paragraph("INSPECTION REPORT", ParagraphStyle(
-            "rpt", fontSize=9, fontName="Helvetica-Bold",
-            textColor=colors.HexColor("#94a3b8"), alignment=2
-        )),
+        Paragraph("INSPECTION REPORT", st["rpt"]),
     ]]
     header_tbl = Table(header_data, colWidths=["65%", "35%"])
     header_tbl.setStyle(TableStyle([
@@ -61,8 +98,8 @@ def generate_inspection_pdf(inspection, org):
     title_data = [[
         Paragraph(inspection.title, h1),
         Paragraph(
-            f'<font color="#{score_colour.hexval()[1:]}"><b>{score_text}</b></font>',
-            ParagraphStyle("sc", fontSize=22, alignment=2, fontName="Helvetica-Bold")
+            f'<font color="#{score_colour.hexval()[2:]}"><b>{score_text}</b></font>',
+            st["score"]
         ),
     ]]
     title_tbl = Table(title_data, colWidths=["75%", "25%"])
@@ -98,7 +135,7 @@ def generate_inspection_pdf(inspection, org):
         story.append(Spacer(1, 3*mm))
         story.append(Paragraph(
             "⚠ This inspection has one or more CRITICAL item failures.",
-            ParagraphStyle("warn", fontSize=9, textColor=ORANGE, fontName="Helvetica-Bold")
+            st["warn"]
         ))
 
     story.append(Spacer(1, 6*mm))
@@ -113,17 +150,6 @@ def generate_inspection_pdf(inspection, org):
         sec = f.template_item.section
         sections.setdefault(sec, []).append(f)
 
-    RESP_COLOURS = {
-        InspectionFinding.RESP_PASS: colors.HexColor("#dcfce7"),
-        InspectionFinding.RESP_FAIL: colors.HexColor("#fee2e2"),
-        InspectionFinding.RESP_NA:   colors.HexColor("#f1f5f9"),
-    }
-    RESP_TEXT_COLOURS = {
-        InspectionFinding.RESP_PASS: GREEN,
-        InspectionFinding.RESP_FAIL: RED,
-        InspectionFinding.RESP_NA:   colors.HexColor("#64748b"),
-    }
-
     for section, sec_findings in sections.items():
         story.append(Paragraph(section.title, h2))
         rows = [["#", "Question", "Response", "Notes"]]
@@ -133,47 +159,28 @@ def generate_inspection_pdf(inspection, org):
             rows.append([
                 Paragraph(str(i), small),
                 Paragraph(f.template_item.question + crit, body),
-                Paragraph(f"<b>{resp_label}</b>", ParagraphStyle(
-                    "resp", fontSize=8, fontName="Helvetica-Bold",
+                Paragraph(f"<b>{resp_label}</b>", text_style(
+                    fontSize=8, fontName="Helvetica-Bold",
                     textColor=RESP_TEXT_COLOURS.get(f.response, colors.black)
                 )),
                 Paragraph(f.notes or "—", small),
             ])
 
-        tbl = Table(rows, colWidths=[8*mm, 90*mm, 22*mm, None], repeatRows=1)
-        style = [
-            ("BACKGROUND",    (0,0), (-1,0), DARK),
-            ("TEXTCOLOR",     (0,0), (-1,0), colors.white),
-            ("FONTNAME",      (0,0), (-1,0), "Helvetica-Bold"),
-            ("FONTSIZE",      (0,0), (-1,0), 8),
-            ("ROWBACKGROUNDS",(0,1), (-1,-1), [colors.white, GREY_BG]),
-            ("BOX",           (0,0), (-1,-1), 0.5, BORDER),
-            ("INNERGRID",     (0,0), (-1,-1), 0.3, BORDER),
-            ("TOPPADDING",    (0,0), (-1,-1), 5),
-            ("BOTTOMPADDING", (0,0), (-1,-1), 5),
-            ("LEFTPADDING",   (0,0), (-1,-1), 6),
-            ("RIGHTPADDING",  (0,0), (-1,-1), 6),
-            ("VALIGN",        (0,0), (-1,-1), "TOP"),
-        ]
+        style = list(FINDINGS_TABLE_STYLE)
         # Colour the response column per row
         for row_idx, f in enumerate(sec_findings, 1):
             bg = RESP_COLOURS.get(f.response, colors.white)
             style.append(("BACKGROUND", (2, row_idx), (2, row_idx), bg))
 
-        tbl.setStyle(TableStyle(style))
-        story.append(tbl)
+        story.extend(data_table(rows, [8*mm, 90*mm, 22*mm, None], style))
         story.append(Spacer(1, 5*mm))
 
     # ── Footer note ──
     story.append(HRFlowable(width="100%", thickness=0.5, color=BORDER, spaceBefore=4))
     story.append(Paragraph(
         f"Generated by Vigilo Safety Management &nbsp;·&nbsp; {org.name if org else ''}",
-        ParagraphStyle("footer", fontSize=7, textColor=colors.HexColor("#94a3b8"), alignment=1)
+        st["footer"]
     ))
 
     doc.build(story)
-    buf.seek(0)
-    filename = f"inspection_{inspection.pk}.pdf"
-    response = HttpResponse(buf, content_type="application/pdf")
-    response["Content-Disposition"] = f'inline; filename="{filename}"'
-    return response
+    return buf.getvalue()
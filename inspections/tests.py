@@ -1,3 +1,173 @@
+"""
+Unit tests for the inspections app.
+Covers: conduct page finding materialization and bulk response saving,
+bulk critical-failure CA creation, JSON batch submit endpoint.
+"""
+import json
+
+from django.contrib.auth import get_user_model
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from actions.models import CorrectiveAction
+from core import entitlements
+from core.models import Organization, Plan
+from inspections.models import (
+    Inspection, InspectionFinding, InspectionItem, InspectionTemplate, TemplateSection,
+)
+
+User = get_user_model()
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def create_org_and_manager(domain="insporg"):
+    Plan.objects.get_or_create(name="Trial", defaults={"price_monthly": 0})
+    org = Organization.objects.create(name="Inspection Org", domain=domain)
+    user = User.objects.create_user(
+        email=f"manager@{domain}.com", password="pass1234", organization=org, role="manager",
+    )
+    return org, user
+
+
+def create_inspection(org, user, items=20, critical=(0, 1)):
+    template = InspectionTemplate.objects.create(organization=org, title="Site walk", created_by=user)
+    sections = [
+        TemplateSection.objects.create(template=template, title=f"Section {s}", order=s)
+        for s in range(2)
+    ]
+    InspectionItem.objects.bulk_create(
+        InspectionItem(section=sections[i % 2], question=f"Check {i}", order=i, is_critical=i in critical)
+        for i in range(items)
+    )
+    return Inspection.objects.create(
+        organization=org, template=template, title="Weekly walk", inspector=user,
+        scheduled_date=timezone.localdate(), created_by=user,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Conduct page
+# ---------------------------------------------------------------------------
+
+class InspectionConductTests(TestCase):
+
+    def setUp(self):
+        self.org, self.user = create_org_and_manager()
+        self.inspection = create_inspection(self.org, self.user)
+        self.client.force_login(self.user)
+        self.url = reverse("inspections:conduct", args=[self.inspection.pk])
+
+    def test_get_materializes_findings_in_constant_queries(self):
+        entitlements.for_org(self.org)              # warm the per-org snapshot
+        with CaptureQueriesContext(connection) as first:
+            self.assertEqual(self.client.get(self.url).status_code, 200)
+        self.assertEqual(self.inspection.findings.count(), 20)
+        self.inspection.refresh_from_db()
+        self.assertEqual(self.inspection.status, Inspection.STATUS_IN_PROGRESS)
+
+        big = create_inspection(self.org, self.user, items=120)
+        with CaptureQueriesContext(connection) as second:
+            self.client.get(reverse("inspections:conduct", args=[big.pk]))
+        self.assertEqual(big.findings.count(), 120)
+        self.assertEqual(len(second), len(first))
+
+        # Re-opening creates nothing new.
+        self.client.get(self.url)
+        self.assertEqual(self.inspection.findings.count(), 20)
+
+    def test_post_saves_responses_and_raises_critical_cas(self):
+        self.client.get(self.url)
+        findings = {f.template_item.order: f for f in self.inspection.findings.select_related("template_item")}
+        data = {f"resp_{f.pk}": InspectionFinding.RESP_PASS for f in findings.values()}
+        for order in (0, 1, 2):                 # two critical, one ordinary failure
+            data[f"resp_{findings[order].pk}"] = InspectionFinding.RESP_FAIL
+        data[f"notes_{findings[0].pk}"] = "Guard missing"
+        data[f"resp_{findings[19].pk}"] = InspectionFinding.RESP_NA
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(self.url, data)
+        self.assertRedirects(response, reverse("inspections:detail", args=[self.inspection.pk]))
+        self.assertLess(len(ctx), 30)
+
+        self.inspection.refresh_from_db()
+        self.assertEqual(self.inspection.status, Inspection.STATUS_COMPLETED)
+        self.assertEqual(self.inspection.score, round(16 / 19 * 100, 1))
+        self.assertEqual(InspectionFinding.objects.get(pk=findings[0].pk).notes, "Guard missing")
+
+        actions = CorrectiveAction.objects.filter(organization=self.org)
+        self.assertEqual(actions.count(), 2)
+        self.assertEqual(
+            set(self.inspection.findings.exclude(raised_action=None).values_list("template_item__order", flat=True)),
+            {0, 1},
+        )
+        self.assertTrue(all(a.source_module == CorrectiveAction.SOURCE_INSPECTION for a in actions))
+
+
+# ---------------------------------------------------------------------------
+# JSON batch submit
+# ---------------------------------------------------------------------------
+
+class InspectionSubmitTests(TestCase):
+
+    def setUp(self):
+        self.org, self.user = create_org_and_manager()
+        self.inspection = create_inspection(self.org, self.user, items=6)
+        self.items = list(
+            InspectionItem.objects.filter(section__template=self.inspection.template).order_by("order")
+        )
+        self.client.force_login(self.user)
+        self.url = reverse("inspections:submit", args=[self.inspection.pk])
+
+    def submit(self, payload):
+        return self.client.post(self.url, json.dumps(payload), content_type="application/json")
+
+    def test_submit_whole_checklist(self):
+        response = self.submit({"findings": [
+            {"item": item.pk, "response": "fail" if item.order == 0 else "pass",
+             "notes": "Frayed lead" if item.order == 0 else ""}
+            for item in self.items
+        ]})
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(body["status"], Inspection.STATUS_COMPLETED)
+        self.assertEqual(body["saved"], 6)
+        self.assertEqual(body["actions_raised"], 1)
+        self.assertAlmostEqual(body["score"], round(5 / 6 * 100, 1))
+        self.assertEqual(self.inspection.findings.get(template_item=self.items[0]).notes, "Frayed lead")
+
+        again = self.submit({"findings": []})
+        self.assertEqual(again.status_code, 409)
+
+    def test_partial_submit_without_completing(self):
+        response = self.submit({"findings": [{"item": self.items[2].pk, "response": "pass"}], "complete": False})
+        self.assertEqual(response.status_code, 200)
+        self.inspection.refresh_from_db()
+        self.assertEqual(self.inspection.status, Inspection.STATUS_IN_PROGRESS)
+        self.assertEqual(self.inspection.findings.count(), 6)
+        self.assertEqual(
+            list(self.inspection.findings.exclude(response="na").values_list("template_item", flat=True)),
+            [self.items[2].pk],
+        )
 
-# Create your tests here.
+    def test_invalid_payloads_are_rejected(self):
+        other = create_inspection(self.org, self.user, items=1)
+        foreign_item = InspectionItem.objects.get(section__template=other.template)
+        for payload in (
+            {"findings": [{"item": self.items[0].pk, "response": "maybe"}]},
+            {"findings": [{"item": "x", "response": "pass"}]},
+            {"findings": {"item": 1}},
+            {"findings": [{"item": foreign_item.pk, "response": "pass"}]},
+            {"findings": [], "complete": "false"},
+            {"findings": [], "complete": 0},
+        ):
+            self.assertEqual(self.submit(payload).status_code, 400, payload)
+        self.assertEqual(self.client.post(self.url, "{", content_type="application/json").status_code, 400)
+        self.inspection.refresh_from_db()
+        self.assertNotEqual(self.inspection.status, Inspection.STATUS_COMPLETED)
+        self.assertFalse(CorrectiveAction.objects.exists())
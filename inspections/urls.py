@@ -9,6 +9,7 @@ urlpatterns = [
     path("new/",                     views.inspection_create,  name="inspection_create"),
     path("<int:pk>/",                views.inspection_detail,  name="detail"),
     path("<int:pk>/conduct/",        views.inspection_conduct, name="conduct"),
+    path("<int:pk>/submit/",         views.inspection_submit,  name="submit"),
     path("<int:pk>/pdf/",            views.inspection_pdf,     name="pdf"),
     path("stats/",                   views.inspection_stats,   name="stats"),
 
@@ -1,12 +1,22 @@
+import json
+
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
+from django.http import JsonResponse
 from django.utils import timezone
 from django.db import transaction
+from django.db.models import Count, Q
+from django.views.decorators.http import require_POST
 
 from .models import InspectionTemplate, TemplateSection, InspectionItem, Inspection, InspectionFinding
 from .forms import InspectionTemplateForm, InspectionCreateForm, ConductFindingForm
 from core.utils.guards import org_required as _org_required
+from core import kpi_cache
+from core.utils.pagination import paginate_keyset
+from jobs.views import enqueue_for_request
+
+VALID_RESPONSES = tuple(value for value, _ in InspectionFinding.RESPONSE_CHOICES)
 
 
 def _org(request):
@@ -166,8 +176,11 @@ def inspection_list(request):
     from django.contrib.auth import get_user_model
     User = get_user_model()
 
+    page_obj = paginate_keyset(request, qs, ("-scheduled_date", "-id"))
+
     return render(request, "inspections/inspection_list.html", {
-        "inspections":       qs,
+        "inspections":       page_obj,
+        "page_obj":          page_obj,
         "templates":         InspectionTemplate.objects.filter(organization=org, is_active=True),
         "inspectors":        User.objects.filter(organization=org, is_active=True),
         "status_filter":     status_filter,
@@ -236,38 +249,70 @@ def inspection_detail(request, pk):
 
 # ── Conduct inspection ────────────────────────────────────────────────────────
 
-@login_required
-def inspection_conduct(request, pk):
-    org        = _org(request)
-    inspection = get_object_or_404(Inspection, pk=pk, organization=org)
-
+def _check_can_conduct(request, inspection):
     # Only inspector or managers can conduct
     if not (request.user == inspection.inspector or
             request.user.is_manager or request.user.is_safety_manager):
         from django.core.exceptions import PermissionDenied
         raise PermissionDenied
 
-    if inspection.status == Inspection.STATUS_COMPLETED:
-        messages.info(request, "This inspection is already completed.")
-        return redirect("inspections:detail", pk)
 
-    # Build or fetch findings for all items
-    all_items = InspectionItem.objects.filter(
+def _materialize_findings(inspection):
+    """Create the missing finding row of every template item in one INSERT."""
+    item_ids = InspectionItem.objects.filter(
         section__template=inspection.template
-    ).select_related("section").order_by("section__order", "order")
-
-    for item in all_items:
-        InspectionFinding.objects.get_or_create(
-            inspection=inspection, template_item=item
-        )
-
+    ).values_list("pk", flat=True)
+    existing = set(inspection.findings.values_list("template_item_id", flat=True))
+    missing  = [
+        InspectionFinding(inspection=inspection, template_item_id=item_id)
+        for item_id in item_ids if item_id not in existing
+    ]
+    if missing:
+        # ignore_conflicts: two tabs opening the same inspection at once.
+        InspectionFinding.objects.bulk_create(missing, ignore_conflicts=True)
+        kpi_cache.invalidate(inspection.organization, "inspections")
+
+
+def _start_inspection(inspection):
     if inspection.status == Inspection.STATUS_SCHEDULED:
         inspection.status = Inspection.STATUS_IN_PROGRESS
         inspection.save(update_fields=["status"])
 
-    findings = inspection.findings.select_related(
+
+def _save_findings(inspection, findings):
+    """
+    Write edited findings back with one bulk UPDATE. Findings carrying a new
+    photo are saved one by one so the upload pipeline (core/images.py)
+    cleans the photo and builds its variants.
+    """
+    plain = []
+    for finding in findings:
+        if finding.photo and not finding.photo._committed:
+            finding.save()
+        else:
+            plain.append(finding)
+    InspectionFinding.objects.bulk_update(plain, ["response", "notes"], batch_size=500)
+    # bulk_update fires no post_save, so the KPI receivers never see it.
+    kpi_cache.invalidate(inspection.organization, "inspections")
+
+
+@login_required
+def inspection_conduct(request, pk):
+    org        = _org(request)
+    inspection = get_object_or_404(Inspection, pk=pk, organization=org)
+    _check_can_conduct(request, inspection)
+
+    if inspection.status == Inspection.STATUS_COMPLETED:
+        messages.info(request, "This inspection is already completed.")
+        return redirect("inspections:detail", pk)
+
+    # Build or fetch findings for all items
+    _materialize_findings(inspection)
+    _start_inspection(inspection)
+
+    findings = list(inspection.findings.select_related(
         "template_item__section"
-    ).order_by("template_item__section__order", "template_item__order")
+    ).order_by("template_item__section__order", "template_item__order"))
 
     # Group by section
     from collections import OrderedDict
@@ -285,11 +330,11 @@ def inspection_conduct(request, pk):
                 resp  = request.POST.get(key_resp, InspectionFinding.RESP_NA)
                 notes = request.POST.get(key_notes, "")
                 photo = request.FILES.get(key_photo)
-                finding.response = resp
+                finding.response = resp if resp in VALID_RESPONSES else InspectionFinding.RESP_NA
                 finding.notes    = notes
                 if photo:
                     finding.photo = photo
-                finding.save()
+            _save_findings(inspection, findings)
 
             _complete_inspection(inspection, request)
 
@@ -299,21 +344,117 @@ def inspection_conduct(request, pk):
     return render(request, "inspections/inspection_conduct.html", {
         "inspection":  inspection,
         "sections":    sections,
-        "total_items": findings.count(),
+        "total_items": len(findings),
         "RESP_PASS":   InspectionFinding.RESP_PASS,
         "RESP_FAIL":   InspectionFinding.RESP_FAIL,
         "RESP_NA":     InspectionFinding.RESP_NA,
     })
 
 
+def _parse_submission(body):
+    """
+    Validate a batch submit body. Returns ({item_id: (response, notes)},
+    complete, errors).
+    """
+    try:
+        payload = json.loads(body or b"{}")
+    except ValueError:
+        return {}, False, {"body": ["Invalid JSON."]}
+    if not isinstance(payload, dict) or not isinstance(payload.get("findings", []), list):
+        return {}, False, {"findings": ["Expected an object with a \"findings\" list."]}
+
+    updates, errors = {}, {}
+    for i, entry in enumerate(payload.get("findings", [])):
+        item     = entry.get("item") if isinstance(entry, dict) else None
+        response = entry.get("response") if isinstance(entry, dict) else None
+        notes    = entry.get("notes", "") if isinstance(entry, dict) else None
+        if not isinstance(item, int) or isinstance(item, bool):
+            errors[f"findings[{i}]"] = ["\"item\" must be a template item id."]
+        elif response not in VALID_RESPONSES:
+            errors[f"findings[{i}]"] = [f"\"response\" must be one of {', '.join(VALID_RESPONSES)}."]
+        elif not isinstance(notes, str):
+            errors[f"findings[{i}]"] = ["\"notes\" must be a string."]
+        else:
+            updates[item] = (response, notes)
+    complete = payload.get("complete", True)
+    if not isinstance(complete, bool):
+        errors["complete"] = ["\"complete\" must be true or false."]
+    return updates, complete is True, errors
+
+
+@login_required
+@require_POST
+def inspection_submit(request, pk):
+    """
+    Batch submit for tablet clients — a whole checklist in one request:
+
+        POST /inspections/<pk>/submit/
+        {"findings": [{"item": 12, "response": "fail", "notes": "Guard missing"}, ...],
+         "complete": true}
+
+    ``item`` is the template item id. Items left out keep their current
+    response. With ``complete`` (the default) the inspection is scored and
+    closed, raising CAs for critical failures, as on the conduct page.
+    """
+    org        = _org(request)
+    inspection = get_object_or_404(Inspection, pk=pk, organization=org)
+    _check_can_conduct(request, inspection)
+
+    if inspection.status == Inspection.STATUS_COMPLETED:
+        return JsonResponse(
+            {"success": False, "errors": {"inspection": ["This inspection is already completed."]}},
+            status=409,
+        )
+
+    updates, complete, errors = _parse_submission(request.body)
+    if errors:
+        return JsonResponse({"success": False, "errors": errors}, status=400)
+
+    with transaction.atomic():
+        _materialize_findings(inspection)
+        by_item = {
+            f.template_item_id: f
+            for f in inspection.findings.filter(template_item_id__in=updates)
+        }
+        unknown = sorted(set(updates) - set(by_item))
+        if unknown:
+            return JsonResponse({"success": False, "errors": {
+                "findings": [f"Unknown template item ids: {', '.join(map(str, unknown))}."],
+            }}, status=400)
+
+        for item_id, (response, notes) in updates.items():
+            by_item[item_id].response = response
+            by_item[item_id].notes    = notes
+        _save_findings(inspection, by_item.values())
+        _start_inspection(inspection)
+
+        raised = _complete_inspection(inspection, request) if complete else 0
+
+    return JsonResponse({
+        "success":        True,
+        "id":             inspection.pk,
+        "status":         inspection.status,
+        "score":          inspection.score,
+        "saved":          len(by_item),
+        "actions_raised": raised,
+    })
+
+
 def _complete_inspection(inspection, request):
-    """Calculate score, set completed status, auto-raise CAs for critical failures."""
+    """
+    Calculate score, set completed status, auto-raise CAs for critical
+    failures. Returns the number of CAs raised.
+    """
     from django.utils.timezone import now
     from actions.models import CorrectiveAction
 
     findings = inspection.findings.all()
-    pass_count = findings.filter(response=InspectionFinding.RESP_PASS).count()
-    fail_count = findings.filter(response=InspectionFinding.RESP_FAIL).count()
+    counts = findings.aggregate(
+        passed=Count("pk", filter=Q(response=InspectionFinding.RESP_PASS)),
+        failed=Count("pk", filter=Q(response=InspectionFinding.RESP_FAIL)),
+    )
+    pass_count = counts["passed"]
+    fail_count = counts["failed"]
     total      = pass_count + fail_count
     score      = round((pass_count / total) * 100, 1) if total else None
 
@@ -323,16 +464,19 @@ def _complete_inspection(inspection, request):
     inspection.save(update_fields=["score", "status", "conducted_date"])
 
     # Auto-raise CA for every critical item that failed
-    critical_fails = findings.filter(
+    critical_fails = list(findings.filter(
         response=InspectionFinding.RESP_FAIL,
         template_item__is_critical=True,
         raised_action__isnull=True,
-    ).select_related("template_item")
+    ).select_related("template_item").order_by("pk"))
+    if not critical_fails:
+        return 0
 
-    for finding in critical_fails:
-        ca = CorrectiveAction.objects.create(
+    title_max = CorrectiveAction._meta.get_field("title").max_length
+    actions = CorrectiveAction.objects.bulk_create([
+        CorrectiveAction(
             organization  = inspection.organization,
-            title         = f"[Inspection] Critical failure: {finding.template_item.question}",
+            title         = f"[Inspection] Critical failure: {finding.template_item.question}"[:title_max],
             description   = (
                 f'Critical item failed during inspection "{inspection.title}".\n'
                 f"Inspector: {inspection.inspector}\n"
@@ -343,8 +487,13 @@ def _complete_inspection(inspection, request):
             assigned_to   = inspection.inspector,
             raised_by     = request.user,
         )
+        for finding in critical_fails
+    ])
+    for finding, ca in zip(critical_fails, actions):
         finding.raised_action = ca
-        finding.save(update_fields=["raised_action"])
+    InspectionFinding.objects.bulk_update(critical_fails, ["raised_action"])
+    kpi_cache.invalidate(inspection.organization, "actions", "inspections")
+    return len(actions)
 
 
 # ── Stats ─────────────────────────────────────────────────────────────────────
@@ -505,5 +654,5 @@ def inspection_stats(request):
 def inspection_pdf(request, pk):
     org        = _org(request)
     inspection = get_object_or_404(Inspection, pk=pk, organization=org)
-    from .pdf import generate_inspection_pdf
-    return generate_inspection_pdf(inspection, org)
+    # Rendered by a background worker (inspections/jobs.py).
+    return enqueue_for_request(request, "inspections.pdf", params={"pk": inspection.pk})
@@ -0,0 +1,12 @@
+from django.contrib import admin
+
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display  = ("id", "kind", "status", "organization", "created_by",
+                     "attempts", "created_at", "finished_at")
+    list_filter   = ("status", "kind")
+    search_fields = ("kind", "organization__name", "created_by__email")
+    readonly_fields = ("locked_by", "locked_at", "started_at", "finished_at", "last_error")
@@ -0,0 +1,13 @@
+from django.apps import AppConfig
+
+
+class JobsConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "jobs"
+    verbose_name = "Background Jobs"
+
+    def ready(self):
+        # Pull in every <app>/jobs.py so their @register handlers exist in
+        # both web and worker processes.
+        from django.utils.module_loading import autodiscover_modules
+        autodiscover_modules("jobs")
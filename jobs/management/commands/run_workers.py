@@ -0,0 +1,90 @@
+"""
+Management command: run_workers
+
+Runs N background job worker processes against the database-backed queue
+(jobs/queue.py). Each process claims one job at a time, so N is also the
+maximum number of heavy jobs running concurrently on this host.
+
+    python manage.py run_workers                # JOBS_WORKER_PROCESSES workers
+    python manage.py run_workers --processes 4
+    python manage.py run_workers --once         # drain the queue in-process, then exit
+
+SIGTERM / SIGINT stop the workers after their current job finishes.
+"""
+import multiprocessing
+import signal
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from jobs.queue import default_worker_id, work
+
+
+def _worker_main(index, poll_interval, stop_event):
+    # Parent handles Ctrl-C; children finish the current job and exit.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, lambda *_: stop_event.set())
+    work(default_worker_id(index), poll_interval=poll_interval,
+         should_stop=stop_event.is_set)
+
+
+class Command(BaseCommand):
+    help = "Run background job worker processes."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--processes", "-n", type=int,
+            default=getattr(settings, "JOBS_WORKER_PROCESSES", 2),
+            help="Number of worker processes (default: JOBS_WORKER_PROCESSES).",
+        )
+        parser.add_argument(
+            "--poll-interval", type=float,
+            default=getattr(settings, "JOBS_POLL_INTERVAL", 2),
+            help="Seconds to sleep when the queue is empty.",
+        )
+        parser.add_argument(
+            "--once", action="store_true",
+            help="Process every runnable job in this process, then exit.",
+        )
+
+    def handle(self, *args, **options):
+        if options["once"]:
+            processed = work(default_worker_id(), once=True)
+            self.stdout.write(self.style.SUCCESS(f"Done. {processed} job(s) processed."))
+            return
+
+        n = max(1, options["processes"])
+        poll = options["poll_interval"]
+        ctx = multiprocessing.get_context("fork")
+        stop_event = ctx.Event()
+
+        def _start(index):
+            proc = ctx.Process(target=_worker_main, args=(index, poll, stop_event),
+                               name=f"job-worker-{index}", daemon=False)
+            proc.start()
+            return proc
+
+        def _shutdown(*_):
+            stop_event.set()
+
+        signal.signal(signal.SIGTERM, _shutdown)
+        signal.signal(signal.SIGINT, _shutdown)
+
+        # Never share a DB socket across fork().
+        connections.close_all()
+        workers = [_start(i) for i in range(n)]
+        self.stdout.write(self.style.SUCCESS(f"Started {n} job worker(s)."))
+
+        # Supervise: replace workers that die unexpectedly.
+        while not stop_event.is_set():
+            for i, proc in enumerate(workers):
+                if not proc.is_alive():
+                    self.stderr.write(f"Worker {i} exited ({proc.exitcode}); restarting.")
+                    workers[i] = _start(i)
+            time.sleep(1)
+
+        for proc in workers:
+            proc.join()
+        self.stdout.write(self.style.SUCCESS("All job workers stopped."))
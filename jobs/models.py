@@ -0,0 +1,82 @@
+# jobs/models.py
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+
+
+class Job(models.Model):
+    """
+    A unit of background work, claimed by `manage.py run_workers`.
+
+    Handlers are looked up by `kind` in jobs.registry; their output (if any)
+    is written to `result_file` on the default storage backend.
+    """
+
+    STATUS_QUEUED    = "queued"
+    STATUS_RUNNING   = "running"
+    STATUS_SUCCEEDED = "succeeded"
+    STATUS_FAILED    = "failed"
+
+    STATUS_CHOICES = [
+        (STATUS_QUEUED,    "Queued"),
+        (STATUS_RUNNING,   "Running"),
+        (STATUS_SUCCEEDED, "Succeeded"),
+        (STATUS_FAILED,    "Failed"),
+    ]
+
+    kind         = models.CharField(max_length=100)
+    params       = models.JSONField(default=dict, blank=True)
+    status       = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_QUEUED)
+
+    organization = models.ForeignKey(
+        "core.Organization", on_delete=models.CASCADE, null=True, blank=True,
+        related_name="jobs",
+    )
+    created_by   = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True,
+        related_name="jobs",
+    )
+
+    # ── Scheduling / retries ──────────────────────────────────────────────────
+    attempts     = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=3)
+    run_after    = models.DateTimeField(default=timezone.now)
+    locked_by    = models.CharField(max_length=100, blank=True)
+    locked_at    = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True,
+                                        help_text="Refreshed by the worker while the job runs.")
+    last_error   = models.TextField(blank=True)
+
+    # ── Result ────────────────────────────────────────────────────────────────
+    result_file  = models.FileField(upload_to="jobs/%Y/%m/", blank=True)
+    result_name  = models.CharField(max_length=255, blank=True,
+                                    help_text="Download filename shown to the user.")
+
+    created_at   = models.DateTimeField(auto_now_add=True)
+    started_at   = models.DateTimeField(null=True, blank=True)
+    finished_at  = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            # Worker claim query: oldest runnable queued job first.
+            models.Index(
+                fields=["run_after", "id"],
+                condition=models.Q(status="queued"),
+                name="job_runnable_idx",
+            ),
+            # Stale-job sweep: running jobs whose worker stopped heartbeating.
+            models.Index(fields=["status", "heartbeat_at"], name="job_status_heartbeat_idx"),
+            models.Index(fields=["created_by", "-created_at"], name="job_owner_created_idx"),
+        ]
+
+    def __str__(self):
+        return f"Job #{self.pk} {self.kind} ({self.status})"
+
+    @property
+    def is_finished(self):
+        return self.status in (self.STATUS_SUCCEEDED, self.STATUS_FAILED)
+
+    @property
+    def has_result(self):
+        return self.status == self.STATUS_SUCCEEDED and bool(self.result_file)
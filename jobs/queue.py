@@ -0,0 +1,249 @@
+# jobs/queue.py
+"""
+Durable job queue on top of the default database — no external broker.
+
+    job = enqueue("audit_export.iso45001_pack", organization=org,
+                  user=request.user, params={...})
+
+Workers (`manage.py run_workers`) call claim_next() in a loop. Claiming uses
+SELECT ... FOR UPDATE SKIP LOCKED on Postgres so concurrent workers never
+block on or double-claim the same row; the follow-up conditional UPDATE
+keeps it safe on SQLite, where row locks are not available.
+
+While a job runs, a side thread refreshes its heartbeat_at every
+JOBS_HEARTBEAT_INTERVAL seconds; requeue_stale() releases running jobs whose
+heartbeat is older than JOBS_LOCK_TIMEOUT, however long they legitimately take.
+"""
+import logging
+import os
+import socket
+import threading
+import time
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.base import ContentFile, File
+from django.db import close_old_connections, connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Job
+from .registry import get_handler
+
+logger = logging.getLogger(__name__)
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def default_worker_id(index=0):
+    return f"{socket.gethostname()}:{os.getpid()}:{index}"
+
+
+# ---------------------------------------------------------------------------
+# Producer side
+# ---------------------------------------------------------------------------
+
+def enqueue(kind, *, organization=None, user=None, params=None, max_attempts=None, run_after=None):
+    """Persist a new job. Committed with the caller's transaction, if any."""
+    return Job.objects.create(
+        kind=kind,
+        params=params or {},
+        organization=organization,
+        created_by=user if user is not None and user.is_authenticated else None,
+        max_attempts=max_attempts or _setting("JOBS_MAX_ATTEMPTS", 3),
+        run_after=run_after or timezone.now(),
+    )
+
+
+# ---------------------------------------------------------------------------
+# Worker side
+# ---------------------------------------------------------------------------
+
+def claim_next(worker_id):
+    """Lock and mark the oldest runnable job as running; None if idle."""
+    now = timezone.now()
+    with transaction.atomic():
+        job = (
+            Job.objects
+            .select_for_update(skip_locked=True)
+            .filter(status=Job.STATUS_QUEUED, run_after__lte=now)
+            .order_by("run_after", "id")
+            .first()
+        )
+        if job is None:
+            return None
+        claimed = Job.objects.filter(pk=job.pk, status=Job.STATUS_QUEUED).update(
+            status=Job.STATUS_RUNNING,
+            locked_by=worker_id,
+            locked_at=now,
+            heartbeat_at=now,
+            started_at=now,
+            attempts=F("attempts") + 1,
+        )
+    if not claimed:
+        return None
+    job.refresh_from_db()
+    return job
+
+
+def run_job(job):
+    """Execute a claimed job's handler and record the outcome. Returns True on success."""
+    handler = get_handler(job.kind)
+    if handler is None:
+        _finish(job, Job.STATUS_FAILED, error=f"No handler registered for '{job.kind}'.")
+        return False
+
+    with _Heartbeat(job):
+        try:
+            result = handler(job)
+        except Exception:
+            _record_failure(job, traceback.format_exc())
+            return False
+
+        try:
+            if result is not None:
+                job.result_name = result.filename
+                if result.file is not None:
+                    # Storage backends copy File objects in chunks — never fully in memory.
+                    with result.file:
+                        job.result_file.save(result.filename, File(result.file), save=False)
+                else:
+                    job.result_file.save(result.filename, ContentFile(result.content), save=False)
+            _finish(job, Job.STATUS_SUCCEEDED)
+        except Exception:
+            # Storing the artifact or the status failed: never leave the job
+            # RUNNING. A plain UPDATE, since job.save() may be what failed.
+            error = traceback.format_exc()
+            logger.error("Job #%s (%s) could not be completed:\n%s", job.pk, job.kind, error)
+            Job.objects.filter(pk=job.pk).update(
+                status=Job.STATUS_FAILED, finished_at=timezone.now(),
+                locked_by="", locked_at=None, last_error=error,
+            )
+            return False
+    return True
+
+
+def heartbeat(job):
+    """Mark ``job`` as alive. False once the job is no longer held by its worker."""
+    return bool(
+        Job.objects
+        .filter(pk=job.pk, status=Job.STATUS_RUNNING, locked_by=job.locked_by)
+        .update(heartbeat_at=timezone.now())
+    )
+
+
+class _Heartbeat:
+    """Call heartbeat(job) from a daemon thread every JOBS_HEARTBEAT_INTERVAL seconds."""
+
+    def __init__(self, job):
+        self.job = job
+        self.interval = _setting("JOBS_HEARTBEAT_INTERVAL", 60)
+        self.stopped = threading.Event()
+        self.thread = None
+
+    def __enter__(self):
+        if self.interval:
+            self.thread = threading.Thread(
+                target=self._run, name=f"job-{self.job.pk}-heartbeat", daemon=True,
+            )
+            self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join()
+
+    def _run(self):
+        try:
+            while not self.stopped.wait(self.interval):
+                try:
+                    if not heartbeat(self.job):
+                        return
+                except Exception:
+                    logger.warning("Heartbeat for job #%s failed", self.job.pk, exc_info=True)
+        finally:
+            # Connections are per thread: close the one this thread opened.
+            connections.close_all()
+
+
+def _finish(job, status, error=""):
+    job.status      = status
+    job.finished_at = timezone.now()
+    job.locked_by   = ""
+    job.locked_at   = None
+    if error:
+        job.last_error = error
+    job.save()
+
+
+def _record_failure(job, error):
+    if job.attempts >= job.max_attempts:
+        logger.error("Job #%s (%s) failed permanently:\n%s", job.pk, job.kind, error)
+        _finish(job, Job.STATUS_FAILED, error=error)
+        return
+
+    # Exponential backoff: base, 2×base, 4×base …
+    delay = _setting("JOBS_RETRY_BACKOFF", 30) * 2 ** (job.attempts - 1)
+    logger.warning("Job #%s (%s) attempt %s failed; retrying in %ss",
+                   job.pk, job.kind, job.attempts, delay)
+    job.status     = Job.STATUS_QUEUED
+    job.run_after  = timezone.now() + timedelta(seconds=delay)
+    job.locked_by  = ""
+    job.locked_at  = None
+    job.last_error = error
+    job.save()
+
+
+def requeue_stale():
+    """
+    Release jobs whose worker died mid-run: no heartbeat for JOBS_LOCK_TIMEOUT
+    (jobs claimed before heartbeats existed fall back to locked_at).
+    The lost attempt still counts towards max_attempts.
+    """
+    cutoff = timezone.now() - timedelta(seconds=_setting("JOBS_LOCK_TIMEOUT", 300))
+    stale = Job.objects.filter(
+        Q(heartbeat_at__lt=cutoff) | Q(heartbeat_at__isnull=True, locked_at__lt=cutoff),
+        status=Job.STATUS_RUNNING,
+    )
+    failed = stale.filter(attempts__gte=F("max_attempts")).update(
+        status=Job.STATUS_FAILED, finished_at=timezone.now(),
+        locked_by="", locked_at=None, last_error="Worker lost (no heartbeat).",
+    )
+    requeued = stale.update(
+        status=Job.STATUS_QUEUED, run_after=timezone.now(),
+        locked_by="", locked_at=None,
+    )
+    return requeued + failed
+
+
+def work(worker_id, *, poll_interval=None, once=False, should_stop=lambda: False):
+    """
+    Claim and run jobs until ``should_stop()`` (or, with ``once``, until the
+    queue is empty). Returns the number of jobs processed.
+    """
+    poll_interval = poll_interval or _setting("JOBS_POLL_INTERVAL", 2)
+    processed = 0
+    last_sweep = 0.0
+
+    while not should_stop():
+        close_old_connections()
+        if time.monotonic() - last_sweep > 60:
+            requeue_stale()
+            last_sweep = time.monotonic()
+
+        job = claim_next(worker_id)
+        if job is None:
+            if once:
+                break
+            time.sleep(poll_interval)
+            continue
+
+        logger.info("Worker %s running job #%s (%s)", worker_id, job.pk, job.kind)
+        run_job(job)
+        processed += 1
+
+    return processed
@@ -0,0 +1,48 @@
+# jobs/registry.py
+"""
+Job handler registry.
+
+Apps register handlers in their own ``jobs.py`` (autodiscovered by
+JobsConfig.ready):
+
+    from jobs.registry import JobResult, register
+
+    @register("audit_export.iso45001_pack")
+    def build_pack(job):
+        ...
+        return JobResult(filename="pack.zip", content=zip_bytes)
+        # or, for large artifacts, an open file streamed into storage:
+        return JobResult(filename="pack.zip", file=tmp_file)
+
+A handler receives the Job instance and may return a JobResult (stored as
+the job's downloadable artifact) or None. Raising marks the attempt failed;
+the job is retried with backoff until max_attempts is reached.
+"""
+from dataclasses import dataclass
+from typing import IO, Callable, Optional
+
+_handlers: dict[str, Callable] = {}
+
+
+@dataclass
+class JobResult:
+    filename: str
+    content: Optional[bytes] = None
+    file: Optional[IO[bytes]] = None   # closed by the queue after saving
+
+
+def register(kind: str):
+    def decorator(func):
+        if kind in _handlers and _handlers[kind] is not func:
+            raise ValueError(f"Job kind '{kind}' is already registered.")
+        _handlers[kind] = func
+        return func
+    return decorator
+
+
+def get_handler(kind: str) -> Optional[Callable]:
+    return _handlers.get(kind)
+
+
+def registered_kinds() -> list[str]:
+    return sorted(_handlers)
@@ -0,0 +1,269 @@
+"""
+Unit tests for the jobs app.
+Covers: enqueue / claim_next / run_job (success, retry with backoff, permanent
+failure, unknown kind), requeue_stale, run_workers --once, job status /
+download views and audit export enqueueing.
+"""
+import shutil
+import tempfile
+import threading
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import DatabaseError
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from core.models import Organization, Plan
+from jobs.models import Job
+from jobs.queue import claim_next, enqueue, heartbeat, requeue_stale, run_job
+from jobs.registry import JobResult, register
+
+User = get_user_model()
+
+_MEDIA_ROOT = tempfile.mkdtemp()
+
+
+@register("tests.hello")
+def _hello(job):
+    return JobResult(filename="hello.txt", content=f"hello {job.params['name']}".encode())
+
+
+@register("tests.boom")
+def _boom(job):
+    raise RuntimeError("boom")
+
+
+_beaten = threading.Event()
+
+
+@register("tests.slow")
+def _slow(job):
+    # Runs until the heartbeat thread has fired at least once.
+    if not _beaten.wait(5):
+        raise RuntimeError("no heartbeat")
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def create_org_and_user(domain="joborg", role="observer"):
+    Plan.objects.get_or_create(name="Trial", defaults={"price_monthly": 0})
+    org = Organization.objects.get_or_create(name="Job Org", domain=domain)[0]
+    user = User.objects.create_user(
+        email=f"{role}@{domain}.com", password="pass1234", organization=org, role=role,
+    )
+    return org, user
+
+
+@override_settings(MEDIA_ROOT=_MEDIA_ROOT, JOBS_RETRY_BACKOFF=10)
+class QueueTests(TestCase):
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(_MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        self.org, self.user = create_org_and_user()
+
+    def test_claim_marks_job_running(self):
+        job = enqueue("tests.hello", organization=self.org, user=self.user, params={"name": "x"})
+        claimed = claim_next("w1")
+        self.assertEqual(claimed.pk, job.pk)
+        self.assertEqual(claimed.status, Job.STATUS_RUNNING)
+        self.assertEqual(claimed.attempts, 1)
+        self.assertEqual(claimed.locked_by, "w1")
+        self.assertIsNone(claim_next("w2"))
+
+    def test_future_job_is_not_claimed(self):
+        enqueue("tests.hello", run_after=timezone.now() + timedelta(minutes=5))
+        self.assertIsNone(claim_next("w1"))
+
+    def test_success_stores_artifact(self):
+        enqueue("tests.hello", organization=self.org, params={"name": "world"})
+        job = claim_next("w1")
+        self.assertTrue(run_job(job))
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.STATUS_SUCCEEDED)
+        self.assertEqual(job.result_name, "hello.txt")
+        with job.result_file.open("rb") as fh:
+            self.assertEqual(fh.read(), b"hello world")
+
+    def test_failure_is_retried_with_backoff(self):
+        enqueue("tests.boom", max_attempts=3)
+        job = claim_next("w1")
+        before = timezone.now()
+        self.assertFalse(run_job(job))
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.STATUS_QUEUED)
+        self.assertIn("RuntimeError: boom", job.last_error)
+        self.assertGreaterEqual(job.run_after, before + timedelta(seconds=10))
+
+    def test_failure_is_permanent_after_max_attempts(self):
+        enqueue("tests.boom", max_attempts=1)
+        job = claim_next("w1")
+        run_job(job)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.STATUS_FAILED)
+        self.assertIsNotNone(job.finished_at)
+
+    def test_unknown_kind_fails_without_retry(self):
+        enqueue("tests.missing", max_attempts=5)
+        job = claim_next("w1")
+        run_job(job)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.STATUS_FAILED)
+
+    def test_requeue_stale_releases_lost_jobs(self):
+        job = enqueue("tests.hello", params={"name": "x"})
+        Job.objects.filter(pk=job.pk).update(
+            status=Job.STATUS_RUNNING, attempts=1,
+            locked_at=timezone.now() - timedelta(hours=2),
+        )
+        self.assertEqual(requeue_stale(), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.STATUS_QUEUED)
+
+    def test_failed_completion_save_marks_job_failed(self):
+        enqueue("tests.hello", params={"name": "x"})
+        job = claim_next("w1")
+        with mock.patch.object(Job, "save", side_effect=DatabaseError("disk full")):
+            self.assertFalse(run_job(job))
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.STATUS_FAILED)
+        self.assertEqual(job.locked_by, "")
+        self.assertIn("disk full", job.last_error)
+
+    def test_requeue_stale_spares_jobs_that_still_heartbeat(self):
+        enqueue("tests.hello", params={"name": "x"})
+        job = claim_next("w1")
+        # Claimed long ago, but the worker is still beating.
+        Job.objects.filter(pk=job.pk).update(locked_at=timezone.now() - timedelta(hours=2))
+        self.assertTrue(heartbeat(job))
+        self.assertEqual(requeue_stale(), 0)
+
+        Job.objects.filter(pk=job.pk).update(heartbeat_at=timezone.now() - timedelta(hours=1))
+        self.assertEqual(requeue_stale(), 1)
+        # The released job is no longer this worker's to beat for.
+        self.assertFalse(heartbeat(job))
+
+    @override_settings(JOBS_HEARTBEAT_INTERVAL=0.01)
+    def test_worker_heartbeats_while_handler_runs(self):
+        enqueue("tests.slow")
+        job = claim_next("w1")
+        _beaten.clear()
+        with mock.patch("jobs.queue.heartbeat", side_effect=lambda job: _beaten.set() or True) as beat:
+            self.assertTrue(run_job(job))
+        beat.assert_called_with(job)
+
+    def test_run_workers_once_drains_queue(self):
+        for name in ("a", "b"):
+            enqueue("tests.hello", params={"name": name})
+        call_command("run_workers", "--once", stdout=open("/dev/null", "w"))
+        self.assertEqual(Job.objects.filter(status=Job.STATUS_SUCCEEDED).count(), 2)
+
+
+@override_settings(MEDIA_ROOT=_MEDIA_ROOT)
+class JobViewTests(TestCase):
+
+    def setUp(self):
+        self.org, self.user = create_org_and_user()
+        self.client.force_login(self.user)
+
+    def _finished_job(self, user=None):
+        enqueue("tests.hello", organization=self.org, user=user or self.user, params={"name": "v"})
+        job = claim_next("w1")
+        run_job(job)
+        return job
+
+    def test_status_and_download(self):
+        job = self._finished_job()
+        data = self.client.get(reverse("jobs:status", args=[job.pk])).json()
+        self.assertEqual(data["status"], Job.STATUS_SUCCEEDED)
+        self.assertEqual(data["download_url"], reverse("jobs:download", args=[job.pk]))
+
+        response = self.client.get(data["download_url"])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b"".join(response.streaming_content), b"hello v")
+        self.assertIn('filename="hello.txt"', response["Content-Disposition"])
+
+    def test_other_users_job_is_forbidden(self):
+        _, other = create_org_and_user(role="action_owner")
+        job = self._finished_job(user=other)
+        response = self.client.get(reverse("jobs:status", args=[job.pk]))
+        self.assertEqual(response.status_code, 403)
+
+    def test_audit_export_enqueues_job(self):
+        response = self.client.post(
+            reverse("audit_export:generate"),
+            {"from_date": "2025-01-01", "to_date": "2025-12-31"},
+        )
+        job = Job.objects.get(kind="audit_export.iso45001_pack")
+        self.assertRedirects(response, reverse("jobs:detail", args=[job.pk]))
+        self.assertEqual(job.params, {"from_date": "2025-01-01", "to_date": "2025-12-31"})
+        self.assertEqual(job.organization, self.org)
+
+    def test_audit_pack_job_produces_zip(self):
+        import io
+        import zipfile
+        self.client.post(
+            reverse("audit_export:generate"),
+            {"from_date": "2025-01-01", "to_date": "2025-12-31"},
+        )
+        job = claim_next("w1")
+        self.assertTrue(run_job(job))
+        job.refresh_from_db()
+        self.assertTrue(job.result_name.startswith("ISO45001_Pack_"))
+        with job.result_file.open("rb") as fh:
+            names = zipfile.ZipFile(io.BytesIO(fh.read())).namelist()
+        self.assertIn("00_Master_Index.pdf", names)
+        self.assertEqual(len(names), 10)
+
+    def test_pdf_and_excel_exports_run_as_jobs(self):
+        from hira.models import HazardRegister
+        from inspections.models import Inspection, InspectionTemplate
+        from observations.models import Location, Observation
+
+        _, manager = create_org_and_user(role="manager")
+        self.client.force_login(manager)
+        location = Location.objects.create(organization=self.org, name="Yard")
+        obs = Observation.objects.create(
+            organization=self.org, location=location, observer=manager, title="Leak", description="-",
+        )
+        template = InspectionTemplate.objects.create(organization=self.org, title="Walk", created_by=manager)
+        inspection = Inspection.objects.create(
+            organization=self.org, template=template, title="Monthly walk", inspector=manager,
+            scheduled_date=timezone.now().date(), created_by=manager,
+        )
+        hazard_register = HazardRegister.objects.create(organization=self.org, title="Yard", activity="-")
+
+        exports = {
+            "observations.export_excel": (reverse("observations:export_observations_excel"), b"PK"),
+            "observations.pdf_report":   (reverse("observations:pdf_report", args=[obs.pk]), b"%PDF"),
+            "inspections.pdf":           (reverse("inspections:pdf", args=[inspection.pk]), b"%PDF"),
+            "hira.register_pdf":         (reverse("hira:register_pdf", args=[hazard_register.pk]), b"%PDF"),
+            "hira.export_excel":         (reverse("hira:export_excel"), b"PK"),
+        }
+        for kind, (url, magic) in exports.items():
+            with self.subTest(kind):
+                response = self.client.get(url)
+                job = Job.objects.get(kind=kind)
+                self.assertRedirects(response, reverse("jobs:detail", args=[job.pk]))
+                self.assertTrue(run_job(claim_next("w1")))
+                job.refresh_from_db()
+                with job.result_file.open("rb") as fh:
+                    self.assertTrue(fh.read().startswith(magic))
+
+    def test_enqueue_returns_202_for_json_clients(self):
+        response = self.client.post(
+            reverse("audit_export:generate"),
+            {"from_date": "2025-01-01", "to_date": "2025-12-31"},
+            HTTP_ACCEPT="application/json",
+        )
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json()["status"], Job.STATUS_QUEUED)
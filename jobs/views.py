@@ -0,0 +1,87 @@
+# jobs/views.py
+from django.contrib.auth.decorators import login_required
+from django.core.exceptions import PermissionDenied
+from django.http import FileResponse, Http404, JsonResponse
+from django.shortcuts import get_object_or_404, redirect, render
+from django.urls import reverse
+
+from core.utils.guards import org_required as _org_required
+
+from .models import Job
+from .queue import enqueue
+
+
+def _get_job(request, pk):
+    """Jobs are visible to their creator and to managers of the same org."""
+    _org_required(request)
+    job = get_object_or_404(Job, pk=pk, organization=request.organization)
+    user = request.user
+    if job.created_by_id != user.pk and not (user.is_manager or user.is_safety_manager):
+        raise PermissionDenied
+    return job
+
+
+def _wants_json(request):
+    return (
+        request.headers.get("x-requested-with") == "XMLHttpRequest"
+        or "application/json" in request.headers.get("accept", "")
+    )
+
+
+def _job_payload(job):
+    return {
+        "id":           job.pk,
+        "kind":         job.kind,
+        "status":       job.status,
+        "attempts":     job.attempts,
+        "max_attempts": job.max_attempts,
+        "finished":     job.is_finished,
+        "error":        job.last_error.strip().splitlines()[-1] if job.status == Job.STATUS_FAILED and job.last_error else "",
+        "status_url":   reverse("jobs:status", args=[job.pk]),
+        "download_url": reverse("jobs:download", args=[job.pk]) if job.has_result else None,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Enqueue — called by feature views, not routed directly
+# ---------------------------------------------------------------------------
+
+def enqueue_for_request(request, kind, params=None, **kwargs):
+    """
+    Queue a job on behalf of the current user and answer the request:
+    202 + JSON for API / XHR callers, otherwise a redirect to the job page
+    which polls until the result is ready.
+    """
+    job = enqueue(kind, organization=request.organization, user=request.user,
+                  params=params, **kwargs)
+    if _wants_json(request):
+        return JsonResponse(_job_payload(job), status=202)
+    return redirect("jobs:detail", pk=job.pk)
+
+
+# ---------------------------------------------------------------------------
+# Poll / download
+# ---------------------------------------------------------------------------
+
+@login_required
+def job_detail(request, pk):
+    job = _get_job(request, pk)
+    return render(request, "jobs/job_detail.html", {"job": job, "payload": _job_payload(job)})
+
+
+@login_required
+def job_status(request, pk):
+    job = _get_job(request, pk)
+    return JsonResponse(_job_payload(job))
+
+
+@login_required
+def job_download(request, pk):
+    job = _get_job(request, pk)
+    if not job.has_result:
+        raise Http404("This job has no downloadable result.")
+    return FileResponse(
+        job.result_file.open("rb"),
+        as_attachment=True,
+        filename=job.result_name or job.result_file.name.rsplit("/", 1)[-1],
+    )
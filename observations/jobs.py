@@ -0,0 +1,17 @@
+"""observations/jobs.py — background job handlers (see jobs/registry.py)."""
+from jobs.registry import JobResult, register
+
+from .models import Observation
+from .pdf_report import generate_observation_pdf
+from .views import build_excel
+
+
+@register("observations.export_excel")
+def export_excel(job):
+    return JobResult(filename="observations.xlsx", file=build_excel(job.organization).save())
+
+
+@register("observations.pdf_report")
+def pdf_report(job):
+    obs = Observation.objects.get(pk=job.params["pk"], organization=job.organization)
+    return JobResult(filename=f"observation-{obs.pk:04d}.pdf", content=generate_observation_pdf(obs))
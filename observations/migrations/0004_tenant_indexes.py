@@ -0,0 +1,32 @@
+# Generated by Django 5.1 on 2026-10-17 02:02
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_add_safety_manager_to_invitation_role'),
+        ('observations', '0003_alter_location_options'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='observation',
+            index=models.Index(condition=models.Q(('is_archived', False)), fields=['organization', '-date_observed'], name='obs_org_live_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='observation',
+            index=models.Index(fields=['organization', 'status', 'target_date'], name='obs_org_status_target_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='observation',
+            index=models.Index(fields=['assigned_to', 'status'], name='obs_assignee_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='observation',
+            index=models.Index(condition=models.Q(('is_archived', False), models.Q(('status', 'CLOSED'), _negated=True)), fields=['target_date'], name='obs_open_target_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.1 on 2026-10-17 02:57
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_searchentry'),
+        ('observations', '0004_tenant_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='observation',
+            name='obs_org_live_date_idx',
+        ),
+        migrations.AddIndex(
+            model_name='observation',
+            index=models.Index(condition=models.Q(('is_archived', False)), fields=['organization', '-date_observed', '-id'], name='obs_org_live_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='observation',
+            index=models.Index(condition=models.Q(('is_archived', True)), fields=['organization', '-id'], name='obs_org_archived_idx'),
+        ),
+    ]
@@ -55,6 +55,35 @@ class Observation(models.Model):
     verification_comment = models.TextField(blank=True, null=True)
     is_archived = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [
+            # observation_list / dashboard: live (non-archived) rows, newest first
+            models.Index(
+                fields=["organization", "-date_observed", "-id"],
+                condition=models.Q(is_archived=False),
+                name="obs_org_live_date_idx",
+            ),
+            # archived_observations_list keyset pages
+            models.Index(
+                fields=["organization", "-id"],
+                condition=models.Q(is_archived=True),
+                name="obs_org_archived_idx",
+            ),
+            # KPI counts: open / overdue / awaiting verification per tenant
+            models.Index(
+                fields=["organization", "status", "target_date"],
+                name="obs_org_status_target_idx",
+            ),
+            # "Assigned to me" cards on the landing page
+            models.Index(fields=["assigned_to", "status"], name="obs_assignee_status_idx"),
+            # send_overdue_alerts: cross-tenant scan of open, live rows by target date
+            models.Index(
+                fields=["target_date"],
+                condition=models.Q(is_archived=False) & ~models.Q(status="CLOSED"),
+                name="obs_open_target_idx",
+            ),
+        ]
+
     def close(self):
         self.status = 'CLOSED'
         self.date_closed = timezone.now()
@@ -4,6 +4,7 @@ Generate a single-observation PDF report using ReportLab.
 """
 from __future__ import annotations
 
+import functools
 from io import BytesIO
 from datetime import datetime
 
@@ -12,7 +13,7 @@ from django.utils import timezone
 from reportlab.lib import colors
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
 from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.lib.styles import ParagraphStyle
 from reportlab.lib.units import cm
 from reportlab.platypus import (
     BaseDocTemplate,
@@ -26,7 +27,9 @@ from reportlab.platypus import (
     TableStyle,
 )
 
+from core.images import variant_bytes
 from core.logo_utils import get_logo_for_pdf
+from core.pdf import text_style
 
 # ── Colour palette ────────────────────────────────────────────────────────────
 BRAND_DARK   = colors.HexColor("#1a2c52")
@@ -50,8 +53,8 @@ PAGE_W, PAGE_H = A4
 MARGIN = 1.8 * cm
 
 
+@functools.cache
 def _styles():
-    base = getSampleStyleSheet()
     return {
         "org_name": ParagraphStyle(
             "org_name",
@@ -112,8 +115,8 @@ def _badge_cell(text, bg_color, text_color=colors.white):
     """Return a single-cell Table that renders as a coloured badge."""
     t = Table([[Paragraph(
         f'<font name="Helvetica-Bold" size="8" color="#{text_color.hexval()[2:]}">{text}</font>',
-        ParagraphStyle("b", fontSize=8, fontName="Helvetica-Bold",
-                       textColor=text_color, leading=10, alignment=TA_CENTER),
+        text_style(fontSize=8, fontName="Helvetica-Bold",
+                   textColor=text_color, leading=10, alignment=TA_CENTER),
     )]], colWidths=[3.5 * cm], rowHeights=[0.55 * cm])
     t.setStyle(TableStyle([
         ("BACKGROUND", (0, 0), (-1, -1), bg_color),
@@ -129,15 +132,14 @@ def _badge_cell(text, bg_color, text_color=colors.white):
 
 
 def _photo_image(field, max_w, max_h):
-    """Return a ReportLab Image from a Django ImageField, or None."""
-    if not field or not field.name:
+    """Return a ReportLab Image from a Django ImageField's medium JPEG variant, or None."""
+    raw = variant_bytes(field, "medium", "jpg")
+    if raw is None:
         return None
     try:
         from PIL import Image as PILImage
         from io import BytesIO as _BytesIO
 
-        with field.open("rb") as f:
-            raw = f.read()
         pil = PILImage.open(_BytesIO(raw))
         orig_w, orig_h = pil.size
         ratio = min(max_w / orig_w, max_h / orig_h)
@@ -155,6 +157,7 @@ def generate_observation_pdf(observation) -> bytes:
 
     # ── Page template with header/footer ─────────────────────────────────────
     generated_at = timezone.localtime(timezone.now()).strftime("%d %b %Y  %H:%M")
+    logo_img = get_logo_for_pdf(org, 3.5 * cm, 1.6 * cm)
 
     def _draw_header_footer(canvas, doc):
         canvas.saveState()
@@ -165,7 +168,6 @@ def generate_observation_pdf(observation) -> bytes:
         canvas.rect(0, PAGE_H - 2.4 * cm, PAGE_W, 2.4 * cm, fill=1, stroke=0)
 
         # Logo (left)
-        logo_img = get_logo_for_pdf(org, 3.5 * cm, 1.6 * cm)
         logo_x = MARGIN
         if logo_img:
             logo_img.drawOn(canvas, logo_x, PAGE_H - 2.2 * cm)
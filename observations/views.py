@@ -1,20 +1,17 @@
 # observations/views.py
-import csv
 from datetime import date
 
 import pandas as pd
 import plotly.express as px
 import plotly.io as pio
-from openpyxl import Workbook
 
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.core.exceptions import PermissionDenied
-from django.core.paginator import Paginator
-from django.db.models import Count, F, Q
+from django.db.models import Count, F
 from django.db.models.functions import TruncDay, TruncMonth, TruncWeek
-from django.http import HttpResponse, JsonResponse
+from django.http import JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse_lazy
 from django.utils import timezone
@@ -23,8 +20,13 @@ from django.views.generic import CreateView, DetailView, UpdateView
 
 from .forms import LocationForm, ObservationCreateForm, RectificationForm, VerificationForm
 from .models import Location, Observation
-from .pdf_report import generate_observation_pdf
+from core import entitlements
+from core.kpi_cache import cached_kpis
+from core.search import SEARCH_ORDERING, is_ranked, search
+from core.utils.exports import XlsxExport, iter_values, stream_csv
+from core.utils.pagination import paginate_keyset
 from core.utils.guards import org_required as _org_required
+from jobs.views import enqueue_for_request
 
 
 # ---------------------------------------------------------------------------
@@ -69,10 +71,10 @@ class ObservationCreateView(LoginRequiredMixin, OrgRequiredMixin, CreateView):
         response = super().dispatch(request, *args, **kwargs)
 
         org = request.organization
-        sub = getattr(org, "subscription", None)
-        if sub and sub.plan.max_observations is not None:
+        ent = entitlements.for_request(request)
+        if ent and ent.max_observations is not None:
             count = Observation.objects.filter(organization=org).count()
-            if count >= sub.plan.max_observations:
+            if count >= ent.max_observations:
                 messages.error(
                     request,
                     "Observation limit reached for your current plan. Please upgrade.",
@@ -121,17 +123,10 @@ def observation_list(request):
         .order_by("-date_observed")
     )
 
-    if q:
-        observations = observations.filter(
-            Q(title__icontains=q)
-            | Q(description__icontains=q)
-            | Q(location__name__icontains=q)
-            | Q(observer__email__icontains=q)        # email, not username
-            | Q(observer__full_name__icontains=q)
-        )
-
-    paginator = Paginator(observations, 10)
-    page_obj = paginator.get_page(request.GET.get("page"))
+    # Title, description, location and observer name / email, best match first.
+    observations = search(observations, request.organization, "observation", q)
+    ordering = SEARCH_ORDERING if is_ranked(observations) else ("-date_observed", "-id")
+    page_obj = paginate_keyset(request, observations, ordering, per_page=10)
 
     return render(request, "observations/observation_list.html", {
         "observations": page_obj,
@@ -235,11 +230,8 @@ def archived_observations_list(request):
     archived = (
         Observation.objects
         .filter(is_archived=True, organization=request.organization)
-        .order_by("-id")
     )
-
-    paginator = Paginator(archived, 10)
-    page_obj = paginator.get_page(request.GET.get("page"))
+    page_obj = paginate_keyset(request, archived, ("-id",), per_page=10)
 
     return render(request, "observations/archived_list.html", {
         "observations": page_obj,
@@ -281,132 +273,63 @@ def restore_observation(request, pk):
 # Exports  (login + org scoped)
 # ---------------------------------------------------------------------------
 
-@login_required
-def export_observations_excel(request):
-    _org_required(request)
+EXPORT_HEADERS = [
+    "ID", "Title", "Description", "Location", "Status",
+    "Observer", "Observer Employee ID",
+    "Assigned To", "Assigned To Employee ID",
+    "Created At",
+]
 
-    from openpyxl.styles import Font, PatternFill, Alignment
-    from core.logo_utils import get_logo_for_excel
 
-    org = request.organization
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Observations"
-
-    # ── Logo + header rows ────────────────────────────────────────────────
-    xl_logo = get_logo_for_excel(org)
-    DATA_START_ROW = 1   # will shift down if logo is present
-
-    if xl_logo:
-        # Rows 1–3 reserved for logo / org header; data starts at row 5
-        xl_logo.anchor = "A1"
-        ws.add_image(xl_logo)
-        ws.row_dimensions[1].height = 14
-        ws.row_dimensions[2].height = 14
-        ws.row_dimensions[3].height = 14
-
-        # Org name + export label in column B
-        ws["B1"] = org.name
-        ws["B1"].font = Font(bold=True, size=13, color="0E1729")
-        ws["B2"] = f"Safety Observations Export"
-        ws["B2"].font = Font(size=9, color="64748B")
-        ws["B3"] = f"Exported: {date.today().strftime('%d %b %Y')}"
-        ws["B3"].font = Font(size=9, color="94A3B8")
-
-        ws.row_dimensions[4].height = 6   # spacer row
-        DATA_START_ROW = 5
-    # ── Column headers ────────────────────────────────────────────────────
-    headers = [
-        "ID", "Title", "Description", "Location", "Status",
-        "Observer", "Observer Employee ID",
-        "Assigned To", "Assigned To Employee ID",
-        "Created At",
-    ]
-    header_fill = PatternFill("solid", fgColor="0E1729")
-    header_font = Font(bold=True, color="FFFFFF", size=9)
-
-    for col_idx, header in enumerate(headers, start=1):
-        cell = ws.cell(row=DATA_START_ROW, column=col_idx, value=header)
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = Alignment(horizontal="center", vertical="center")
-    ws.row_dimensions[DATA_START_ROW].height = 18
-
-    # ── Data rows ─────────────────────────────────────────────────────────
+def _export_rows(org):
+    """EXPORT_HEADERS rows streamed from values() — no model instances."""
     qs = (
         Observation.objects
         .filter(organization=org)
-        .select_related("observer", "assigned_to", "location")
         .order_by("-date_observed")
     )
-
-    for row_offset, obs in enumerate(qs, start=1):
-        row_num = DATA_START_ROW + row_offset
-        row_data = [
-            obs.id,
-            obs.title,
-            obs.description,
-            str(obs.location),
-            obs.status,
-            obs.observer.email if obs.observer else "",
-            obs.observer.employee_id if obs.observer else "",
-            obs.assigned_to.email if obs.assigned_to else "",
-            obs.assigned_to.employee_id if obs.assigned_to else "",
-            obs.date_observed.strftime("%Y-%m-%d %H:%M"),
-        ]
-        for col_idx, value in enumerate(row_data, start=1):
-            ws.cell(row=row_num, column=col_idx, value=value)
-
-    # ── Column widths ─────────────────────────────────────────────────────
-    col_widths = [6, 30, 50, 20, 16, 28, 16, 28, 16, 18]
-    for i, w in enumerate(col_widths, start=1):
-        ws.column_dimensions[ws.cell(row=1, column=i).column_letter].width = w
-
-    response = HttpResponse(
-        content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    fields = (
+        "id", "title", "description", "location__name", "location__area", "status",
+        "observer__email", "observer__employee_id",
+        "assigned_to__email", "assigned_to__employee_id",
+        "date_observed",
     )
-    response["Content-Disposition"] = 'attachment; filename="observations.xlsx"'
-    wb.save(response)
-    return response
-
+    for r in iter_values(qs, *fields):
+        yield (
+            r["id"],
+            r["title"],
+            r["description"],
+            f"{r['location__name']} ({r['location__area']})" if r["location__area"] else r["location__name"],
+            r["status"],
+            r["observer__email"] or "",
+            r["observer__employee_id"] or "",
+            r["assigned_to__email"] or "",
+            r["assigned_to__employee_id"] or "",
+            r["date_observed"].strftime("%Y-%m-%d %H:%M"),
+        )
 
-@login_required
-def export_observations_csv(request):
-    _org_required(request)
 
-    response = HttpResponse(content_type="text/csv")
-    response["Content-Disposition"] = 'attachment; filename="observations.csv"'
+def build_excel(org):
+    """The org's observations as an XlsxExport (built by observations/jobs.py)."""
+    xl = XlsxExport("Observations", widths=[6, 30, 50, 20, 16, 28, 16, 28, 16, 18])
+    xl.logo_header(org, "Safety Observations Export")
+    xl.header(EXPORT_HEADERS)
+    for row in _export_rows(org):
+        xl.append(row)
+    return xl
 
-    writer = csv.writer(response)
-    writer.writerow([
-        "ID", "Title", "Description", "Location", "Status",
-        "Observer", "Observer Employee ID",
-        "Assigned To", "Assigned To Employee ID",
-        "Created At",
-    ])
 
-    qs = (
-        Observation.objects
-        .filter(organization=request.organization)
-        .select_related("observer", "assigned_to", "location")
-        .order_by("-date_observed")
-    )
+@login_required
+def export_observations_excel(request):
+    _org_required(request)
+    # A large tenant's workbook can outlive a web worker's timeout.
+    return enqueue_for_request(request, "observations.export_excel")
 
-    for obs in qs:
-        writer.writerow([
-            obs.id,
-            obs.title,
-            obs.description,
-            str(obs.location),
-            obs.status,
-            obs.observer.email if obs.observer else "",
-            obs.observer.employee_id if obs.observer else "",
-            obs.assigned_to.email if obs.assigned_to else "",
-            obs.assigned_to.employee_id if obs.assigned_to else "",
-            obs.date_observed.strftime("%Y-%m-%d %H:%M"),
-        ])
 
-    return response
+@login_required
+def export_observations_csv(request):
+    _org_required(request)
+    return stream_csv("observations.csv", EXPORT_HEADERS, _export_rows(request.organization))
 
 
 # ---------------------------------------------------------------------------
@@ -437,109 +360,123 @@ def observations_dashboard(request):
     _org_required(request)
 
     org = request.organization
+    trend = request.GET.get("trend", "monthly")
+    if trend not in ("daily", "weekly", "monthly"):
+        trend = "monthly"
+
+    data = cached_kpis(
+        org, "observations_dashboard", ("observations",),
+        lambda: _dashboard_data(org, trend),
+        scope=f"trend:{trend}",
+    )
+    return render(request, "observations/dashboard.html", _dashboard_context(data, trend))
+
+
+def _dashboard_data(org, trend):
+    """KPI counts and chart series for the observations dashboard (cached)."""
     qs = Observation.objects.filter(is_archived=False, organization=org)
     today = date.today()
 
-    # KPI cards
-    total_obs   = qs.count()
-    open_obs    = qs.filter(status__in=["OPEN", "IN_PROGRESS"]).count()
-    closed_obs  = qs.filter(status="CLOSED").count()
-    overdue_obs = qs.filter(target_date__lt=today).exclude(status="CLOSED").count()
-
     # Trend selector
-    trend = request.GET.get("trend", "monthly")
     trunc_map = {
         "daily":   TruncDay("date_observed"),
         "weekly":  TruncWeek("date_observed"),
         "monthly": TruncMonth("date_observed"),
     }
     trunc_func = trunc_map.get(trend, TruncMonth("date_observed"))
-
     trend_qs = (
         qs.annotate(period=trunc_func)
           .values("period")
           .annotate(count=Count("id"))
           .order_by("period")
     )
-    labels = [row["period"].strftime("%Y-%m-%d") for row in trend_qs if row["period"]]
-    values = [row["count"] for row in trend_qs]
 
-    trend_df = pd.DataFrame({"Date": labels, "Observations": values})
-    fig = px.line(
-        trend_df, x="Date", y="Observations", markers=True,
+    def series(rows, key):
+        return [r[key] for r in rows], [r["total"] for r in rows]
+
+    return {
+        # KPI cards
+        "total_obs":   qs.count(),
+        "open_obs":    qs.filter(status__in=["OPEN", "IN_PROGRESS"]).count(),
+        "closed_obs":  qs.filter(status="CLOSED").count(),
+        "overdue_obs": qs.filter(target_date__lt=today).exclude(status="CLOSED").count(),
+        # Chart series: (labels, values)
+        "trend": (
+            [row["period"].strftime("%Y-%m-%d") for row in trend_qs if row["period"]],
+            [row["count"] for row in trend_qs],
+        ),
+        "severity": series(
+            qs.values("severity").annotate(total=Count("id")).order_by("severity"), "severity",
+        ),
+        "status": series(qs.values("status").annotate(total=Count("id")), "status"),
+        # Observer / action owner / safety manager performance (org-scoped)
+        "observers": series(
+            Observation.objects.filter(organization=org)
+            .values(person=F("observer__email"))
+            .annotate(total=Count("id"))
+            .filter(observer__isnull=False)
+            .order_by("-total"),
+            "person",
+        ),
+        "owners": series(
+            Observation.objects.filter(organization=org)
+            .values(person=F("assigned_to__email"))
+            .annotate(total=Count("id"))
+            .filter(assigned_to__isnull=False)
+            .order_by("-total"),
+            "person",
+        ),
+        "managers": series(
+            Observation.objects.filter(organization=org, status="CLOSED")
+            .values(person=F("assigned_to__email"))
+            .annotate(total=Count("id"))
+            .order_by("-total"),
+            "person",
+        ),
+    }
+
+
+def _dashboard_context(data, trend):
+    """KPI cards + Plotly charts built from the cached dashboard data."""
+    def plot(fig):
+        fig.update_layout(modebar_add=["toImage"])
+        return pio.to_html(fig, full_html=False, include_plotlyjs=False)
+
+    def bar(key, x, y, title):
+        labels, values = data[key]
+        return pio.to_html(
+            px.bar(pd.DataFrame({x: labels, y: values}), x=x, y=y, title=title),
+            full_html=False, include_plotlyjs=False,
+        )
+
+    labels, values = data["trend"]
+    trend_fig = px.line(
+        pd.DataFrame({"Date": labels, "Observations": values}),
+        x="Date", y="Observations", markers=True,
         title=f"{trend.capitalize()} Observation Trend",
     )
-    fig.update_layout(modebar_add=["toImage"])
-    chart_html = fig.to_html(full_html=False)
-
-    # Severity breakdown
-    severity_qs = qs.values("severity").annotate(count=Count("id")).order_by("severity")
-    sev_df = pd.DataFrame({"Severity": [r["severity"] for r in severity_qs],
-                           "Count":    [r["count"]    for r in severity_qs]})
-    severity_fig = px.bar(sev_df, x="Severity", y="Count",
-                          title="Observations by Severity")
-    severity_fig.update_layout(modebar_add=["toImage"])
-
-    # Status pie
-    status_qs = qs.values("status").annotate(count=Count("id"))
-    status_fig = px.pie(
-        names=[r["status"] for r in status_qs],
-        values=[r["count"] for r in status_qs],
-        title="Observations by Status",
-    )
-    status_fig.update_layout(modebar_add=["toImage"])
-
-    # Observer performance (org-scoped)
-    observer_qs = list(
-        Observation.objects.filter(organization=org)
-        .values(Observer=F("observer__email"))
-        .annotate(total=Count("id"))
-        .filter(observer__isnull=False)
-        .order_by("-total")
-    )
-    obs_df = pd.DataFrame({"Observer": [d["Observer"] for d in observer_qs],
-                           "Observations": [d["total"] for d in observer_qs]})
-    observer_fig = px.bar(obs_df, x="Observer", y="Observations",
-                          title="Observers – Observations Reported")
-
-    # Action owner performance (org-scoped)
-    owner_qs = list(
-        Observation.objects.filter(organization=org)
-        .values(owner=F("assigned_to__email"))
-        .annotate(total=Count("id"))
-        .filter(assigned_to__isnull=False)
-        .order_by("-total")
-    )
-    owner_df = pd.DataFrame({"Action Owner": [d["owner"] for d in owner_qs],
-                             "Assigned Tasks": [d["total"] for d in owner_qs]})
-    owner_fig = px.bar(owner_df, x="Action Owner", y="Assigned Tasks",
-                       title="Action Owners – Tasks Assigned")
-
-    # Safety manager close performance (org-scoped)
-    manager_qs = list(
-        Observation.objects.filter(organization=org, status="CLOSED")
-        .values(safety_manager=F("assigned_to__email"))
-        .annotate(total=Count("id"))
-        .order_by("-total")
-    )
-    manager_df = pd.DataFrame({"Manager": [d["safety_manager"] for d in manager_qs],
-                               "Closed Observations": [d["total"] for d in manager_qs]})
-    manager_fig = px.bar(manager_df, x="Manager", y="Closed Observations",
-                         title="Safety Managers – Observations Closed")
-
-    return render(request, "observations/dashboard.html", {
-        "total_obs":      total_obs,
-        "open_obs":       open_obs,
-        "closed_obs":     closed_obs,
-        "overdue_obs":    overdue_obs,
-        "chart_html":     chart_html,
+    sev_labels, sev_values = data["severity"]
+    severity_fig = px.bar(pd.DataFrame({"Severity": sev_labels, "Count": sev_values}),
+                          x="Severity", y="Count", title="Observations by Severity")
+    status_labels, status_values = data["status"]
+    status_fig = px.pie(names=status_labels, values=status_values, title="Observations by Status")
+
+    return {
+        "total_obs":      data["total_obs"],
+        "open_obs":       data["open_obs"],
+        "closed_obs":     data["closed_obs"],
+        "overdue_obs":    data["overdue_obs"],
+        "chart_html":     plot(trend_fig),
         "trend":          trend,
-        "severity_plot":  pio.to_html(severity_fig, full_html=False),
-        "status_plot":    pio.to_html(status_fig,   full_html=False),
-        "observer_plot":  pio.to_html(observer_fig, full_html=False),
-        "owner_plot":     pio.to_html(owner_fig,    full_html=False),
-        "manager_plot":   pio.to_html(manager_fig,  full_html=False),
-    })
+        "severity_plot":  plot(severity_fig),
+        "status_plot":    plot(status_fig),
+        "observer_plot":  bar("observers", "Observer", "Observations",
+                              "Observers – Observations Reported"),
+        "owner_plot":     bar("owners", "Action Owner", "Assigned Tasks",
+                              "Action Owners – Tasks Assigned"),
+        "manager_plot":   bar("managers", "Manager", "Closed Observations",
+                              "Safety Managers – Observations Closed"),
+    }
 
 
 # ---------------------------------------------------------------------------
@@ -553,8 +490,5 @@ def observation_pdf_report(request, pk):
         pk=pk,
         organization=request.organization,
     )
-    pdf_bytes = generate_observation_pdf(obs)
-    filename = f"observation-{obs.pk:04d}.pdf"
-    response = HttpResponse(pdf_bytes, content_type="application/pdf")
-    response["Content-Disposition"] = f'attachment; filename="{filename}"'
-    return response
+    # Rendered by a background worker (observations/jobs.py).
+    return enqueue_for_request(request, "observations.pdf_report", params={"pk": obs.pk})
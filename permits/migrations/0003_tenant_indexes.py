@@ -0,0 +1,29 @@
+# Generated by Django 5.1 on 2026-10-17 02:02
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_add_safety_manager_to_invitation_role'),
+        ('observations', '0004_tenant_indexes'),
+        ('permits', '0002_alter_permit_approved_by_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='permit',
+            index=models.Index(fields=['organization', 'status', '-created_at'], name='permit_org_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='permit',
+            index=models.Index(fields=['organization', '-created_at'], name='permit_org_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='permit',
+            index=models.Index(fields=['requestor', 'status'], name='permit_requestor_status_idx'),
+        ),
+    ]
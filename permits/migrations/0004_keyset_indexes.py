@@ -0,0 +1,25 @@
+# Generated by Django 5.1 on 2026-10-17 02:58
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_searchentry'),
+        ('observations', '0005_keyset_indexes'),
+        ('permits', '0003_tenant_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='permit',
+            name='permit_org_created_idx',
+        ),
+        migrations.AddIndex(
+            model_name='permit',
+            index=models.Index(fields=['organization', '-created_at', '-id'], name='permit_org_created_idx'),
+        ),
+    ]
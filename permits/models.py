@@ -146,6 +146,15 @@ class Permit(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # permit_list / permit_dashboard: status filter, newest first
+            models.Index(
+                fields=["organization", "status", "-created_at"],
+                name="permit_org_status_created_idx",
+            ),
+            models.Index(fields=["organization", "-created_at", "-id"], name="permit_org_created_idx"),
+            models.Index(fields=["requestor", "status"], name="permit_requestor_status_idx"),
+        ]
 
     def __str__(self):
         return f"[{self.permit_number}] {self.get_work_type_display()} — {self.title}"
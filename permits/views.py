@@ -2,7 +2,6 @@
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.core.exceptions import PermissionDenied
-from django.core.paginator import Paginator
 from django.db.models import Count, Q
 from django.shortcuts import get_object_or_404, redirect, render
 from django.utils import timezone
@@ -14,7 +13,9 @@ from .forms import (
     PermitRequestForm,
 )
 from .models import Permit
+from core.kpi_cache import cached_kpis
 from core.utils.guards import org_required as _org_required
+from core.utils.pagination import paginate_keyset
 
 
 # ---------------------------------------------------------------------------
@@ -64,8 +65,7 @@ def permit_list(request):
     if type_f:
         qs = qs.filter(work_type=type_f)
 
-    paginator = Paginator(qs, 15)
-    page_obj  = paginator.get_page(request.GET.get("page"))
+    page_obj = paginate_keyset(request, qs, ("-created_at", "-id"), per_page=15)
 
     return render(request, "permits/permit_list.html", {
         "permits":        page_obj,
@@ -376,10 +376,17 @@ def permit_dashboard(request):
 
     qs = Permit.objects.filter(organization=org)
 
-    by_status = dict(qs.values_list("status").annotate(c=Count("id")))
-    by_type   = list(
-        qs.values("work_type").annotate(count=Count("id")).order_by("-count")
-    )
+    def _counts():
+        by_status = dict(qs.values_list("status").annotate(c=Count("id")))
+        return {
+            "by_status": by_status,
+            "by_type":   list(
+                qs.values("work_type").annotate(count=Count("id")).order_by("-count")
+            ),
+            "total":     sum(by_status.values()),
+        }
+
+    counts = cached_kpis(org, "permit_dashboard", ("permits",), _counts)
 
     overdue = qs.filter(
         status__in=("APPROVED", "ACTIVE"),
@@ -393,10 +400,8 @@ def permit_dashboard(request):
                        .select_related("requestor", "location")
 
     return render(request, "permits/permit_dashboard.html", {
-        "by_status":        by_status,
-        "by_type":          by_type,
+        **counts,
         "overdue":          overdue,
         "pending_approval": pending_approval,
         "active_permits":   active_permits,
-        "total":            qs.count(),
     })
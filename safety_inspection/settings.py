@@ -55,6 +55,7 @@ INSTALLED_APPS = [
     "inspections.apps.InspectionsConfig",
     "audit_export.apps.AuditExportConfig",
     "appraisals.apps.AppraisalsConfig",
+    "jobs.apps.JobsConfig",
 ]
 
 # ---------------------------------------------------------------------------
@@ -63,6 +64,9 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",       # serve static in production
+    # After WhiteNoise, so static-file hits are neither recorded nor
+    # budgeted; before the rest, so session / auth / org lookups count.
+    "core.middleware.RequestMetricsMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -73,6 +77,26 @@ MIDDLEWARE = [
     "core.middleware.SubscriptionMiddleware",
 ]
 
+# ---------------------------------------------------------------------------
+# Request metrics (core.middleware.RequestMetricsMiddleware)
+# ---------------------------------------------------------------------------
+REQUEST_METRICS_ENABLED = os.environ.get("REQUEST_METRICS_ENABLED", "True") == "True"
+
+# Log a warning when a view runs more queries than its budget.
+# Keys are resolved view names ("namespace:name"). Budgets count the whole
+# request, session / user / organization lookups included. An empty or
+# "none" REQUEST_QUERY_BUDGET_DEFAULT disables the default.
+_budget_default = os.environ.get("REQUEST_QUERY_BUDGET_DEFAULT", "50").strip()
+REQUEST_QUERY_BUDGET_DEFAULT = (
+    None if _budget_default.lower() in ("", "none") else int(_budget_default)
+)
+REQUEST_QUERY_BUDGETS = {
+    "core:app_dashboard":    25,
+    "users:profile_detail":  25,
+    "observations:observation_list": 10,
+    "actions:list":          10,
+}
+
 ROOT_URLCONF = "safety_inspection.urls"
 
 # ---------------------------------------------------------------------------
@@ -186,6 +210,86 @@ else:
         },
     }
 
+# ---------------------------------------------------------------------------
+# Cache — dashboard KPIs (core/kpi_cache.py)
+# ---------------------------------------------------------------------------
+# locmem is per-process: with several gunicorn workers set REDIS_URL (or
+# CACHE_DIR for a single host) so signal invalidation reaches every worker.
+REDIS_URL = os.environ.get("REDIS_URL", "")
+CACHE_DIR = os.environ.get("CACHE_DIR", "")
+
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND":  "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+            "KEY_PREFIX": "vigilo",
+        }
+    }
+elif CACHE_DIR:
+    CACHES = {
+        "default": {
+            "BACKEND":  "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": CACHE_DIR,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND":  "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "vigilo-default",
+        }
+    }
+
+# Upper bound on KPI staleness if an invalidation is ever missed.
+KPI_CACHE_TIMEOUT = int(os.environ.get("KPI_CACHE_TIMEOUT", "300"))
+
+# Assessment answer keys (training/services.py): keys are versioned by
+# Assessment.key_version, so this only bounds how long superseded keys linger.
+ANSWER_KEY_CACHE_TIMEOUT = 60 * 60
+
+# Cached per-org manager recipient lists (core/recipients.py): upper bound
+# on staleness for changes the user save / delete receivers cannot see.
+RECIPIENTS_CACHE_TIMEOUT = 15 * 60
+# None = shared cache on unless the backend is per-process locmem.
+RECIPIENTS_CACHE = None
+
+# Alert commands (core/alert_runs.py): objects processed between checkpoint
+# writes, i.e. the most a resumed run rescans (the send ledger skips them)
+# unless a send failed — the checkpoint then holds before the failed object.
+ALERT_CHECKPOINT_EVERY = 100
+
+# Per-org entitlement snapshots (core/entitlements.py): upper bound on
+# staleness for subscription / plan changes the save receivers cannot see.
+ENTITLEMENTS_CACHE_TIMEOUT = 60
+# None = shared cache on unless the backend is per-process locmem.
+ENTITLEMENTS_CACHE = None
+
+# ---------------------------------------------------------------------------
+# Background jobs (jobs app — run with `python manage.py run_workers`)
+# ---------------------------------------------------------------------------
+JOBS_WORKER_PROCESSES   = int(os.environ.get("JOBS_WORKER_PROCESSES", "2"))
+JOBS_POLL_INTERVAL      = float(os.environ.get("JOBS_POLL_INTERVAL", "2"))
+JOBS_MAX_ATTEMPTS       = 3
+JOBS_RETRY_BACKOFF      = 30        # seconds; doubles on each retry
+JOBS_HEARTBEAT_INTERVAL = 60        # seconds between a running job's heartbeat writes
+JOBS_LOCK_TIMEOUT       = 5 * 60    # a running job without a heartbeat this long is presumed lost
+
+# ISO 45001 pack: processes rendering sections in parallel (default: up to 4 CPUs)
+AUDIT_PACK_PROCESSES = int(os.environ["AUDIT_PACK_PROCESSES"]) if os.environ.get("AUDIT_PACK_PROCESSES") else None
+
+# Reuse unchanged section PDFs between runs of the same period. None = on
+# unless the cache backend is per-process locmem (see section_cache.py).
+AUDIT_PACK_CACHE = None
+
+# Full-text search (core/search.py): most matches a list search returns.
+SEARCH_RESULT_LIMIT = 1000
+
+# Org logo cache (core/logo_utils.py): per-process byte budget, and how
+# often a cached logo's modified time is re-checked in storage.
+LOGO_CACHE_MAX_BYTES = 16 * 1024 * 1024
+LOGO_CACHE_REVALIDATE_SECONDS = 60
+
 # ---------------------------------------------------------------------------
 # File upload size limit (20 MB)
 # ---------------------------------------------------------------------------
@@ -222,6 +326,15 @@ BREVO_API_KEY      = os.environ.get("BREVO_API_KEY", "")
 DEFAULT_FROM_EMAIL = os.environ.get("DEFAULT_FROM_EMAIL", "SafetySuite <noreply@yourdomain.com>")
 ADMIN_EMAIL        = os.environ.get("ADMIN_EMAIL", "")
 
+# Outbox delivery (core/outbox.py) — sent by the job workers.
+EMAIL_TRANSPORT            = os.environ.get("EMAIL_TRANSPORT", "core.outbox.BrevoTransport")
+EMAIL_DISPATCH_CONCURRENCY = int(os.environ.get("EMAIL_DISPATCH_CONCURRENCY", "4"))
+EMAIL_RATE_LIMIT           = float(os.environ.get("EMAIL_RATE_LIMIT", "10"))   # messages / second
+EMAIL_DISPATCH_BATCH       = 100
+EMAIL_MAX_ATTEMPTS         = 5
+EMAIL_RETRY_BACKOFF        = 60      # seconds; doubles on each retry
+EMAIL_DEDUPE_WINDOW        = 3600    # identical messages within this window are sent once
+
 
 # ---------------------------------------------------------------------------
 # Site URL — used in email links (no trailing slash)
@@ -58,6 +58,9 @@ urlpatterns = [
 
     # Performance Appraisals
     path("appraisals/", include("appraisals.urls", namespace="appraisals")),
+
+    # Background jobs (poll / download)
+    path("jobs/", include("jobs.urls", namespace="jobs")),
 ]
 
 if settings.DEBUG:
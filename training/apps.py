@@ -5,3 +5,6 @@ class TrainingConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "training"
     verbose_name = "Training & Skills"
+
+    def ready(self):
+        import training.signals  # noqa
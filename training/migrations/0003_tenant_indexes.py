@@ -0,0 +1,28 @@
+# Generated by Django 5.1 on 2026-10-17 02:02
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_add_safety_manager_to_invitation_role'),
+        ('training', '0002_trainingmodule_content_url'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='assessmentattempt',
+            index=models.Index(fields=['organization', '-submitted_at'], name='attempt_org_submitted_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='assessmentattempt',
+            index=models.Index(fields=['user', '-submitted_at'], name='attempt_user_submitted_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='assessmentattempt',
+            index=models.Index(fields=['organization', 'passed'], name='attempt_org_passed_idx'),
+        ),
+    ]
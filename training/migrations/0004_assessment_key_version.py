@@ -0,0 +1,18 @@
+# Generated by Django 5.1 on 2026-10-17 04:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('training', '0003_tenant_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='assessment',
+            name='key_version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
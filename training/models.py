@@ -170,11 +170,25 @@ class Assessment(models.Model):
         validators=[MinValueValidator(1), MaxValueValidator(5)],
         help_text="Proficiency level (1–5) awarded to the user upon passing",
     )
+    # Bumped whenever a question or choice changes; part of the cached
+    # answer key's cache key (training/services.py).
+    key_version = models.PositiveIntegerField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        # key_version only moves through invalidate_answer_key()'s UPDATE: a
+        # full save of an instance loaded before an edit must not write the
+        # old version back and revive a superseded cached key.
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                f.name for f in self._meta.concrete_fields
+                if not f.primary_key and f.name != "key_version"
+            ]
+        super().save(*args, **kwargs)
+
     @property
     def question_count(self):
         return self.questions.count()
@@ -228,6 +242,15 @@ class AssessmentAttempt(models.Model):
 
     class Meta:
         ordering = ["-submitted_at"]
+        indexes = [
+            # Training dashboard (org-wide) and "my attempts" histories
+            models.Index(
+                fields=["organization", "-submitted_at"],
+                name="attempt_org_submitted_idx",
+            ),
+            models.Index(fields=["user", "-submitted_at"], name="attempt_user_submitted_idx"),
+            models.Index(fields=["organization", "passed"], name="attempt_org_passed_idx"),
+        ]
 
     def __str__(self):
         status = "PASS" if self.passed else "FAIL"
@@ -1,7 +1,84 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
 from django.db import transaction
+from django.db.models import F
 from django.utils import timezone
 
-from .models import AssessmentAttempt, SkillProficiency
+from .models import AssessmentAttempt, Choice, Question, SkillProficiency
+
+
+# ── Answer keys ───────────────────────────────────────────────────────────────
+#
+# An assessment's answer key — {question id: frozenset of correct choice ids},
+# in question order — is compiled once and cached, so scoring a submission
+# needs no per-question queries. The cache key includes
+# Assessment.key_version, which is bumped in the database whenever questions
+# or choices are edited (once per edit_questions save, plus the receivers in
+# training/signals.py for admin edits). Every worker reads the version from
+# the assessment row it scores against, so a per-process cache can never
+# serve a superseded key; ANSWER_KEY_CACHE_TIMEOUT only bounds how long
+# orphaned keys linger.
+
+def _answer_key_cache_key(assessment_id, version):
+    return f"training:answer_key:{assessment_id}:v{version}"
+
+
+def answer_key(assessment) -> dict:
+    """{question_id: frozenset(correct choice ids)} for ``assessment``."""
+    key = _answer_key_cache_key(assessment.pk, assessment.key_version)
+    compiled = cache.get(key)
+    if compiled is None:
+        compiled = {
+            question_id: set()
+            for question_id in Question.objects.filter(
+                assessment=assessment,
+            ).values_list("pk", flat=True)
+        }
+        for question_id, choice_id in Choice.objects.filter(
+            question__assessment=assessment, is_correct=True,
+        ).values_list("question_id", "pk"):
+            compiled[question_id].add(choice_id)
+        compiled = {question_id: frozenset(ids) for question_id, ids in compiled.items()}
+        cache.set(key, compiled, timeout=getattr(settings, "ANSWER_KEY_CACHE_TIMEOUT", 3600))
+    return compiled
+
+
+def invalidate_answer_key(assessment_id):
+    """
+    Bump the assessment's key version. It commits with the edit, and from
+    then on every worker looks up (and compiles) the key under the new version.
+    """
+    from .models import Assessment
+
+    Assessment.objects.filter(pk=assessment_id).update(key_version=F("key_version") + 1)
+
+
+# Assessments inside editing_answer_key(): the per-row receivers skip them.
+_bulk_edits: ContextVar[frozenset] = ContextVar("answer_key_bulk_edits", default=frozenset())
+
+
+@contextmanager
+def editing_answer_key(assessment_id):
+    """
+    Save many questions / choices of one assessment with the per-row
+    receivers suspended, then bump its key version once.
+    """
+    token = _bulk_edits.set(_bulk_edits.get() | {assessment_id})
+    try:
+        yield
+    finally:
+        _bulk_edits.reset(token)
+    invalidate_answer_key(assessment_id)
+
+
+def in_bulk_edit(assessment_id):
+    return assessment_id in _bulk_edits.get()
+
+
+# ── Submission ────────────────────────────────────────────────────────────────
 
 
 def handle_assessment_submission(user, assessment, submitted_answers: dict) -> AssessmentAttempt:
@@ -21,9 +98,12 @@ def handle_assessment_submission(user, assessment, submitted_answers: dict) -> A
         - Score = (correct answers / total questions) * 100
         - Passed = score >= assessment.passing_score
         - On pass: SkillProficiency is created or upgraded (never downgraded).
+
+    Scoring runs against the cached answer key (see answer_key()), so it
+    issues no per-question queries.
     """
-    questions = assessment.questions.prefetch_related("choices").all()
-    total = questions.count()
+    key = answer_key(assessment)
+    total = len(key)
 
     if total == 0:
         raise ValueError("This assessment has no questions yet.")
@@ -31,13 +111,13 @@ def handle_assessment_submission(user, assessment, submitted_answers: dict) -> A
     correct = 0
     answers_snapshot = {}
 
-    for question in questions:
-        chosen_id_str = submitted_answers.get(str(question.id))
+    for question_id, correct_ids in key.items():
+        chosen_id_str = submitted_answers.get(str(question_id))
         if chosen_id_str:
             try:
                 chosen_id = int(chosen_id_str)
-                answers_snapshot[str(question.id)] = chosen_id
-                if question.choices.filter(id=chosen_id, is_correct=True).exists():
+                answers_snapshot[str(question_id)] = chosen_id
+                if chosen_id in correct_ids:
                     correct += 1
             except (ValueError, TypeError):
                 pass
@@ -0,0 +1,28 @@
+# training/signals.py
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Choice, Question
+from .services import in_bulk_edit, invalidate_answer_key
+
+
+@receiver([post_save, post_delete], sender=Question, dispatch_uid="answer_key:question")
+def drop_answer_key_for_question(sender, instance, **kwargs):
+    """Editing or removing a question supersedes its assessment's cached answer key."""
+    if not in_bulk_edit(instance.assessment_id):
+        invalidate_answer_key(instance.assessment_id)
+
+
+@receiver([post_save, post_delete], sender=Choice, dispatch_uid="answer_key:choice")
+def drop_answer_key_for_choice(sender, instance, **kwargs):
+    if Choice.question.is_cached(instance):
+        # Formsets set the parent question: no query needed.
+        assessment_id = instance.question.assessment_id
+    else:
+        # None when the choice went with its deleted question, whose own
+        # receiver already dropped the key.
+        assessment_id = Question.objects.filter(
+            pk=instance.question_id,
+        ).values_list("assessment_id", flat=True).first()
+    if assessment_id is not None and not in_bulk_edit(assessment_id):
+        invalidate_answer_key(assessment_id)
@@ -0,0 +1,165 @@
+"""
+Unit tests for the training app.
+Covers: cached assessment answer keys and their versioning (full saves,
+the question builder), in-memory assessment scoring.
+"""
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from core.models import Organization, Plan
+from training.models import Assessment, Choice, Question, TrainingModule
+from training.services import answer_key, handle_assessment_submission
+
+User = get_user_model()
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def create_org_and_user(domain="trainorg"):
+    Plan.objects.get_or_create(name="Trial", defaults={"price_monthly": 0})
+    org = Organization.objects.create(name="Training Org", domain=domain)
+    user = User.objects.create_user(
+        email=f"worker@{domain}.com", password="pass1234", organization=org, role="manager",
+    )
+    return org, user
+
+
+def create_assessment(org, questions=4, title="Induction"):
+    module = TrainingModule.objects.create(organization=org, title=title)
+    assessment = Assessment.objects.create(
+        organization=org, training_module=module, title=title, passing_score=75,
+    )
+    for q in range(questions):
+        question = Question.objects.create(assessment=assessment, text=f"Q{q}", order=q)
+        Choice.objects.bulk_create(
+            Choice(question=question, text=f"Option {c}", is_correct=c == 0) for c in range(3)
+        )
+    return assessment
+
+
+def answers(assessment, right):
+    """Submitted answers with the first ``right`` questions answered correctly."""
+    out = {}
+    for i, question in enumerate(assessment.questions.prefetch_related("choices")):
+        choice = next(c for c in question.choices.all() if c.is_correct == (i < right))
+        out[str(question.pk)] = str(choice.pk)
+    return out
+
+
+# ---------------------------------------------------------------------------
+# Answer keys / scoring
+# ---------------------------------------------------------------------------
+
+class AssessmentScoringTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.org, self.user = create_org_and_user()
+        self.assessment = create_assessment(self.org)
+
+    def test_scores_from_answer_key(self):
+        attempt = handle_assessment_submission(self.user, self.assessment, answers(self.assessment, 3))
+        self.assertEqual(attempt.score, 75.0)
+        self.assertTrue(attempt.passed)
+
+        partial = answers(self.assessment, 1)
+        partial.pop(next(iter(partial)))           # first (correct) question unanswered
+        attempt = handle_assessment_submission(self.user, self.assessment, partial)
+        self.assertEqual(attempt.score, 0.0)
+        self.assertEqual(len(attempt.answers), 3)
+
+    def test_scoring_queries_do_not_grow_with_questions(self):
+        big = create_assessment(self.org, questions=40, title="Permit to work")
+        small_answers, big_answers = answers(self.assessment, 2), answers(big, 20)
+        answer_key(self.assessment), answer_key(big)        # warm the cache
+
+        with CaptureQueriesContext(connection) as small_ctx:
+            handle_assessment_submission(self.user, self.assessment, small_answers)
+        with CaptureQueriesContext(connection) as big_ctx:
+            handle_assessment_submission(self.user, big, big_answers)
+        self.assertEqual(len(big_ctx), len(small_ctx))
+        self.assertFalse(any("training_choice" in q["sql"] for q in big_ctx.captured_queries))
+
+    def test_editing_questions_moves_to_a_new_key(self):
+        key = answer_key(self.assessment)
+        question = self.assessment.questions.first()
+        wrong = question.choices.filter(is_correct=False).first()
+
+        wrong.is_correct = True
+        wrong.save()
+        self.assessment.refresh_from_db()
+        self.assertEqual(answer_key(self.assessment)[question.pk], key[question.pk] | {wrong.pk})
+
+        question.delete()
+        self.assessment.refresh_from_db()
+        self.assertNotIn(question.pk, answer_key(self.assessment))
+        self.assertEqual(len(answer_key(self.assessment)), 3)
+
+    def test_other_workers_never_score_against_a_superseded_key(self):
+        # Another process's cache still holds the key compiled before the edit.
+        stale = Assessment.objects.get(pk=self.assessment.pk)
+        answer_key(stale)
+        submitted = answers(stale, 4)                   # all correct before the edit
+        question = self.assessment.questions.first()
+        question.choices.filter(is_correct=True).update(is_correct=False)
+        question.choices.filter(is_correct=False).first().save()     # admin edit: receiver bumps
+
+        fresh = Assessment.objects.get(pk=self.assessment.pk)
+        self.assertGreater(fresh.key_version, stale.key_version)
+        self.assertEqual(answer_key(fresh)[question.pk], frozenset())
+        attempt = handle_assessment_submission(self.user, fresh, submitted)
+        self.assertEqual(attempt.score, 75.0)
+
+    def test_full_save_of_a_stale_assessment_keeps_the_key_version(self):
+        from training.services import invalidate_answer_key
+
+        stale = Assessment.objects.get(pk=self.assessment.pk)
+        invalidate_answer_key(self.assessment.pk)
+        stale.title = "Site induction"
+        stale.save()
+
+        self.assessment.refresh_from_db()
+        self.assertEqual(self.assessment.title, "Site induction")
+        self.assertEqual(self.assessment.key_version, stale.key_version + 1)
+
+    def test_question_builder_bumps_the_key_once(self):
+        from unittest import mock
+        from django.urls import reverse
+
+        question = self.assessment.questions.first()
+        choices = list(question.choices.order_by("pk"))
+        data = {
+            "questions-TOTAL_FORMS": "1", "questions-INITIAL_FORMS": "1",
+            "questions-MIN_NUM_FORMS": "0", "questions-MAX_NUM_FORMS": "1000",
+            "questions-0-id": question.pk, "questions-0-assessment": self.assessment.pk,
+            "questions-0-text": "Which gloves?", "questions-0-order": "0",
+            "q0_choices-TOTAL_FORMS": "3", "q0_choices-INITIAL_FORMS": "3",
+            "q0_choices-MIN_NUM_FORMS": "0", "q0_choices-MAX_NUM_FORMS": "1000",
+        }
+        for j, choice in enumerate(choices):
+            data.update({
+                f"q0_choices-{j}-id": choice.pk, f"q0_choices-{j}-question": question.pk,
+                f"q0_choices-{j}-text": f"Gloves {j}",
+            })
+        data["q0_choices-2-is_correct"] = "on"       # the correct answer moves to the last choice
+        self.assessment.refresh_from_db()
+        before = self.assessment.key_version
+
+        self.client.force_login(self.user)
+        with mock.patch("training.signals.invalidate_answer_key") as per_row:
+            response = self.client.post(reverse("training:edit_questions", args=[self.assessment.pk]), data)
+        self.assertEqual(response.status_code, 302)
+        per_row.assert_not_called()
+        self.assessment.refresh_from_db()
+        self.assertEqual(self.assessment.key_version, before + 1)
+        self.assertEqual(answer_key(self.assessment)[question.pk], frozenset({choices[2].pk}))
+
+    def test_empty_assessment_is_rejected(self):
+        empty = create_assessment(self.org, questions=0, title="Empty")
+        with self.assertRaises(ValueError):
+            handle_assessment_submission(self.user, empty, {})
@@ -1,4 +1,3 @@
-import csv
 from io import BytesIO
 
 import pandas as pd
@@ -7,6 +6,7 @@ import plotly.graph_objects as go
 import plotly.io as pio
 
 from django.contrib import messages
+from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import login_required
 from django.core.exceptions import PermissionDenied
 from django.core.paginator import Paginator
@@ -28,7 +28,11 @@ from .models import (
     SkillProficiency,
     TrainingModule,
 )
-from .services import handle_assessment_submission
+from .services import editing_answer_key, handle_assessment_submission
+from core.kpi_cache import cached_kpis
+from core.utils.exports import iter_values, stream_csv
+
+User = get_user_model()
 
 
 # ── Helpers ──────────────────────────────────────────────────────────────────
@@ -239,7 +243,7 @@ def edit_questions(request, pk):
         q_formset = QuestionFormSet(request.POST, instance=assessment, prefix="questions")
 
         if q_formset.is_valid():
-            with transaction.atomic():
+            with transaction.atomic(), editing_answer_key(assessment.pk):
                 # First pass: save all questions (new, updated, deleted)
                 q_formset.save()
 
@@ -400,228 +404,256 @@ def _base_layout(fig, height=320):
 def training_dashboard(request):
     _org_required(request)
     org = request.organization
-    is_manager = request.user.is_manager or request.user.is_safety_manager
+    user = request.user
+    is_manager = user.is_manager or user.is_safety_manager
 
+    # The cache holds figure dicts; they are rendered per request (and
+    # without the plotly.js bundle, which the template loads once).
     if is_manager:
-        # ── KPIs ─────────────────────────────────────────────────────────
-        total_modules   = TrainingModule.objects.filter(organization=org, is_active=True).count()
-        total_attempts  = AssessmentAttempt.objects.filter(organization=org).count()
-        passed_attempts = AssessmentAttempt.objects.filter(organization=org, passed=True).count()
-        overall_pass_rate = (
-            round(passed_attempts / total_attempts * 100, 1) if total_attempts else 0
-        )
-        certified_users = (
-            SkillProficiency.objects.filter(organization=org)
-            .values("user").distinct().count()
+        context = cached_kpis(
+            org, "training_dashboard", ("training",),
+            lambda: _manager_dashboard_context(org), scope="manager",
         )
+    else:
+        context = {
+            **cached_kpis(
+                org, "training_dashboard", ("training",),
+                lambda: _personal_dashboard_context(org, user), scope=f"user:{user.pk}",
+            ),
+            "recent_attempts": (
+                AssessmentAttempt.objects.filter(organization=org, user=user)
+                .select_related("assessment").order_by("-submitted_at")[:8]
+            ),
+        }
 
-        # ── Chart 1: Pass rate per module (horizontal bar) ────────────────
-        assessments = (
-            Assessment.objects
-            .filter(organization=org)
-            .annotate(
-                total=Count("attempts"),
-                passed_count=Count("attempts", filter=Q(attempts__passed=True)),
-            )
-            .select_related("training_module")
+    context = {
+        key: pio.to_html(go.Figure(value), full_html=False, include_plotlyjs=False)
+        if key.endswith("_plot") else value
+        for key, value in context.items()
+    }
+    return render(request, "training/dashboard.html", context)
+
+
+def _manager_dashboard_context(org):
+    """Org-wide KPIs and charts for managers."""
+    # ── KPIs ─────────────────────────────────────────────────────────
+    total_modules   = TrainingModule.objects.filter(organization=org, is_active=True).count()
+    total_attempts  = AssessmentAttempt.objects.filter(organization=org).count()
+    passed_attempts = AssessmentAttempt.objects.filter(organization=org, passed=True).count()
+    overall_pass_rate = (
+        round(passed_attempts / total_attempts * 100, 1) if total_attempts else 0
+    )
+    certified_users = (
+        SkillProficiency.objects.filter(organization=org)
+        .values("user").distinct().count()
+    )
+
+    # ── Chart 1: Pass rate per module (horizontal bar) ────────────────
+    assessments = (
+        Assessment.objects
+        .filter(organization=org)
+        .annotate(
+            total=Count("attempts"),
+            passed_count=Count("attempts", filter=Q(attempts__passed=True)),
         )
-        rows = [
-            {
-                "Module": a.training_module.title[:35],
-                "Pass Rate": round(a.passed_count / a.total * 100, 1),
-                "Attempts": a.total,
-            }
-            for a in assessments if a.total > 0
-        ]
-        if rows:
-            df = pd.DataFrame(rows).sort_values("Pass Rate")
-            pass_rate_fig = px.bar(
-                df, x="Pass Rate", y="Module", orientation="h",
-                color="Pass Rate",
-                color_continuous_scale=["#ef4444", "#f97316", "#22c55e"],
-                text=df["Pass Rate"].apply(lambda v: f"{v}%"),
-                title="Pass Rate by Module",
-                hover_data={"Attempts": True},
-            )
-            pass_rate_fig.update_traces(textposition="outside")
-            pass_rate_fig.update_layout(
-                coloraxis_showscale=False, xaxis_range=[0, 115],
-            )
-            _base_layout(pass_rate_fig, height=max(300, len(rows) * 52 + 90))
-        else:
-            pass_rate_fig = _empty_figure("No assessment attempts yet")
-
-        # ── Chart 2: Attempts over time (multi-line) ──────────────────────
-        trend_qs = (
-            AssessmentAttempt.objects.filter(organization=org)
-            .annotate(period=TruncMonth("submitted_at"))
-            .values("period")
-            .annotate(
-                total=Count("id"),
-                passed=Count("id", filter=Q(passed=True)),
-            )
-            .order_by("period")
+        .select_related("training_module")
+    )
+    rows = [
+        {
+            "Module": a.training_module.title[:35],
+            "Pass Rate": round(a.passed_count / a.total * 100, 1),
+            "Attempts": a.total,
+        }
+        for a in assessments if a.total > 0
+    ]
+    if rows:
+        df = pd.DataFrame(rows).sort_values("Pass Rate")
+        pass_rate_fig = px.bar(
+            df, x="Pass Rate", y="Module", orientation="h",
+            color="Pass Rate",
+            color_continuous_scale=["#ef4444", "#f97316", "#22c55e"],
+            text=df["Pass Rate"].apply(lambda v: f"{v}%"),
+            title="Pass Rate by Module",
+            hover_data={"Attempts": True},
         )
-        trend_rows = [r for r in trend_qs if r["period"]]
-        if trend_rows:
-            trend_df = pd.DataFrame({
-                "Month":  [r["period"].strftime("%b %Y") for r in trend_rows],
-                "Total":  [r["total"]  for r in trend_rows],
-                "Passed": [r["passed"] for r in trend_rows],
-                "Failed": [r["total"] - r["passed"] for r in trend_rows],
-            })
-            trend_fig = px.line(
-                trend_df, x="Month", y=["Total", "Passed", "Failed"],
-                markers=True,
-                title="Assessment Attempts Over Time",
-                labels={"value": "Attempts", "variable": ""},
-                color_discrete_map={
-                    "Total": "#6366f1", "Passed": "#22c55e", "Failed": "#ef4444"
-                },
-            )
-            _base_layout(trend_fig)
-        else:
-            trend_fig = _empty_figure("No attempt data yet")
-
-        # ── Chart 3: Proficiency level distribution (bar) ────────────────
-        prof_qs = (
-            SkillProficiency.objects.filter(organization=org)
-            .values("level")
-            .annotate(count=Count("id"))
-            .order_by("level")
+        pass_rate_fig.update_traces(textposition="outside")
+        pass_rate_fig.update_layout(
+            coloraxis_showscale=False, xaxis_range=[0, 115],
         )
-        if prof_qs:
-            prof_df = pd.DataFrame({
-                "Level":     [f"L{r['level']} {LEVEL_LABELS[r['level']]}" for r in prof_qs],
-                "Employees": [r["count"] for r in prof_qs],
-            })
-            prof_fig = px.bar(
-                prof_df, x="Level", y="Employees",
-                color="Level",
-                color_discrete_sequence=APP_COLORS,
-                text="Employees",
-                title="Proficiency Level Distribution (Org-wide)",
-            )
-            prof_fig.update_traces(textposition="outside")
-            prof_fig.update_layout(showlegend=False)
-            _base_layout(prof_fig)
-        else:
-            prof_fig = _empty_figure("No proficiencies recorded yet")
-
-        # ── Chart 4: Top performers — most skills certified ───────────────
-        top_qs = list(
-            SkillProficiency.objects.filter(organization=org)
-            .values("user__full_name", "user__email")
-            .annotate(skills=Count("skill"))
-            .order_by("-skills")[:10]
+        _base_layout(pass_rate_fig, height=max(300, len(rows) * 52 + 90))
+    else:
+        pass_rate_fig = _empty_figure("No assessment attempts yet")
+
+    # ── Chart 2: Attempts over time (multi-line) ──────────────────────
+    trend_qs = (
+        AssessmentAttempt.objects.filter(organization=org)
+        .annotate(period=TruncMonth("submitted_at"))
+        .values("period")
+        .annotate(
+            total=Count("id"),
+            passed=Count("id", filter=Q(passed=True)),
         )
-        if top_qs:
-            top_df = pd.DataFrame({
-                "Employee": [
-                    r["user__full_name"] or r["user__email"].split("@")[0]
-                    for r in top_qs
-                ],
-                "Skills Certified": [r["skills"] for r in top_qs],
-            }).sort_values("Skills Certified")
-            top_fig = px.bar(
-                top_df, x="Skills Certified", y="Employee", orientation="h",
-                color="Skills Certified",
-                color_continuous_scale=APP_COLORS,
-                text="Skills Certified",
-                title="Top Performers — Skills Certified",
-            )
-            top_fig.update_traces(textposition="outside")
-            top_fig.update_layout(
-                coloraxis_showscale=False,
-                xaxis_range=[0, top_df["Skills Certified"].max() + 1.5],
-            )
-            _base_layout(top_fig, height=max(300, len(top_qs) * 48 + 90))
-        else:
-            top_fig = _empty_figure("No data yet")
-
-        context = {
-            "is_manager":       True,
-            "total_modules":    total_modules,
-            "total_attempts":   total_attempts,
-            "overall_pass_rate": overall_pass_rate,
-            "certified_users":  certified_users,
-            "pass_rate_plot":   pio.to_html(pass_rate_fig, full_html=False),
-            "trend_plot":       pio.to_html(trend_fig,     full_html=False),
-            "prof_plot":        pio.to_html(prof_fig,      full_html=False),
-            "top_plot":         pio.to_html(top_fig,       full_html=False),
-        }
-
+        .order_by("period")
+    )
+    trend_rows = [r for r in trend_qs if r["period"]]
+    if trend_rows:
+        trend_df = pd.DataFrame({
+            "Month":  [r["period"].strftime("%b %Y") for r in trend_rows],
+            "Total":  [r["total"]  for r in trend_rows],
+            "Passed": [r["passed"] for r in trend_rows],
+            "Failed": [r["total"] - r["passed"] for r in trend_rows],
+        })
+        trend_fig = px.line(
+            trend_df, x="Month", y=["Total", "Passed", "Failed"],
+            markers=True,
+            title="Assessment Attempts Over Time",
+            labels={"value": "Attempts", "variable": ""},
+            color_discrete_map={
+                "Total": "#6366f1", "Passed": "#22c55e", "Failed": "#ef4444"
+            },
+        )
+        _base_layout(trend_fig)
     else:
-        # ── KPIs (personal) ───────────────────────────────────────────────
-        my_attempts  = AssessmentAttempt.objects.filter(organization=org, user=request.user)
-        total_attempted = my_attempts.count()
-        total_passed    = my_attempts.filter(passed=True).count()
-        my_skills       = SkillProficiency.objects.filter(organization=org, user=request.user).count()
-        avg_score_raw   = my_attempts.aggregate(avg=Avg("score"))["avg"]
-        avg_score       = round(avg_score_raw, 1) if avg_score_raw else 0
-
-        # ── Chart 1: My skill proficiency levels ──────────────────────────
-        my_profs = list(
-            SkillProficiency.objects
-            .filter(organization=org, user=request.user)
-            .select_related("skill")
-            .order_by("level")
+        trend_fig = _empty_figure("No attempt data yet")
+
+    # ── Chart 3: Proficiency level distribution (bar) ────────────────
+    prof_qs = (
+        SkillProficiency.objects.filter(organization=org)
+        .values("level")
+        .annotate(count=Count("id"))
+        .order_by("level")
+    )
+    if prof_qs:
+        prof_df = pd.DataFrame({
+            "Level":     [f"L{r['level']} {LEVEL_LABELS[r['level']]}" for r in prof_qs],
+            "Employees": [r["count"] for r in prof_qs],
+        })
+        prof_fig = px.bar(
+            prof_df, x="Level", y="Employees",
+            color="Level",
+            color_discrete_sequence=APP_COLORS,
+            text="Employees",
+            title="Proficiency Level Distribution (Org-wide)",
         )
-        if my_profs:
-            skill_fig = px.bar(
-                x=[p.level for p in my_profs],
-                y=[p.skill.name for p in my_profs],
-                orientation="h",
-                color=[p.level for p in my_profs],
-                color_continuous_scale=APP_COLORS,
-                text=[f"L{p.level} – {LEVEL_LABELS[p.level]}" for p in my_profs],
-                title="My Skill Proficiency Levels",
-                labels={"x": "Level (1–5)", "y": "Skill", "color": "Level"},
-            )
-            skill_fig.update_traces(textposition="outside")
-            skill_fig.update_layout(
-                coloraxis_showscale=False,
-                xaxis=dict(range=[0, 6.5], tickvals=[1, 2, 3, 4, 5]),
-            )
-            _base_layout(skill_fig, height=max(300, len(my_profs) * 52 + 90))
-        else:
-            skill_fig = _empty_figure("No skills certified yet — pass an assessment to earn one!")
-
-        # ── Chart 2: My score history (scatter) ───────────────────────────
-        history = list(my_attempts.select_related("assessment").order_by("submitted_at")[:30])
-        if history:
-            hist_fig = px.scatter(
-                x=[a.submitted_at.strftime("%d %b %Y") for a in history],
-                y=[a.score for a in history],
-                color=["Pass" if a.passed else "Fail" for a in history],
-                hover_name=[a.assessment.title for a in history],
-                title="My Assessment Score History",
-                labels={"x": "Date", "y": "Score (%)", "color": "Result"},
-                color_discrete_map={"Pass": "#22c55e", "Fail": "#ef4444"},
-            )
-            hist_fig.add_hline(
-                y=70, line_dash="dash", line_color="#94a3b8",
-                annotation_text="Typical pass mark (70%)",
-                annotation_position="bottom right",
-            )
-            hist_fig.update_traces(marker=dict(size=11))
-            hist_fig.update_layout(yaxis=dict(range=[0, 105]))
-            _base_layout(hist_fig)
-        else:
-            hist_fig = _empty_figure("No attempts yet — take an assessment to see your scores!")
+        prof_fig.update_traces(textposition="outside")
+        prof_fig.update_layout(showlegend=False)
+        _base_layout(prof_fig)
+    else:
+        prof_fig = _empty_figure("No proficiencies recorded yet")
+
+    # ── Chart 4: Top performers — most skills certified ───────────────
+    top_qs = list(
+        SkillProficiency.objects.filter(organization=org)
+        .values("user__full_name", "user__email")
+        .annotate(skills=Count("skill"))
+        .order_by("-skills")[:10]
+    )
+    if top_qs:
+        top_df = pd.DataFrame({
+            "Employee": [
+                r["user__full_name"] or r["user__email"].split("@")[0]
+                for r in top_qs
+            ],
+            "Skills Certified": [r["skills"] for r in top_qs],
+        }).sort_values("Skills Certified")
+        top_fig = px.bar(
+            top_df, x="Skills Certified", y="Employee", orientation="h",
+            color="Skills Certified",
+            color_continuous_scale=APP_COLORS,
+            text="Skills Certified",
+            title="Top Performers — Skills Certified",
+        )
+        top_fig.update_traces(textposition="outside")
+        top_fig.update_layout(
+            coloraxis_showscale=False,
+            xaxis_range=[0, top_df["Skills Certified"].max() + 1.5],
+        )
+        _base_layout(top_fig, height=max(300, len(top_qs) * 48 + 90))
+    else:
+        top_fig = _empty_figure("No data yet")
+
+    return {
+        "is_manager":       True,
+        "total_modules":    total_modules,
+        "total_attempts":   total_attempts,
+        "overall_pass_rate": overall_pass_rate,
+        "certified_users":  certified_users,
+        "pass_rate_plot":   pass_rate_fig.to_dict(),
+        "trend_plot":       trend_fig.to_dict(),
+        "prof_plot":        prof_fig.to_dict(),
+        "top_plot":         top_fig.to_dict(),
+    }
 
-        context = {
-            "is_manager":      False,
-            "total_attempted": total_attempted,
-            "total_passed":    total_passed,
-            "my_skills":       my_skills,
-            "avg_score":       avg_score,
-            "skill_plot":      pio.to_html(skill_fig, full_html=False),
-            "hist_plot":       pio.to_html(hist_fig,  full_html=False),
-            "recent_attempts": my_attempts.select_related("assessment").order_by("-submitted_at")[:8],
-        }
 
-    return render(request, "training/dashboard.html", context)
+def _personal_dashboard_context(org, user):
+    """The employee's own KPIs and charts."""
+    # ── KPIs (personal) ───────────────────────────────────────────────
+    my_attempts  = AssessmentAttempt.objects.filter(organization=org, user=user)
+    total_attempted = my_attempts.count()
+    total_passed    = my_attempts.filter(passed=True).count()
+    my_skills       = SkillProficiency.objects.filter(organization=org, user=user).count()
+    avg_score_raw   = my_attempts.aggregate(avg=Avg("score"))["avg"]
+    avg_score       = round(avg_score_raw, 1) if avg_score_raw else 0
+
+    # ── Chart 1: My skill proficiency levels ──────────────────────────
+    my_profs = list(
+        SkillProficiency.objects
+        .filter(organization=org, user=user)
+        .select_related("skill")
+        .order_by("level")
+    )
+    if my_profs:
+        skill_fig = px.bar(
+            x=[p.level for p in my_profs],
+            y=[p.skill.name for p in my_profs],
+            orientation="h",
+            color=[p.level for p in my_profs],
+            color_continuous_scale=APP_COLORS,
+            text=[f"L{p.level} – {LEVEL_LABELS[p.level]}" for p in my_profs],
+            title="My Skill Proficiency Levels",
+            labels={"x": "Level (1–5)", "y": "Skill", "color": "Level"},
+        )
+        skill_fig.update_traces(textposition="outside")
+        skill_fig.update_layout(
+            coloraxis_showscale=False,
+            xaxis=dict(range=[0, 6.5], tickvals=[1, 2, 3, 4, 5]),
+        )
+        _base_layout(skill_fig, height=max(300, len(my_profs) * 52 + 90))
+    else:
+        skill_fig = _empty_figure("No skills certified yet — pass an assessment to earn one!")
+
+    # ── Chart 2: My score history (scatter) ───────────────────────────
+    history = list(my_attempts.select_related("assessment").order_by("submitted_at")[:30])
+    if history:
+        hist_fig = px.scatter(
+            x=[a.submitted_at.strftime("%d %b %Y") for a in history],
+            y=[a.score for a in history],
+            color=["Pass" if a.passed else "Fail" for a in history],
+            hover_name=[a.assessment.title for a in history],
+            title="My Assessment Score History",
+            labels={"x": "Date", "y": "Score (%)", "color": "Result"},
+            color_discrete_map={"Pass": "#22c55e", "Fail": "#ef4444"},
+        )
+        hist_fig.add_hline(
+            y=70, line_dash="dash", line_color="#94a3b8",
+            annotation_text="Typical pass mark (70%)",
+            annotation_position="bottom right",
+        )
+        hist_fig.update_traces(marker=dict(size=11))
+        hist_fig.update_layout(yaxis=dict(range=[0, 105]))
+        _base_layout(hist_fig)
+    else:
+        hist_fig = _empty_figure("No attempts yet — take an assessment to see your scores!")
+
+    return {
+        "is_manager":      False,
+        "total_attempted": total_attempted,
+        "total_passed":    total_passed,
+        "my_skills":       my_skills,
+        "avg_score":       avg_score,
+        "skill_plot":      skill_fig.to_dict(),
+        "hist_plot":       hist_fig.to_dict(),
+    }
 
 
 # ── Skills & Categories management ───────────────────────────────────────────
@@ -723,37 +755,36 @@ def report_skills_csv(request):
     proficiencies = (
         SkillProficiency.objects
         .filter(organization=org)
-        .select_related("user", "skill", "skill__category")
         .order_by("user__full_name", "skill__name")
     )
 
-    response = HttpResponse(content_type="text/csv")
-    response["Content-Disposition"] = 'attachment; filename="skill_matrix.csv"'
-
-    writer = csv.writer(response)
-    writer.writerow([
-        "Employee Name", "Employee ID", "Email", "Role",
-        "Skill Category", "Skill", "Proficiency Level", "Level Label", "Last Assessed",
-    ])
-
     level_labels = {
         1: "Beginner", 2: "Basic", 3: "Intermediate", 4: "Advanced", 5: "Expert",
     }
-
-    for prof in proficiencies:
-        writer.writerow([
-            prof.user.full_name or prof.user.email,
-            prof.user.employee_id or "",
-            prof.user.email,
-            prof.user.get_role_display(),
-            prof.skill.category.name if prof.skill.category else "—",
-            prof.skill.name,
-            prof.level,
-            level_labels.get(prof.level, "—"),
-            prof.last_assessed_at.strftime("%d %b %Y") if prof.last_assessed_at else "—",
-        ])
-
-    return response
+    role_labels = dict(User.ROLE_CHOICES)
+
+    rows = (
+        (
+            r["user__full_name"] or r["user__email"],
+            r["user__employee_id"] or "",
+            r["user__email"],
+            role_labels.get(r["user__role"], r["user__role"]),
+            r["skill__category__name"] or "—",
+            r["skill__name"],
+            r["level"],
+            level_labels.get(r["level"], "—"),
+            r["last_assessed_at"].strftime("%d %b %Y") if r["last_assessed_at"] else "—",
+        )
+        for r in iter_values(
+            proficiencies,
+            "user__full_name", "user__email", "user__employee_id", "user__role",
+            "skill__category__name", "skill__name", "level", "last_assessed_at",
+        )
+    )
+    return stream_csv("skill_matrix.csv", [
+        "Employee Name", "Employee ID", "Email", "Role",
+        "Skill Category", "Skill", "Proficiency Level", "Level Label", "Last Assessed",
+    ], rows)
 
 
 @login_required
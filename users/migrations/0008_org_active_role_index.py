@@ -0,0 +1,19 @@
+# Generated by Django 5.1 on 2026-10-17 03:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('core', '0011_searchentry'),
+        ('users', '0007_customuser_reports_to'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='customuser',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['organization', 'role'], name='users_org_active_role_idx'),
+        ),
+    ]
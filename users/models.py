@@ -108,6 +108,14 @@ class CustomUser(AbstractBaseUser, PermissionsMixin):
                 name="unique_employee_id_per_org",
             )
         ]
+        indexes = [
+            # core/recipients.py: active users of an org by role
+            models.Index(
+                fields=["organization", "role"],
+                condition=models.Q(is_active=True),
+                name="users_org_active_role_idx",
+            ),
+        ]
 
     @property
     def is_worker_account(self):
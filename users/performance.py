@@ -9,6 +9,7 @@ from datetime import date, timedelta
 from io import BytesIO
 from typing import Optional
 
+import numpy as np
 from django.db.models import Avg, Count, F, FloatField, Q
 from django.db.models.functions import Cast
 from django.utils import timezone
@@ -18,6 +19,15 @@ from django.utils import timezone
 # Observation stats
 # ---------------------------------------------------------------------------
 
+def _count_by(field, values):
+    """One conditional Count() per value of ``field``, for aggregate()."""
+    return {v: Count("id", filter=Q(**{field: v})) for v in values}
+
+
+_OBS_STATUSES = ["OPEN", "IN_PROGRESS", "AWAITING_VERIFICATION", "CLOSED"]
+_OBS_SEVERITIES = ["LOW", "MEDIUM", "HIGH"]
+
+
 def get_observation_stats(user, org) -> dict:
     from observations.models import Observation
 
@@ -25,54 +35,44 @@ def get_observation_stats(user, org) -> dict:
     today = date.today()
     thirty_days_ago = timezone.now() - timedelta(days=30)
 
-    # --- reported by user (observer) ---
-    reported = base_obs.filter(observer=user)
-    total_reported = reported.count()
-
-    reported_by_severity = {
-        "LOW": reported.filter(severity="LOW").count(),
-        "MEDIUM": reported.filter(severity="MEDIUM").count(),
-        "HIGH": reported.filter(severity="HIGH").count(),
-    }
-    reported_by_status = {
-        "OPEN": reported.filter(status="OPEN").count(),
-        "IN_PROGRESS": reported.filter(status="IN_PROGRESS").count(),
-        "AWAITING_VERIFICATION": reported.filter(status="AWAITING_VERIFICATION").count(),
-        "CLOSED": reported.filter(status="CLOSED").count(),
-    }
+    # --- reported by user (observer) — one conditional aggregate ---
+    reported = base_obs.filter(observer=user).aggregate(
+        total=Count("id"),
+        last_30_days=Count("id", filter=Q(date_observed__gte=thirty_days_ago)),
+        **{f"sev_{k}": v for k, v in _count_by("severity", _OBS_SEVERITIES).items()},
+        **{f"st_{k}": v for k, v in _count_by("status", _OBS_STATUSES).items()},
+    )
+    total_reported = reported["total"]
+    reported_by_severity = {sev: reported[f"sev_{sev}"] for sev in _OBS_SEVERITIES}
+    reported_by_status = {st: reported[f"st_{st}"] for st in _OBS_STATUSES}
     reported_closed = reported_by_status["CLOSED"]
     closure_rate_reported = (reported_closed / total_reported * 100) if total_reported else 0
-    last_30_days = reported.filter(date_observed__gte=thirty_days_ago).count()
+    last_30_days = reported["last_30_days"]
 
     # --- assigned to user (action owner) ---
     assigned = base_obs.filter(assigned_to=user)
-    total_assigned = assigned.count()
-
-    assigned_by_status = {
-        "OPEN": assigned.filter(status="OPEN").count(),
-        "IN_PROGRESS": assigned.filter(status="IN_PROGRESS").count(),
-        "AWAITING_VERIFICATION": assigned.filter(status="AWAITING_VERIFICATION").count(),
-        "CLOSED": assigned.filter(status="CLOSED").count(),
-    }
+    assigned_agg = assigned.aggregate(
+        total=Count("id"),
+        overdue=Count("id", filter=(
+            ~Q(status="CLOSED") & Q(target_date__lt=today, target_date__isnull=False)
+        )),
+        **{f"st_{k}": v for k, v in _count_by("status", _OBS_STATUSES).items()},
+    )
+    total_assigned = assigned_agg["total"]
+    assigned_by_status = {st: assigned_agg[f"st_{st}"] for st in _OBS_STATUSES}
     assigned_closed = assigned_by_status["CLOSED"]
     closure_rate_assigned = (assigned_closed / total_assigned * 100) if total_assigned else 0
 
     # avg days to close (only for closed with date_closed)
-    closed_with_dates = assigned.filter(status="CLOSED", date_closed__isnull=False)
-    avg_days_to_close = 0.0
-    if closed_with_dates.exists():
-        total_days = sum(
-            (obs.date_closed.date() - obs.date_observed.date()).days
-            for obs in closed_with_dates.only("date_closed", "date_observed")
-            if obs.date_closed
-        )
-        avg_days_to_close = total_days / closed_with_dates.count()
+    closed_days = [
+        (closed.date() - observed.date()).days
+        for observed, closed in assigned.filter(
+            status="CLOSED", date_closed__isnull=False,
+        ).values_list("date_observed", "date_closed")
+    ]
+    avg_days_to_close = sum(closed_days) / len(closed_days) if closed_days else 0.0
 
-    overdue_count = assigned.filter(
-        ~Q(status="CLOSED"),
-        target_date__lt=today,
-        target_date__isnull=False,
-    ).count()
+    overdue_count = assigned_agg["overdue"]
 
     return {
         "total_reported": total_reported,
@@ -95,18 +95,27 @@ def get_observation_stats(user, org) -> dict:
 def get_training_stats(user, org) -> dict:
     from training.models import AssessmentAttempt, SkillProficiency
 
-    attempts = AssessmentAttempt.objects.filter(organization=org, user=user)
-    total_attempts = attempts.count()
-    passed_attempts = attempts.filter(passed=True).count()
+    attempts = AssessmentAttempt.objects.filter(organization=org, user=user).aggregate(
+        total=Count("id"),
+        passed=Count("id", filter=Q(passed=True)),
+        avg_score=Avg("score"),
+        distinct_assessments=Count("assessment", distinct=True),
+    )
+    total_attempts = attempts["total"]
+    passed_attempts = attempts["passed"]
     pass_rate = (passed_attempts / total_attempts * 100) if total_attempts else 0
-    avg_score = attempts.aggregate(avg=Avg("score"))["avg"] or 0.0
+    avg_score = attempts["avg_score"] or 0.0
 
-    distinct_assessments = attempts.values("assessment").distinct().count()
+    distinct_assessments = attempts["distinct_assessments"]
 
-    proficiencies = SkillProficiency.objects.filter(organization=org, user=user)
-    skills_certified = proficiencies.count()
-    skill_levels = {i: proficiencies.filter(level=i).count() for i in range(1, 6)}
-    avg_skill_level = proficiencies.aggregate(avg=Avg("level"))["avg"] or 0.0
+    proficiencies = SkillProficiency.objects.filter(organization=org, user=user).aggregate(
+        total=Count("id"),
+        avg_level=Avg("level"),
+        **{f"level_{i}": Count("id", filter=Q(level=i)) for i in range(1, 6)},
+    )
+    skills_certified = proficiencies["total"]
+    skill_levels = {i: proficiencies[f"level_{i}"] for i in range(1, 6)}
+    avg_skill_level = proficiencies["avg_level"] or 0.0
 
     return {
         "total_modules_taken": distinct_assessments,
@@ -121,157 +130,195 @@ def get_training_stats(user, org) -> dict:
 
 
 # ---------------------------------------------------------------------------
-# Star rating helpers
+# Star ratings — org-wide scoring engine
 # ---------------------------------------------------------------------------
+#
+# Every user's raw score for a role is computed from a few grouped aggregate
+# queries, then the whole org is ranked at once with NumPy. The result for
+# the org is cached via core.kpi_cache (invalidated by observation, training
+# and user writes; KPI_CACHE_TIMEOUT as TTL), so a profile page or
+# certificate is a dictionary lookup.
 
-def _percentile_to_stars(score: float, all_scores: list[float]) -> float:
-    """Map a score to 1–5 stars based on percentile rank within all_scores."""
-    if not all_scores:
-        return 3.0
-    rank = sum(1 for s in all_scores if s < score)
-    percentile = rank / len(all_scores) * 100
-    if percentile < 20:
-        return 1.0
-    elif percentile < 40:
-        return 2.0
-    elif percentile < 60:
-        return 3.0
-    elif percentile < 80:
-        return 4.0
-    else:
-        return 5.0
+# Percentile bands → 1–5 stars
+_STAR_BANDS = np.array([20, 40, 60, 80])
+
+PERFORMANCE_MODULES = ("observations", "training", "users")
 
 
-def _observer_raw(total_reported: int, high: int, medium: int, low: int, closure_rate: float) -> float:
+def _observer_raw(total_reported, high, medium, low, closure_rate):
     quality = (high * 3 + medium * 2 + low * 1) * 0.4
     closure = closure_rate * 0.4
-    volume = min(total_reported, 50) / 50 * 100 * 0.2
+    volume = np.minimum(total_reported, 50) / 50 * 100 * 0.2
     return quality + closure + volume
 
 
-def _action_owner_raw(closure_rate: float, avg_days_to_close: float, overdue_count: int, total_assigned: int) -> float:
+def _action_owner_raw(closure_rate, avg_days_to_close, overdue_count, total_assigned):
     closure = closure_rate * 0.5
-    speed = (1 / max(avg_days_to_close, 1)) * 100 * 0.3
-    punctuality = (1 - overdue_count / max(total_assigned, 1)) * 100 * 0.2
+    speed = (1 / np.maximum(avg_days_to_close, 1)) * 100 * 0.3
+    punctuality = (1 - overdue_count / np.maximum(total_assigned, 1)) * 100 * 0.2
     return closure + speed + punctuality
 
 
-def _training_raw(pass_rate: float, avg_score: float, avg_skill_level: float) -> float:
+def _training_raw(pass_rate, avg_score, avg_skill_level):
     return pass_rate * 0.4 + avg_score * 0.2 + avg_skill_level / 5 * 100 * 0.4
 
 
-def calculate_observer_stars(user, org) -> Optional[tuple[float, str]]:
-    """Return (stars, rank_label) or None if user has 0 observations."""
+def _rank(pks, scores, noun) -> dict:
+    """
+    Map each pk to ``(stars, "<rank> of <n> <noun>")``. Stars come from the
+    share of the org scoring strictly lower (20% bands); rank orders by
+    score, highest first, ties by pk.
+    """
+    n = len(pks)
+    if not n:
+        return {}
+    pks = np.asarray(pks)
+    scores = np.asarray(scores, dtype=float)
+    below = np.searchsorted(np.sort(scores), scores, side="left")
+    stars = np.digitize(below / n * 100, _STAR_BANDS) + 1.0
+    order = np.lexsort((pks, -scores))
+    rank = np.empty(n, dtype=int)
+    rank[order] = np.arange(1, n + 1)
+    return {
+        int(pk): (float(st), f"{r} of {n} {noun}")
+        for pk, st, r in zip(pks.tolist(), stars.tolist(), rank.tolist())
+    }
+
+
+def _observer_ratings(org) -> dict:
     from observations.models import Observation
 
-    base = Observation.objects.filter(organization=org)
-
-    # All org users who have reported at least 1
-    from django.contrib.auth import get_user_model
-    User = get_user_model()
-    org_users = User.objects.filter(organization=org)
-
-    user_scores = {}
-    for u in org_users:
-        reported = base.filter(observer=u)
-        total = reported.count()
-        if total == 0:
-            continue
-        sev = {
-            "HIGH": reported.filter(severity="HIGH").count(),
-            "MEDIUM": reported.filter(severity="MEDIUM").count(),
-            "LOW": reported.filter(severity="LOW").count(),
-        }
-        closed = reported.filter(status="CLOSED").count()
-        cr = closed / total * 100
-        user_scores[u.pk] = _observer_raw(total, sev["HIGH"], sev["MEDIUM"], sev["LOW"], cr)
-
-    if user.pk not in user_scores:
-        return None
-
-    all_scores = list(user_scores.values())
-    stars = _percentile_to_stars(user_scores[user.pk], all_scores)
-    rank = sorted(user_scores.keys(), key=lambda pk: user_scores[pk], reverse=True).index(user.pk) + 1
-    total_observers = len(user_scores)
-    return stars, f"{rank} of {total_observers} observers"
+    rows = list(
+        Observation.objects.filter(organization=org, observer__organization=org)
+        .values("observer")
+        .annotate(
+            total=Count("id"),
+            high=Count("id", filter=Q(severity="HIGH")),
+            medium=Count("id", filter=Q(severity="MEDIUM")),
+            low=Count("id", filter=Q(severity="LOW")),
+            closed=Count("id", filter=Q(status="CLOSED")),
+        )
+        .order_by()
+    )
+    if not rows:
+        return {}
+    total = np.array([r["total"] for r in rows], dtype=float)
+    closed = np.array([r["closed"] for r in rows], dtype=float)
+    scores = _observer_raw(
+        total,
+        np.array([r["high"] for r in rows], dtype=float),
+        np.array([r["medium"] for r in rows], dtype=float),
+        np.array([r["low"] for r in rows], dtype=float),
+        closed / total * 100,
+    )
+    return _rank([r["observer"] for r in rows], scores, "observers")
 
 
-def calculate_action_owner_stars(user, org) -> Optional[tuple[float, str]]:
-    """Return (stars, rank_label) or None if user has 0 assigned observations."""
+def _action_owner_ratings(org) -> dict:
     from observations.models import Observation
 
-    base = Observation.objects.filter(organization=org)
+    assigned = Observation.objects.filter(organization=org, assigned_to__organization=org)
+    rows = list(
+        assigned.values("assigned_to")
+        .annotate(
+            total=Count("id"),
+            closed=Count("id", filter=Q(status="CLOSED")),
+            overdue=Count("id", filter=(
+                ~Q(status="CLOSED") & Q(target_date__lt=date.today(), target_date__isnull=False)
+            )),
+        )
+        .order_by()
+    )
+    if not rows:
+        return {}
+    pks = [r["assigned_to"] for r in rows]
+    index = {pk: i for i, pk in enumerate(pks)}
+
+    # Days to close per closed observation, summed per owner with bincount.
+    closed_rows = assigned.filter(
+        status="CLOSED", date_closed__isnull=False,
+    ).values_list("assigned_to", "date_observed", "date_closed")
+    owner_idx, days = [], []
+    for owner, observed, closed_at in closed_rows:
+        owner_idx.append(index[owner])
+        days.append((closed_at.date() - observed.date()).days)
+    day_sums = np.bincount(owner_idx, weights=days, minlength=len(pks))
+    day_counts = np.bincount(owner_idx, minlength=len(pks))
+    avg_days = np.divide(day_sums, day_counts, out=np.zeros(len(pks)), where=day_counts > 0)
+
+    total = np.array([r["total"] for r in rows], dtype=float)
+    scores = _action_owner_raw(
+        np.array([r["closed"] for r in rows], dtype=float) / total * 100,
+        avg_days,
+        np.array([r["overdue"] for r in rows], dtype=float),
+        total,
+    )
+    return _rank(pks, scores, "action owners")
+
 
-    from django.contrib.auth import get_user_model
-    User = get_user_model()
-    org_users = User.objects.filter(organization=org)
+def _training_ratings(org) -> dict:
+    from training.models import AssessmentAttempt, SkillProficiency
 
-    today = date.today()
-    user_scores = {}
-    for u in org_users:
-        assigned = base.filter(assigned_to=u)
-        total = assigned.count()
-        if total == 0:
-            continue
-        closed_qs = assigned.filter(status="CLOSED", date_closed__isnull=False)
-        closed = assigned.filter(status="CLOSED").count()
-        cr = closed / total * 100
-
-        avg_days = 0.0
-        if closed_qs.exists():
-            total_days = sum(
-                (obs.date_closed.date() - obs.date_observed.date()).days
-                for obs in closed_qs.only("date_closed", "date_observed")
-                if obs.date_closed
-            )
-            avg_days = total_days / closed_qs.count()
-
-        from django.db.models import Q
-        overdue = assigned.filter(
-            ~Q(status="CLOSED"), target_date__lt=today, target_date__isnull=False
-        ).count()
-
-        user_scores[u.pk] = _action_owner_raw(cr, avg_days, overdue, total)
-
-    if user.pk not in user_scores:
-        return None
-
-    all_scores = list(user_scores.values())
-    stars = _percentile_to_stars(user_scores[user.pk], all_scores)
-    rank = sorted(user_scores.keys(), key=lambda pk: user_scores[pk], reverse=True).index(user.pk) + 1
-    total_owners = len(user_scores)
-    return stars, f"{rank} of {total_owners} action owners"
+    rows = list(
+        AssessmentAttempt.objects.filter(organization=org, user__organization=org)
+        .values("user")
+        .annotate(
+            total=Count("id"),
+            passed=Count("id", filter=Q(passed=True)),
+            avg_score=Avg("score"),
+        )
+        .order_by()
+    )
+    if not rows:
+        return {}
+    skill = dict(
+        SkillProficiency.objects.filter(organization=org)
+        .values_list("user")
+        .annotate(avg=Avg("level"))
+        .order_by()
+    )
+    pks = [r["user"] for r in rows]
+    total = np.array([r["total"] for r in rows], dtype=float)
+    scores = _training_raw(
+        np.array([r["passed"] for r in rows], dtype=float) / total * 100,
+        np.array([r["avg_score"] or 0.0 for r in rows], dtype=float),
+        np.array([skill.get(pk) or 0.0 for pk in pks], dtype=float),
+    )
+    return _rank(pks, scores, "learners")
+
+
+def compute_org_ratings(org) -> dict:
+    """
+    Star ratings for every ranked user in the org::
+
+        {"observer": {pk: (stars, rank_label)}, "action_owner": {...}, "training": {...}}
+    """
+    return {
+        "observer":     _observer_ratings(org),
+        "action_owner": _action_owner_ratings(org),
+        "training":     _training_ratings(org),
+    }
+
+
+def org_ratings(org) -> dict:
+    """compute_org_ratings(), cached per org until its source data changes."""
+    from core.kpi_cache import cached_kpis
+    return cached_kpis(org, "performance", PERFORMANCE_MODULES, lambda: compute_org_ratings(org))
+
+
+def calculate_observer_stars(user, org) -> Optional[tuple[float, str]]:
+    """Return (stars, rank_label) or None if user has 0 observations."""
+    return org_ratings(org)["observer"].get(user.pk)
+
+
+def calculate_action_owner_stars(user, org) -> Optional[tuple[float, str]]:
+    """Return (stars, rank_label) or None if user has 0 assigned observations."""
+    return org_ratings(org)["action_owner"].get(user.pk)
 
 
 def calculate_training_stars(user, org) -> Optional[tuple[float, str]]:
     """Return (stars, rank_label) or None if user has 0 attempts."""
-    from training.models import AssessmentAttempt, SkillProficiency
-
-    from django.contrib.auth import get_user_model
-    User = get_user_model()
-    org_users = User.objects.filter(organization=org)
-
-    user_scores = {}
-    for u in org_users:
-        attempts = AssessmentAttempt.objects.filter(organization=org, user=u)
-        if not attempts.exists():
-            continue
-        total = attempts.count()
-        passed = attempts.filter(passed=True).count()
-        pass_rate = passed / total * 100
-        avg_score = attempts.aggregate(avg=Avg("score"))["avg"] or 0.0
-        profs = SkillProficiency.objects.filter(organization=org, user=u)
-        avg_skill = profs.aggregate(avg=Avg("level"))["avg"] or 0.0
-        user_scores[u.pk] = _training_raw(pass_rate, avg_score, avg_skill)
-
-    if user.pk not in user_scores:
-        return None
-
-    all_scores = list(user_scores.values())
-    stars = _percentile_to_stars(user_scores[user.pk], all_scores)
-    rank = sorted(user_scores.keys(), key=lambda pk: user_scores[pk], reverse=True).index(user.pk) + 1
-    total_learners = len(user_scores)
-    return stars, f"{rank} of {total_learners} learners"
+    return org_ratings(org)["training"].get(user.pk)
 
 
 # ---------------------------------------------------------------------------
@@ -283,11 +330,12 @@ def generate_certificate_pdf(user, obs_stats: dict, training_stats: dict,
     """Return PDF bytes for a performance certificate."""
     from reportlab.lib import colors
     from reportlab.lib.pagesizes import A4, landscape
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
     from reportlab.lib.units import mm
     from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, HRFlowable
     from reportlab.lib.enums import TA_CENTER
 
+    from core.pdf import sample_style, text_style
+
     buffer = BytesIO()
     page_w, page_h = landscape(A4)
     margin = 22 * mm
@@ -311,12 +359,11 @@ def generate_certificate_pdf(user, obs_stats: dict, training_stats: dict,
     # never collapse onto each other regardless of font size.
     # Rule of thumb: leading ≈ fontSize * 1.35–1.5
     # ------------------------------------------------------------------
-    base = getSampleStyleSheet()["Normal"]
-
-    def ps(name, fontSize, fontName="Helvetica", textColor=GREY,
+    # Built once per process (core/pdf.py) — identical for every certificate.
+    def ps(fontSize, fontName="Helvetica", textColor=GREY,
            leading=None, alignment=TA_CENTER, spaceBefore=0, spaceAfter=0):
-        return ParagraphStyle(
-            name, parent=base,
+        return text_style(
+            parent=sample_style(),
             fontSize=fontSize,
             leading=leading if leading is not None else round(fontSize * 1.4),
             fontName=fontName,
@@ -326,22 +373,22 @@ def generate_certificate_pdf(user, obs_stats: dict, training_stats: dict,
             spaceAfter=spaceAfter,
         )
 
-    org_style    = ps("Org",    10, "Helvetica-Bold", GREY,  leading=15)
-    title_style  = ps("Title",  24, "Helvetica-Bold", NAVY,  leading=32)
-    certify_style= ps("Certify",10, textColor=GREY,   leading=15)
-    name_style   = ps("Name",   26, "Helvetica-Bold", NAVY,  leading=36)
-    role_style   = ps("Role",   11, textColor=GREY,   leading=16)
-    small_style  = ps("Small",   9, textColor=GREY,   leading=14)
-    footer_style = ps("Footer",  9, textColor=GREY,   leading=13)
+    org_style    = ps(10, "Helvetica-Bold", GREY,  leading=15)
+    title_style  = ps(24, "Helvetica-Bold", NAVY,  leading=32)
+    certify_style= ps(10, textColor=GREY,   leading=15)
+    name_style   = ps(26, "Helvetica-Bold", NAVY,  leading=36)
+    role_style   = ps(11, textColor=GREY,   leading=16)
+    small_style  = ps(9, textColor=GREY,   leading=14)
+    footer_style = ps(9, textColor=GREY,   leading=13)
 
     # Star-cell inner paragraph styles
-    star_label_ps = ps("StarLbl",  8, "Helvetica-Bold", GREY, leading=12)
-    star_stars_ps = ps("StarStars",17, textColor=GOLD, leading=24)
-    star_rank_ps  = ps("StarRank", 8, textColor=GREY, leading=12)
+    star_label_ps = ps(8, "Helvetica-Bold", GREY, leading=12)
+    star_stars_ps = ps(17, textColor=GOLD, leading=24)
+    star_rank_ps  = ps(8, textColor=GREY, leading=12)
 
     # Metrics-cell inner paragraph styles
-    metric_hdr_ps = ps("MetHdr", 8, "Helvetica-Bold", colors.white, leading=12)
-    metric_val_ps = ps("MetVal",18, "Helvetica-Bold", colors.white,   leading=26)
+    metric_hdr_ps = ps(8, "Helvetica-Bold", colors.white, leading=12)
+    metric_val_ps = ps(18, "Helvetica-Bold", colors.white,   leading=26)
 
     # ------------------------------------------------------------------
     # Helpers
@@ -457,7 +504,7 @@ def generate_certificate_pdf(user, obs_stats: dict, training_stats: dict,
     # -- Key metrics table (each cell = list of Paragraphs) --
     content.append(Paragraph(
         "KEY METRICS",
-        ps("MetHdrTitle", 8, "Helvetica-Bold", GREY, leading=12, spaceAfter=3)
+        ps(8, "Helvetica-Bold", GREY, leading=12, spaceAfter=3)
     ))
     content.append(Spacer(1, 2 * mm))
 
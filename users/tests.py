@@ -1,9 +1,21 @@
 """
 Unit tests for the users app.
-Covers: CustomUserManager, CustomUser model properties and methods.
+Covers: CustomUserManager, CustomUser model properties and methods,
+org-wide performance star ratings (users/performance.py), org logo view
+and logo cache (core/logo_utils.py).
 """
-from django.test import TestCase
+import shutil
+import tempfile
+from datetime import timedelta
+from io import BytesIO
+
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
 from django.contrib.auth import get_user_model
+from django.utils import timezone
 
 User = get_user_model()
 
@@ -118,3 +130,151 @@ class CustomUserRolePropertyTests(TestCase):
         self.assertFalse(self.user.is_manager)
         self.assertFalse(self.user.is_safety_manager)
         self.assertFalse(self.user.is_action_owner)
+
+
+# ---------------------------------------------------------------------------
+# Performance star ratings
+# ---------------------------------------------------------------------------
+
+class OrgRatingsTests(TestCase):
+
+    def setUp(self):
+        from core.models import Organization, Plan
+        from observations.models import Location
+
+        cache.clear()
+        Plan.objects.get_or_create(name="Trial", defaults={"price_monthly": 0})
+        self.org = Organization.objects.create(name="Perf Org", domain="perforg")
+        self.location = Location.objects.create(organization=self.org, name="Yard")
+        self.users = [
+            User.objects.create_user(email=f"u{i}@perf.com", password="pass1234", organization=self.org)
+            for i in range(5)
+        ]
+
+    def _observe(self, observer, n, severity="LOW", **extra):
+        from observations.models import Observation
+        for _ in range(n):
+            Observation.objects.create(
+                organization=self.org, location=self.location, observer=observer,
+                title="Obs", description="x", severity=severity, **extra,
+            )
+
+    def test_observer_stars_follow_percentile_bands(self):
+        from users.performance import calculate_observer_stars
+        for i, user in enumerate(self.users):
+            self._observe(user, i + 1)
+        results = [calculate_observer_stars(u, self.org) for u in self.users]
+        self.assertEqual([stars for stars, _ in results], [1.0, 2.0, 3.0, 4.0, 5.0])
+        self.assertEqual(results[-1][1], "1 of 5 observers")
+        self.assertEqual(results[0][1], "5 of 5 observers")
+
+    def test_unranked_user_gets_none(self):
+        from users.performance import calculate_action_owner_stars, calculate_training_stars
+        self._observe(self.users[0], 1)
+        self.assertIsNone(calculate_action_owner_stars(self.users[1], self.org))
+        self.assertIsNone(calculate_training_stars(self.users[1], self.org))
+
+    def test_action_owner_scores_speed(self):
+        from users.performance import calculate_action_owner_stars
+        now = timezone.now()
+        fast, slow = self.users[0], self.users[1]
+        self._observe(self.users[2], 1, assigned_to=fast, status="CLOSED",
+                      date_observed=now - timedelta(days=1), date_closed=now)
+        self._observe(self.users[2], 1, assigned_to=slow, status="CLOSED",
+                      date_observed=now - timedelta(days=20), date_closed=now)
+        self.assertEqual(calculate_action_owner_stars(fast, self.org), (3.0, "1 of 2 action owners"))
+        self.assertEqual(calculate_action_owner_stars(slow, self.org), (1.0, "2 of 2 action owners"))
+
+    def test_query_count_is_independent_of_org_size(self):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from users.performance import compute_org_ratings
+
+        def queries():
+            with CaptureQueriesContext(connection) as ctx:
+                compute_org_ratings(self.org)
+            return len(ctx.captured_queries)
+
+        self._observe(self.users[0], 1, assigned_to=self.users[1])
+        few = queries()
+        for user in self.users:
+            self._observe(user, 3, assigned_to=user)
+        self.assertEqual(queries(), few)
+
+    def test_ratings_cached_until_observations_change(self):
+        from users.performance import calculate_observer_stars
+        self._observe(self.users[0], 1)
+        calculate_observer_stars(self.users[0], self.org)
+        with self.assertNumQueries(0):
+            calculate_observer_stars(self.users[0], self.org)
+        self._observe(self.users[1], 3)
+        self.assertEqual(calculate_observer_stars(self.users[1], self.org)[1], "1 of 2 observers")
+
+
+# ---------------------------------------------------------------------------
+# Org logo view and logo cache
+# ---------------------------------------------------------------------------
+
+_MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def _png(color="red", size=(400, 100)):
+    from PIL import Image
+
+    buf = BytesIO()
+    Image.new("RGB", size, color).save(buf, "PNG")
+    return buf.getvalue()
+
+
+@override_settings(MEDIA_ROOT=_MEDIA_ROOT)
+class OrgLogoTests(TestCase):
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(_MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        from core.logo_utils import clear_logo_cache
+        from core.models import Organization, Plan
+
+        clear_logo_cache()
+        Plan.objects.get_or_create(name="Trial", defaults={"price_monthly": 0})
+        self.org = Organization.objects.create(name="Logo Org", domain="logoorg")
+        self.org.logo.save("logo.png", ContentFile(_png()))
+        self.user = User.objects.create_user(
+            email="boss@logoorg.com", password="pass1234", organization=self.org, role="manager",
+        )
+        self.client.force_login(self.user)
+
+    def test_view_sends_strong_etag_and_304_on_revalidation(self):
+        url = reverse("users:org_logo")
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "image/png")
+        etag = response["ETag"]
+        self.assertFalse(etag.startswith("W/"))
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_cached_bytes_served_without_storage_reads(self):
+        from core.logo_utils import get_logo, get_logo_for_excel
+
+        first = get_logo(self.org)
+        self.assertEqual(first.size, (400, 100))
+        self.assertEqual(get_logo_for_excel(self.org).width, 192)
+        # Gone from storage, but still within the revalidation window.
+        self.org.logo.storage.delete(self.org.logo.name)
+        self.assertIs(get_logo(self.org), first)
+        self.assertEqual(get_logo_for_excel(self.org).height, 48)
+
+    def test_replaced_logo_gets_a_new_etag(self):
+        url = reverse("users:org_logo")
+        old = self.client.get(url)["ETag"]
+        upload = SimpleUploadedFile("logo.png", _png("blue"), content_type="image/png")
+        self.client.post(reverse("users:upload_org_logo"), {"logo": upload})
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=old)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], old)
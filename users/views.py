@@ -4,7 +4,9 @@ from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth import get_user_model, authenticate, login
 from django.http import HttpResponse, Http404
+from django.views.decorators.http import condition
 
+from core.logo_utils import forget_logo, get_logo
 from users.forms import EmailLoginForm, ProfileUpdateForm, OrgLogoForm, WorkerLoginForm
 
 User = get_user_model()
@@ -258,26 +260,30 @@ def profile_certificate_pdf(request, user_id):
     return response
 
 
+def _org_logo(request):
+    org = getattr(request, "organization", None) or getattr(request.user, "organization", None)
+    return get_logo(org)
+
+
+def _org_logo_etag(request):
+    logo = _org_logo(request)
+    return logo.etag if logo else None
+
+
 @login_required
+@condition(etag_func=_org_logo_etag)
 def org_logo_view(request):
     """
     Proxy view: reads the org logo through Django's storage API and returns it
     as an HTTP image response.  Works whether media is on S3 or local disk,
-    and whether the bucket is public or private.
+    and whether the bucket is public or private.  Bytes come from the logo
+    cache (core/logo_utils.py); revalidation with If-None-Match gets a 304.
     """
-    org = getattr(request, "organization", None) or getattr(request.user, "organization", None)
-    if not org or not getattr(org, "logo", None) or not org.logo.name:
-        raise Http404
-
-    import mimetypes
-    try:
-        with org.logo.open("rb") as f:
-            data = f.read()
-    except Exception:
+    logo = _org_logo(request)
+    if logo is None:
         raise Http404
 
-    content_type, _ = mimetypes.guess_type(org.logo.name)
-    response = HttpResponse(data, content_type=content_type or "image/png")
+    response = HttpResponse(logo.data, content_type=logo.content_type)
     # Cache for 1 hour in browser; revalidate after logo changes via ETags
     response["Cache-Control"] = "private, max-age=3600"
     return response
@@ -297,6 +303,7 @@ def upload_org_logo_view(request):
         if form.is_valid():
             if form.cleaned_data.get("remove_logo"):
                 if org.logo:
+                    forget_logo(org.logo.name)
                     org.logo.delete(save=False)
                     org.logo = None
                     org.save(update_fields=["logo"])
@@ -304,9 +311,11 @@ def upload_org_logo_view(request):
             elif form.cleaned_data.get("logo"):
                 # Delete old logo file before replacing
                 if org.logo:
+                    forget_logo(org.logo.name)
                     org.logo.delete(save=False)
                 org.logo = form.cleaned_data["logo"]
                 org.save(update_fields=["logo"])
+                forget_logo(org.logo.name)
                 messages.success(request, "Organisation logo updated successfully.")
             else:
                 messages.info(request, "No changes made.")